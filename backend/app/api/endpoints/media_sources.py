@@ -8,7 +8,8 @@ YouTube, 영상파일, 영상통화 등 다양한 미디어 소스 처리
 from typing import Optional, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Header, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.core.logging import get_logger
 from app.schemas.media_source import (
@@ -18,10 +19,22 @@ from app.schemas.media_source import (
     YouTubeVideoInfo,
     TranslationDisplaySettings,
     TranslationDisplaySettingsUpdate,
+    FileTranscriptionRequest,
+    TranscriptSegment,
     MEDIA_SOURCE_CATEGORIES,
 )
 from app.schemas.common import APIResponse
+from app.core.database import get_db
+from app.services.file_transcription import FileTranscriptionService, get_file_transcription_service
 from app.services.media_source_service import MediaSourceService, get_media_source_service
+from app.services.subtitles import (
+    SUBTITLE_MEDIA_TYPES,
+    SubtitleFormat,
+    media_subtitle_segments,
+    write_subtitles,
+)
+from app.services.upload_service import ResumableUploadService, UploadError, get_upload_service
+from app.services.usage_metering import get_usage_meter
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -225,6 +238,8 @@ async def end_session(
             detail="세션을 찾을 수 없습니다."
         )
     
+    await get_usage_meter().flush(session_id=str(session_id))
+    
     return APIResponse(
         success=True,
         message="세션이 종료되었습니다.",
@@ -321,6 +336,251 @@ async def create_upload_url(
         )
 
 
+def _upload_headers(upload: dict) -> dict:
+    """tus 방식 업로드 상태 헤더"""
+    return {
+        "Upload-Offset": str(upload["offset"]),
+        "Upload-Length": str(upload["length"]),
+        "Cache-Control": "no-store",
+    }
+
+
+@router.head(
+    "/upload/{upload_id}",
+    summary="업로드 오프셋 조회",
+    description="재개할 위치(Upload-Offset 헤더)를 반환합니다."
+)
+async def get_upload_offset(
+    upload_id: UUID,
+    upload_service: ResumableUploadService = Depends(get_upload_service),
+):
+    """업로드 오프셋 조회 (HEAD)"""
+    upload = upload_service.get_upload(str(upload_id))
+    
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="업로드를 찾을 수 없습니다."
+        )
+    
+    return Response(status_code=status.HTTP_200_OK, headers=_upload_headers(upload))
+
+
+@router.get(
+    "/upload/{upload_id}",
+    response_model=APIResponse[dict],
+    summary="업로드 상태",
+    description="업로드 진행 상태를 조회합니다."
+)
+async def get_upload_status(
+    upload_id: UUID,
+    upload_service: ResumableUploadService = Depends(get_upload_service),
+):
+    """업로드 상태 조회"""
+    upload = upload_service.get_upload(str(upload_id))
+    
+    if not upload:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="업로드를 찾을 수 없습니다."
+        )
+    
+    return APIResponse(
+        success=True,
+        data=upload
+    )
+
+
+@router.patch(
+    "/upload/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="청크 업로드",
+    description="Upload-Offset 위치부터 요청 본문을 기록합니다. Upload-Checksum이 있으면 청크를 검증합니다."
+)
+async def upload_chunk(
+    upload_id: UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    upload_checksum: Optional[str] = Header(None, alias="Upload-Checksum"),
+    upload_service: ResumableUploadService = Depends(get_upload_service),
+):
+    """청크 업로드 (본문은 스트리밍으로 바로 파일에 기록)"""
+    try:
+        upload = await upload_service.write_chunk(
+            upload_id=str(upload_id),
+            offset=upload_offset,
+            body=request.stream(),
+            checksum=upload_checksum,
+        )
+    except UploadError as e:
+        upload = upload_service.get_upload(str(upload_id))
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers=_upload_headers(upload) if upload else None,
+        )
+    
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers=_upload_headers(upload))
+
+
+@router.delete(
+    "/upload/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="업로드 취소",
+    description="업로드를 취소하고 받은 파일을 삭제합니다."
+)
+async def delete_upload(
+    upload_id: UUID,
+    upload_service: ResumableUploadService = Depends(get_upload_service),
+):
+    """업로드 취소"""
+    if not upload_service.delete_upload(str(upload_id)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="업로드를 찾을 수 없습니다."
+        )
+    
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+# ==================== 파일 전사 ====================
+
+@router.post(
+    "/sessions/{session_id}/transcribe",
+    response_model=APIResponse[dict],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="업로드 파일 전사",
+    description="업로드한 파일을 청크로 나눠 병렬 전사합니다. 진행 상황은 /ws/media/{session_id}로 전달됩니다."
+)
+async def transcribe_file(
+    session_id: UUID,
+    request: FileTranscriptionRequest,
+    user_id: UUID = Query(..., description="사용자 ID (세션 소유자)"),
+    media_service: MediaSourceService = Depends(get_media_source_service),
+    transcription_service: FileTranscriptionService = Depends(get_file_transcription_service),
+):
+    """업로드 파일 전사 시작"""
+    session = await media_service.get_session(str(session_id))
+    
+    if not session or session.get("user_id") != str(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="세션을 찾을 수 없습니다."
+        )
+    
+    if transcription_service.is_running(str(session_id)):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="이미 전사가 진행 중입니다."
+        )
+    
+    try:
+        job = transcription_service.start(
+            session_id=str(session_id),
+            file_path=request.file_path,
+            language=request.language,
+            user_id=str(user_id),
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="업로드된 파일을 찾을 수 없습니다."
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return APIResponse(
+        success=True,
+        message="전사를 시작했습니다.",
+        data=job
+    )
+
+
+@router.get(
+    "/sessions/{session_id}/transcription",
+    response_model=APIResponse[dict],
+    summary="파일 전사 상태",
+    description="진행 중이거나 끝난 파일 전사 작업의 상태를 조회합니다."
+)
+async def get_transcription_status(
+    session_id: UUID,
+    media_service: MediaSourceService = Depends(get_media_source_service),
+    transcription_service: FileTranscriptionService = Depends(get_file_transcription_service),
+):
+    """파일 전사 상태 조회"""
+    job = transcription_service.get_job(str(session_id))
+    if job:
+        return APIResponse(success=True, data=job)
+    
+    # 다른 프로세스/재시작 전에 실행한 작업은 세션에 기록된 상태 반환
+    session = await media_service.get_session(str(session_id))
+    transcription = ((session or {}).get("source_metadata") or {}).get("transcription")
+    
+    if not transcription:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="전사 작업이 없습니다."
+        )
+    
+    return APIResponse(success=True, data=transcription)
+
+
+@router.get(
+    "/sessions/{session_id}/transcript",
+    response_model=APIResponse[List[TranscriptSegment]],
+    summary="파일 전사 결과",
+    description="완료된 파일 전사 결과를 시간 순으로 조회합니다."
+)
+async def get_transcript(
+    session_id: UUID,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(500, ge=1, le=1000),
+):
+    """파일 전사 결과 조회"""
+    segments = await get_db().get_media_transcript_segments(
+        str(session_id),
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+    
+    return APIResponse(
+        success=True,
+        data=segments
+    )
+
+
+
+@router.get(
+    "/sessions/{session_id}/subtitles",
+    summary="파일 전사 자막 내보내기",
+    description="파일 전사 결과를 SRT/WebVTT 자막으로 내보냅니다. 전사 언어가 아니면 번역해 내보냅니다."
+)
+async def export_subtitles(
+    session_id: UUID,
+    language: str = Query(..., description="자막 언어"),
+    format: SubtitleFormat = Query(SubtitleFormat.SRT, description="자막 형식 (srt | vtt)"),
+    media_service: MediaSourceService = Depends(get_media_source_service),
+):
+    """파일 전사 자막 스트리밍"""
+    session = await media_service.get_session(str(session_id))
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="세션을 찾을 수 없습니다."
+        )
+    
+    segments = media_subtitle_segments(str(session_id), language, user_id=session.get("user_id"))
+    return StreamingResponse(
+        write_subtitles(segments, format, language),
+        media_type=SUBTITLE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{session_id}.{language}.{format.value}"'},
+    )
+
+
 # ==================== 번역 표시 설정 ====================
 
 @router.get(
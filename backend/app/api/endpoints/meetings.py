@@ -9,8 +9,10 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.core.config import settings
 from app.core.database import get_db, SupabaseDB
 from app.core.logging import get_logger
 from app.schemas.meeting import (
@@ -21,8 +23,20 @@ from app.schemas.meeting import (
     MeetingStartRequest,
     MeetingEndRequest,
     MeetingStatus,
+    RetranscriptionRequest,
 )
 from app.schemas.common import APIResponse, PaginatedResponse
+from app.services.audio_archive import get_audio_archive_service
+from app.services.meeting_warmup import get_meeting_warmup_service
+from app.services.realtime_service import get_realtime_service
+from app.services.retranscription import get_retranscription_service
+from app.services.subtitles import (
+    SUBTITLE_MEDIA_TYPES,
+    SubtitleFormat,
+    meeting_subtitle_segments,
+    write_subtitles,
+)
+from app.services.usage_metering import get_usage_meter
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -177,11 +191,12 @@ async def update_meeting(
     "/{meeting_id}/start",
     response_model=APIResponse[MeetingResponse],
     summary="회의 시작",
-    description="회의를 시작 상태로 변경합니다."
+    description="회의를 시작 상태로 변경하고 자주 쓰는 문구를 회의 언어로 미리 번역합니다."
 )
 async def start_meeting(
     meeting_id: UUID,
     request: MeetingStartRequest,
+    background_tasks: BackgroundTasks,
     db: SupabaseDB = Depends(get_db),
 ):
     """회의 시작"""
@@ -206,6 +221,12 @@ async def start_meeting(
         
         logger.info("Meeting started", meeting_id=str(meeting_id))
         
+        # 초반 자막이 캐시에서 나오도록 응답 후 문구 사전 번역
+        if settings.meeting_warmup_enabled:
+            background_tasks.add_task(
+                get_meeting_warmup_service().warm_up_meeting, str(meeting_id)
+            )
+        
         return APIResponse(
             success=True,
             message="회의가 시작되었습니다.",
@@ -249,6 +270,15 @@ async def end_meeting(
         
         logger.info("Meeting ended", meeting_id=str(meeting_id))
         
+        # 회의 중 집계된 번역 사용량 기록
+        await get_usage_meter().flush(meeting_id=str(meeting_id))
+        
+        # 보관 중인 오디오 세그먼트 닫기
+        await get_audio_archive_service().close_meeting(str(meeting_id))
+        
+        # 실시간 회의 상태 (참여자 버퍼, 증분 번역 상태) 정리
+        get_realtime_service().remove_meeting_state(str(meeting_id))
+        
         # TODO: 요약 생성 로직 (request.generate_summary가 True인 경우)
         # 이 부분은 SummaryService에서 처리
         
@@ -305,6 +335,134 @@ async def get_meeting_transcript(
         )
 
 
+@router.get(
+    "/{meeting_id}/subtitles",
+    summary="회의 자막 내보내기",
+    description="회의 발화를 SRT/WebVTT 자막으로 내보냅니다. 원문 언어가 아니면 저장된 번역을 사용합니다."
+)
+async def export_meeting_subtitles(
+    meeting_id: UUID,
+    language: str = Query(..., description="자막 언어"),
+    format: SubtitleFormat = Query(SubtitleFormat.SRT, description="자막 형식 (srt | vtt)"),
+    db: SupabaseDB = Depends(get_db),
+):
+    """회의 자막 스트리밍"""
+    meeting = await db.get_meeting(str(meeting_id))
+    
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="회의를 찾을 수 없습니다."
+        )
+    
+    segments = meeting_subtitle_segments(str(meeting_id), language, started_at=meeting.get("actual_start"))
+    return StreamingResponse(
+        write_subtitles(segments, format, language),
+        media_type=SUBTITLE_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{meeting_id}.{language}.{format.value}"'},
+    )
+
+
+@router.get(
+    "/{meeting_id}/utterances/{utterance_id}/audio",
+    summary="발화 오디오 조회",
+    description="보관된 발화 오디오를 WAV로 반환합니다. 회의 설정 save_audio가 켜진 회의만 보관됩니다."
+)
+async def get_utterance_audio(
+    meeting_id: UUID,
+    utterance_id: UUID,
+    db: SupabaseDB = Depends(get_db),
+):
+    """발화 오디오 조회"""
+    utterance = await db.get_utterance(str(utterance_id))
+    
+    if not utterance or utterance.get("meeting_id") != str(meeting_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="발화를 찾을 수 없습니다."
+        )
+    
+    if not utterance.get("audio_path"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="보관된 오디오가 없습니다."
+        )
+    
+    try:
+        audio = await get_audio_archive_service().read_clip(
+            utterance["audio_path"],
+            offset_ms=utterance["audio_offset_ms"],
+            duration_ms=utterance["audio_duration_ms"],
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="오디오를 아직 기록하는 중입니다. 잠시 후 다시 시도해주세요."
+        )
+    
+    return Response(content=audio, media_type="audio/wav")
+
+
+@router.post(
+    "/{meeting_id}/retranscribe",
+    response_model=APIResponse[dict],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="보관 오디오 재전사",
+    description="보관된 회의 오디오를 다시 인식해 바뀐 발화와 번역을 갱신합니다. 중단된 작업은 같은 옵션으로 요청하면 이어서 실행합니다."
+)
+async def retranscribe_meeting(
+    meeting_id: UUID,
+    request: RetranscriptionRequest,
+    db: SupabaseDB = Depends(get_db),
+):
+    """보관 오디오 재전사 시작"""
+    meeting = await db.get_meeting(str(meeting_id))
+    
+    if not meeting:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="회의를 찾을 수 없습니다."
+        )
+    
+    try:
+        job = get_retranscription_service().start(
+            str(meeting_id),
+            profile=request.profile,
+            enable_speaker_diarization=request.enable_speaker_diarization,
+            diarization_speaker_count=request.diarization_speaker_count,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    
+    return APIResponse(
+        success=True,
+        message="재전사를 시작했습니다.",
+        data=job
+    )
+
+
+@router.get(
+    "/{meeting_id}/retranscription",
+    response_model=APIResponse[dict],
+    summary="재전사 상태",
+    description="재전사 진행 상황, 처리량(오디오 초 / 소요 초), 예상 비용을 조회합니다."
+)
+async def get_retranscription_status(meeting_id: UUID):
+    """재전사 상태 조회"""
+    job = get_retranscription_service().get_job(str(meeting_id))
+    
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="재전사 작업이 없습니다."
+        )
+    
+    return APIResponse(success=True, data=job)
+
+
 
 
 
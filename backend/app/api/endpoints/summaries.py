@@ -18,15 +18,16 @@ from app.schemas.summary import (
     SummaryGenerateResponse,
 )
 from app.schemas.common import APIResponse
+from app.services.container import ServiceContainer, get_container
 from app.services.summary_service import SummaryService
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
-def get_summary_service() -> SummaryService:
-    """요약 서비스 인스턴스 반환"""
-    return SummaryService()
+def get_summary_service(container: ServiceContainer = Depends(get_container)) -> SummaryService:
+    """요약 서비스 인스턴스 반환 (애플리케이션 범위 공유)"""
+    return container.summary_service
 
 
 @router.post(
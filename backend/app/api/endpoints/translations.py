@@ -5,30 +5,43 @@
 번역 관련 API
 """
 
-from typing import Optional
+import json
+import math
+from contextlib import nullcontext
+from typing import ContextManager, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from app.core.database import get_db, SupabaseDB
 from app.core.logging import get_logger
+from app.core.rate_limiter import PriorityClass, RateLimitExceeded, priority_scope
 from app.schemas.translation import (
     TranslationRequest,
     TranslationResult,
     BatchTranslationRequest,
     BatchTranslationResult,
+    StreamingBatchTranslationRequest,
     TranslationResponse,
 )
 from app.schemas.common import APIResponse
+from app.services.container import ServiceContainer, get_container
 from app.services.translation_service import TranslationService
+from app.services.usage_metering import usage_scope
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
-def get_translation_service() -> TranslationService:
-    """번역 서비스 인스턴스 반환"""
-    return TranslationService()
+def get_translation_service(container: ServiceContainer = Depends(get_container)) -> TranslationService:
+    """번역 서비스 인스턴스 반환 (애플리케이션 범위 공유)"""
+    return container.translation_service
+
+
+def _usage_scope(user_id: Optional[UUID]) -> ContextManager[None]:
+    """user_id가 주어졌을 때만 번역 사용량 집계"""
+    return usage_scope(str(user_id)) if user_id else nullcontext()
 
 
 @router.post(
@@ -39,15 +52,17 @@ def get_translation_service() -> TranslationService:
 )
 async def translate_text(
     request: TranslationRequest,
+    user_id: Optional[UUID] = Query(None, description="사용자 ID (주면 번역 사용량 기록)"),
     translation_service: TranslationService = Depends(get_translation_service),
 ):
     """단일 텍스트 번역"""
     try:
-        result = await translation_service.translate(
-            text=request.text,
-            source_language=request.source_language,
-            target_language=request.target_language,
-        )
+        with _usage_scope(user_id):
+            result = await translation_service.translate(
+                text=request.text,
+                source_language=request.source_language,
+                target_language=request.target_language,
+            )
         
         return APIResponse(
             success=True,
@@ -58,6 +73,13 @@ async def translate_text(
                 target_language=request.target_language,
             )
         )
+    except RateLimitExceeded as e:
+        logger.warning("Translation shed by rate limiter", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"번역 요청이 많아 처리하지 못했습니다: {str(e)}",
+            headers={"Retry-After": str(math.ceil(e.expected_wait))},
+        )
     except Exception as e:
         logger.error("Translation failed", error=str(e))
         raise HTTPException(
@@ -74,15 +96,17 @@ async def translate_text(
 )
 async def translate_batch(
     request: BatchTranslationRequest,
+    user_id: Optional[UUID] = Query(None, description="사용자 ID (주면 번역 사용량 기록)"),
     translation_service: TranslationService = Depends(get_translation_service),
 ):
     """일괄 번역"""
     try:
-        results = await translation_service.translate_batch(
-            texts=request.texts,
-            source_language=request.source_language,
-            target_languages=request.target_languages,
-        )
+        with priority_scope(PriorityClass.BATCH), _usage_scope(user_id):
+            results = await translation_service.translate_batch(
+                texts=request.texts,
+                source_language=request.source_language,
+                target_languages=request.target_languages,
+            )
         
         return APIResponse(
             success=True,
@@ -92,6 +116,13 @@ async def translate_batch(
                 target_languages=request.target_languages,
             )
         )
+    except RateLimitExceeded as e:
+        logger.warning("Batch translation shed by rate limiter", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"번역 요청이 많아 처리하지 못했습니다: {str(e)}",
+            headers={"Retry-After": str(math.ceil(e.expected_wait))},
+        )
     except Exception as e:
         logger.error("Batch translation failed", error=str(e))
         raise HTTPException(
@@ -100,6 +131,39 @@ async def translate_batch(
         )
 
 
+@router.post(
+    "/translate/batch/stream",
+    summary="스트리밍 일괄 번역",
+    description=(
+        "대량 텍스트를 중복 제거 후 동시에 번역하고, 완료된 결과부터 "
+        "NDJSON(한 줄에 하나의 JSON)으로 전송합니다."
+    ),
+)
+async def translate_batch_stream(
+    request: StreamingBatchTranslationRequest,
+    user_id: Optional[UUID] = Query(None, description="사용자 ID (주면 번역 사용량 기록)"),
+    translation_service: TranslationService = Depends(get_translation_service),
+):
+    """스트리밍 일괄 번역 (application/x-ndjson, 속도 제한으로 폐기되면 마지막 줄에 error 전송)"""
+    async def generate():
+        with priority_scope(PriorityClass.BATCH), _usage_scope(user_id):
+            try:
+                async for item in translation_service.translate_batch_stream(
+                    texts=request.texts,
+                    source_language=request.source_language,
+                    target_languages=request.target_languages,
+                ):
+                    yield json.dumps(item, ensure_ascii=False) + "\n"
+            except RateLimitExceeded as e:
+                logger.warning("Streaming batch translation shed by rate limiter", error=str(e))
+                yield json.dumps(
+                    {"error": "rate_limited", "retry_after": math.ceil(e.expected_wait)},
+                    ensure_ascii=False,
+                ) + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get(
     "/utterance/{utterance_id}",
     response_model=APIResponse[list[TranslationResponse]],
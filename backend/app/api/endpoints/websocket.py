@@ -5,15 +5,21 @@ WebSocket 엔드포인트
 실시간 통신을 위한 WebSocket 엔드포인트
 """
 
+import asyncio
+import functools
 import json
-from typing import Dict, Set
+from collections import Counter
+from typing import Awaitable, Dict, List, Set
 from uuid import UUID
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends
 
+from app.core.config import settings
 from app.core.database import get_db, SupabaseDB
 from app.core.logging import get_logger
-from app.services.realtime_service import RealtimeService
+from app.services.incremental_translation import TranslationDelta
+from app.services.realtime_service import RealtimeService, get_realtime_service
+from app.services.session_events import get_session_event_hub
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -29,6 +35,8 @@ class ConnectionManager:
         self.participant_connections: Dict[str, WebSocket] = {}
         # WebSocket -> participant info
         self.connection_info: Dict[WebSocket, dict] = {}
+        # meeting_id -> 청취 언어별 연결 수 (참조 카운트)
+        self.language_listeners: Dict[str, Counter] = {}
     
     async def connect(
         self,
@@ -54,6 +62,7 @@ class ConnectionManager:
             "participant_id": participant_id,
             "preferred_language": preferred_language,
         }
+        self._add_listener(meeting_id, preferred_language)
         
         logger.info(
             "WebSocket connected",
@@ -78,6 +87,9 @@ class ConnectionManager:
             if participant_id in self.participant_connections:
                 del self.participant_connections[participant_id]
             
+            # 청취 언어 참조 카운트 감소
+            self._remove_listener(meeting_id, info["preferred_language"])
+            
             # 연결 정보 제거
             del self.connection_info[websocket]
             
@@ -87,6 +99,51 @@ class ConnectionManager:
                 participant_id=participant_id
             )
     
+    def is_connected(self, meeting_id: str, participant_id: str) -> bool:
+        """참여자의 연결이 회의에 남아 있는지 (재연결 중복 연결 포함)"""
+        return any(
+            info["meeting_id"] == meeting_id and info["participant_id"] == participant_id
+            for info in self.connection_info.values()
+        )
+    
+    def _add_listener(self, meeting_id: str, language: str) -> bool:
+        """청취 언어 참조 카운트 증가 (새 언어면 True)"""
+        listeners = self.language_listeners.setdefault(meeting_id, Counter())
+        listeners[language] += 1
+        return listeners[language] == 1
+    
+    def _remove_listener(self, meeting_id: str, language: str) -> None:
+        """청취 언어 참조 카운트 감소"""
+        listeners = self.language_listeners.get(meeting_id)
+        if not listeners:
+            return
+        
+        listeners[language] -= 1
+        if listeners[language] <= 0:
+            del listeners[language]
+        if not listeners:
+            del self.language_listeners[meeting_id]
+    
+    def change_language(self, websocket: WebSocket, language: str) -> bool:
+        """
+        연결의 청취 언어 변경
+        
+        Returns:
+            bool: 언어가 실제로 바뀌었으면 True
+        """
+        info = self.connection_info.get(websocket)
+        if not info or not language or info["preferred_language"] == language:
+            return False
+        
+        self._remove_listener(info["meeting_id"], info["preferred_language"])
+        self._add_listener(info["meeting_id"], language)
+        info["preferred_language"] = language
+        return True
+    
+    def get_listener_languages(self, meeting_id: str) -> List[str]:
+        """회의의 현재 청취 언어 목록 (청취자가 없으면 빈 목록)"""
+        return list(self.language_listeners.get(meeting_id, {}))
+    
     async def broadcast_to_meeting(self, meeting_id: str, message: dict):
         """회의 참여자 전체에게 메시지 전송"""
         if meeting_id in self.meeting_connections:
@@ -148,6 +205,11 @@ class ConnectionManager:
                     "original_text": utterance_data.get("original_text"),
                     "translated_text": translated_text,
                     "target_language": preferred_lang,
+                    # 번역이 폐기(속도 제한)되어 원문을 보낸 경우
+                    "degraded": (
+                        preferred_lang != utterance_data.get("original_language")
+                        and preferred_lang not in translations
+                    ),
                     "timestamp": utterance_data.get("timestamp"),
                     "is_final": utterance_data.get("is_final", True),
                 }
@@ -158,6 +220,58 @@ class ConnectionManager:
             except Exception:
                 pass  # 에러는 무시하고 계속 진행
     
+    async def broadcast_translation_delta(
+        self,
+        meeting_id: str,
+        utterance_data: dict,
+        delta: TranslationDelta,
+    ):
+        """
+        증분 번역 결과(새로 확정된 문장)를 각 참여자의 선호 언어로 전송
+        
+        Args:
+            meeting_id: 회의 ID
+            utterance_data: 원본 발화 데이터
+            delta: 증분 번역 결과
+        """
+        if meeting_id not in self.meeting_connections:
+            return
+        
+        for connection in list(self.meeting_connections[meeting_id]):
+            info = self.connection_info.get(connection)
+            if not info:
+                continue
+            
+            preferred_lang = info["preferred_language"]
+            
+            message = {
+                "type": "subtitle_delta",
+                "data": {
+                    "utterance_key": utterance_data.get("utterance_key"),
+                    "speaker_name": utterance_data.get("speaker_name"),
+                    "original_language": utterance_data.get("original_language"),
+                    "target_language": preferred_lang,
+                    "segments": [
+                        {
+                            "index": segment["index"],
+                            "original_text": segment["original_text"],
+                            "translated_text": segment["translations"].get(
+                                preferred_lang, segment["original_text"]
+                            ),
+                        }
+                        for segment in delta.segments
+                    ],
+                    "pending_text": delta.pending_text,
+                    "timestamp": utterance_data.get("timestamp"),
+                    "is_final": delta.is_final,
+                }
+            }
+            
+            try:
+                await connection.send_json(message)
+            except Exception:
+                pass  # 에러는 무시하고 계속 진행
+    
     def get_meeting_participants(self, meeting_id: str) -> list:
         """회의 참여자 정보 목록 반환"""
         if meeting_id not in self.meeting_connections:
@@ -176,6 +290,98 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+def _on_audio_task_done(pending_tasks: Set[asyncio.Task], slots: asyncio.Semaphore, task: asyncio.Task) -> None:
+    """백그라운드 오디오 처리 완료 (슬롯 반환, 오류 기록)"""
+    pending_tasks.discard(task)
+    slots.release()
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Audio processing failed", error=str(task.exception()))
+
+
+def _process_audio_message(
+    realtime_service: RealtimeService,
+    meeting_id: str,
+    participant_id: str,
+    message: dict,
+    backlog: int,
+) -> Awaitable[None]:
+    """오디오 메시지 처리 코루틴 (seq가 있으면 지터 버퍼 경유)"""
+    if message.get("seq") is not None:
+        return realtime_service.process_audio_frame(
+            meeting_id=meeting_id,
+            participant_id=participant_id,
+            audio_data=message.get("data"),
+            sequence=int(message["seq"]),
+            timestamp_ms=message.get("timestamp"),
+            stream_id=message.get("stream"),
+            manager=manager,
+            backlog=backlog,
+        )
+    return realtime_service.process_audio(
+        meeting_id=meeting_id,
+        participant_id=participant_id,
+        audio_data=message.get("data"),
+        manager=manager,
+        backlog=backlog,
+    )
+
+
+async def _run_audio_queue(
+    queue: asyncio.Queue,
+    realtime_service: RealtimeService,
+    meeting_id: str,
+    participant_id: str,
+) -> None:
+    """
+    연결별 오디오 큐 처리 (None을 받으면 남은 작업을 마치고 종료)
+    
+    묶음 번역 시 다음 발화를 모을 수 있도록 동시에 처리하고(연결별 상한), 아니면 순서대로 처리한다.
+    동시에 처리해도 자막 전송과 저장은 실시간 서비스가 참여자별 도착 순서대로 내보낸다.
+    처리를 기다리는 메시지 수를 적체로 넘겨 청크 길이 결정에 반영한다.
+    """
+    pending_tasks: Set[asyncio.Task] = set()
+    slots = asyncio.Semaphore(settings.realtime_max_pending_audio)
+    try:
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            # 적체: 큐에서 기다리는 메시지 (동시 처리 중인 인식은 실시간 서비스가 따로 집계)
+            processing = _process_audio_message(
+                realtime_service, meeting_id, participant_id, message, backlog=queue.qsize()
+            )
+            if settings.translation_batching_enabled:
+                await slots.acquire()
+                task = asyncio.create_task(processing)
+                pending_tasks.add(task)
+                task.add_done_callback(functools.partial(_on_audio_task_done, pending_tasks, slots))
+            else:
+                try:
+                    await processing
+                except Exception as e:
+                    logger.error("Audio processing failed", error=str(e))
+        
+        if pending_tasks:
+            await asyncio.gather(*pending_tasks, return_exceptions=True)
+    finally:
+        for task in list(pending_tasks):
+            task.cancel()
+
+
+async def _stop_audio_queue(queue: asyncio.Queue, worker: asyncio.Task, timeout: float) -> None:
+    """남은 오디오를 처리한 뒤 작업자 종료 (timeout 안에 끝나지 않으면 취소)"""
+    async def finish() -> None:
+        await queue.put(None)
+        await worker
+    
+    try:
+        await asyncio.wait_for(finish(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning("Audio queue drain timed out", pending=queue.qsize())
+    finally:
+        worker.cancel()
+
+
 @router.websocket("/meeting/{meeting_id}")
 async def websocket_meeting(
     websocket: WebSocket,
@@ -188,12 +394,16 @@ async def websocket_meeting(
     
     연결 후 수신 가능한 메시지 타입:
     - subtitle: 실시간 자막
+    - subtitle_delta: 새로 확정된 문장 번역 (증분 자막)
+    - subtitle_backfill: 언어 변경 시 최근 발화 자막
     - participant_joined: 참여자 입장
     - participant_left: 참여자 퇴장
     - meeting_ended: 회의 종료
     
     전송 가능한 메시지 타입:
-    - audio: 오디오 데이터 (base64)
+    - audio: 오디오 데이터 (base64, seq/timestamp/stream이 있으면 지터 버퍼에서 순서 재조립)
+      연결별 큐에서 처리하며 큐가 가득 차면 수신을 멈춤
+    - transcript: 클라이언트 STT 중간/최종 텍스트 (text, is_final, language)
     - language_change: 언어 변경
     """
     await manager.connect(
@@ -203,8 +413,8 @@ async def websocket_meeting(
         preferred_language=preferred_language,
     )
     
-    # 실시간 서비스 인스턴스
-    realtime_service = RealtimeService()
+    # 실시간 서비스 인스턴스 (회의 상태 공유)
+    realtime_service = get_realtime_service()
     
     # 참여자 입장 알림
     await manager.broadcast_to_meeting(
@@ -218,6 +428,10 @@ async def websocket_meeting(
         }
     )
     
+    # 오디오는 연결별 큐로 넘겨 처리 (수신 루프가 막히지 않고, 큐 적체를 청크 길이 결정에 반영)
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.realtime_max_pending_audio)
+    audio_worker = asyncio.create_task(_run_audio_queue(audio_queue, realtime_service, meeting_id, participant_id))
+    
     try:
         while True:
             # 클라이언트로부터 메시지 수신
@@ -227,24 +441,42 @@ async def websocket_meeting(
             message_type = message.get("type")
             
             if message_type == "audio":
-                # 오디오 데이터 처리 (STT -> 번역 -> 브로드캐스트)
-                await realtime_service.process_audio(
+                # 오디오 데이터 처리 (STT -> 번역 -> 브로드캐스트, 큐가 가득 차면 대기)
+                await audio_queue.put(message)
+            
+            elif message_type == "transcript":
+                # 전사 텍스트 처리 (증분 번역 -> delta 브로드캐스트)
+                await realtime_service.process_transcript(
                     meeting_id=meeting_id,
                     participant_id=participant_id,
-                    audio_data=message.get("data"),
+                    text=message.get("text", ""),
+                    is_final=bool(message.get("is_final", False)),
+                    source_language=message.get("language") or preferred_language,
                     manager=manager,
                 )
             
             elif message_type == "language_change":
-                # 언어 설정 변경
+                # 언어 설정 변경 (청취 언어 집합 갱신)
                 new_language = message.get("language")
                 if websocket in manager.connection_info:
-                    manager.connection_info[websocket]["preferred_language"] = new_language
+                    changed = manager.change_language(websocket, new_language)
                     
                     await websocket.send_json({
                         "type": "language_changed",
                         "data": {"language": new_language}
                     })
+                    
+                    # 최근 발화를 새 언어로 백필
+                    if changed:
+                        subtitles = await realtime_service.backfill_language(
+                            meeting_id=meeting_id,
+                            language=new_language,
+                        )
+                        if subtitles:
+                            await websocket.send_json({
+                                "type": "subtitle_backfill",
+                                "data": {"subtitles": subtitles}
+                            })
             
             elif message_type == "ping":
                 # 연결 유지
@@ -253,6 +485,16 @@ async def websocket_meeting(
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         
+        # 큐에 남은 오디오를 마친 뒤 지터 버퍼의 남은 프레임 처리
+        await _stop_audio_queue(audio_queue, audio_worker, settings.realtime_disconnect_drain_seconds)
+        
+        # 지터 버퍼에 남은 오디오 처리
+        await realtime_service.flush_audio_frames(meeting_id, participant_id, manager)
+        
+        # 마지막 연결이 끊기면 참여자 버퍼 정리
+        if not manager.is_connected(meeting_id, participant_id):
+            realtime_service.remove_participant(meeting_id, participant_id)
+        
         # 참여자 퇴장 알림
         await manager.broadcast_to_meeting(
             meeting_id,
@@ -269,13 +511,69 @@ async def websocket_meeting(
             error=str(e)
         )
         manager.disconnect(websocket)
+        if not manager.is_connected(meeting_id, participant_id):
+            realtime_service.remove_participant(meeting_id, participant_id)
+    finally:
+        audio_worker.cancel()
+
+
+@router.websocket("/media/{session_id}")
+async def websocket_media_session(
+    websocket: WebSocket,
+    session_id: str,
+):
+    """
+    미디어 세션 작업 진행 알림
+    
+    연결 후 수신 가능한 메시지 타입:
+    - transcription_started / transcription_progress: 파일 전사 진행률
+    - transcript_segment: 순서대로 확정된 전사 구간
+    - transcription_completed / transcription_failed: 전사 종료
+    
+    전송 가능한 메시지 타입:
+    - ping: 연결 유지
+    """
+    await websocket.accept()
+    
+    hub = get_session_event_hub()
+    queue = hub.subscribe(session_id)
+    
+    async def forward() -> None:
+        while True:
+            event = await queue.get()
+            await websocket.send_json(event)
+    
+    sender = asyncio.create_task(forward())
+    
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            if message.get("type") == "ping":
+                await websocket.send_json({"type": "pong"})
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(
+            "Media WebSocket error",
+            session_id=session_id,
+            error=str(e)
+        )
+    finally:
+        sender.cancel()
+        hub.unsubscribe(session_id, queue)
 
 
 @router.get("/meeting/{meeting_id}/participants")
 async def get_websocket_participants(meeting_id: str):
-    """회의의 현재 WebSocket 연결 참여자 목록"""
+    """회의의 현재 WebSocket 연결 참여자 목록 (참여자별 오디오 프레임 손실/순서 집계 포함)"""
     participants = manager.get_meeting_participants(meeting_id)
-    return {"participants": participants, "count": len(participants)}
+    audio_frames = (
+        get_realtime_service().get_meeting_state(meeting_id).get_jitter_stats()
+        if participants
+        else {}
+    )
+    return {"participants": participants, "count": len(participants), "audio_frames": audio_frames}
 
 
 
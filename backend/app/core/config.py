@@ -5,7 +5,7 @@
 환경 변수 및 설정값 관리
 """
 
-from typing import List
+from typing import Dict, List
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -45,6 +45,170 @@ class Settings(BaseSettings):
     # Google Gemini API
     gemini_api_key: str = ""
     
+    # Service Container Settings
+    service_executor_workers: int = 32  # 동기 SDK 호출용 공유 스레드 풀 크기
+    
+    # Translation Backend Settings
+    translation_backend: str = "sdk"  # sdk (google-cloud-translate) | http (httpx 비동기)
+    google_translate_api_key: str = ""  # 비어 있으면 서비스 계정 인증 사용
+    google_translate_endpoint: str = "https://translation.googleapis.com"
+    translation_http_max_connections: int = 100
+    translation_http_max_keepalive: int = 20
+    translation_http_keepalive_expiry: float = 30.0  # 초
+    translation_http_timeout: float = 10.0  # 초
+    translation_http_compress_min_bytes: int = 1024  # 이 크기 이상 요청 본문은 gzip 압축
+    translation_bulk_concurrency: int = 8  # 일괄 번역 동시 요청 수
+    translation_bulk_chunk_size: int = 128  # 요청당 최대 세그먼트 수 (Translation v2 한도)
+    translation_bulk_chunk_chars: int = 5000  # 요청당 최대 문자 수 (권장값)
+    
+    # Translation Hedging Settings
+    translation_hedging_enabled: bool = False
+    translation_hedge_endpoints: List[str] = Field(default=[])  # 대체 리전 REST 엔드포인트
+    translation_hedge_percentile: float = 95.0  # 1차 엔진 지연 시간이 이 백분위를 넘으면 헤지
+    translation_hedge_min_delay_ms: float = 50.0
+    translation_hedge_default_delay_ms: float = 400.0  # 지연 시간 표본이 부족할 때
+    translation_hedge_window_size: int = 200  # 엔진/언어쌍별 지연 시간 표본 수
+    
+    # Translation Memory Settings
+    translation_memory_enabled: bool = True
+    translation_memory_fuzzy_threshold: float = 0.92  # 퍼지 일치로 재사용할 최소 유사도 (0~1)
+    translation_memory_max_entries: int = 200000
+    translation_memory_load_limit: int = 50000  # 시작 시 translations 테이블에서 불러올 최대 건수
+    
+    # Utterance Batching Settings (같은 화자 연속 발화 묶음 번역)
+    translation_batching_enabled: bool = False
+    translation_batch_window_ms: float = 250.0  # 첫 발화 후 최대 대기 시간 (자막 지연 예산)
+    translation_batch_max_segments: int = 8
+    translation_batch_max_chars: int = 1500
+    
+    # Language Identification Settings
+    language_id_local_enabled: bool = True
+    language_id_min_confidence: float = 0.8  # 로컬 감지 신뢰도가 이보다 낮으면 API로 감지
+    
+    # Outbound API Rate Limit Settings (초당 요청 수, 0이면 제한 없음)
+    rate_limit_enabled: bool = True
+    rate_limit_translate_rps: float = 100.0
+    rate_limit_speech_rps: float = 50.0
+    rate_limit_gemini_rps: float = 5.0
+    rate_limit_project_rps: float = 150.0  # 프로젝트 전체 (모든 API 합산)
+    rate_limit_burst_seconds: float = 1.0  # 버킷 용량 = 초당 요청 수 * 이 값
+    rate_limit_live_deadline: float = 2.0  # 초, 이보다 오래 기다려야 하면 실시간 요청 폐기
+    rate_limit_batch_deadline: float = 30.0
+    rate_limit_summary_deadline: float = 120.0
+    rate_limit_penalty_seconds: float = 1.0  # 429 응답 시 해당 API 호출 중단 시간 (Retry-After 없을 때)
+    rate_limit_max_retries: int = 2  # 429 응답 재시도 횟수
+    
+    # Meeting Warm-up Settings (회의 시작 시 자주 쓰는 문구 미리 번역)
+    meeting_warmup_enabled: bool = True
+    meeting_warmup_phrases: Dict[str, List[str]] = Field(default={})  # 언어별 추가 문구 (기본 문구에 더함)
+    meeting_warmup_history_meetings: int = 20  # 주최자의 최근 회의 중 빈출 발화를 수집할 회의 수
+    meeting_warmup_history_utterances: int = 5000  # 빈출 발화 집계에 사용할 최대 발화 수
+    meeting_warmup_top_segments: int = 200  # 원본 언어별 미리 번역할 빈출 발화 수
+    meeting_warmup_min_count: int = 2  # 이 횟수 이상 반복된 발화만 사용
+    meeting_warmup_max_chars: int = 80  # 이보다 긴 발화는 반복 가능성이 낮아 제외
+    
+    # Usage Metering Settings (번역 문자 수 과금 집계)
+    usage_metering_enabled: bool = True
+    usage_flush_interval_seconds: float = 60.0  # 집계한 사용량을 usage_records에 기록하는 주기
+    
+    # Speech Recognition Profile Settings (low_latency: latest_short, accurate: latest_long)
+    speech_default_profile: str = "accurate"
+    speech_realtime_profile: str = "low_latency"  # 실시간 자막용 짧은 오디오 청크
+    speech_word_time_offsets: bool = True  # 실시간 인식에도 단어 타임스탬프 요청 (자막 내보내기 타이밍)
+    
+    # Speech gRPC Channel Pool Settings
+    speech_channel_pool_enabled: bool = True
+    speech_channel_pool_size: int = 4
+    speech_channel_keepalive_ms: int = 30000  # 유휴 채널 keepalive ping 주기
+    speech_channel_keepalive_timeout_ms: int = 10000
+    speech_channel_connect_timeout: float = 10.0  # 워밍업 시 채널 연결 대기 시간 (초)
+    speech_channel_health_interval: float = 30.0  # 상태 점검 주기 (초)
+    speech_channel_max_failures: int = 3  # 연속 연결 오류가 이 횟수에 도달하면 채널 재생성
+    
+    # Streaming STT Settings
+    speech_stream_max_seconds: float = 290.0  # 스트림 하나의 최대 길이 (제공자 제한 약 5분보다 짧게)
+    speech_stream_overlap_seconds: float = 5.0  # 스트림 교체 시 두 스트림에 함께 보내는 오디오 길이
+    
+    # File Transcription Settings (업로드 파일 병렬 청크 전사)
+    media_storage_dir: str = "./storage"  # 업로드 파일 저장 위치 (file_path 기준 디렉터리)
+    ffmpeg_path: str = "ffmpeg"
+    ffprobe_path: str = "ffprobe"
+    file_transcription_concurrency: int = 8  # 동시에 인식 요청할 청크 수
+    file_chunk_target_seconds: float = 25.0  # 이 길이를 넘으면 다음 무음 구간에서 청크 분할
+    file_chunk_max_seconds: float = 55.0  # 무음이 없어도 강제 분할 (동기 인식 제한 60초 미만)
+    file_chunk_overlap_ms: int = 300  # 분할 지점 앞 오디오를 다음 청크에 겹쳐 포함
+    file_vad_frame_ms: int = 30
+    file_vad_min_silence_ms: int = 300  # 분할 지점으로 사용할 최소 무음 길이
+    file_vad_energy_floor: float = 200.0  # 무음 판정 최소 RMS 에너지 (16bit PCM)
+    
+    # Local STT Settings (CPU 로컬 인식 엔진, faster-whisper/CTranslate2 모델)
+    local_stt_enabled: bool = False
+    local_stt_model_path: str = "./models/whisper-small-ct2"
+    local_stt_compute_type: str = "int8"
+    local_stt_workers: int = 2  # 프로세스 수 (워커마다 모델 상주)
+    local_stt_cpu_threads: int = 2  # 워커당 CPU 스레드 (코어 고정 단위)
+    local_stt_pin_cores: bool = True
+    local_stt_batch_size: int = 8  # 워커 하나에 한 번에 넘기는 최대 요청 수
+    local_stt_batch_wait_ms: int = 10  # 묶음을 채우기 위해 기다리는 최대 시간
+    local_stt_beam_size: int = 1
+    local_stt_retry_seconds: float = 60.0  # 풀이 깨지면 이 시간 동안 Google로 대체한 뒤 다시 시작
+    local_stt_tiers: List[str] = Field(default=["free"])  # 로컬 엔진을 쓰는 구독 등급
+    
+    # STT Result Cache Settings (청크 PCM + 인식 설정 해시 기준)
+    stt_cache_enabled: bool = True
+    stt_cache_dir: str = "./storage/stt_cache"
+    stt_cache_max_mb: int = 2048
+    
+    # Subtitle Export Settings (SRT/WebVTT 큐 배치)
+    subtitle_max_chars_per_line: int = 42
+    subtitle_max_chars_per_line_unspaced: int = 16  # 일본어/중국어/태국어
+    subtitle_max_lines: int = 2
+    subtitle_min_cue_ms: int = 1000
+    subtitle_max_cue_ms: int = 7000
+    subtitle_page_size: int = 500  # 내보내기 시 한 번에 읽는 발화/구간 수
+    
+    # Audio Archive Settings (회의 설정 save_audio를 켠 회의의 오디오 보관)
+    audio_archive_enabled: bool = True
+    audio_archive_dir: str = "./storage/audio_archive"
+    audio_archive_format: str = "flac"  # flac | opus
+    audio_archive_segment_seconds: int = 600  # 세그먼트 파일 최대 길이
+    audio_archive_queue_chunks: int = 256  # 트랙별 대기 청크 수 (넘으면 버림)
+    audio_archive_idle_seconds: int = 60  # 오디오가 없으면 세그먼트를 닫는 시간
+    audio_archive_bucket: str = ""  # Supabase Storage 버킷 (비우면 로컬 보관)
+    
+    # Retranscription Settings (보관 오디오 재전사 일괄 작업)
+    retranscription_dir: str = "./storage/retranscription"  # 작업 체크포인트
+    retranscription_concurrency: int = 8  # 동시 인식 발화 수
+    retranscription_page_size: int = 200  # 체크포인트 단위 발화 수
+    # 화자 분리 시 같은 보관 세그먼트에서 이어지는 발화를 한 번에 인식 (동기 인식 제한 1분 미만)
+    retranscription_span_max_seconds: float = 55.0
+    retranscription_span_max_gap_ms: int = 3000  # 한 구간으로 묶을 발화 사이 최대 간격
+    
+    # Resumable Upload Settings (tus 방식 오프셋 업로드)
+    upload_require_checksum: bool = False  # True면 모든 청크에 Upload-Checksum 헤더 필수
+    
+    # Realtime Settings
+    realtime_backfill_size: int = 20  # 청취 언어 변경 시 백필할 최근 발화 수
+    realtime_max_pending_audio: int = 8  # 연결별 오디오 큐 크기 / 묶음 번역 시 동시 처리 수 (넘으면 수신 대기)
+    realtime_meeting_load_retry_seconds: float = 5.0  # 회의 정보 조회 실패 후 재시도 간격 (실패마다 2배, 최대 60초)
+    realtime_disconnect_drain_seconds: float = 5.0  # 연결 종료 시 처리 중인 오디오를 기다리는 최대 시간
+    
+    # Audio Jitter Buffer Settings (시퀀스 번호가 있는 오디오 프레임 재조립)
+    jitter_buffer_depth: int = 4  # 빈 순번 뒤로 이만큼 프레임이 쌓이면 손실로 처리
+    jitter_buffer_max_gap_ms: int = 2000  # 손실 구간을 채우는 최대 무음 길이
+    jitter_buffer_reset_frames: int = 1000  # 순번이 이만큼 되돌아가면 새 스트림으로 초기화 (중복 확인 범위)
+    jitter_buffer_max_wait_ms: int = 200  # 빈 순번 뒤 프레임이 depth보다 적어도 이 시간이 지나면 손실로 처리
+    
+    # Adaptive STT Chunk Settings (실시간 인식 청크 길이를 지연/발화 길이에 맞춰 조절)
+    stt_adaptive_chunking_enabled: bool = False  # 끄면 수신한 오디오를 그대로 인식
+    stt_chunk_target_delay_ms: int = 1500  # 목표 종단 지연 (오디오 누적 + STT 왕복)
+    stt_chunk_min_ms: int = 300
+    stt_chunk_max_ms: int = 3000
+    stt_chunk_speech_ramp: float = 0.5  # 발화가 1초 길어질 때마다 늘리는 청크 길이 (초)
+    stt_chunk_segment_end_ms: int = 300  # 이 길이 이상 무음이면 발화 종료로 보고 바로 전송
+    stt_chunk_energy_floor: float = 200.0  # 발화 판정 최소 RMS 에너지 (16bit PCM)
+    stt_chunk_rtt_alpha: float = 0.2  # STT 왕복 지연 EWMA 가중치
+    
     # Zoom API Settings
     zoom_api_key: str = ""
     zoom_api_secret: str = ""
@@ -156,6 +156,17 @@ class SupabaseDB:
         )
         return response.data[0] if response.data else {}
     
+    async def get_utterance(self, utterance_id: str) -> Optional[dict]:
+        """발화 단건 조회"""
+        response = (
+            self.client.table("utterances")
+            .select("*")
+            .eq("id", utterance_id)
+            .single()
+            .execute()
+        )
+        return response.data
+    
     async def get_meeting_utterances(
         self, 
         meeting_id: str,
@@ -173,6 +184,72 @@ class SupabaseDB:
         )
         return response.data or []
     
+    async def get_meeting_transcript_page(
+        self,
+        meeting_id: str,
+        target_language: str,
+        limit: int = 500,
+        offset: int = 0,
+    ) -> list:
+        """자막용 회의 발화 페이지 조회 (타이밍 + 대상 언어 번역만)"""
+        response = (
+            self.client.table("utterances")
+            .select(
+                "original_language, original_text, timestamp, start_ms, end_ms, word_timings, "
+                "translations(translated_text)"
+            )
+            .eq("meeting_id", meeting_id)
+            .eq("translations.target_language", target_language)
+            .order("timestamp", desc=False)
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return response.data or []
+    
+    async def get_meeting_archived_utterances(
+        self,
+        meeting_id: str,
+        limit: int = 200,
+        offset: int = 0,
+    ) -> list:
+        """오디오가 보관된 회의 발화 조회 (시간 순, 번역 언어 포함, 재전사용)"""
+        response = (
+            self.client.table("utterances")
+            .select("*, translations(target_language)")
+            .eq("meeting_id", meeting_id)
+            .not_.is_("audio_path", "null")
+            .order("timestamp", desc=False)
+            .order("id", desc=False)
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return response.data or []
+    
+    async def upsert_utterances(self, utterances: list) -> int:
+        """발화 일괄 갱신 (id 기준 upsert, 전체 행을 전달)"""
+        if not utterances:
+            return 0
+        self.client.table("utterances").upsert(utterances, on_conflict="id").execute()
+        return len(utterances)
+    
+    async def get_meetings_utterance_texts(
+        self,
+        meeting_ids: list,
+        limit: int = 5000,
+    ) -> list:
+        """여러 회의의 최근 발화 원문 조회 (original_language, original_text만)"""
+        if not meeting_ids:
+            return []
+        response = (
+            self.client.table("utterances")
+            .select("original_language, original_text")
+            .in_("meeting_id", meeting_ids)
+            .order("timestamp", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return response.data or []
+    
     # ==================== Translations ====================
     
     async def create_translation(self, translation_data: dict) -> dict:
@@ -211,6 +288,35 @@ class SupabaseDB:
         response = query.execute()
         return response.data or []
     
+    async def replace_translations(self, utterance_ids: list, translations: list) -> int:
+        """발화들의 번역 교체 (기존 번역 삭제 후 일괄 생성)"""
+        if not utterance_ids:
+            return 0
+        (
+            self.client.table("translations")
+            .delete()
+            .in_("utterance_id", utterance_ids)
+            .execute()
+        )
+        if translations:
+            self.client.table("translations").insert(translations).execute()
+        return len(translations)
+    
+    async def list_translations_with_source(
+        self,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> list:
+        """원문 발화가 포함된 번역 목록 조회 (최신순, 번역 메모리 구축용)"""
+        response = (
+            self.client.table("translations")
+            .select("target_language, translated_text, utterances(original_text, original_language)")
+            .order("created_at", desc=True)
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return response.data or []
+    
     # ==================== Summaries ====================
     
     async def create_summary(self, summary_data: dict) -> dict:
@@ -240,6 +346,46 @@ class SupabaseDB:
         response = query.execute()
         return response.data or []
     
+    # ==================== Media Transcripts ====================
+    
+    async def replace_media_transcript_segments(
+        self,
+        session_id: str,
+        segments: list,
+        batch_size: int = 500,
+    ) -> int:
+        """미디어 세션 전사 구간 교체 (기존 구간 삭제 후 일괄 생성)"""
+        (
+            self.client.table("media_transcript_segments")
+            .delete()
+            .eq("session_id", session_id)
+            .execute()
+        )
+        for start in range(0, len(segments), batch_size):
+            (
+                self.client.table("media_transcript_segments")
+                .insert(segments[start:start + batch_size])
+                .execute()
+            )
+        return len(segments)
+    
+    async def get_media_transcript_segments(
+        self,
+        session_id: str,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> list:
+        """미디어 세션 전사 구간 조회 (시간 순)"""
+        response = (
+            self.client.table("media_transcript_segments")
+            .select("*")
+            .eq("session_id", session_id)
+            .order("segment_index", desc=False)
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return response.data or []
+    
     # ==================== Users ====================
     
     async def get_user_by_email(self, email: str) -> Optional[dict]:
@@ -0,0 +1,421 @@
+"""
+외부 API 요청 속도 제한 모듈
+==========================
+
+Google Cloud / Gemini API 쿼터를 넘지 않도록 호출을 스케줄링한다.
+
+- API별 토큰 버킷 + 프로젝트 전체 토큰 버킷
+- 우선순위: 실시간 자막(LIVE) > 배치/YouTube(BATCH) > 요약(SUMMARY)
+- 대기 기한(deadline)을 넘길 요청은 미리 폐기(shed)
+- 429 응답 시 해당 API 일시 중단 후 재시도
+- 우선순위별 대기 시간 통계
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class PriorityClass(IntEnum):
+    """요청 우선순위 (값이 작을수록 먼저 처리)"""
+    LIVE = 0
+    BATCH = 1
+    SUMMARY = 2
+
+
+_current_priority: ContextVar[PriorityClass] = ContextVar(
+    "rate_limit_priority", default=PriorityClass.LIVE
+)
+
+
+@contextmanager
+def priority_scope(priority: PriorityClass) -> Iterator[None]:
+    """블록 안에서 발생하는 외부 API 호출의 우선순위 지정"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> PriorityClass:
+    """현재 컨텍스트의 우선순위"""
+    return _current_priority.get()
+
+
+class RateLimitExceeded(Exception):
+    """대기 기한 안에 호출 슬롯을 얻지 못해 요청이 폐기됨"""
+    
+    def __init__(self, api: str, priority: PriorityClass, expected_wait: float):
+        self.api = api
+        self.priority = priority
+        self.expected_wait = expected_wait
+        super().__init__(
+            f"Rate limit: {api} request shed "
+            f"(priority={priority.name}, expected_wait={expected_wait:.2f}s)"
+        )
+
+
+def is_quota_error(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED 여부"""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    return getattr(error, "code", None) == 429
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Retry-After 헤더 값 (초)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """토큰 버킷 (rate: 초당 보충 토큰, capacity: 최대 버스트)"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+    
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+    
+    def wait_time(self, cost: float, now: float) -> float:
+        """cost 토큰을 얻기까지 남은 시간 (초)"""
+        self._refill(now)
+        blocked = max(0.0, self.blocked_until - now)
+        missing = min(cost, self.capacity) - self.tokens
+        return max(blocked, missing / self.rate if missing > 0 else 0.0)
+    
+    def consume(self, cost: float) -> None:
+        self.tokens -= min(cost, self.capacity)
+    
+    def block(self, seconds: float, now: float) -> None:
+        """쿼터 초과 응답 후 일정 시간 토큰 지급 중단"""
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = min(self.tokens, 0.0)
+
+
+@dataclass(order=True)
+class _Waiter:
+    """대기 중인 요청"""
+    priority: int
+    seq: int
+    cost: float = field(compare=False)
+    enqueued: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+@dataclass
+class _ApiQueue:
+    """API별 대기열"""
+    buckets: List[TokenBucket]
+    heap: List[_Waiter] = field(default_factory=list)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    dispatcher: Optional[asyncio.Task] = None
+    throttled: int = 0
+
+
+@dataclass
+class _ClassStats:
+    """우선순위별 통계"""
+    granted: int = 0
+    shed: int = 0
+    throttled: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    recent_waits: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+
+class RateLimiter:
+    """우선순위 기반 외부 API 호출 스케줄러"""
+    
+    def __init__(
+        self,
+        api_rates: Optional[Dict[str, float]] = None,
+        project_rate: Optional[float] = None,
+        burst_seconds: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.logger = get_logger(__name__)
+        self.enabled = settings.rate_limit_enabled if enabled is None else enabled
+        self.burst_seconds = burst_seconds or settings.rate_limit_burst_seconds
+        self.api_rates = api_rates if api_rates is not None else {
+            "translate": settings.rate_limit_translate_rps,
+            "speech": settings.rate_limit_speech_rps,
+            "gemini": settings.rate_limit_gemini_rps,
+        }
+        project_rate = settings.rate_limit_project_rps if project_rate is None else project_rate
+        self._project_bucket = (
+            TokenBucket(project_rate, project_rate * self.burst_seconds)
+            if project_rate > 0 else None
+        )
+        self.deadlines: Dict[PriorityClass, Optional[float]] = {
+            PriorityClass.LIVE: settings.rate_limit_live_deadline,
+            PriorityClass.BATCH: settings.rate_limit_batch_deadline,
+            PriorityClass.SUMMARY: settings.rate_limit_summary_deadline,
+        }
+        self._queues: Dict[str, _ApiQueue] = {}
+        self._seq = itertools.count()
+        self._stats: Dict[PriorityClass, _ClassStats] = {
+            priority: _ClassStats() for priority in PriorityClass
+        }
+    
+    def _queue(self, api: str) -> _ApiQueue:
+        queue = self._queues.get(api)
+        if queue is None:
+            buckets = []
+            rate = self.api_rates.get(api, 0)
+            if rate > 0:
+                buckets.append(TokenBucket(rate, rate * self.burst_seconds))
+            if self._project_bucket is not None:
+                buckets.append(self._project_bucket)
+            queue = _ApiQueue(buckets=buckets)
+            self._queues[api] = queue
+        return queue
+    
+    @staticmethod
+    def _wait_time(queue: _ApiQueue, cost: float, now: float) -> float:
+        return max((bucket.wait_time(cost, now) for bucket in queue.buckets), default=0.0)
+    
+    @staticmethod
+    def _estimate_wait(queue: _ApiQueue, priority: PriorityClass, cost: float, now: float) -> float:
+        """같거나 높은 우선순위 대기 요청이 먼저 처리된다고 볼 때 예상 대기 시간"""
+        ahead = cost + sum(
+            waiter.cost for waiter in queue.heap
+            if waiter.priority <= priority and not waiter.future.done()
+        )
+        return max(
+            (
+                max(0.0, bucket.blocked_until - now)
+                + max(0.0, ahead - bucket.tokens) / bucket.rate
+                for bucket in queue.buckets
+            ),
+            default=0.0,
+        )
+    
+    def _record_wait(self, priority: PriorityClass, waited: float) -> None:
+        stats = self._stats[priority]
+        stats.granted += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        stats.recent_waits.append(waited)
+    
+    def _shed(self, api: str, priority: PriorityClass, expected_wait: float) -> RateLimitExceeded:
+        self._stats[priority].shed += 1
+        self.logger.warning(
+            "Outbound API request shed",
+            api=api,
+            priority=priority.name,
+            expected_wait=round(expected_wait, 3),
+        )
+        return RateLimitExceeded(api, priority, expected_wait)
+    
+    async def acquire(
+        self,
+        api: str,
+        cost: float = 1.0,
+        priority: Optional[PriorityClass] = None,
+        deadline: Optional[float] = None,
+    ) -> float:
+        """
+        호출 슬롯 획득
+        
+        Args:
+            api: API 이름 (translate, speech, gemini)
+            cost: 소모할 토큰 수
+            priority: 우선순위 (None이면 현재 컨텍스트 우선순위)
+            deadline: 최대 대기 시간(초, None이면 우선순위 기본값)
+        
+        Returns:
+            float: 대기한 시간 (초)
+        
+        Raises:
+            RateLimitExceeded: 대기 기한 안에 슬롯을 얻을 수 없는 경우
+        """
+        if not self.enabled:
+            return 0.0
+        
+        priority = current_priority() if priority is None else PriorityClass(priority)
+        if deadline is None:
+            deadline = self.deadlines[priority]
+        
+        queue = self._queue(api)
+        now = time.monotonic()
+        
+        if not queue.heap and self._wait_time(queue, cost, now) <= 0:
+            for bucket in queue.buckets:
+                bucket.consume(cost)
+            self._record_wait(priority, 0.0)
+            return 0.0
+        
+        # 너무 늦게 처리될 요청은 대기열에 넣지 않고 바로 폐기
+        expected_wait = self._estimate_wait(queue, priority, cost, now)
+        if deadline is not None and expected_wait > deadline:
+            raise self._shed(api, priority, expected_wait)
+        
+        waiter = _Waiter(
+            priority=int(priority),
+            seq=next(self._seq),
+            cost=cost,
+            enqueued=now,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(queue.heap, waiter)
+        queue.wakeup.set()
+        if queue.dispatcher is None or queue.dispatcher.done():
+            queue.dispatcher = asyncio.create_task(self._dispatch(queue))
+        
+        try:
+            waited = await asyncio.wait_for(waiter.future, timeout=deadline)
+        except asyncio.TimeoutError:
+            raise self._shed(api, priority, time.monotonic() - now) from None
+        
+        self._record_wait(priority, waited)
+        return waited
+    
+    async def _dispatch(self, queue: _ApiQueue) -> None:
+        """토큰이 생기는 대로 우선순위 순서로 대기 요청 처리"""
+        while queue.heap:
+            waiter = queue.heap[0]
+            if waiter.future.done():  # 기한 초과/취소된 요청
+                heapq.heappop(queue.heap)
+                continue
+            
+            now = time.monotonic()
+            wait = self._wait_time(queue, waiter.cost, now)
+            if wait <= 0:
+                heapq.heappop(queue.heap)
+                for bucket in queue.buckets:
+                    bucket.consume(waiter.cost)
+                waiter.future.set_result(now - waiter.enqueued)
+                continue
+            
+            # 토큰 보충을 기다리되, 더 높은 우선순위 요청이 들어오면 다시 확인
+            queue.wakeup.clear()
+            try:
+                await asyncio.wait_for(queue.wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+    
+    def penalize(self, api: str, retry_after: Optional[float] = None) -> None:
+        """429 응답을 받은 API의 토큰 지급 일시 중단"""
+        queue = self._queue(api)
+        queue.throttled += 1
+        self._stats[current_priority()].throttled += 1
+        seconds = retry_after if retry_after is not None else settings.rate_limit_penalty_seconds
+        now = time.monotonic()
+        for bucket in queue.buckets:
+            if bucket is not self._project_bucket:
+                bucket.block(seconds, now)
+        self.logger.warning("Outbound API quota exceeded", api=api, pause_seconds=seconds)
+    
+    async def call(
+        self,
+        api: str,
+        func: Callable[[], Awaitable[T]],
+        cost: float = 1.0,
+    ) -> T:
+        """
+        슬롯을 얻은 뒤 호출하고, 429 응답이면 대기 후 재시도
+        
+        Args:
+            api: API 이름
+            func: 호출할 코루틴 함수 (인자 없음)
+            cost: 소모할 토큰 수
+        
+        Returns:
+            func 반환값
+        """
+        priority = current_priority()
+        deadline = self.deadlines[priority]
+        started = time.monotonic()
+        attempt = 0
+        
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - (time.monotonic() - started))
+            await self.acquire(api, cost, priority=priority, deadline=remaining)
+            
+            try:
+                return await func()
+            except Exception as e:
+                if not self.enabled or not is_quota_error(e) or attempt >= settings.rate_limit_max_retries:
+                    raise
+                attempt += 1
+                self.penalize(api, _retry_after(e))
+    
+    def get_stats(self) -> Dict:
+        """우선순위별 대기 시간 및 API별 대기열 상태"""
+        classes = {}
+        for priority, stats in self._stats.items():
+            waits = sorted(stats.recent_waits)
+            classes[priority.name.lower()] = {
+                "granted": stats.granted,
+                "shed": stats.shed,
+                "throttled": stats.throttled,
+                "avg_wait_ms": round(stats.wait_total / stats.granted * 1000, 2) if stats.granted else 0.0,
+                "p95_wait_ms": round(waits[int(len(waits) * 0.95) - 1] * 1000, 2) if waits else 0.0,
+                "max_wait_ms": round(stats.wait_max * 1000, 2),
+            }
+        
+        apis = {
+            api: {
+                "queued": sum(1 for waiter in queue.heap if not waiter.future.done()),
+                "throttled": queue.throttled,
+            }
+            for api, queue in self._queues.items()
+        }
+        
+        return {"enabled": self.enabled, "classes": classes, "apis": apis}
+
+
+# 싱글톤 인스턴스
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """외부 API 속도 제한기 인스턴스 반환"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+
+
+
+
+
+
+
+
+
+
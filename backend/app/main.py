@@ -14,7 +14,23 @@ from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_logger
+from app.core.rate_limiter import get_rate_limiter
 from app.api import router as api_router
+from app.services.audio_archive import get_audio_archive_service
+from app.services.hedged_translation_service import get_hedge_tracker
+from app.services.local_speech_service import get_local_speech_service
+from app.services.container import close_container, init_container
+from app.services.file_transcription import get_file_transcription_service
+from app.services.meeting_warmup import get_meeting_warmup_service
+from app.services.realtime_service import get_realtime_service
+from app.services.recognition_config import get_recognition_config_registry
+from app.services.retranscription import get_retranscription_service
+from app.services.session_events import get_session_event_hub
+from app.services.speech_channel_pool import get_speech_channel_pool
+from app.services.stt_cache import get_stt_result_cache
+from app.services.translation_memory import get_translation_memory
+from app.services.upload_service import get_upload_service
+from app.services.usage_metering import get_usage_meter
 
 # 로깅 초기화
 setup_logging()
@@ -31,9 +47,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         environment=settings.app_env,
     )
     
+    # 서비스 컨테이너 (공유 클라이언트, executor) 초기화
+    await init_container()
+    
+    # 번역 메모리 구축 (translations 테이블)
+    if settings.translation_memory_enabled:
+        try:
+            await get_translation_memory().load_from_db()
+        except Exception as e:
+            logger.warning("Failed to load translation memory", error=str(e))
+    
     yield
     
     # Shutdown
+    await close_container()
     logger.info("Shutting down UniLang Interpreter")
 
 
@@ -89,6 +116,35 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """성능 지표 (캐시 적중률 등)"""
+    return {
+        "translation_memory": get_translation_memory().get_stats(),
+        "incremental_translation": get_realtime_service().incremental_translator.get_stats(),
+        "rate_limiter": get_rate_limiter().get_stats(),
+        "translation_hedging": get_hedge_tracker().get_stats(),
+        "utterance_batching": (
+            batcher.get_stats()
+            if (batcher := get_realtime_service().translation_pipeline.batcher) is not None
+            else None
+        ),
+        "usage_metering": get_usage_meter().get_stats(),
+        "meeting_warmup": get_meeting_warmup_service().get_stats(),
+        "speech_channels": get_speech_channel_pool().get_stats(),
+        "recognition_configs": get_recognition_config_registry().get_stats(),
+        "file_transcription": get_file_transcription_service().get_stats(),
+        "session_events": get_session_event_hub().get_stats(),
+        "uploads": get_upload_service().get_stats(),
+        "stt_cache": get_stt_result_cache().get_stats(),
+        "audio_archive": get_audio_archive_service().get_stats(),
+        "retranscription": get_retranscription_service().get_stats(),
+        "local_stt": get_local_speech_service().get_stats() if settings.local_stt_enabled else None,
+        "jitter_buffer": get_realtime_service().get_jitter_stats(),
+        "adaptive_chunking": get_realtime_service().get_chunking_stats(),
+    }
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """루트 엔드포인트"""
@@ -252,6 +252,23 @@ class FileUploadInfo(BaseModel):
     upload_url: str
 
 
+class FileTranscriptionRequest(BaseModel):
+    """업로드 파일 전사 요청"""
+    file_path: str = Field(..., min_length=1, description="업로드 URL 생성 시 받은 file_path")
+    language: str = Field("ko", min_length=2, max_length=10)
+
+
+class TranscriptSegment(BaseModel):
+    """파일 전사 결과 구간"""
+    segment_index: int
+    start_ms: int
+    end_ms: int
+    text: str
+    language: str
+    confidence: Optional[float] = None
+    words: List[list] = Field(default_factory=list, description="[단어, 구간 시작 기준 시작 ms, 끝 ms]")
+
+
 class TranslationDisplaySettings(BaseModel):
     """번역 표시 설정"""
     show_original: bool = True
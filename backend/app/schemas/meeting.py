@@ -37,6 +37,7 @@ class MeetingSettings(BaseModel):
     default_source_language: Optional[str] = None
     target_languages: list[str] = Field(default_factory=list)
     save_audio: bool = False
+    stt_engine: Optional[str] = Field(None, pattern="^(google|local)$", description="음성 인식 엔진 (없으면 구독 등급 기준)")
 
 
 class MeetingCreate(BaseModel):
@@ -125,6 +126,13 @@ class MeetingEndRequest(BaseModel):
     summary_languages: list[str] = Field(default_factory=lambda: ["ko", "en"])
 
 
+class RetranscriptionRequest(BaseModel):
+    """보관 오디오 재전사 요청"""
+    profile: str = Field("accurate", pattern="^(low_latency|accurate)$", description="인식 프로파일")
+    enable_speaker_diarization: bool = False
+    diarization_speaker_count: int = Field(2, ge=1, le=6, description="예상 화자 수")
+
+
 
 
 
@@ -65,6 +65,13 @@ class BatchTranslationResult(BaseModel):
     target_languages: list[str]
 
 
+class StreamingBatchTranslationRequest(BaseModel):
+    """스트리밍 일괄 번역 요청 (자막 파일 등 대량 텍스트)"""
+    texts: list[str] = Field(..., min_items=1, max_items=5000, description="번역할 텍스트 목록")
+    source_language: str = Field(..., min_length=2, max_length=10, description="원본 언어")
+    target_languages: list[str] = Field(..., min_items=1, description="대상 언어 목록")
+
+
 
 
 
@@ -0,0 +1,318 @@
+"""
+회의 오디오 보관
+==============
+
+회의 설정 save_audio를 켠 회의의 참여자 오디오를 압축해 보관한다.
+(더 나은 모델로 재전사, 분쟁 확인, 화자 분리 재실행용)
+
+- 참여자별 트랙을 FLAC(무손실) 또는 Opus 세그먼트 파일로 인코딩
+- 실시간 루프는 큐에 넣기만 하고 인코딩/파일 기록은 트랙별 백그라운드 작성기가 스레드에서 처리
+  (큐가 가득 차면 기다리지 않고 해당 청크를 버리고 집계)
+- 보관 위치는 큐에 넣는 시점에 정해지므로 발화 저장 시 세그먼트 경로와 오프셋을 함께 기록
+  (utterances.audio_path / audio_offset_ms / audio_duration_ms -> 발화 단위 임의 접근)
+- 완료된 세그먼트는 로컬 디스크에 두거나 Supabase Storage 버킷으로 올림
+"""
+
+import asyncio
+import io
+import os
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 실시간 오디오 형식 (16kHz LINEAR16 mono)
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+# 형식 -> (파일 확장자, soundfile format, subtype, content type)
+ARCHIVE_FORMATS = {
+    "flac": ("flac", "FLAC", "PCM_16", "audio/flac"),
+    "opus": ("ogg", "OGG", "OPUS", "audio/ogg"),
+}
+
+
+@dataclass
+class AudioArchiveRef:
+    """보관된 오디오 위치"""
+    path: str  # 보관 디렉터리(또는 버킷) 기준 세그먼트 경로
+    offset_ms: int
+    duration_ms: int
+
+
+class _Track:
+    """참여자 트랙 (세그먼트 번호/위치 할당과 작성기 큐)"""
+    
+    def __init__(self, meeting_id: str, participant_id: str):
+        self.meeting_id = meeting_id
+        self.participant_id = participant_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.audio_archive_queue_chunks)
+        self.started = int(time.time())  # 트랙을 다시 열어도 세그먼트 경로가 겹치지 않게
+        self.segment = 0
+        self.segment_samples = 0  # 현재 세그먼트에 할당한 샘플 수
+        self.writer: Optional[asyncio.Task] = None
+    
+    def next_segment(self) -> None:
+        """이후 청크를 새 세그먼트에 할당"""
+        if self.segment_samples:
+            self.segment += 1
+            self.segment_samples = 0
+    
+    def segment_path(self, segment: int) -> str:
+        extension = ARCHIVE_FORMATS[settings.audio_archive_format][0]
+        return f"{self.meeting_id}/{self.participant_id}/{self.started}-{segment:05d}.{extension}"
+
+
+class AudioArchiveService:
+    """회의 오디오 비동기 보관"""
+    
+    def __init__(self, archive_dir: Optional[str] = None):
+        self.logger = get_logger(__name__)
+        self.archive_dir = archive_dir or settings.audio_archive_dir
+        self.segment_samples = settings.audio_archive_segment_seconds * SAMPLE_RATE
+        self._tracks: Dict[Tuple[str, str], _Track] = {}
+        self._archived_bytes = 0
+        self._dropped_chunks = 0
+        self._segments_written = 0
+        self._write_errors = 0
+    
+    # ==================== 기록 ====================
+    
+    def append(self, meeting_id: str, participant_id: str, pcm: bytes) -> Optional[AudioArchiveRef]:
+        """
+        오디오 청크 보관 요청 (기다리지 않음)
+        
+        Returns:
+            AudioArchiveRef: 청크가 기록될 위치 (큐가 가득 차 버린 경우 None)
+        """
+        samples = len(pcm) // SAMPLE_WIDTH
+        if samples == 0:
+            return None
+        
+        key = (meeting_id, participant_id)
+        track = self._tracks.get(key)
+        if track is None:
+            track = self._tracks[key] = _Track(meeting_id, participant_id)
+        
+        if track.queue.full():
+            self._dropped_chunks += 1
+            return None
+        
+        if track.segment_samples + samples > self.segment_samples:
+            track.next_segment()
+        
+        ref = AudioArchiveRef(
+            path=track.segment_path(track.segment),
+            offset_ms=track.segment_samples * 1000 // SAMPLE_RATE,
+            duration_ms=samples * 1000 // SAMPLE_RATE,
+        )
+        track.queue.put_nowait((track.segment, pcm))
+        track.segment_samples += samples
+        
+        if track.writer is None or track.writer.done():
+            track.writer = asyncio.create_task(self._write_track(track))
+        return ref
+    
+    async def _write_track(self, track: _Track) -> None:
+        """트랙 작성기 (세그먼트가 바뀌거나 유휴 시간이 지나면 파일을 닫음)"""
+        import soundfile as sf
+        
+        _, file_format, subtype, _ = ARCHIVE_FORMATS[settings.audio_archive_format]
+        current: Optional[int] = None
+        sound_file = None
+        
+        async def finish() -> None:
+            nonlocal sound_file
+            if sound_file is not None:
+                await asyncio.to_thread(sound_file.close)
+                sound_file = None
+                await self._finalize(track.segment_path(current))
+        
+        pending = None
+        try:
+            while True:
+                if pending is not None:
+                    item, pending = pending, None
+                else:
+                    try:
+                        item = await asyncio.wait_for(track.queue.get(), timeout=settings.audio_archive_idle_seconds)
+                    except asyncio.TimeoutError:
+                        # 유휴: 이후 청크는 새 세그먼트에 할당
+                        track.next_segment()
+                        item = None
+                
+                if item is None:
+                    # 유휴 또는 회의 종료: 현재 세그먼트를 닫음
+                    await finish()
+                    if track.queue.empty():
+                        return
+                    continue
+                
+                segment, pcm = item
+                if segment != current:
+                    await finish()
+                    current = segment
+                    path = os.path.join(self.archive_dir, track.segment_path(segment))
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    sound_file = await asyncio.to_thread(
+                        sf.SoundFile, path, "w",
+                        samplerate=SAMPLE_RATE, channels=1, format=file_format, subtype=subtype,
+                    )
+                
+                # 큐에 쌓인 같은 세그먼트 청크를 한 번에 기록
+                chunks = [pcm]
+                while not track.queue.empty():
+                    item = track.queue.get_nowait()
+                    if item is None or item[0] != current:
+                        pending = item
+                        break
+                    chunks.append(item[1])
+                data = b"".join(chunks)
+                await asyncio.to_thread(sound_file.buffer_write, data, "int16")
+                self._archived_bytes += len(data)
+        except Exception as e:
+            self._write_errors += 1
+            self.logger.error(
+                "Audio archive write failed",
+                meeting_id=track.meeting_id,
+                participant_id=track.participant_id,
+                error=str(e),
+            )
+            # 남은 청크는 버리고 이후 청크는 새 세그먼트에 기록
+            while not track.queue.empty():
+                if track.queue.get_nowait() is not None:
+                    self._dropped_chunks += 1
+            track.next_segment()
+            if sound_file is not None:
+                sound_file.close()
+    
+    async def _finalize(self, relative_path: str) -> None:
+        """완료된 세그먼트 업로드 (버킷 설정 시 로컬 파일 삭제)"""
+        self._segments_written += 1
+        bucket = settings.audio_archive_bucket
+        if not bucket:
+            return
+        
+        from app.core.database import get_db
+        
+        path = os.path.join(self.archive_dir, relative_path)
+        content_type = ARCHIVE_FORMATS[settings.audio_archive_format][3]
+        
+        def upload() -> None:
+            with open(path, "rb") as f:
+                get_db().client.storage.from_(bucket).upload(
+                    relative_path, f.read(), {"content-type": content_type}
+                )
+            os.remove(path)
+        
+        try:
+            await asyncio.to_thread(upload)
+        except Exception as e:
+            # 업로드 실패 시 로컬 파일 유지 (read_clip은 로컬을 먼저 확인)
+            self.logger.warning("Audio archive upload failed", path=relative_path, error=str(e))
+    
+    async def close_meeting(self, meeting_id: str) -> None:
+        """회의 트랙의 남은 청크 기록 후 세그먼트 닫기"""
+        tracks = [track for key, track in self._tracks.items() if key[0] == meeting_id]
+        for track in tracks:
+            if track.writer is not None and not track.writer.done():
+                track.next_segment()
+                await track.queue.put(None)
+        await asyncio.gather(
+            *(track.writer for track in tracks if track.writer is not None),
+            return_exceptions=True,
+        )
+        for track in tracks:
+            self._tracks.pop((meeting_id, track.participant_id), None)
+    
+    async def close(self) -> None:
+        """모든 회의 트랙 닫기 (애플리케이션 종료 시)"""
+        for meeting_id in {key[0] for key in self._tracks}:
+            await self.close_meeting(meeting_id)
+    
+    # ==================== 읽기 ====================
+    
+    async def read_pcm(self, path: str, offset_ms: int, duration_ms: int) -> bytes:
+        """
+        보관된 구간을 16kHz LINEAR16 PCM으로 반환 (세그먼트 안에서 seek)
+        
+        Raises:
+            FileNotFoundError: 세그먼트가 없거나 아직 기록 중
+        """
+        import soundfile as sf
+        
+        local_path = os.path.join(self.archive_dir, path)
+        
+        def read() -> bytes:
+            if os.path.exists(local_path):
+                source = local_path
+            elif settings.audio_archive_bucket:
+                from app.core.database import get_db
+                
+                source = io.BytesIO(get_db().client.storage.from_(settings.audio_archive_bucket).download(path))
+            else:
+                raise FileNotFoundError(path)
+            
+            with sf.SoundFile(source) as sound_file:
+                sound_file.seek(offset_ms * SAMPLE_RATE // 1000)
+                return bytes(sound_file.buffer_read(duration_ms * SAMPLE_RATE // 1000, dtype="int16"))
+        
+        try:
+            return await asyncio.to_thread(read)
+        except sf.LibsndfileError as e:
+            # 기록 중인 세그먼트는 닫히기 전까지 읽을 수 없음
+            raise FileNotFoundError(path) from e
+    
+    async def read_clip(self, path: str, offset_ms: int, duration_ms: int) -> bytes:
+        """보관된 구간을 WAV로 반환 (Raises: FileNotFoundError)"""
+        pcm = await self.read_pcm(path, offset_ms, duration_ms)
+        header = struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF", 36 + len(pcm), b"WAVE", b"fmt ", 16, 1, 1,
+            SAMPLE_RATE, SAMPLE_RATE * SAMPLE_WIDTH, SAMPLE_WIDTH, SAMPLE_WIDTH * 8,
+            b"data", len(pcm),
+        )
+        return header + pcm
+    
+    def get_stats(self) -> Dict[str, int]:
+        """활성 트랙 수와 보관/버린 양"""
+        return {
+            "active_tracks": sum(
+                1 for track in self._tracks.values()
+                if track.writer is not None and not track.writer.done()
+            ),
+            "queued_chunks": sum(track.queue.qsize() for track in self._tracks.values()),
+            "archived_bytes": self._archived_bytes,
+            "dropped_chunks": self._dropped_chunks,
+            "segments_written": self._segments_written,
+            "write_errors": self._write_errors,
+        }
+
+
+# 싱글톤 인스턴스
+_audio_archive_service: Optional[AudioArchiveService] = None
+
+
+def get_audio_archive_service() -> AudioArchiveService:
+    """오디오 보관 서비스 인스턴스 반환"""
+    global _audio_archive_service
+    if _audio_archive_service is None:
+        _audio_archive_service = AudioArchiveService()
+    return _audio_archive_service
+
+
+
+
+
+
+
+
+
+
+
+
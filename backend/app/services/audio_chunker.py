@@ -0,0 +1,292 @@
+"""
+오디오 디코딩 / 무음 기준 청크 분할
+=================================
+
+업로드된 미디어 파일을 인식용 PCM 청크로 나눈다.
+
+- ffmpeg 하위 프로세스로 컨테이너를 16kHz mono LINEAR16으로 스트리밍 디코딩
+  (파일 전체를 메모리에 올리지 않음)
+- 프레임 RMS 에너지 기반 VAD: 목표 길이를 넘은 뒤 첫 무음 구간의 가운데에서 분할
+  (무음 기준은 프레임마다 갱신해 입력을 어떤 크기로 나눠 넣어도 분할 지점이 같음)
+- 무음이 없으면 최대 길이 안에서 가장 조용한 프레임에서 강제 분할
+- 분할 지점 앞 오디오를 다음 청크에 겹쳐 넣어 경계 단어 손실 방지
+- 발화가 없는 청크는 표시만 하고 인식 요청을 생략할 수 있도록 함
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+BYTES_PER_SAMPLE = 2  # LINEAR16
+
+# 무음 기준 에너지 = max(최소값, 최근 프레임 에너지 하위 10% * 배수)
+_NOISE_WINDOW_FRAMES = 300
+_NOISE_MULTIPLIER = 3.0
+
+
+class AudioDecodeError(Exception):
+    """ffmpeg 디코딩 실패"""
+
+
+@dataclass
+class AudioChunk:
+    """인식 단위 오디오 청크"""
+    index: int
+    start_ms: float  # 파일 기준 청크 시작 위치 (앞 겹침 포함)
+    end_ms: float
+    overlap_ms: float  # 이전 청크와 겹치는 앞부분 길이
+    pcm: bytes
+    has_speech: bool
+    
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+async def probe_duration(path: str) -> Optional[float]:
+    """ffprobe로 미디어 길이(초) 조회 (실패 시 None)"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            settings.ffprobe_path,
+            "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        return float(stdout.decode().strip()) if process.returncode == 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+async def decode_pcm_stream(
+    path: str,
+    sample_rate: int = 16000,
+    read_size: int = 64 * 1024,
+    source: Optional[AsyncIterator[bytes]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    미디어 파일을 mono LINEAR16 PCM으로 스트리밍 디코딩
+    
+    Args:
+        path: 미디어 파일 경로 (ffmpeg가 지원하는 모든 컨테이너/코덱)
+        sample_rate: 출력 샘플링 레이트
+        read_size: 한 번에 읽을 바이트 수
+        source: 파일 대신 stdin으로 넘길 원본 바이트 스트림 (업로드 중인 파일 등,
+            순차 읽기가 가능한 형식만 가능 - mp4는 moov가 앞에 있어야 함)
+    
+    Yields:
+        bytes: PCM 블록 (샘플 경계와 맞지 않을 수 있음)
+    
+    Raises:
+        AudioDecodeError: ffmpeg 실행 실패 또는 0이 아닌 종료 코드
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            settings.ffmpeg_path,
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", "pipe:0" if source is not None else path,
+            "-vn",
+            "-ac", "1",
+            "-ar", str(sample_rate),
+            "-f", "s16le",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE if source is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        raise AudioDecodeError(f"ffmpeg를 실행할 수 없습니다: {e}") from e
+    
+    async def feed() -> None:
+        try:
+            async for data in source:
+                process.stdin.write(data)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg가 먼저 종료됨 (종료 코드로 오류 판단)
+        finally:
+            if not process.stdin.is_closing():
+                process.stdin.close()
+    
+    feeder = asyncio.create_task(feed()) if source is not None else None
+    
+    try:
+        while True:
+            data = await process.stdout.read(read_size)
+            if not data:
+                break
+            yield data
+        
+        stderr = await process.stderr.read()
+        if feeder is not None:
+            await feeder
+        if await process.wait() != 0:
+            message = stderr.decode(errors="replace").strip().splitlines()
+            raise AudioDecodeError(message[-1] if message else f"ffmpeg exited with {process.returncode}")
+    finally:
+        if feeder is not None and not feeder.done():
+            feeder.cancel()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+
+
+class VadChunker:
+    """무음 구간 기준 PCM 청크 분할기 (feed()로 순서대로 입력)"""
+    
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: Optional[int] = None,
+        target_seconds: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        overlap_ms: Optional[int] = None,
+        min_silence_ms: Optional[int] = None,
+        energy_floor: Optional[float] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms or settings.file_vad_frame_ms
+        self.frame_bytes = int(sample_rate * self.frame_ms / 1000) * BYTES_PER_SAMPLE
+        
+        target_seconds = target_seconds or settings.file_chunk_target_seconds
+        max_seconds = max_seconds or settings.file_chunk_max_seconds
+        overlap_ms = settings.file_chunk_overlap_ms if overlap_ms is None else overlap_ms
+        min_silence_ms = min_silence_ms or settings.file_vad_min_silence_ms
+        
+        self.target_frames = int(target_seconds * 1000 / self.frame_ms)
+        self.max_frames = max(self.target_frames + 1, int(max_seconds * 1000 / self.frame_ms))
+        self.overlap_frames = int(overlap_ms / self.frame_ms)
+        self.min_silence_frames = max(1, int(min_silence_ms / self.frame_ms))
+        self.energy_floor = settings.file_vad_energy_floor if energy_floor is None else energy_floor
+        
+        self._pending = bytearray()  # 프레임 단위에 못 미친 나머지
+        self._chunk = bytearray()
+        self._energies: List[float] = []  # 현재 청크의 프레임별 에너지
+        self._silent: List[bool] = []
+        self._head_frames = 0  # 현재 청크 앞의 겹침 프레임 수
+        self._start_frame = 0  # 현재 청크 첫 프레임의 파일 기준 번호
+        self._silence_run = 0
+        self._recent = deque(maxlen=_NOISE_WINDOW_FRAMES)
+        self._index = 0
+        self.total_frames = 0
+    
+    def _thresholds(self, energies: np.ndarray) -> np.ndarray:
+        """프레임별 무음 기준 (각 프레임까지 최근 _NOISE_WINDOW_FRAMES 프레임 에너지 기준)"""
+        offset = len(self._recent)
+        history = np.concatenate([np.fromiter(self._recent, dtype=np.float64, count=offset), energies])
+        noise = np.empty(len(energies))
+        
+        # 창이 다 차기 전 (파일 앞부분)은 프레임마다 계산
+        full_from = min(len(energies), max(0, _NOISE_WINDOW_FRAMES - 1 - offset))
+        for position in range(full_from):
+            noise[position] = np.percentile(history[:offset + position + 1], 10)
+        if full_from < len(energies):
+            windows = sliding_window_view(history, _NOISE_WINDOW_FRAMES)
+            noise[full_from:] = np.percentile(windows[offset + full_from + 1 - _NOISE_WINDOW_FRAMES:], 10, axis=1)
+        
+        self._recent.extend(energies.tolist())
+        return np.maximum(self.energy_floor, noise * _NOISE_MULTIPLIER)
+    
+    def feed(self, pcm: bytes) -> List[AudioChunk]:
+        """PCM 입력 후 완성된 청크 반환"""
+        self._pending += pcm
+        frame_count = len(self._pending) // self.frame_bytes
+        if frame_count == 0:
+            return []
+        
+        size = frame_count * self.frame_bytes
+        raw = bytes(self._pending[:size])
+        del self._pending[:size]
+        
+        samples = np.frombuffer(raw, dtype=np.int16).reshape(frame_count, -1).astype(np.float32)
+        energies = np.sqrt(np.mean(samples * samples, axis=1)).astype(np.float64)
+        thresholds = self._thresholds(energies)
+        
+        chunks: List[AudioChunk] = []
+        for position, (energy, threshold) in enumerate(zip(energies.tolist(), thresholds.tolist())):
+            self._chunk += raw[position * self.frame_bytes:(position + 1) * self.frame_bytes]
+            silent = energy < threshold
+            self._energies.append(energy)
+            self._silent.append(silent)
+            self._silence_run = self._silence_run + 1 if silent else 0
+            self.total_frames += 1
+            
+            frames = len(self._energies)
+            if frames >= self.target_frames and self._silence_run >= self.min_silence_frames:
+                # 무음 구간 가운데에서 분할
+                chunks.append(self._cut(frames - self._silence_run // 2))
+            elif frames >= self.max_frames:
+                # 목표 길이 이후 가장 조용한 프레임 뒤에서 분할
+                window = self._energies[self.target_frames:]
+                chunks.append(self._cut(self.target_frames + int(np.argmin(window)) + 1))
+        return chunks
+    
+    def flush(self) -> List[AudioChunk]:
+        """남은 오디오를 마지막 청크로 반환"""
+        if self._pending:
+            self._chunk += self._pending[:len(self._pending) - len(self._pending) % BYTES_PER_SAMPLE]
+            self._pending.clear()
+        if len(self._chunk) <= self._head_frames * self.frame_bytes:
+            return []
+        
+        chunk = self._make_chunk(bytes(self._chunk), len(self._energies))
+        self._chunk.clear()
+        self._energies, self._silent = [], []
+        return [chunk]
+    
+    def _make_chunk(self, pcm: bytes, frames: int) -> AudioChunk:
+        start_ms = self._start_frame * self.frame_ms
+        chunk = AudioChunk(
+            index=self._index,
+            start_ms=start_ms,
+            end_ms=start_ms + len(pcm) / BYTES_PER_SAMPLE / self.sample_rate * 1000,
+            overlap_ms=self._head_frames * self.frame_ms,
+            pcm=pcm,
+            has_speech=not all(self._silent[self._head_frames:frames]),
+        )
+        self._index += 1
+        return chunk
+    
+    def _cut(self, cut_frame: int) -> AudioChunk:
+        chunk = self._make_chunk(bytes(self._chunk[:cut_frame * self.frame_bytes]), cut_frame)
+        
+        # 분할 지점 앞 overlap 프레임부터 다음 청크 시작
+        keep_from = max(self._head_frames, cut_frame - self.overlap_frames)
+        self._chunk = self._chunk[keep_from * self.frame_bytes:]
+        self._energies = self._energies[keep_from:]
+        self._silent = self._silent[keep_from:]
+        self._head_frames = cut_frame - keep_from
+        self._start_frame += keep_from
+        
+        self._silence_run = 0
+        for silent in reversed(self._silent):
+            if not silent:
+                break
+            self._silence_run += 1
+        return chunk
+
+
+
+
+
+
+
+
+
+
+
+
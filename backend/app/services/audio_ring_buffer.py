@@ -0,0 +1,161 @@
+"""
+오디오 링 버퍼
+============
+
+참여자별로 미리 할당한 int16 링 버퍼에 PCM을 쌓고, 샘플 경계에 맞춘 memoryview 창으로 꺼낸다.
+(bytearray에 이어 붙이고 bytes(...)로 복사한 뒤 새로 할당하던 방식 대체)
+
+- 버퍼는 생성 시 한 번만 할당 (numpy int16, 용량 + 창 크기)
+- 쓰기는 입력을 버퍼로 한 번 복사, 읽기는 복사 없이 memoryview 창 반환
+- 모두 읽어 비었으면 버퍼 앞에서 다시 쓰기 시작 (자주 쓰는 영역만 캐시에 유지)
+- 창이 버퍼 끝을 넘으면 넘친 앞부분만 버퍼 뒤 여유 영역에 복제해 연속 메모리로 반환
+  (창 크기가 용량의 약수이고 같은 크기로만 읽으면 복제가 일어나지 않음)
+- 홀수 바이트 입력은 마지막 바이트를 다음 쓰기까지 보류해 int16 샘플을 자르지 않음
+- 용량을 넘으면 가장 오래된 샘플부터 버리고 집계 (최근 오디오 유지)
+- 반환한 창은 다음 write/read 전까지만 유효 (보관하려면 bytes(...)로 복사)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+SAMPLE_WIDTH = 2  # LINEAR16
+
+
+class AudioRingBuffer:
+    """미리 할당한 int16 PCM 링 버퍼"""
+    
+    def __init__(self, capacity: int, window: Optional[int] = None):
+        """
+        Args:
+            capacity: 보관할 최대 샘플 수
+            window: 한 번에 꺼낼 최대 샘플 수 (기본값: capacity)
+        """
+        self.capacity = capacity
+        self.window = min(window or capacity, capacity)
+        self._samples = np.zeros(capacity + self.window, dtype=np.int16)
+        self._bytes = memoryview(self._samples).cast("B")
+        self._read = 0  # 누적 샘플 위치
+        self._write = 0
+        self._odd: Optional[int] = None  # 샘플을 채우지 못한 마지막 바이트
+        self.written_bytes = 0
+        self.mirrored_bytes = 0  # 버퍼 끝을 넘는 창을 위해 복제한 양
+        self.overrun_samples = 0  # 용량을 넘어 버린 샘플 수
+    
+    @property
+    def available(self) -> int:
+        """읽을 수 있는 샘플 수"""
+        return self._write - self._read
+    
+    def write(self, data: bytes) -> None:
+        """PCM 추가 (bytes, bytearray, memoryview)"""
+        if type(data) is not bytes and type(data) is not bytearray:
+            data = memoryview(data).cast("B")
+        if self._odd is not None or len(data) & 1:
+            data = self._align(data)
+        if data:
+            self._put(data)
+    
+    def _align(self, data: bytes) -> memoryview:
+        # 보류 바이트와 합쳐 샘플을 채우고, 남는 마지막 바이트는 다시 보류
+        view = memoryview(data)
+        if self._odd is not None and view:
+            self._put(bytes((self._odd, view[0])))
+            self._odd = None
+            view = view[1:]
+        if len(view) % SAMPLE_WIDTH:
+            self._odd = view[-1]
+            view = view[:-1]
+        return view
+    
+    def _put(self, data: bytes) -> None:
+        capacity = self.capacity
+        size = len(data)
+        samples = size // SAMPLE_WIDTH
+        if self._read == self._write:
+            # 비어 있으면 버퍼 앞에서 다시 시작 (쓰는 영역을 캐시에 머물게 하고 창이 끝을 넘지 않게)
+            self._read = self._write = 0
+            if samples <= capacity:
+                self._bytes[:size] = data
+                self._write = samples
+                self.written_bytes += size
+                return
+        
+        if samples > capacity:
+            # 가장 최근 capacity 샘플만 기록 (앞부분은 아래에서 넘친 샘플로 집계)
+            skipped = samples - capacity
+            data = memoryview(data)[skipped * SAMPLE_WIDTH:]
+            self._write += skipped
+            samples = capacity
+        
+        overflow = self._write - self._read + samples - capacity
+        if overflow > 0:
+            self._read += overflow
+            self.overrun_samples += overflow
+        
+        start = self._write % capacity
+        if start + samples <= capacity:
+            self._bytes[start * SAMPLE_WIDTH:(start + samples) * SAMPLE_WIDTH] = data
+        else:
+            view = memoryview(data)
+            first = capacity - start
+            self._bytes[start * SAMPLE_WIDTH:capacity * SAMPLE_WIDTH] = view[:first * SAMPLE_WIDTH]
+            self._bytes[:(samples - first) * SAMPLE_WIDTH] = view[first * SAMPLE_WIDTH:]
+        self._write += samples
+        self.written_bytes += samples * SAMPLE_WIDTH
+    
+    def _window(self, start: int, samples: int) -> memoryview:
+        position = start % self.capacity
+        end = position + samples
+        if end > self.capacity:
+            # 넘친 앞부분을 버퍼 뒤 여유 영역에 복제
+            tail = end - self.capacity
+            self._samples[self.capacity:self.capacity + tail] = self._samples[:tail]
+            self.mirrored_bytes += tail * SAMPLE_WIDTH
+        return self._bytes[position * SAMPLE_WIDTH:end * SAMPLE_WIDTH]
+    
+    def peek(self, samples: Optional[int] = None) -> memoryview:
+        """가장 오래된 샘플부터 창 반환 (소비하지 않음, 최대 window 샘플)"""
+        samples = min(self.available if samples is None else samples, self.available, self.window)
+        return self._window(self._read, samples)
+    
+    def consume(self, samples: int) -> None:
+        """앞쪽 샘플 소비"""
+        self._read += min(samples, self.available)
+    
+    def read(self, samples: Optional[int] = None) -> memoryview:
+        """가장 오래된 샘플부터 창 반환 후 소비"""
+        window = self.peek(samples)
+        self._read += len(window) // SAMPLE_WIDTH
+        return window
+    
+    def latest(self, samples: int) -> memoryview:
+        """가장 최근 샘플 창 (소비하지 않음)"""
+        samples = min(samples, self.available, self.window)
+        return self._window(self._write - samples, samples)
+    
+    def clear(self) -> None:
+        """남은 샘플과 보류 바이트 버림"""
+        self._read = self._write
+        self._odd = None
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "capacity_bytes": self.capacity * SAMPLE_WIDTH,
+            "available_bytes": self.available * SAMPLE_WIDTH,
+            "written_bytes": self.written_bytes,
+            "mirrored_bytes": self.mirrored_bytes,
+            "overrun_bytes": self.overrun_samples * SAMPLE_WIDTH,
+        }
+
+
+
+
+
+
+
+
+
+
+
+
@@ -133,7 +133,66 @@ class BillingService:
         metadata: dict = None,
     ) -> dict:
         """사용량 기록"""
-        # 단위 원가 계산
+        record_data = self._build_usage_record(
+            user_id, session_id, usage_type, quantity, unit, metadata
+        )
+        
+        response = (
+            self.db.client.table("usage_records")
+            .insert(record_data)
+            .execute()
+        )
+        
+        # 구독 사용량 업데이트 (STT 사용량만 분으로 계산)
+        if usage_type == UsageType.STT:
+            await self._update_subscription_usage(user_id, float(quantity))
+        
+        return response.data[0] if response.data else {}
+    
+    async def record_usage_bulk(self, records: List[dict]) -> List[dict]:
+        """
+        사용량 일괄 기록 (한 번의 insert)
+        
+        Args:
+            records: record_usage 인자(user_id, session_id, usage_type, quantity, unit, metadata) 딕셔너리 목록
+        """
+        if not records:
+            return []
+        
+        rows = [
+            self._build_usage_record(
+                record["user_id"],
+                record.get("session_id"),
+                record["usage_type"],
+                record["quantity"],
+                record["unit"],
+                record.get("metadata"),
+            )
+            for record in records
+        ]
+        
+        response = (
+            self.db.client.table("usage_records")
+            .insert(rows)
+            .execute()
+        )
+        
+        for record in records:
+            if record["usage_type"] == UsageType.STT:
+                await self._update_subscription_usage(record["user_id"], float(record["quantity"]))
+        
+        return response.data or []
+    
+    def _build_usage_record(
+        self,
+        user_id: str,
+        session_id: Optional[str],
+        usage_type: UsageType,
+        quantity: Decimal,
+        unit: str,
+        metadata: Optional[dict],
+    ) -> dict:
+        """usage_records 행 구성 (단위 원가 계산 포함)"""
         if usage_type == UsageType.STT:
             unit_cost = Decimal(str(API_COSTS["stt_per_minute"]))
         elif usage_type == UsageType.TRANSLATION:
@@ -143,7 +202,7 @@ class BillingService:
         
         total_cost = quantity * unit_cost
         
-        record_data = {
+        return {
             "user_id": user_id,
             "session_id": session_id,
             "usage_type": usage_type.value,
@@ -153,18 +212,6 @@ class BillingService:
             "total_cost": float(total_cost),
             "metadata": metadata or {},
         }
-        
-        response = (
-            self.db.client.table("usage_records")
-            .insert(record_data)
-            .execute()
-        )
-        
-        # 구독 사용량 업데이트 (STT 사용량만 분으로 계산)
-        if usage_type == UsageType.STT:
-            await self._update_subscription_usage(user_id, float(quantity))
-        
-        return response.data[0] if response.data else {}
     
     async def _update_subscription_usage(
         self,
@@ -0,0 +1,184 @@
+"""
+적응형 STT 청크 길이 조절
+======================
+
+참여자별로 인식 요청에 보낼 오디오 길이(flush 크기)를 목표 종단 지연에 맞춰 조절한다.
+(짧은 청크는 호출 수가 늘고, 긴 청크는 자막 지연이 늘어남)
+
+- 지연 예산: 목표 지연 - STT 왕복 지연(EWMA) 만큼만 오디오를 모음
+- 발화 길이: 발화 초반은 짧게 보내 첫 자막을 빨리 띄우고, 발화가 길어질수록 청크를 늘림
+- 적체: 같은 참여자의 처리 대기 요청이 있으면 왕복 지연 x (1 + 대기 수) 이상으로 늘려 호출 수를 줄임
+- 발화가 끝나면(무음 전환) 목표 길이를 기다리지 않고 바로 보냄
+- 결정 이유와 flush 원인을 집계해 /metrics로 노출
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 결정 이유
+REASON_SPEECH = "speech_ramp"  # 발화 초반 (발화 길이에 비례)
+REASON_DELAY = "delay_budget"  # 목표 지연 - 왕복 지연
+REASON_BACKLOG = "backlog"  # 처리 대기 적체
+REASON_MIN = "min"
+REASON_MAX = "max"
+
+
+@dataclass
+class _ParticipantState:
+    """참여자별 관측값과 현재 결정"""
+    rtt_ms: Optional[float] = None  # STT 왕복 지연 EWMA
+    queue_depth: int = 0
+    segment_ms: float = 0.0  # 현재 발화 길이
+    segment_flushed_ms: float = 0.0  # 마지막으로 보냈을 때의 발화 길이 (모으는 중인 오디오 제외)
+    silence_ms: float = 0.0  # 발화 뒤 이어진 무음 길이
+    chunk_ms: int = 0
+    reason: str = REASON_MIN
+
+
+def is_speech(pcm: bytes, energy_floor: Optional[float] = None) -> bool:
+    """RMS 에너지 기준 발화 여부 (16bit PCM)"""
+    samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+    if samples.size == 0:
+        return False
+    floor = settings.stt_chunk_energy_floor if energy_floor is None else energy_floor
+    return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) >= floor
+
+
+class AdaptiveChunkController:
+    """참여자별 STT 청크 길이 제어기"""
+    
+    def __init__(
+        self,
+        target_delay_ms: Optional[int] = None,
+        min_ms: Optional[int] = None,
+        max_ms: Optional[int] = None,
+    ):
+        self.logger = get_logger(__name__)
+        self.target_delay_ms = target_delay_ms or settings.stt_chunk_target_delay_ms
+        self.min_ms = min_ms or settings.stt_chunk_min_ms
+        self.max_ms = max(self.min_ms, max_ms or settings.stt_chunk_max_ms)
+        self.speech_ramp = settings.stt_chunk_speech_ramp
+        self.segment_end_ms = settings.stt_chunk_segment_end_ms
+        self.rtt_alpha = settings.stt_chunk_rtt_alpha
+        self._participants: Dict[str, _ParticipantState] = {}
+        
+        # 집계
+        self._reasons: Counter = Counter()
+        self._triggers: Counter = Counter()
+        self._flushed_ms = 0.0
+        self._flushes = 0
+    
+    def _state(self, participant_id: str) -> _ParticipantState:
+        state = self._participants.get(participant_id)
+        if state is None:
+            state = self._participants[participant_id] = _ParticipantState(chunk_ms=self.min_ms)
+        return state
+    
+    # ==================== 관측 ====================
+    
+    def observe_audio(self, participant_id: str, duration_ms: float, speech: bool) -> bool:
+        """
+        들어온 오디오 반영 (발화/무음 길이 갱신)
+        
+        Returns:
+            bool: 발화가 방금 끝났으면 True (모아 둔 오디오를 바로 보낼 때)
+        """
+        state = self._state(participant_id)
+        if speech:
+            state.segment_ms += state.silence_ms + duration_ms  # 짧은 쉼은 발화에 포함
+            state.silence_ms = 0.0
+            return False
+        
+        if state.segment_ms == 0:
+            return False
+        state.silence_ms += duration_ms
+        if state.silence_ms >= self.segment_end_ms:
+            state.segment_ms = state.segment_flushed_ms = state.silence_ms = 0.0
+            return True
+        return False
+    
+    def record_latency(self, participant_id: str, rtt_ms: float) -> None:
+        """STT 왕복 지연 반영"""
+        state = self._state(participant_id)
+        if state.rtt_ms is None:
+            state.rtt_ms = rtt_ms
+        else:
+            state.rtt_ms += self.rtt_alpha * (rtt_ms - state.rtt_ms)
+    
+    def set_queue_depth(self, participant_id: str, depth: int) -> None:
+        """처리 대기 중인 같은 참여자 요청 수"""
+        self._state(participant_id).queue_depth = max(0, depth)
+    
+    # ==================== 결정 ====================
+    
+    def chunk_ms(self, participant_id: str) -> int:
+        """현재 flush 크기 (밀리초)"""
+        state = self._state(participant_id)
+        rtt = state.rtt_ms or 0.0
+        
+        budget = self.target_delay_ms - rtt
+        ramp = self.min_ms + state.segment_flushed_ms * self.speech_ramp
+        chunk, reason = (ramp, REASON_SPEECH) if ramp < budget else (budget, REASON_DELAY)
+        
+        if state.queue_depth and rtt * (1 + state.queue_depth) > chunk:
+            chunk, reason = rtt * (1 + state.queue_depth), REASON_BACKLOG
+        if chunk < self.min_ms:
+            chunk, reason = self.min_ms, REASON_MIN
+        elif chunk > self.max_ms:
+            chunk, reason = self.max_ms, REASON_MAX
+        
+        state.chunk_ms = int(chunk)
+        state.reason = reason
+        return state.chunk_ms
+    
+    def record_flush(self, participant_id: str, duration_ms: float, trigger: str) -> None:
+        """보낸 청크 집계 (trigger: size | segment_end | flush)"""
+        state = self._state(participant_id)
+        state.segment_flushed_ms = state.segment_ms
+        self._reasons[state.reason] += 1
+        self._triggers[trigger] += 1
+        self._flushes += 1
+        self._flushed_ms += duration_ms
+    
+    def remove(self, participant_id: str) -> None:
+        self._participants.pop(participant_id, None)
+    
+    def get_stats(self) -> Dict:
+        """결정 이유/flush 원인 집계와 참여자별 현재 값"""
+        return {
+            "target_delay_ms": self.target_delay_ms,
+            "flushes": self._flushes,
+            "flushed_ms": round(self._flushed_ms),
+            "reasons": dict(self._reasons),
+            "triggers": dict(self._triggers),
+            "participants": {
+                participant_id: {
+                    "chunk_ms": state.chunk_ms,
+                    "reason": state.reason,
+                    "rtt_ms": round(state.rtt_ms) if state.rtt_ms is not None else None,
+                    "queue_depth": state.queue_depth,
+                    "segment_ms": round(state.segment_ms),
+                }
+                for participant_id, state in self._participants.items()
+            },
+        }
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,132 @@
+"""
+서비스 컨테이너
+==============
+
+애플리케이션 수명 동안 공유하는 서비스 인스턴스 모음
+
+- main.lifespan에서 한 번 생성/워밍업하고 종료 시 정리
+- REST 엔드포인트는 Depends로 같은 인스턴스(클라이언트, 커넥션 풀, 캐시)를 재사용
+- 동기 SDK 호출용 스레드 풀을 이벤트 루프 기본 executor로 지정
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.audio_archive import get_audio_archive_service
+from app.services.file_transcription import get_file_transcription_service
+from app.services.http_translation_service import close_http_clients
+from app.services.local_speech_service import close_local_speech_service
+from app.services.realtime_service import RealtimeService, get_realtime_service
+from app.services.recognition_config import get_recognition_config_registry
+from app.services.retranscription import get_retranscription_service
+from app.services.speech_channel_pool import close_speech_channel_pool, get_speech_channel_pool
+from app.services.summary_service import SummaryService
+from app.services.translation_service import TranslationService
+from app.services.usage_metering import get_usage_meter
+
+logger = get_logger(__name__)
+
+
+class ServiceContainer:
+    """애플리케이션 범위 서비스 컨테이너"""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.service_executor_workers,
+            thread_name_prefix="unilang-io",
+        )
+        
+        # 실시간 파이프라인과 REST 엔드포인트가 같은 번역 엔진을 공유
+        self.realtime_service: RealtimeService = get_realtime_service()
+        self.translation_service: TranslationService = self.realtime_service.translation_service
+        self.summary_service = SummaryService(translation_service=self.translation_service)
+        self._started = False
+    
+    async def startup(self) -> None:
+        """executor 등록 및 클라이언트 워밍업"""
+        if self._started:
+            return
+        
+        asyncio.get_running_loop().set_default_executor(self.executor)
+        
+        try:
+            await self.translation_service.warm_up()
+        except Exception as e:
+            # 자격 증명이 없는 개발 환경 등에서는 첫 요청 시 다시 생성
+            self.logger.warning("Translation client warm-up failed", error=str(e))
+        
+        get_recognition_config_registry().preload(settings.supported_languages)
+        
+        if settings.speech_channel_pool_enabled:
+            try:
+                await get_speech_channel_pool().start()
+            except Exception as e:
+                # 연결에 실패한 채널은 상태 점검/첫 호출에서 다시 연결
+                self.logger.warning("Speech channel pool warm-up failed", error=str(e))
+        
+        get_usage_meter().start()
+        
+        # 중단된 재전사 작업 재개
+        get_retranscription_service().resume_incomplete()
+        
+        self._started = True
+        self.logger.info(
+            "Service container started",
+            translation_service=type(self.translation_service).__name__,
+            executor_workers=settings.service_executor_workers,
+        )
+    
+    async def shutdown(self) -> None:
+        """진행 중인 파일 전사/재전사 중단, 보관 중인 오디오/남은 사용량 기록, 커넥션 풀 및 executor 정리"""
+        await get_file_transcription_service().close()
+        await get_retranscription_service().close()
+        await get_audio_archive_service().close()
+        await get_usage_meter().stop()
+        await close_http_clients()
+        await close_speech_channel_pool()
+        await close_local_speech_service()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._started = False
+
+
+# 싱글톤 인스턴스
+_container: Optional[ServiceContainer] = None
+
+
+def get_container() -> ServiceContainer:
+    """서비스 컨테이너 인스턴스 반환 (lifespan 이전 접근 시 지연 생성)"""
+    global _container
+    if _container is None:
+        _container = ServiceContainer()
+    return _container
+
+
+async def init_container() -> ServiceContainer:
+    """서비스 컨테이너 생성 및 시작 (애플리케이션 시작 시 호출)"""
+    container = get_container()
+    await container.startup()
+    return container
+
+
+async def close_container() -> None:
+    """서비스 컨테이너 종료 (애플리케이션 종료 시 호출)"""
+    global _container
+    if _container is not None:
+        await _container.shutdown()
+        _container = None
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,506 @@
+"""
+업로드 파일 병렬 청크 전사
+========================
+
+업로드된 영상/음성 파일을 무음 경계 청크로 나눠 병렬로 인식하고 순서대로 합친다.
+
+- ffmpeg 스트리밍 디코딩과 청크 분할을 인식 요청과 동시에 진행
+- 동시 인식 수를 세마포어로 제한 (디코딩도 함께 대기해 메모리 사용량 고정)
+- 완료된 청크는 순서를 맞춰 병합, 겹침 구간의 중복 단어는 단어 타임스탬프와
+  텍스트 겹침 비교로 제거
+- 업로드가 끝나지 않은 파일은 업로드된 구간부터 ffmpeg stdin으로 넘겨 전사를 먼저 시작
+- 청크 PCM + 인식 설정 해시로 인식 결과를 캐시해 같은 녹음을 다시 처리하면 인식 생략
+- 진행률과 확정된 구간을 세션 WebSocket(/ws/media/{session_id})으로 전달
+- 결과는 media_transcript_segments에, 진행 상태는 세션 source_metadata에 기록
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from google.api_core import exceptions as core_exceptions
+from google.cloud.speech_v1.types import RecognitionConfig
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.rate_limiter import PriorityClass, RateLimitExceeded, priority_scope
+from app.services.audio_chunker import AudioChunk, VadChunker, decode_pcm_stream, probe_duration
+from app.services.session_events import get_session_event_hub
+from app.services.speech_service import SpeechService, TranscriptionResult, WordTiming, pack_word_timings
+from app.services.streaming_recognition import merge_overlapping_text
+from app.services.stt_cache import get_stt_result_cache
+from app.services.upload_service import get_upload_service
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+
+# 공백 없이 이어 쓰는 언어 (문자 단위 비교/결합)
+_UNSPACED_LANGUAGES = ("ja", "zh", "th")
+
+# 청크 인식 재시도 대상 오류 (속도 제한 폐기, 일시적 연결 오류)
+_RETRYABLE_ERRORS = (
+    RateLimitExceeded,
+    core_exceptions.ServiceUnavailable,
+    core_exceptions.DeadlineExceeded,
+)
+_MAX_ATTEMPTS = 3
+
+
+def resolve_media_path(file_path: str, user_id: Optional[str]) -> str:
+    """
+    업로드 file_path를 저장 디렉터리 안의 실제 경로로 변환
+    
+    업로드 서비스에 기록된 해당 사용자의 업로드 파일만 허용한다.
+    (저장 디렉터리 안의 아카이브/캐시 등 다른 파일은 거부)
+    
+    Args:
+        file_path: 업로드 URL 생성 시 받은 file_path
+        user_id: 세션 소유자 ID (업로드 소유자와 같아야 함)
+    
+    Raises:
+        ValueError: 저장 디렉터리 밖을 가리키는 경로
+        FileNotFoundError: 파일이 없거나 해당 사용자의 업로드가 아님
+    """
+    upload = get_upload_service().find_by_path(file_path)
+    if upload is None or not user_id or upload["user_id"] != user_id:
+        raise FileNotFoundError(file_path)
+    
+    root = os.path.realpath(settings.media_storage_dir)
+    path = os.path.realpath(os.path.join(root, upload["file_path"]))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError("유효하지 않은 파일 경로입니다.")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(file_path)
+    return path
+
+
+@dataclass
+class FileTranscriptionJob:
+    """세션 하나의 전사 작업 상태"""
+    session_id: str
+    file_path: str
+    language: str
+    status: str = "running"
+    duration_seconds: Optional[float] = None
+    processed_ms: float = 0.0
+    chunks_total: int = 0
+    chunks_done: int = 0
+    chunks_skipped: int = 0  # 발화가 없어 인식을 생략한 청크
+    cache_hits: int = 0  # 인식 결과 캐시로 처리한 청크
+    cache_misses: int = 0
+    segments: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    elapsed_seconds: Optional[float] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    
+    @property
+    def percent(self) -> Optional[float]:
+        if not self.duration_seconds:
+            return None
+        return round(min(100.0, self.processed_ms / 10 / self.duration_seconds), 1)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "status": self.status,
+            "language": self.language,
+            "duration_seconds": self.duration_seconds,
+            "processed_seconds": round(self.processed_ms / 1000, 1),
+            "percent": self.percent,
+            "chunks_total": self.chunks_total,
+            "chunks_done": self.chunks_done,
+            "chunks_skipped": self.chunks_skipped,
+            "cache_hits": self.cache_hits,
+            "cache_hit_ratio": (
+                round(self.cache_hits / (self.cache_hits + self.cache_misses), 3)
+                if self.cache_hits + self.cache_misses
+                else None
+            ),
+            "segments": self.segments,
+            "elapsed_seconds": (
+                self.elapsed_seconds
+                if self.elapsed_seconds is not None
+                else round(time.monotonic() - self.started_at, 1)
+            ),
+            "error": self.error,
+        }
+
+
+class _OrderedMerger:
+    """순서대로 들어오는 청크 결과의 겹침 구간 중복 제거"""
+    
+    def __init__(self, unspaced: bool):
+        self.unspaced = unspaced
+        self.emitted_until_ms = 0.0
+        self.tail = ""
+        self.dropped_words = 0
+    
+    def _join(self, words: List[WordTiming]) -> str:
+        return ("" if self.unspaced else " ").join(word.word for word in words)
+    
+    def _drop_leading_words(self, words: List[WordTiming], removed_tokens: int) -> List[WordTiming]:
+        if not self.unspaced:
+            return words[removed_tokens:]
+        removed_chars = 0
+        for position, word in enumerate(words):
+            if removed_chars >= removed_tokens:
+                return words[position:]
+            removed_chars += len(word.word.replace(" ", ""))
+        return []
+    
+    def merge(self, chunk: AudioChunk, results: List[TranscriptionResult]) -> List[TranscriptionResult]:
+        merged: List[TranscriptionResult] = []
+        overlap_end_ms = chunk.start_ms + chunk.overlap_ms
+        
+        for result in results:
+            words = result.words
+            text = result.text.strip()
+            
+            # 이미 내보낸 구간의 단어는 타임스탬프로 제거
+            if words and words[0].start_ms < self.emitted_until_ms:
+                kept = [word for word in words if (word.start_ms + word.end_ms) / 2 >= self.emitted_until_ms]
+                self.dropped_words += len(words) - len(kept)
+                words = kept
+                text = self._join(words)
+            
+            # 타임스탬프 경계에서 남은 중복은 텍스트 겹침으로 제거
+            if self.tail and text and result.start_ms is not None and result.start_ms < overlap_end_ms + 1000:
+                before = len(text.replace(" ", "")) if self.unspaced else len(text.split())
+                text = merge_overlapping_text(self.tail, text, unspaced=self.unspaced)
+                after = len(text.replace(" ", "")) if self.unspaced else len(text.split())
+                if before != after:
+                    self.dropped_words += before - after
+                    words = self._drop_leading_words(words, before - after)
+            
+            if not text.strip():
+                continue
+            
+            start_ms = words[0].start_ms if words else max(result.start_ms or 0.0, self.emitted_until_ms)
+            end_ms = max(result.end_ms or start_ms, start_ms)
+            merged.append(TranscriptionResult(
+                text=text,
+                language=result.language,
+                confidence=result.confidence,
+                is_final=True,
+                start_ms=start_ms,
+                end_ms=end_ms,
+                words=words,
+            ))
+            self.tail = text
+            self.emitted_until_ms = max(self.emitted_until_ms, end_ms)
+        
+        return merged
+
+
+class FileTranscriptionService:
+    """업로드 파일 전사 작업 관리"""
+    
+    def __init__(self, speech_service: Optional[SpeechService] = None):
+        self.logger = get_logger(__name__)
+        self.speech_service = speech_service or SpeechService()
+        self.events = get_session_event_hub()
+        self._jobs: Dict[str, FileTranscriptionJob] = {}
+        self._completed = 0
+        self._failed = 0
+        self._audio_seconds = 0.0
+        self._wall_seconds = 0.0
+    
+    # ==================== 작업 관리 ====================
+    
+    def get_job(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회 (이 프로세스에서 실행한 작업만)"""
+        job = self._jobs.get(session_id)
+        return job.to_dict() if job else None
+    
+    def is_running(self, session_id: str) -> bool:
+        job = self._jobs.get(session_id)
+        return job is not None and job.status == "running"
+    
+    def start(
+        self,
+        session_id: str,
+        file_path: str,
+        language: str = "ko",
+        user_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        전사 작업 시작 (백그라운드 태스크)
+        
+        Args:
+            session_id: 미디어 세션 ID
+            file_path: 업로드 file_path (저장 디렉터리 기준)
+            language: 인식 언어 (ISO 639-1)
+            user_id: 세션 소유자 ID (이 사용자의 업로드만 전사)
+        
+        Returns:
+            Dict: 작업 상태
+        
+        Raises:
+            ValueError: 잘못된 경로 또는 이미 진행 중인 작업
+            FileNotFoundError: 파일이 없거나 해당 사용자의 업로드가 아님
+        """
+        if self.is_running(session_id):
+            raise ValueError("이미 전사가 진행 중입니다.")
+        
+        path = resolve_media_path(file_path, user_id)
+        job = FileTranscriptionJob(session_id=session_id, file_path=file_path, language=language)
+        self._jobs[session_id] = job
+        self.events.clear(session_id)
+        job.task = asyncio.create_task(self._run(job, path))
+        return job.to_dict()
+    
+    async def close(self) -> None:
+        """진행 중인 작업 취소 (애플리케이션 종료 시 호출)"""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # ==================== 전사 ====================
+    
+    async def _run(self, job: FileTranscriptionJob, path: str) -> None:
+        with priority_scope(PriorityClass.BATCH):
+            try:
+                job.duration_seconds = await probe_duration(path)
+                self._publish(job, "transcription_started", job.to_dict(), retain=True)
+                await self._update_session(job)
+                
+                # 업로드 중인 파일은 확정된 구간부터 순서대로 읽어 디코딩
+                upload = get_upload_service().find_by_path(job.file_path)
+                source = None
+                if upload is not None and not upload["completed"]:
+                    source = get_upload_service().follow(upload["upload_id"])
+                
+                segments = await self.transcribe(job, path, source=source)
+                
+                await get_db().replace_media_transcript_segments(job.session_id, segments)
+                job.status = "completed"
+                self._completed += 1
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "cancelled"
+                self._failed += 1
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self._failed += 1
+                self.logger.error("File transcription failed", session_id=job.session_id, error=str(e))
+            finally:
+                job.elapsed_seconds = round(time.monotonic() - job.started_at, 1)
+                if job.status == "completed":
+                    audio_seconds = job.duration_seconds or job.processed_ms / 1000
+                    self._audio_seconds += audio_seconds
+                    self._wall_seconds += job.elapsed_seconds
+                    self.logger.info(
+                        "File transcription completed",
+                        session_id=job.session_id,
+                        audio_seconds=round(audio_seconds, 1),
+                        elapsed_seconds=job.elapsed_seconds,
+                        chunks=job.chunks_total,
+                        cache_hits=job.cache_hits,
+                        segments=job.segments,
+                    )
+                self._publish(job, f"transcription_{job.status}", job.to_dict(), retain=True)
+                try:
+                    await self._update_session(job)
+                except Exception as e:
+                    self.logger.warning("Failed to update media session", session_id=job.session_id, error=str(e))
+    
+    async def transcribe(
+        self,
+        job: FileTranscriptionJob,
+        path: str,
+        source: Optional[AsyncIterator[bytes]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        파일 전사 (디코딩/분할 -> 병렬 인식 -> 순서대로 병합)
+        
+        Args:
+            job: 작업 상태
+            path: 미디어 파일 경로
+            source: 파일 대신 디코딩할 원본 스트림 (업로드 중인 파일)
+        
+        Returns:
+            List[Dict]: media_transcript_segments 행 목록
+        """
+        merger = _OrderedMerger(unspaced=job.language in _UNSPACED_LANGUAGES)
+        config_fingerprint = (
+            RecognitionConfig.serialize(self.speech_service.segment_config(job.language, SAMPLE_RATE))
+            if settings.stt_cache_enabled
+            else None
+        )
+        chunker = VadChunker(sample_rate=SAMPLE_RATE)
+        semaphore = asyncio.Semaphore(settings.file_transcription_concurrency)
+        tasks: set = set()
+        finished: Dict[int, tuple] = {}
+        segments: List[Dict[str, Any]] = []
+        next_index = 0
+        
+        async def recognize(chunk: AudioChunk) -> tuple:
+            try:
+                results = await self._recognize_chunk(job, chunk, config_fingerprint) if chunk.has_speech else []
+            finally:
+                semaphore.release()
+            chunk.pcm = b""  # 병합 대기 중 메모리 해제
+            return chunk, results
+        
+        def collect() -> None:
+            nonlocal next_index
+            for task in [task for task in tasks if task.done()]:
+                tasks.discard(task)
+                chunk, results = task.result()
+                finished[chunk.index] = (chunk, results)
+            
+            # 앞 청크가 끝난 만큼만 순서대로 병합
+            while next_index in finished:
+                chunk, results = finished.pop(next_index)
+                for result in merger.merge(chunk, results):
+                    segment = self._to_segment(job, len(segments), result)
+                    segments.append(segment)
+                    self._publish(job, "transcript_segment", segment)
+                job.processed_ms = chunk.end_ms
+                job.chunks_done += 1
+                job.chunks_skipped += 0 if chunk.has_speech else 1
+                job.segments = len(segments)
+                next_index += 1
+                self._publish(job, "transcription_progress", job.to_dict(), retain=True)
+        
+        async def submit(chunk: AudioChunk) -> None:
+            job.chunks_total += 1
+            await semaphore.acquire()
+            tasks.add(asyncio.create_task(recognize(chunk)))
+            collect()
+        
+        try:
+            async for pcm in decode_pcm_stream(path, sample_rate=SAMPLE_RATE, source=source):
+                for chunk in chunker.feed(pcm):
+                    await submit(chunk)
+            for chunk in chunker.flush():
+                await submit(chunk)
+            
+            while tasks:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                collect()
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        job.processed_ms = chunker.total_frames * chunker.frame_ms
+        if job.duration_seconds is None:
+            job.duration_seconds = round(job.processed_ms / 1000, 1)
+        self.logger.debug("Overlap words dropped", session_id=job.session_id, words=merger.dropped_words)
+        return segments
+    
+    async def _recognize_chunk(
+        self,
+        job: FileTranscriptionJob,
+        chunk: AudioChunk,
+        config_fingerprint: Optional[bytes] = None,
+    ) -> List[TranscriptionResult]:
+        """청크 하나 인식 (같은 PCM/설정의 캐시 결과가 있으면 생략, 일시적 오류는 재시도)"""
+        cache = get_stt_result_cache() if config_fingerprint is not None else None
+        if cache is not None:
+            key = cache.make_key(chunk.pcm, config_fingerprint)
+            cached = await cache.get(key, offset_ms=chunk.start_ms)
+            if cached is not None:
+                job.cache_hits += 1
+                return cached
+            job.cache_misses += 1
+        
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            try:
+                results = await self.speech_service.recognize_segments(
+                    chunk.pcm,
+                    language_code=job.language,
+                    sample_rate=SAMPLE_RATE,
+                    offset_ms=chunk.start_ms,
+                )
+                break
+            except _RETRYABLE_ERRORS as e:
+                if attempt == _MAX_ATTEMPTS:
+                    raise
+                self.logger.warning("Chunk recognition retry", chunk=chunk.index, attempt=attempt, error=str(e))
+                await asyncio.sleep(attempt)
+        
+        if cache is not None:
+            await cache.put(key, job.language, results, offset_ms=chunk.start_ms)
+        return results
+    
+    # ==================== 결과 기록/알림 ====================
+    
+    @staticmethod
+    def _to_segment(job: FileTranscriptionJob, index: int, result: TranscriptionResult) -> Dict[str, Any]:
+        return {
+            "session_id": job.session_id,
+            "segment_index": index,
+            "start_ms": int(result.start_ms or 0),
+            "end_ms": int(result.end_ms or 0),
+            "text": result.text,
+            "language": result.language,
+            "confidence": result.confidence,
+            "words": pack_word_timings(result.words, base_ms=int(result.start_ms or 0)),
+        }
+    
+    def _publish(self, job: FileTranscriptionJob, event_type: str, data: Dict[str, Any], retain: bool = False) -> None:
+        self.events.publish(job.session_id, {"type": event_type, "data": data}, retain=retain)
+    
+    async def _update_session(self, job: FileTranscriptionJob) -> None:
+        """세션 source_metadata에 전사 상태 기록 (완료 시 stt_seconds 포함)"""
+        from app.services.media_source_service import get_media_source_service
+        
+        media_service = get_media_source_service()
+        session = await media_service.get_session(job.session_id) or {}
+        metadata = dict(session.get("source_metadata") or {})
+        metadata["transcription"] = {
+            "status": job.status,
+            "file_path": job.file_path,
+            "language": job.language,
+            "duration_seconds": job.duration_seconds,
+            "segments": job.segments,
+            "elapsed_seconds": job.elapsed_seconds,
+            "error": job.error,
+        }
+        update_data: Dict[str, Any] = {"source_metadata": metadata}
+        if job.status == "completed" and job.duration_seconds:
+            update_data["stt_seconds"] = int(round(job.duration_seconds))
+        await media_service.update_session(job.session_id, update_data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """작업 수와 처리 속도 (오디오 길이 / 소요 시간)"""
+        return {
+            "running": sum(1 for job in self._jobs.values() if job.status == "running"),
+            "completed": self._completed,
+            "failed": self._failed,
+            "audio_seconds": round(self._audio_seconds, 1),
+            "speedup": round(self._audio_seconds / self._wall_seconds, 1) if self._wall_seconds else None,
+        }
+
+
+# 싱글톤 인스턴스
+_file_transcription_service: Optional[FileTranscriptionService] = None
+
+
+def get_file_transcription_service() -> FileTranscriptionService:
+    """파일 전사 서비스 인스턴스 반환"""
+    global _file_transcription_service
+    if _file_transcription_service is None:
+        _file_transcription_service = FileTranscriptionService()
+    return _file_transcription_service
+
+
+
+
+
+
+
+
+
+
+
+
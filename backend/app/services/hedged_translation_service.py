@@ -0,0 +1,311 @@
+"""
+헤지 번역 서비스
+===============
+
+여러 번역 엔진(백엔드/리전)에 대해 지연 시간 기반 라우팅과 헤지 요청을 수행한다.
+
+- (엔진, 원본 언어, 대상 언어)별 최근 지연 시간 창으로 가장 빠른 엔진을 1차로 선택
+- 1차 엔진이 최근 지연 시간의 백분위(기본 p95) 안에 응답하지 않으면 대체 엔진에 동일 요청
+- 먼저 도착한 결과를 사용하고 나머지 요청은 취소
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.translation_service import TranslationService
+
+logger = get_logger(__name__)
+
+
+class LatencyWindow:
+    """최근 지연 시간(초) 슬라이딩 창"""
+    
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+    
+    def __len__(self) -> int:
+        return len(self._samples)
+    
+    def record(self, latency: float) -> None:
+        self._samples.append(latency)
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """백분위 지연 시간 (표본이 없으면 None)"""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+
+class HedgeTracker:
+    """엔진/언어쌍별 지연 시간 창과 헤지 통계 (서비스 인스턴스 간 공유)"""
+    
+    def __init__(self, window_size: Optional[int] = None):
+        self.window_size = window_size or settings.translation_hedge_window_size
+        self._windows: Dict[Tuple[str, str, str], LatencyWindow] = {}
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedge_losses = 0  # 헤지에서 져 취소된 요청 (지연 시간 미기록)
+        self.failovers = 0
+    
+    def window(self, engine: str, source_language: str, target_language: str) -> LatencyWindow:
+        key = (engine, source_language, target_language)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = LatencyWindow(self.window_size)
+        return window
+    
+    def get_stats(self) -> Dict:
+        """헤지 비율, 대체 엔진 승리 횟수, 엔진/언어쌍별 지연 시간"""
+        windows = {}
+        for (engine, source, target), window in self._windows.items():
+            windows[f"{engine}:{source}-{target}"] = {
+                "samples": len(window),
+                "p50_ms": round((window.percentile(50) or 0.0) * 1000, 1),
+                "p95_ms": round((window.percentile(95) or 0.0) * 1000, 1),
+            }
+        
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "hedge_losses": self.hedge_losses,
+            "failovers": self.failovers,
+            "latency": windows,
+        }
+
+
+class HedgedTranslationService(TranslationService):
+    """지연 시간 기반 라우팅 + 헤지 요청 번역 서비스"""
+    
+    def __init__(
+        self,
+        engines: List[Tuple[str, TranslationService]],
+        tracker: Optional[HedgeTracker] = None,
+        hedge_percentile: Optional[float] = None,
+        min_samples: int = 20,
+    ):
+        """
+        Args:
+            engines: (엔진 이름, 번역 서비스) 목록 (앞쪽이 기본 우선순위)
+            tracker: 지연 시간/통계 공유 객체 (None이면 전역 인스턴스)
+            hedge_percentile: 헤지 요청을 보낼 1차 엔진 지연 시간 백분위
+            min_samples: 지연 시간 창을 신뢰하기 위한 최소 표본 수
+        """
+        super().__init__()
+        if not engines:
+            raise ValueError("At least one translation engine is required")
+        
+        self.engines = engines
+        self.tracker = tracker or get_hedge_tracker()
+        self.hedge_percentile = hedge_percentile or settings.translation_hedge_percentile
+        self.min_samples = min_samples
+    
+    async def warm_up(self) -> None:
+        """모든 엔진 클라이언트 워밍업"""
+        await asyncio.gather(*(engine.warm_up() for _, engine in self.engines))
+    
+    def _route(self, source_language: str, target_language: str) -> List[Tuple[str, TranslationService]]:
+        """
+        최근 p50 지연 시간이 짧은 엔진 순으로 정렬
+        
+        표본이 부족한 엔진이 하나라도 있으면 설정 순서를 유지한다.
+        (대체 엔진은 헤지/장애 조치 요청으로만 표본을 모음)
+        """
+        windows = [
+            self.tracker.window(name, source_language, target_language)
+            for name, _ in self.engines
+        ]
+        if any(len(window) < self.min_samples for window in windows):
+            return list(self.engines)
+        
+        order = sorted(range(len(self.engines)), key=lambda index: (windows[index].percentile(50), index))
+        return [self.engines[index] for index in order]
+    
+    def _hedge_delay(self, engine: str, source_language: str, target_language: str) -> float:
+        """헤지 요청까지 대기 시간 (초)"""
+        window = self.tracker.window(engine, source_language, target_language)
+        delay = None
+        if len(window) >= self.min_samples:
+            delay = window.percentile(self.hedge_percentile)
+        if delay is None:
+            delay = settings.translation_hedge_default_delay_ms / 1000
+        return max(delay, settings.translation_hedge_min_delay_ms / 1000)
+    
+    async def _timed(
+        self,
+        name: str,
+        engine: TranslationService,
+        texts: List[str],
+        source_language: str,
+        target_language: str,
+        format_: str,
+    ) -> List[str]:
+        """엔진 호출 후 성공 시 지연 시간 기록"""
+        started = time.perf_counter()
+        try:
+            result = await engine.translate_texts(texts, source_language, target_language, format_)
+        except asyncio.CancelledError:
+            # 헤지에서 져 취소된 요청의 경과 시간은 하한일 뿐이라 지연 시간 창에 넣지 않음
+            self.tracker.hedge_losses += 1
+            raise
+        self.tracker.window(name, source_language, target_language).record(
+            time.perf_counter() - started
+        )
+        return result
+    
+    async def translate(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+    ) -> str:
+        """
+        텍스트 번역
+        
+        Args:
+            text: 원본 텍스트
+            source_language: 원본 언어 코드 (ISO 639-1)
+            target_language: 대상 언어 코드 (ISO 639-1)
+        
+        Returns:
+            str: 번역된 텍스트
+        """
+        if source_language == target_language or not text.strip():
+            return text
+        
+        translated = await self.translate_texts([text], source_language, target_language)
+        return translated[0]
+    
+    async def translate_texts(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str,
+        format_: str = "text",
+    ) -> List[str]:
+        """
+        여러 텍스트 번역 (헤지 요청 포함)
+        
+        Args:
+            texts: 원본 텍스트 목록
+            source_language: 원본 언어 코드
+            target_language: 대상 언어 코드
+            format_: 입력 형식 (text | html)
+        
+        Returns:
+            List[str]: 입력 순서와 동일한 번역 텍스트 목록
+        """
+        if not texts:
+            return []
+        
+        if source_language == target_language:
+            return list(texts)
+        
+        self.tracker.requests += 1
+        route = self._route(source_language, target_language)
+        primary_name, primary = route[0]
+        
+        primary_task = asyncio.ensure_future(
+            self._timed(primary_name, primary, texts, source_language, target_language, format_)
+        )
+        if len(route) == 1:
+            return await primary_task
+        
+        delay = self._hedge_delay(primary_name, source_language, target_language)
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done and primary_task.exception() is None:
+            return primary_task.result()
+        
+        alternate_name, alternate = route[1]
+        if done:
+            self.tracker.failovers += 1
+            self.logger.warning(
+                "Primary translation engine failed, failing over",
+                primary=primary_name,
+                alternate=alternate_name,
+                error=str(primary_task.exception()),
+            )
+            return await self._timed(alternate_name, alternate, texts, source_language, target_language, format_)
+        
+        self.tracker.hedged += 1
+        hedge_task = asyncio.ensure_future(
+            self._timed(alternate_name, alternate, texts, source_language, target_language, format_)
+        )
+        pending = {primary_task, hedge_task}
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge_task:
+                            self.tracker.hedge_wins += 1
+                        return task.result()
+            
+            # 둘 다 실패하면 1차 엔진 오류 전달
+            raise primary_task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _detect_language_remote(self, text: str) -> Dict[str, any]:
+        """1차 엔진으로 언어 감지"""
+        return await self.engines[0][1]._detect_language_remote(text)
+
+
+def create_hedged_translation_service() -> HedgedTranslationService:
+    """
+    설정 기반 헤지 번역 서비스 생성
+    
+    기본 백엔드를 1차 엔진으로, translation_hedge_endpoints의 각 리전 엔드포인트를
+    대체 엔진으로 사용한다. 대체 엔드포인트가 없으면 다른 백엔드(sdk/http)를 대체 엔진으로 쓴다.
+    """
+    from app.services.http_translation_service import HttpTranslationService
+    
+    if settings.translation_backend == "http":
+        engines: List[Tuple[str, TranslationService]] = [("http", HttpTranslationService())]
+    else:
+        engines = [("sdk", TranslationService())]
+    
+    for endpoint in settings.translation_hedge_endpoints:
+        engines.append((endpoint, HttpTranslationService(base_url=endpoint)))
+    
+    if len(engines) == 1:
+        if settings.translation_backend == "http":
+            engines.append(("sdk", TranslationService()))
+        else:
+            engines.append(("http", HttpTranslationService()))
+    
+    return HedgedTranslationService(engines)
+
+
+# 싱글톤 인스턴스
+_hedge_tracker: Optional[HedgeTracker] = None
+
+
+def get_hedge_tracker() -> HedgeTracker:
+    """헤지 통계 인스턴스 반환"""
+    global _hedge_tracker
+    if _hedge_tracker is None:
+        _hedge_tracker = HedgeTracker()
+    return _hedge_tracker
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,251 @@
+"""
+HTTP 번역 서비스
+===============
+
+httpx 기반 비동기 Google Cloud Translation (v2 REST) 클라이언트
+
+- HTTP/2 + 공유 커넥션 풀 (keep-alive)
+- 큰 요청 본문 gzip 압축
+- 스레드 풀을 거치지 않는 순수 비동기 호출
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.rate_limiter import get_rate_limiter
+from app.services.translation_service import TranslationService
+from app.services.usage_metering import get_usage_meter
+
+logger = get_logger(__name__)
+
+TRANSLATE_PATH = "/language/translate/v2"
+DETECT_PATH = "/language/translate/v2/detect"
+TRANSLATE_SCOPE = "https://www.googleapis.com/auth/cloud-translation"
+
+# 프로세스 전역 공유 클라이언트 (base_url -> AsyncClient)
+_http_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """
+    엔드포인트별 공유 AsyncClient 반환
+    
+    서비스 인스턴스가 여러 개여도 같은 커넥션 풀을 재사용한다.
+    """
+    client = _http_clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.translation_http_max_connections,
+                max_keepalive_connections=settings.translation_http_max_keepalive,
+                keepalive_expiry=settings.translation_http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.translation_http_timeout),
+            headers={"Accept-Encoding": "gzip"},
+        )
+        _http_clients[base_url] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """공유 AsyncClient 모두 종료 (애플리케이션 종료 시 호출)"""
+    clients = list(_http_clients.values())
+    _http_clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+class HttpTranslationService(TranslationService):
+    """httpx 비동기 Google Cloud Translation 서비스"""
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ):
+        super().__init__()
+        self.base_url = (base_url or settings.google_translate_endpoint).rstrip("/")
+        self.api_key = api_key if api_key is not None else settings.google_translate_api_key
+        self._credentials = None
+        self._credentials_lock = asyncio.Lock()
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """공유 HTTP 클라이언트"""
+        return get_http_client(self.base_url)
+    
+    async def warm_up(self) -> None:
+        """공유 클라이언트 생성 및 인증 토큰 미리 발급"""
+        get_http_client(self.base_url)
+        await self._auth_headers()
+    
+    async def _auth_headers(self) -> Dict[str, str]:
+        """인증 헤더 (API 키가 없으면 서비스 계정 토큰 사용)"""
+        if self.api_key:
+            return {}
+        
+        async with self._credentials_lock:
+            if self._credentials is None:
+                import google.auth
+                
+                self._credentials, _ = google.auth.default(scopes=[TRANSLATE_SCOPE])
+            
+            if not self._credentials.valid:
+                from google.auth.transport.requests import Request
+                
+                # 토큰 갱신은 동기 호출이므로 만료 시에만 스레드로 위임
+                loop = asyncio.get_event_loop()
+                await loop.run_in_executor(None, self._credentials.refresh, Request())
+        
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+    
+    async def _post(self, path: str, payload: Dict) -> Dict:
+        """JSON POST 요청 (큰 본문은 gzip 압축)"""
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        headers.update(await self._auth_headers())
+        
+        if len(body) >= settings.translation_http_compress_min_bytes:
+            body = gzip.compress(body, compresslevel=5)
+            headers["Content-Encoding"] = "gzip"
+        
+        params = {"key": self.api_key} if self.api_key else None
+        
+        async def send() -> httpx.Response:
+            response = await self.http.post(path, content=body, headers=headers, params=params)
+            response.raise_for_status()
+            return response
+        
+        response = await get_rate_limiter().call("translate", send)
+        return response.json()
+    
+    async def translate(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+    ) -> str:
+        """
+        텍스트 번역
+        
+        Args:
+            text: 원본 텍스트
+            source_language: 원본 언어 코드 (ISO 639-1)
+            target_language: 대상 언어 코드 (ISO 639-1)
+        
+        Returns:
+            str: 번역된 텍스트
+        """
+        if source_language == target_language:
+            return text
+        
+        if not text.strip():
+            return text
+        
+        translated = await self.translate_texts([text], source_language, target_language)
+        return translated[0]
+    
+    async def translate_texts(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str,
+        format_: str = "text",
+    ) -> List[str]:
+        """
+        여러 텍스트를 한 번의 HTTP 요청으로 번역
+        
+        Args:
+            texts: 원본 텍스트 목록
+            source_language: 원본 언어 코드
+            target_language: 대상 언어 코드
+            format_: 입력 형식 (text | html)
+        
+        Returns:
+            List[str]: 입력 순서와 동일한 번역 텍스트 목록
+        """
+        if not texts:
+            return []
+        
+        if source_language == target_language:
+            return list(texts)
+        
+        started = time.perf_counter()
+        
+        try:
+            data = await self._post(
+                TRANSLATE_PATH,
+                {
+                    "q": list(texts),
+                    "source": source_language,
+                    "target": target_language,
+                    "format": format_,
+                },
+            )
+            
+            translations = data.get("data", {}).get("translations", [])
+            if len(translations) != len(texts):
+                raise ValueError(
+                    f"Expected {len(texts)} translations, got {len(translations)}"
+                )
+            get_usage_meter().record_translation(sum(len(text) for text in texts), target_language)
+            
+            self.logger.debug(
+                "HTTP translation completed",
+                source=source_language,
+                target=target_language,
+                count=len(texts),
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+            
+            return [
+                item.get("translatedText", text)
+                for text, item in zip(texts, translations)
+            ]
+        
+        except Exception as e:
+            self.logger.error(
+                "HTTP translation failed",
+                error=str(e),
+                source=source_language,
+                target=target_language,
+                count=len(texts),
+            )
+            raise
+    
+    async def _detect_language_remote(self, text: str) -> Dict[str, any]:
+        """Translation API(REST)로 언어 감지"""
+        try:
+            data = await self._post(DETECT_PATH, {"q": [text]})
+            detections = data.get("data", {}).get("detections", [[]])
+            best = detections[0][0] if detections and detections[0] else {}
+            
+            return {
+                "language": best.get("language", "en"),
+                "confidence": best.get("confidence", 0.0),
+            }
+        
+        except Exception as e:
+            self.logger.error("Language detection failed", error=str(e))
+            return {"language": "en", "confidence": 0.0}
+
+
+
+
+
+
+
+
+
+
+
+
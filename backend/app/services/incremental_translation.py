@@ -0,0 +1,236 @@
+"""
+증분 번역 서비스
+===============
+
+중간(interim) STT 결과를 문장 단위로 나누어 새로 확정된 문장만 번역한다.
+
+- 마지막 문장을 제외한 문장은 확정(stable)으로 보고 번역 후 캐시
+- 캐시 키: (회의 ID, 스트림 ID) + 문장 위치
+- 클라이언트에는 새로 확정된 문장의 번역(delta)만 전송
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.services.translation_service import TranslationService
+
+logger = get_logger(__name__)
+
+# 문장 경계: 공백/끝이 뒤따르는 마침표류, 또는 전각 종결 부호
+_SENTENCE_RE = re.compile(r".+?(?:[.!?…]+(?=\s|$)|[。！？]+|$)", re.S)
+
+
+def split_sentences(text: str) -> List[str]:
+    """텍스트를 문장 목록으로 분리"""
+    return [
+        sentence
+        for sentence in (m.group().strip() for m in _SENTENCE_RE.finditer(text))
+        if sentence
+    ]
+
+
+@dataclass
+class _Segment:
+    """확정된 문장과 언어별 번역"""
+    original: str
+    translations: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _StreamState:
+    """화자 스트림의 현재 발화 상태"""
+    utterance_index: int = 0
+    segments: List[_Segment] = field(default_factory=list)
+
+
+@dataclass
+class TranslationDelta:
+    """클라이언트로 보낼 증분 번역 결과"""
+    utterance_index: int
+    segments: List[Dict]  # [{"index", "original_text", "translations"}]
+    pending_text: str
+    is_final: bool
+    full_translations: Optional[Dict[str, str]] = None  # 최종 결과일 때만
+
+
+class IncrementalTranslator:
+    """문장 단위 증분 번역기"""
+    
+    def __init__(self, translation_service: TranslationService):
+        self.translation_service = translation_service
+        self.logger = get_logger(__name__)
+        self._streams: Dict[Tuple[str, str], _StreamState] = {}
+        
+        self._updates = 0
+        self._finalized = 0
+        self._api_calls = 0
+        self._translated_chars = 0
+        self._baseline_api_calls = 0
+        self._baseline_chars = 0
+    
+    async def process(
+        self,
+        meeting_id: str,
+        stream_id: str,
+        text: str,
+        source_language: str,
+        target_languages: List[str],
+        is_final: bool,
+    ) -> TranslationDelta:
+        """
+        중간/최종 전사 결과 처리
+        
+        Args:
+            meeting_id: 회의 ID
+            stream_id: 스트림 ID (보통 참여자 ID)
+            text: 현재까지의 발화 전체 텍스트
+            source_language: 원본 언어
+            target_languages: 대상 언어 목록
+            is_final: 최종 결과 여부
+        
+        Returns:
+            TranslationDelta: 새로 확정된 문장 번역
+        """
+        state = self._streams.setdefault((meeting_id, stream_id), _StreamState())
+        languages = [lang for lang in target_languages if lang != source_language]
+        
+        sentences = split_sentences(text)
+        stable = sentences if is_final else sentences[:-1]
+        pending_text = "" if is_final else (sentences[-1] if sentences else "")
+        
+        # 전체 재번역 시의 비용 (비교 지표)
+        self._updates += 1
+        if text.strip():
+            self._baseline_api_calls += len(languages)
+            self._baseline_chars += len(text) * len(languages)
+        
+        # 확정 문장이 STT 수정으로 바뀌었으면 해당 위치부터 다시 번역
+        changed: List[int] = []
+        for index, sentence in enumerate(stable):
+            if index < len(state.segments):
+                if state.segments[index].original == sentence:
+                    continue
+                state.segments[index] = _Segment(original=sentence)
+            else:
+                state.segments.append(_Segment(original=sentence))
+            changed.append(index)
+        del state.segments[len(stable):]
+        
+        # 새 언어가 추가되어 번역이 빠진 문장도 번역 대상
+        work: Dict[str, List[int]] = {}
+        for lang in languages:
+            indexes = [
+                index for index, segment in enumerate(state.segments)
+                if lang not in segment.translations
+            ]
+            if indexes:
+                work[lang] = indexes
+        
+        if work:
+            await self._translate_segments(state, work, source_language)
+        
+        delta_indexes = sorted(set(changed) | {i for indexes in work.values() for i in indexes})
+        delta = TranslationDelta(
+            utterance_index=state.utterance_index,
+            segments=[
+                {
+                    "index": index,
+                    "original_text": state.segments[index].original,
+                    "translations": {
+                        source_language: state.segments[index].original,
+                        **state.segments[index].translations,
+                    },
+                }
+                for index in delta_indexes
+            ],
+            pending_text=pending_text,
+            is_final=is_final,
+        )
+        
+        if is_final:
+            delta.full_translations = {source_language: " ".join(sentences)}
+            for lang in languages:
+                delta.full_translations[lang] = " ".join(
+                    segment.translations.get(lang, segment.original)
+                    for segment in state.segments
+                )
+            
+            self._finalized += 1
+            state.utterance_index += 1
+            state.segments = []
+        
+        return delta
+    
+    async def _translate_segments(
+        self,
+        state: _StreamState,
+        work: Dict[str, List[int]],
+        source_language: str,
+    ) -> None:
+        """언어별로 누락 문장을 한 번의 호출로 번역"""
+        langs = list(work.keys())
+        results = await asyncio.gather(
+            *(
+                self.translation_service.translate_texts(
+                    [state.segments[i].original for i in work[lang]],
+                    source_language,
+                    lang,
+                )
+                for lang in langs
+            ),
+            return_exceptions=True,
+        )
+        
+        for lang, result in zip(langs, results):
+            indexes = work[lang]
+            self._api_calls += 1
+            self._translated_chars += sum(len(state.segments[i].original) for i in indexes)
+            
+            if isinstance(result, Exception):
+                self.logger.warning(
+                    "Incremental translation failed",
+                    target=lang,
+                    error=str(result),
+                )
+                continue
+            
+            for index, translated_text in zip(indexes, result):
+                state.segments[index].translations[lang] = translated_text
+    
+    def reset_stream(self, meeting_id: str, stream_id: str) -> None:
+        """스트림 상태 제거"""
+        self._streams.pop((meeting_id, stream_id), None)
+    
+    def clear_meeting(self, meeting_id: str) -> None:
+        """회의의 모든 스트림 상태 제거"""
+        for key in [key for key in self._streams if key[0] == meeting_id]:
+            del self._streams[key]
+    
+    def get_stats(self) -> Dict[str, float]:
+        """최종 발화당 API 호출/번역 문자 수 (전체 재번역 대비)"""
+        finalized = self._finalized or 1
+        return {
+            "updates": self._updates,
+            "finalized_utterances": self._finalized,
+            "api_calls": self._api_calls,
+            "translated_characters": self._translated_chars,
+            "api_calls_per_utterance": round(self._api_calls / finalized, 2),
+            "characters_per_utterance": round(self._translated_chars / finalized, 1),
+            "baseline_api_calls_per_utterance": round(self._baseline_api_calls / finalized, 2),
+            "baseline_characters_per_utterance": round(self._baseline_chars / finalized, 1),
+        }
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,233 @@
+"""
+오디오 프레임 지터 버퍼
+====================
+
+WebSocket으로 들어오는 참여자 오디오 프레임을 시퀀스 번호 순으로 재조립한다.
+(재연결 후 다시 보낸 프레임이나 빠진 프레임이 PCM 스트림을 깨뜨리지 않도록)
+
+- 참여자별 버퍼: 시퀀스 번호로 정렬하고 중복 프레임은 버림
+- 다음 순번 프레임이 있으면 바로 내보내고, 빈 순번 뒤로 depth 개 프레임이 쌓이거나
+  max_wait_ms가 지날 때까지 기다림
+- 끝내 오지 않은 프레임은 손실로 보고 캡처 시각 간격만큼 무음으로 채움 (max_gap_ms 상한)
+- 빈 순번을 넘긴 뒤에 도착한 프레임은 늦은 프레임으로 집계하고 버림
+- 새 스트림 판단 후 초기화: 스트림 ID가 바뀌거나, 순번은 되돌아갔는데 캡처 시각은 앞으로 가거나,
+  순번이 크게 되돌아간 경우 (다시 보낸 프레임은 캡처 시각이 그대로라 중복으로 처리)
+"""
+
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Deque, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 실시간 오디오 형식 (16kHz LINEAR16 mono)
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+
+@dataclass
+class AudioFrame:
+    """시퀀스 번호가 있는 오디오 프레임"""
+    sequence: int
+    data: bytes
+    timestamp_ms: Optional[int] = None  # 클라이언트 캡처 시각
+    stream_id: Optional[str] = None  # 클라이언트 스트림 ID (재연결 시 새 ID)
+    
+    @property
+    def duration_ms(self) -> float:
+        return len(self.data) // SAMPLE_WIDTH * 1000 / SAMPLE_RATE
+
+
+@dataclass
+class JitterStats:
+    """지터 버퍼 집계"""
+    received: int = 0
+    released: int = 0
+    duplicates: int = 0
+    reordered: int = 0  # 더 큰 순번보다 늦게 왔지만 제때 도착한 프레임
+    late: int = 0  # 손실 처리 후 도착해 버린 프레임
+    lost: int = 0
+    silence_ms: float = 0.0  # 손실 구간에 채운 무음 길이
+    resets: int = 0
+    
+    def merge(self, other: "JitterStats") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+    
+    def to_dict(self) -> Dict:
+        stats = asdict(self)
+        stats["silence_ms"] = round(self.silence_ms)
+        expected = self.released + self.lost
+        stats["loss_rate"] = round(self.lost / expected, 4) if expected else 0.0
+        return stats
+
+
+class JitterBuffer:
+    """참여자 오디오 프레임 재조립 버퍼"""
+    
+    def __init__(
+        self,
+        depth: Optional[int] = None,
+        max_gap_ms: Optional[int] = None,
+        reset_frames: Optional[int] = None,
+        max_wait_ms: Optional[int] = None,
+    ):
+        self.depth = depth if depth is not None else settings.jitter_buffer_depth
+        self.max_gap_ms = max_gap_ms if max_gap_ms is not None else settings.jitter_buffer_max_gap_ms
+        self.reset_frames = reset_frames or settings.jitter_buffer_reset_frames
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else settings.jitter_buffer_max_wait_ms
+        self.stats = JitterStats()
+        self._restart()
+    
+    def _restart(self) -> None:
+        self._pending: Dict[int, AudioFrame] = {}
+        self._next: Optional[int] = None  # 다음에 내보낼 순번
+        self._highest: Optional[int] = None
+        self._last: Optional[AudioFrame] = None  # 마지막으로 내보낸 프레임 (무음 길이 계산)
+        self._stream: Optional[str] = None
+        self._latest_timestamp: Optional[int] = None  # 받은 프레임 중 가장 늦은 캡처 시각
+        self._gap_since: Optional[float] = None  # 빈 순번을 기다리기 시작한 시각 (monotonic)
+        # 최근 받은 순번 (중복과 늦은 프레임 구분, reset_frames 개 유지)
+        self._seen: Set[int] = set()
+        self._seen_order: Deque[int] = deque()
+    
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+    
+    def gap_wait_ms(self) -> Optional[float]:
+        """빈 순번을 기다리는 중이면 손실 처리까지 남은 시간 (아니면 None)"""
+        if self._gap_since is None or not self._pending:
+            return None
+        return max(0.0, self.max_wait_ms - (time.monotonic() - self._gap_since) * 1000)
+    
+    def push(self, frame: AudioFrame) -> List[bytes]:
+        """
+        프레임 추가
+        
+        Returns:
+            List[bytes]: 순서대로 내보낼 수 있게 된 PCM (손실 구간의 무음 포함, 없으면 빈 목록)
+        """
+        self.stats.received += 1
+        released: List[bytes] = []
+        sequence = frame.sequence
+        
+        if self._next is not None and self._is_new_stream(frame):
+            # 새 스트림: 남은 프레임을 내보내고 처음부터
+            released = self.flush()
+            self._restart()
+            self.stats.resets += 1
+        if self._next is None:
+            self._next = sequence
+            self._stream = frame.stream_id
+        if frame.timestamp_ms is not None and (
+            self._latest_timestamp is None or frame.timestamp_ms > self._latest_timestamp
+        ):
+            self._latest_timestamp = frame.timestamp_ms
+        
+        if sequence in self._seen:
+            self.stats.duplicates += 1
+            return released
+        self._remember(sequence)
+        
+        if sequence < self._next:
+            self.stats.late += 1
+            return released
+        
+        if self._highest is not None and sequence < self._highest:
+            self.stats.reordered += 1
+        else:
+            self._highest = sequence
+        self._pending[sequence] = frame
+        
+        released.extend(self._drain(force=False))
+        return released
+    
+    def poll(self) -> List[bytes]:
+        """새 프레임 없이 대기 시간이 지난 빈 순번을 손실로 처리하고 내보냄"""
+        return self._drain(force=False)
+    
+    def flush(self) -> List[bytes]:
+        """빈 순번을 기다리지 않고 남은 프레임을 모두 내보냄"""
+        return self._drain(force=True)
+    
+    def _is_new_stream(self, frame: AudioFrame) -> bool:
+        if frame.stream_id is not None and frame.stream_id != self._stream:
+            return True
+        if frame.sequence >= self._next:
+            return False
+        if frame.sequence < self._next - self.reset_frames:
+            return True
+        # 순번은 되돌아갔는데 지금까지 받은 어떤 프레임보다 나중에 캡처됨 (순번을 0부터 다시 시작)
+        return (
+            frame.timestamp_ms is not None
+            and self._latest_timestamp is not None
+            and frame.timestamp_ms > self._latest_timestamp
+        )
+    
+    def _remember(self, sequence: int) -> None:
+        self._seen.add(sequence)
+        self._seen_order.append(sequence)
+        if len(self._seen_order) > self.reset_frames:
+            self._seen.discard(self._seen_order.popleft())
+    
+    def _drain(self, force: bool) -> List[bytes]:
+        released: List[bytes] = []
+        while self._pending:
+            frame = self._pending.pop(self._next, None)
+            if frame is None:
+                if not force and len(self._pending) < self.depth:
+                    # 뒤에 쌓인 프레임이 적어도 max_wait_ms가 지나면 손실로 처리
+                    now = time.monotonic()
+                    if self._gap_since is None:
+                        self._gap_since = now
+                    if (now - self._gap_since) * 1000 < self.max_wait_ms:
+                        break
+                # 빈 순번을 손실로 처리하고 다음 프레임까지 무음으로 채움
+                following = min(self._pending)
+                missing = following - self._next
+                frame = self._pending.pop(following)
+                self.stats.lost += missing
+                silence = self._silence(missing, frame)
+                if silence:
+                    released.append(silence)
+                self._next = following
+            
+            self._gap_since = None
+            released.append(frame.data)
+            self.stats.released += 1
+            self._last = frame
+            self._next += 1
+        return released
+    
+    def _silence(self, missing: int, following: AudioFrame) -> bytes:
+        """손실 구간 무음 (캡처 시각이 있으면 시각 간격, 없으면 프레임 길이 x 손실 수)"""
+        last = self._last
+        if last is not None and last.timestamp_ms is not None and following.timestamp_ms is not None:
+            gap_ms = following.timestamp_ms - (last.timestamp_ms + last.duration_ms)
+        else:
+            gap_ms = missing * (last or following).duration_ms
+        
+        samples = int(min(max(gap_ms, 0), self.max_gap_ms) * SAMPLE_RATE / 1000)
+        self.stats.silence_ms += samples * 1000 / SAMPLE_RATE
+        return bytes(samples * SAMPLE_WIDTH)
+    
+    def get_stats(self) -> Dict:
+        """버퍼 집계와 대기 프레임 수"""
+        return {**self.stats.to_dict(), "pending": self.pending}
+
+
+
+
+
+
+
+
+
+
+
+
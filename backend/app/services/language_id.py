@@ -0,0 +1,263 @@
+"""
+로컬 언어 감지 서비스
+===================
+
+지원 14개 언어를 API 호출 없이 판별한다.
+
+1. 유니코드 문자 체계(script)로 대부분의 언어 판별
+   (한글, 가나, 한자, 태국어, 데바나가리, 아랍 문자, 키릴 문자)
+2. 라틴 문자 언어(en, es, fr, de, pt, vi, id)는 문자 3-gram 나이브 베이즈 모델로 판별
+3. 신뢰도가 낮으면 호출 측에서 Translation API로 대체 감지
+"""
+
+import math
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 문자 체계 -> 언어 (라틴 문자는 n-gram 모델 사용)
+_SCRIPT_RANGES: List[Tuple[int, int, str]] = [
+    (0x1100, 0x11FF, "hangul"),
+    (0x3130, 0x318F, "hangul"),
+    (0xAC00, 0xD7AF, "hangul"),
+    (0x3040, 0x30FF, "kana"),
+    (0x31F0, 0x31FF, "kana"),
+    (0xFF66, 0xFF9F, "kana"),
+    (0x3400, 0x4DBF, "han"),
+    (0x4E00, 0x9FFF, "han"),
+    (0xF900, 0xFAFF, "han"),
+    (0x0E00, 0x0E7F, "thai"),
+    (0x0900, 0x097F, "devanagari"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0750, 0x077F, "arabic"),
+    (0xFB50, 0xFDFF, "arabic"),
+    (0xFE70, 0xFEFF, "arabic"),
+    (0x0400, 0x04FF, "cyrillic"),
+]
+
+_SCRIPT_LANGUAGES = {
+    "hangul": "ko",
+    "kana": "ja",
+    "thai": "th",
+    "devanagari": "hi",
+    "arabic": "ar",
+    "cyrillic": "ru",
+}
+
+# 라틴 문자 언어별 학습용 예문 (회의/일상 대화 위주)
+_LATIN_SEED_TEXT: Dict[str, str] = {
+    "en": (
+        "hello everyone, thank you for joining the meeting today. can you hear me? "
+        "let's get started with the first item on the agenda. we need to review the "
+        "budget and the schedule for the next quarter. i think we should discuss this "
+        "with the team before we make a decision. what do you think about the proposal? "
+        "please share your screen so that we can see the numbers. the project is on "
+        "track and the release will happen next week. if there are no more questions, "
+        "we will finish here. have a good day and see you tomorrow."
+    ),
+    "es": (
+        "hola a todos, gracias por unirse a la reunión de hoy. ¿me escuchan bien? "
+        "vamos a empezar con el primer punto del orden del día. tenemos que revisar el "
+        "presupuesto y el calendario para el próximo trimestre. creo que deberíamos "
+        "hablar de esto con el equipo antes de tomar una decisión. ¿qué opinan de la "
+        "propuesta? por favor, compartan la pantalla para que podamos ver los números. "
+        "el proyecto va bien y el lanzamiento será la semana que viene. si no hay más "
+        "preguntas, terminamos aquí. que tengan un buen día y hasta mañana."
+    ),
+    "fr": (
+        "bonjour à tous, merci d'avoir rejoint la réunion aujourd'hui. est-ce que vous "
+        "m'entendez ? commençons par le premier point de l'ordre du jour. nous devons "
+        "examiner le budget et le calendrier du prochain trimestre. je pense que nous "
+        "devrions en parler avec l'équipe avant de prendre une décision. qu'est-ce que "
+        "vous pensez de la proposition ? pouvez-vous partager votre écran pour que nous "
+        "puissions voir les chiffres ? le projet avance bien et la sortie aura lieu la "
+        "semaine prochaine. s'il n'y a plus de questions, nous allons terminer ici. "
+        "bonne journée et à demain."
+    ),
+    "de": (
+        "hallo zusammen, danke, dass ihr heute an der besprechung teilnehmt. könnt ihr "
+        "mich hören? fangen wir mit dem ersten punkt der tagesordnung an. wir müssen das "
+        "budget und den zeitplan für das nächste quartal überprüfen. ich denke, wir "
+        "sollten das mit dem team besprechen, bevor wir eine entscheidung treffen. was "
+        "haltet ihr von dem vorschlag? bitte teilt euren bildschirm, damit wir die zahlen "
+        "sehen können. das projekt ist im zeitplan und die veröffentlichung ist nächste "
+        "woche. wenn es keine weiteren fragen gibt, hören wir hier auf. schönen tag noch "
+        "und bis morgen."
+    ),
+    "pt": (
+        "olá a todos, obrigado por participarem da reunião de hoje. vocês estão me "
+        "ouvindo? vamos começar pelo primeiro item da pauta. precisamos revisar o "
+        "orçamento e o cronograma do próximo trimestre. acho que devemos conversar sobre "
+        "isso com a equipe antes de tomar uma decisão. o que vocês acham da proposta? "
+        "por favor, compartilhem a tela para que possamos ver os números. o projeto está "
+        "no prazo e o lançamento acontece na semana que vem. se não houver mais "
+        "perguntas, vamos encerrar por aqui. tenham um bom dia e até amanhã."
+    ),
+    "vi": (
+        "xin chào mọi người, cảm ơn các bạn đã tham gia cuộc họp hôm nay. mọi người có "
+        "nghe tôi nói không? chúng ta hãy bắt đầu với mục đầu tiên trong chương trình. "
+        "chúng ta cần xem xét ngân sách và kế hoạch cho quý tới. tôi nghĩ chúng ta nên "
+        "thảo luận điều này với nhóm trước khi đưa ra quyết định. các bạn nghĩ gì về đề "
+        "xuất này? vui lòng chia sẻ màn hình để chúng ta có thể xem các con số. dự án "
+        "đang đúng tiến độ và sẽ phát hành vào tuần sau. nếu không còn câu hỏi nào, "
+        "chúng ta sẽ kết thúc ở đây. chúc một ngày tốt lành và hẹn gặp lại ngày mai."
+    ),
+    "id": (
+        "halo semuanya, terima kasih sudah bergabung dalam rapat hari ini. apakah kalian "
+        "bisa mendengar saya? mari kita mulai dengan agenda yang pertama. kita perlu "
+        "meninjau anggaran dan jadwal untuk kuartal berikutnya. saya pikir kita harus "
+        "membicarakan hal ini dengan tim sebelum mengambil keputusan. bagaimana pendapat "
+        "kalian tentang usulan ini? tolong bagikan layar supaya kita bisa melihat "
+        "angkanya. proyek ini berjalan sesuai rencana dan peluncurannya minggu depan. "
+        "kalau tidak ada pertanyaan lagi, kita selesai di sini. semoga hari kalian "
+        "menyenangkan dan sampai jumpa besok."
+    ),
+}
+
+
+@dataclass
+class LanguageGuess:
+    """언어 감지 결과"""
+    language: str
+    confidence: float
+    method: str  # script | ngram | none
+
+
+def _char_script(char: str) -> str:
+    """문자의 문자 체계 분류"""
+    code = ord(char)
+    if code < 0x0250:
+        return "latin" if char.isalpha() else ""
+    if 0x1E00 <= code <= 0x1EFF:  # 베트남어 등 라틴 확장 부가 기호
+        return "latin"
+    for start, end, script in _SCRIPT_RANGES:
+        if start <= code <= end:
+            return script
+    return ""
+
+
+class LanguageIdentifier:
+    """문자 체계 + 문자 3-gram 기반 로컬 언어 감지기"""
+    
+    def __init__(self, ngram_size: int = 3, smoothing: float = 0.5):
+        self.ngram_size = ngram_size
+        self.smoothing = smoothing
+        self._log_probs: Dict[str, Dict[str, float]] = {}
+        self._unseen_log_prob: Dict[str, float] = {}
+        
+        for language, seed in _LATIN_SEED_TEXT.items():
+            counts = Counter(self._ngrams(seed))
+            total = sum(counts.values())
+            vocabulary = len(counts) + 1
+            denominator = total + smoothing * vocabulary
+            self._log_probs[language] = {
+                gram: math.log((count + smoothing) / denominator)
+                for gram, count in counts.items()
+            }
+            self._unseen_log_prob[language] = math.log(smoothing / denominator)
+    
+    def _ngrams(self, text: str) -> List[str]:
+        """단어 경계를 포함한 문자 n-gram 목록"""
+        n = self.ngram_size
+        grams = []
+        for word in text.split():
+            word = "".join(c for c in word if c.isalpha() or c == "'")
+            if not word:
+                continue
+            padded = f" {word} "
+            grams.extend(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+        return grams
+    
+    def identify(self, text: str) -> LanguageGuess:
+        """
+        텍스트 언어 감지
+        
+        Args:
+            text: 감지할 텍스트
+        
+        Returns:
+            LanguageGuess: 언어 코드, 신뢰도(0~1), 판별 방법
+        """
+        scripts = Counter(
+            script
+            for script in (_char_script(c) for c in text)
+            if script
+        )
+        letters = sum(scripts.values())
+        if not letters:
+            return LanguageGuess("en", 0.0, "none")
+        
+        # 한글/가나가 섞여 있으면 한자는 해당 언어의 일부로 본다
+        if scripts["hangul"]:
+            scripts["hangul"] += scripts.pop("han", 0)
+        elif scripts["kana"]:
+            scripts["kana"] += scripts.pop("han", 0)
+        
+        script, count = scripts.most_common(1)[0]
+        ratio = count / letters
+        
+        if script == "han":
+            # 가나 없는 한자 텍스트는 중국어 (짧은 일본어 한자 표기는 낮은 신뢰도)
+            confidence = ratio * (0.97 if count >= 4 else 0.75)
+            return LanguageGuess("zh", round(confidence, 4), "script")
+        
+        if script != "latin":
+            confidence = ratio * (0.99 if count >= 2 else 0.8)
+            return LanguageGuess(_SCRIPT_LANGUAGES[script], round(confidence, 4), "script")
+        
+        language, posterior = self._classify_latin(text.casefold())
+        # 입력이 짧을수록 신뢰도를 낮춘다
+        length_factor = min(1.0, count / 12)
+        return LanguageGuess(language, round(posterior * ratio * length_factor, 4), "ngram")
+    
+    def _classify_latin(self, text: str) -> Tuple[str, float]:
+        """라틴 문자 언어 나이브 베이즈 분류 -> (언어, 사후 확률)"""
+        normalized = unicodedata.normalize("NFC", text)
+        grams = self._ngrams(normalized)
+        if not grams:
+            return "en", 0.0
+        
+        scores = {}
+        for language, log_probs in self._log_probs.items():
+            unseen = self._unseen_log_prob[language]
+            scores[language] = sum(log_probs.get(gram, unseen) for gram in grams)
+        
+        # n-gram 간 독립 가정으로 과신하지 않도록 n-gram 수로 온도 보정
+        temperature = max(1.0, len(grams) / 8)
+        best = max(scores.values())
+        weights = {
+            language: math.exp((score - best) / temperature)
+            for language, score in scores.items()
+        }
+        total = sum(weights.values())
+        language = max(weights, key=weights.get)
+        return language, weights[language] / total
+
+
+# 싱글톤 인스턴스
+_language_identifier: Optional[LanguageIdentifier] = None
+
+
+def get_language_identifier() -> LanguageIdentifier:
+    """로컬 언어 감지기 인스턴스 반환"""
+    global _language_identifier
+    if _language_identifier is None:
+        _language_identifier = LanguageIdentifier()
+    return _language_identifier
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,421 @@
+"""
+로컬 음성 인식 엔진 (CPU)
+=======================
+
+무료 등급/온프레미스 고객용으로 외부 API 없이 로컬 whisper 계열 모델로 인식한다.
+
+- faster-whisper(CTranslate2) 모델을 로컬 경로에서 로드 (선택 의존성, 사용 시에만 import)
+- 프로세스 풀 워커마다 모델을 한 번 로드해 상주시키고 워커별 CPU 코어 고정
+  (요청마다 모델을 로드하거나 워커끼리 코어를 빼앗지 않음)
+- 워커가 비는 동안 모인 요청을 묶어 한 번에 전달 (IPC/스케줄링 비용 분산, 부하가 클수록 큰 묶음)
+- SpeechService와 같은 transcribe_audio / recognize_segments 인터페이스 (스트리밍/화자 분리 미지원)
+- 구독 등급 또는 회의 설정(stt_engine)으로 Google / 로컬 엔진 선택
+- 워커가 죽어 풀이 깨지면 풀을 새로 만들고, 그동안(local_stt_retry_seconds)은 LocalEngineUnavailable로
+  알려 호출 측이 Google로 대체
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.cloud.speech_v1.types import RecognitionConfig
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.speech_service import SpeechService, TranscriptionResult, WordTiming
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+
+# 엔진 이름
+ENGINE_GOOGLE = "google"
+ENGINE_LOCAL = "local"
+
+
+class LocalEngineUnavailable(RuntimeError):
+    """로컬 인식 엔진을 쓸 수 없음 (모델 로드 실패, 워커 비정상 종료, 스트리밍 인식 미지원)"""
+
+
+# ==================== 워커 프로세스 ====================
+
+_worker_model = None
+
+
+def _init_worker(model_path: str, compute_type: str, cpu_threads: int, pin_cores: bool, counter) -> None:
+    """워커 시작 시 모델 로드 (프로세스 수명 동안 상주) 및 코어 고정"""
+    global _worker_model
+    
+    if pin_cores and hasattr(os, "sched_setaffinity"):
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        cores = sorted(os.sched_getaffinity(0))
+        start = (index * cpu_threads) % len(cores)
+        os.sched_setaffinity(0, cores[start:start + cpu_threads] or cores)
+    
+    from faster_whisper import WhisperModel
+    
+    _worker_model = WhisperModel(
+        model_path,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1,
+    )
+
+
+def _transcribe_batch(items: List[Tuple[bytes, int, str, bool, int]]) -> List[List[Dict[str, Any]]]:
+    """
+    요청 묶음 인식 (워커 프로세스에서 실행)
+    
+    Args:
+        items: (PCM, 샘플링 레이트, 언어, 단어 타임스탬프 여부, beam 크기) 목록
+    
+    Returns:
+        요청별 구간 목록 ({"text", "start", "end", "avg_logprob", "words"}, 초 단위)
+    """
+    import numpy as np
+    
+    outputs = []
+    for pcm, sample_rate, language, word_timestamps, beam_size in items:
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if sample_rate != SAMPLE_RATE and len(audio):
+            positions = np.arange(0, len(audio), sample_rate / SAMPLE_RATE)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        
+        segments, _ = _worker_model.transcribe(
+            audio,
+            language=language,
+            beam_size=beam_size,
+            word_timestamps=word_timestamps,
+            condition_on_previous_text=False,
+        )
+        outputs.append([
+            {
+                "text": segment.text.strip(),
+                "start": segment.start,
+                "end": segment.end,
+                "avg_logprob": segment.avg_logprob,
+                "words": [(word.word.strip(), word.start, word.end) for word in segment.words or ()],
+            }
+            for segment in segments
+        ])
+    return outputs
+
+
+# ==================== 서비스 ====================
+
+class LocalSpeechService(SpeechService):
+    """프로세스 풀 기반 로컬 음성 인식 (SpeechService 호환)"""
+    
+    def __init__(self, model_path: Optional[str] = None):
+        super().__init__()
+        self.model_path = model_path or settings.local_stt_model_path
+        self.model_name = os.path.basename(os.path.normpath(self.model_path))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self._unavailable_until = 0.0  # 풀이 깨진 뒤 다시 시도할 시각 (monotonic)
+        self._requests = 0
+        self._batches = 0
+        self._audio_seconds = 0.0
+        self._busy_seconds = 0.0
+    
+    # ==================== 풀 / 묶음 처리 ====================
+    
+    @property
+    def available(self) -> bool:
+        """풀이 깨진 뒤 재시도 대기 중이 아니면 True"""
+        return time.monotonic() >= self._unavailable_until
+    
+    def _pool(self) -> ProcessPoolExecutor:
+        """프로세스 풀 (없거나 깨져서 버렸으면 새로 생성)"""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.local_stt_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    self.model_path,
+                    settings.local_stt_compute_type,
+                    settings.local_stt_cpu_threads,
+                    settings.local_stt_pin_cores,
+                    context.Value("i", 0),
+                ),
+            )
+            self.logger.info(
+                "Local STT pool started",
+                model=self.model_name,
+                workers=settings.local_stt_workers,
+                cpu_threads=settings.local_stt_cpu_threads,
+            )
+        return self._executor
+    
+    def _discard_pool(self, executor: ProcessPoolExecutor, error: BaseException) -> None:
+        """깨진 풀을 버리고 재시도 대기 (다음 묶음에서 새 풀 생성)"""
+        if self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._unavailable_until = time.monotonic() + settings.local_stt_retry_seconds
+            self.logger.error("Local STT pool broken", model=self.model_name, error=str(error))
+    
+    def _ensure_started(self) -> None:
+        # 큐는 한 번만 만들어 디스패처를 다시 시작해도 대기 중인 요청을 그대로 처리
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(settings.local_stt_workers)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+    
+    async def _dispatch(self) -> None:
+        """워커가 비면 대기 중인 요청을 묶어 전달"""
+        loop = asyncio.get_running_loop()
+        wait = settings.local_stt_batch_wait_ms / 1000
+        while True:
+            await self._slots.acquire()
+            batch: List[Tuple[tuple, asyncio.Future]] = []
+            try:
+                batch.append(await self._queue.get())
+                
+                deadline = loop.time() + wait
+                while len(batch) < settings.local_stt_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except BaseException as e:
+                # 디스패처 종료: 꺼낸 요청은 실패 처리하고 슬롯 반환 (큐에 남은 요청은 유지)
+                self._slots.release()
+                self._fail(batch, LocalEngineUnavailable(f"디스패처 종료: {e!r}"))
+                raise
+            
+            task = asyncio.create_task(self._run_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+    
+    @staticmethod
+    def _fail(batch: List[Tuple[tuple, asyncio.Future]], error: BaseException) -> None:
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+    
+    async def _run_batch(self, batch: List[Tuple[tuple, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        executor = None
+        try:
+            executor = self._pool()
+            outputs = await loop.run_in_executor(
+                executor, _transcribe_batch, [item for item, _ in batch]
+            )
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+        except BrokenProcessPool as e:
+            self._discard_pool(executor, e)
+            self._fail(batch, LocalEngineUnavailable(str(e) or "로컬 인식 풀이 깨졌습니다."))
+        except Exception as e:
+            self._fail(batch, e)
+        finally:
+            self._slots.release()
+            self._batches += 1
+            self._busy_seconds += time.monotonic() - started
+    
+    async def _submit(
+        self,
+        audio_data: bytes,
+        sample_rate: int,
+        language_code: str,
+        word_timestamps: bool,
+    ) -> List[Dict[str, Any]]:
+        if not self.available:
+            raise LocalEngineUnavailable("로컬 인식 풀 재시작 대기 중")
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        item = (audio_data, sample_rate, language_code, word_timestamps, settings.local_stt_beam_size)
+        self._queue.put_nowait((item, future))
+        self._requests += 1
+        self._audio_seconds += len(audio_data) / 2 / sample_rate
+        return await future
+    
+    @staticmethod
+    def _to_result(segment: Dict[str, Any], language_code: str, offset_ms: float) -> TranscriptionResult:
+        return TranscriptionResult(
+            text=segment["text"],
+            language=language_code,
+            confidence=round(math.exp(min(segment["avg_logprob"], 0.0)), 3),
+            is_final=True,
+            start_ms=offset_ms + segment["start"] * 1000,
+            end_ms=offset_ms + segment["end"] * 1000,
+            words=[
+                WordTiming(word=word, start_ms=offset_ms + start * 1000, end_ms=offset_ms + end * 1000)
+                for word, start, end in segment["words"]
+            ],
+        )
+    
+    # ==================== SpeechService 인터페이스 ====================
+    
+    async def transcribe_audio(
+        self,
+        audio_data: bytes,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        enable_word_time_offsets: bool = False,
+    ) -> Optional[TranscriptionResult]:
+        """단일 오디오 청크 인식 (구간을 하나의 결과로 합침, profile은 무시)"""
+        segments = [
+            segment
+            for segment in await self._submit(audio_data, sample_rate, language_code, enable_word_time_offsets)
+            if segment["text"]
+        ]
+        if not segments:
+            return None
+        
+        results = [self._to_result(segment, language_code, 0.0) for segment in segments]
+        separator = "" if language_code in ("ja", "zh", "th") else " "
+        words = [word for result in results for word in result.words]
+        return TranscriptionResult(
+            text=separator.join(result.text for result in results),
+            language=language_code,
+            confidence=sum(result.confidence for result in results) / len(results),
+            is_final=True,
+            start_ms=words[0].start_ms if words else None,
+            end_ms=results[-1].end_ms if words else None,
+            words=words,
+        )
+    
+    def segment_config(
+        self,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        enable_speaker_diarization: bool = False,
+        diarization_speaker_count: int = 2,
+    ) -> RecognitionConfig:
+        """캐시 키용 설정 (모델 이름으로 Google 결과와 구분)"""
+        return RecognitionConfig(
+            encoding=RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code=language_code,
+            model=f"local/{self.model_name}",
+            enable_word_time_offsets=True,
+        )
+    
+    async def recognize_segments(
+        self,
+        audio_data: bytes,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        offset_ms: float = 0.0,
+        enable_speaker_diarization: bool = False,
+        diarization_speaker_count: int = 2,
+    ) -> List[TranscriptionResult]:
+        """오디오 구간의 모든 인식 결과 (화자 분리는 지원하지 않아 speaker_tag 없음)"""
+        segments = await self._submit(audio_data, sample_rate, language_code, True)
+        return [
+            self._to_result(segment, language_code, offset_ms)
+            for segment in segments
+            if segment["text"]
+        ]
+    
+    async def open_streaming_session(self, *args, **kwargs):
+        """스트리밍 인식은 지원하지 않음 (호출자는 Google 엔진으로 대체)"""
+        raise LocalEngineUnavailable("로컬 인식 엔진은 스트리밍 인식을 지원하지 않습니다.")
+    
+    async def close(self) -> None:
+        """디스패처와 프로세스 풀 종료 (대기 중인 요청은 실패 처리)"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        if self._queue is not None:
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._fail(pending, LocalEngineUnavailable("로컬 인식 엔진 종료"))
+            self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """요청/묶음 수와 실시간 배율 (처리 시간 / 오디오 길이)"""
+        return {
+            "model": self.model_name,
+            "workers": settings.local_stt_workers,
+            "available": self.available,
+            "requests": self._requests,
+            "batches": self._batches,
+            "avg_batch_size": round(self._requests / self._batches, 2) if self._batches else None,
+            "audio_seconds": round(self._audio_seconds, 1),
+            "real_time_factor": (
+                round(self._busy_seconds / self._audio_seconds, 3) if self._audio_seconds else None
+            ),
+        }
+
+
+# ==================== 엔진 선택 ====================
+
+def select_speech_engine(tier: Optional[str], preference: Optional[str] = None) -> str:
+    """
+    인식 엔진 선택
+    
+    Args:
+        tier: 구독 등급 (free | basic | pro | enterprise, 없으면 free)
+        preference: 회의 설정 stt_engine (google | local, 지정 시 우선)
+    
+    Returns:
+        str: google | local (로컬 엔진이 꺼져 있으면 항상 google)
+    """
+    if not settings.local_stt_enabled:
+        return ENGINE_GOOGLE
+    if preference in (ENGINE_GOOGLE, ENGINE_LOCAL):
+        return preference
+    return ENGINE_LOCAL if (tier or "free") in settings.local_stt_tiers else ENGINE_GOOGLE
+
+
+# 싱글톤 인스턴스
+_local_speech_service: Optional[LocalSpeechService] = None
+
+
+def get_local_speech_service() -> LocalSpeechService:
+    """로컬 음성 인식 서비스 인스턴스 반환"""
+    global _local_speech_service
+    if _local_speech_service is None:
+        _local_speech_service = LocalSpeechService()
+    return _local_speech_service
+
+
+async def close_local_speech_service() -> None:
+    """로컬 음성 인식 풀 종료 (애플리케이션 종료 시)"""
+    if _local_speech_service is not None:
+        await _local_speech_service.close()
+
+
+
+
+
+
+
+
+
+
+
+
@@ -9,7 +9,6 @@ import re
 import asyncio
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-from uuid import uuid4
 
 import httpx
 
@@ -22,6 +21,7 @@ from app.schemas.media_source import (
     YouTubeVideoInfo,
     MEDIA_SOURCE_INFO,
 )
+from app.services.upload_service import get_upload_service
 
 logger = get_logger(__name__)
 
@@ -225,9 +225,12 @@ class MediaSourceService:
         filename: str,
         file_size: int,
         mime_type: str,
-    ) -> Dict[str, str]:
+    ) -> Dict[str, Any]:
         """
-        파일 업로드 URL 생성 (Supabase Storage 사용)
+        파일 업로드 URL 생성
+        
+        반환된 upload_url로 PATCH(Upload-Offset, Upload-Checksum 헤더)하여 청크 단위로 업로드하고,
+        끊기면 HEAD로 현재 오프셋을 조회해 이어서 보낸다.
         """
         # 파일 확장자 확인
         ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
@@ -244,15 +247,19 @@ class MediaSourceService:
         if file_size > max_size:
             raise ValueError(f"File too large. Max size: {max_size} bytes")
         
-        # Supabase Storage에 업로드 URL 생성
-        file_path = f"media/{user_id}/{uuid4()}/{filename}"
-        
-        # 실제로는 Supabase Storage API 사용
-        # upload_url = self.db.client.storage.from_("media-files").create_signed_upload_url(file_path)
+        # 재개 가능한 업로드 생성 (파일 미리 할당)
+        upload = get_upload_service().create_upload(
+            user_id=user_id,
+            filename=filename,
+            file_size=file_size,
+            mime_type=mime_type,
+        )
         
         return {
-            "upload_url": f"/api/v1/media/upload/{file_path}",
-            "file_path": file_path,
+            "upload_id": upload["upload_id"],
+            "upload_url": f"/api/v1/media/upload/{upload['upload_id']}",
+            "file_path": upload["file_path"],
+            "offset": upload["offset"],
             "expires_in": 3600,
         }
     
@@ -0,0 +1,235 @@
+"""
+회의 번역 워밍업 서비스
+=====================
+
+회의 시작 시 인사말 등 자주 쓰는 문구를 회의 언어로 미리 번역하여
+초반 자막이 캐시/번역 메모리에서 바로 나오도록 한다.
+
+- 기본 문구(언어별) + 설정의 추가 문구
+- 주최자의 최근 회의에서 반복된 짧은 발화 (빈도순)
+- 회의 언어 조합으로 한 번에 일괄 번역 (BATCH 우선순위, 주최자에게 과금)
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.rate_limiter import PriorityClass, priority_scope
+from app.services.translation_memory import normalize_segment
+from app.services.translation_service import RealtimeTranslationPipeline
+from app.services.usage_metering import usage_scope
+
+logger = get_logger(__name__)
+
+# 회의 초반에 자주 나오는 문구
+DEFAULT_WARMUP_PHRASES: Dict[str, List[str]] = {
+    "ko": [
+        "안녕하세요", "안녕하세요, 여러분", "제 목소리 들리시나요?", "잘 들립니다",
+        "화면 보이시나요?", "화면 공유하겠습니다", "잠시만요", "감사합니다",
+        "네", "아니요", "좋습니다", "시작하겠습니다", "다시 한 번 말씀해 주시겠어요?",
+        "소리가 끊겨요", "음소거 해제해 주세요", "질문 있으신가요?", "오늘 회의 안건은",
+    ],
+    "en": [
+        "Hello", "Hi everyone", "Can you hear me?", "I can hear you",
+        "Can you see my screen?", "Let me share my screen", "Just a moment", "Thank you",
+        "Yes", "No", "Sounds good", "Let's get started", "Could you say that again?",
+        "You're breaking up", "Please unmute", "Any questions?", "Today's agenda is",
+    ],
+    "ja": [
+        "こんにちは", "皆さん、こんにちは", "聞こえますか?", "聞こえます",
+        "画面は見えますか?", "画面を共有します", "少々お待ちください", "ありがとうございます",
+        "はい", "いいえ", "始めましょう", "もう一度お願いできますか?", "質問はありますか?",
+    ],
+    "zh": [
+        "你好", "大家好", "能听到我说话吗?", "能听到",
+        "能看到我的屏幕吗?", "我来共享屏幕", "请稍等", "谢谢",
+        "是的", "不是", "我们开始吧", "能再说一遍吗?", "有什么问题吗?",
+    ],
+    "es": [
+        "Hola", "Hola a todos", "¿Me escuchan?", "Te escucho",
+        "¿Ven mi pantalla?", "Voy a compartir mi pantalla", "Un momento", "Gracias",
+        "Sí", "No", "Empecemos", "¿Puedes repetirlo?", "¿Alguna pregunta?",
+    ],
+    "fr": [
+        "Bonjour", "Bonjour à tous", "Vous m'entendez ?", "Je vous entends",
+        "Vous voyez mon écran ?", "Je partage mon écran", "Un instant", "Merci",
+        "Oui", "Non", "Commençons", "Pouvez-vous répéter ?", "Des questions ?",
+    ],
+    "de": [
+        "Hallo", "Hallo zusammen", "Könnt ihr mich hören?", "Ich höre dich",
+        "Seht ihr meinen Bildschirm?", "Ich teile meinen Bildschirm", "Einen Moment", "Danke",
+        "Ja", "Nein", "Fangen wir an", "Kannst du das wiederholen?", "Gibt es Fragen?",
+    ],
+}
+
+
+def meeting_languages(meeting: Dict) -> List[str]:
+    """회의 설정과 참여자 선호 언어로 회의 언어 목록 구성"""
+    meeting_settings = meeting.get("settings") or {}
+    languages: List[str] = []
+    
+    candidates = [meeting_settings.get("default_source_language")]
+    candidates += meeting_settings.get("target_languages") or []
+    candidates += [
+        participant.get("preferred_language")
+        for participant in meeting.get("participants") or []
+    ]
+    for lang in candidates:
+        if lang and lang not in languages:
+            languages.append(lang)
+    
+    return languages
+
+
+class MeetingWarmupService:
+    """회의 시작 시 문구 사전 번역"""
+    
+    def __init__(self, pipeline: RealtimeTranslationPipeline):
+        self.pipeline = pipeline
+        self.logger = get_logger(__name__)
+        
+        self._meetings = 0
+        self._phrases = 0
+        self._translated = 0
+        self._failures = 0
+        self._last_duration = 0.0
+    
+    async def warm_up_meeting(self, meeting_id: str) -> Dict[str, int]:
+        """
+        회의 언어로 자주 쓰는 문구 미리 번역 (백그라운드 작업, 예외를 밖으로 던지지 않음)
+        
+        Args:
+            meeting_id: 회의 ID
+        
+        Returns:
+            Dict[str, int]: {"phrases": 후보 문구 수, "translated": 새로 번역한 문구 수}
+        """
+        started = time.perf_counter()
+        try:
+            meeting = await get_db().get_meeting(meeting_id)
+            if not meeting:
+                return {"phrases": 0, "translated": 0}
+            
+            languages = meeting_languages(meeting)
+            if len(languages) < 2:
+                return {"phrases": 0, "translated": 0}
+            
+            owner_id = meeting.get("created_by")
+            phrases = self._default_phrases(languages)
+            if owner_id:
+                history = await self._frequent_segments(owner_id, languages)
+                for lang, segments in history.items():
+                    phrases.setdefault(lang, []).extend(segments)
+            
+            with priority_scope(PriorityClass.BATCH), usage_scope(owner_id, meeting_id=meeting_id):
+                counts = await asyncio.gather(*(
+                    self.pipeline.preload(
+                        texts,
+                        source_language,
+                        [lang for lang in languages if lang != source_language],
+                    )
+                    for source_language, texts in phrases.items()
+                ))
+            
+            stats = {
+                "phrases": sum(len(texts) for texts in phrases.values()),
+                "translated": sum(counts),
+            }
+            self._meetings += 1
+            self._phrases += stats["phrases"]
+            self._translated += stats["translated"]
+            self._last_duration = time.perf_counter() - started
+            
+            self.logger.info(
+                "Meeting translation warm-up completed",
+                meeting_id=meeting_id,
+                languages=languages,
+                elapsed_ms=round(self._last_duration * 1000, 1),
+                **stats,
+            )
+            return stats
+        
+        except Exception as e:
+            self._failures += 1
+            self.logger.warning("Meeting translation warm-up failed", meeting_id=meeting_id, error=str(e))
+            return {"phrases": 0, "translated": 0}
+    
+    def _default_phrases(self, languages: List[str]) -> Dict[str, List[str]]:
+        """회의 언어별 기본 + 설정 문구"""
+        return {
+            lang: DEFAULT_WARMUP_PHRASES.get(lang, []) + settings.meeting_warmup_phrases.get(lang, [])
+            for lang in languages
+            if lang in DEFAULT_WARMUP_PHRASES or lang in settings.meeting_warmup_phrases
+        }
+    
+    async def _frequent_segments(self, owner_id: str, languages: List[str]) -> Dict[str, List[str]]:
+        """주최자의 최근 회의에서 반복된 짧은 발화 (원본 언어별 빈도순)"""
+        db = get_db()
+        meetings = await db.list_meetings(owner_id, limit=settings.meeting_warmup_history_meetings)
+        rows = await db.get_meetings_utterance_texts(
+            [meeting["id"] for meeting in meetings],
+            limit=settings.meeting_warmup_history_utterances,
+        )
+        
+        # 정규화 키별 빈도와 가장 최근 표기
+        counts: Dict[str, Counter] = {}
+        surface: Dict[tuple, str] = {}
+        for row in rows:
+            lang = row.get("original_language")
+            text = (row.get("original_text") or "").strip()
+            if lang not in languages or not text or len(text) > settings.meeting_warmup_max_chars:
+                continue
+            key = normalize_segment(text)
+            if not key:
+                continue
+            counts.setdefault(lang, Counter())[key] += 1
+            surface.setdefault((lang, key), text)
+        
+        return {
+            lang: [
+                surface[(lang, key)]
+                for key, count in counter.most_common(settings.meeting_warmup_top_segments)
+                if count >= settings.meeting_warmup_min_count
+            ]
+            for lang, counter in counts.items()
+        }
+    
+    def get_stats(self) -> Dict[str, float]:
+        """워밍업 통계"""
+        return {
+            "meetings": self._meetings,
+            "phrases": self._phrases,
+            "translated": self._translated,
+            "failures": self._failures,
+            "last_duration_ms": round(self._last_duration * 1000, 1),
+        }
+
+
+# 싱글톤 인스턴스
+_meeting_warmup_service: Optional[MeetingWarmupService] = None
+
+
+def get_meeting_warmup_service() -> MeetingWarmupService:
+    """회의 워밍업 서비스 인스턴스 반환"""
+    global _meeting_warmup_service
+    if _meeting_warmup_service is None:
+        from app.services.realtime_service import get_realtime_service
+        
+        _meeting_warmup_service = MeetingWarmupService(get_realtime_service().translation_pipeline)
+    return _meeting_warmup_service
+
+
+
+
+
+
+
+
+
+
+
+
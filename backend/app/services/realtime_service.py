@@ -7,15 +7,36 @@
 
 import asyncio
 import base64
+import time
+from collections import Counter, deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.core.logging import get_logger
-from app.services.speech_service import SpeechService, TranscriptionResult
-from app.services.translation_service import TranslationService, RealtimeTranslationPipeline
+from app.services.audio_archive import AudioArchiveRef, get_audio_archive_service
+from app.services.audio_ring_buffer import AudioRingBuffer
+from app.services.chunk_controller import AdaptiveChunkController, is_speech
+from app.services.incremental_translation import IncrementalTranslator
+from app.services.jitter_buffer import AudioFrame, JitterBuffer, JitterStats
+from app.services.local_speech_service import (
+    ENGINE_GOOGLE,
+    ENGINE_LOCAL,
+    LocalEngineUnavailable,
+    get_local_speech_service,
+    select_speech_engine,
+)
+from app.services.speech_service import SpeechService, TranscriptionResult, pack_word_timings
+from app.services.translation_memory import get_translation_memory
+from app.services.translation_service import (
+    RealtimeTranslationPipeline,
+    TranslationService,
+    create_translation_service,
+)
+from app.services.usage_metering import usage_scope
+from app.services.utterance_batcher import UtteranceBatcher
 
 logger = get_logger(__name__)
 
@@ -26,8 +47,13 @@ class RealtimeService:
     def __init__(self):
         self.logger = get_logger(__name__)
         self.speech_service = SpeechService()
-        self.translation_service = TranslationService()
-        self.translation_pipeline = RealtimeTranslationPipeline(self.translation_service)
+        self.translation_service = create_translation_service()
+        self.translation_pipeline = RealtimeTranslationPipeline(
+            self.translation_service,
+            translation_memory=get_translation_memory() if settings.translation_memory_enabled else None,
+            batcher=UtteranceBatcher(self.translation_service) if settings.translation_batching_enabled else None,
+        )
+        self.incremental_translator = IncrementalTranslator(self.translation_service)
         
         # 회의별 상태 관리
         self._meeting_states: Dict[str, MeetingState] = {}
@@ -40,16 +66,27 @@ class RealtimeService:
     
     def remove_meeting_state(self, meeting_id: str) -> None:
         """회의 상태 제거"""
-        if meeting_id in self._meeting_states:
-            del self._meeting_states[meeting_id]
+        meeting_state = self._meeting_states.pop(meeting_id, None)
+        if meeting_state is not None:
+            for task in list(meeting_state.jitter_timers.values()):
+                task.cancel()
+        self.incremental_translator.clear_meeting(meeting_id)
+    
+    def remove_participant(self, meeting_id: str, participant_id: str) -> None:
+        """참여자 상태 제거 (지터/오디오 버퍼 포함, 회의 상태가 없으면 무시)"""
+        meeting_state = self._meeting_states.get(meeting_id)
+        if meeting_state is not None:
+            meeting_state.remove_participant(participant_id)
     
     async def process_audio(
         self,
         meeting_id: str,
         participant_id: str,
-        audio_data: str,  # Base64 인코딩된 오디오
+        audio_data: Union[str, bytes],  # Base64 인코딩된 오디오 (지터 버퍼를 거친 경우 PCM)
         manager: Any,  # ConnectionManager
         source_language: Optional[str] = None,
+        flush: bool = False,
+        backlog: int = 0,
     ) -> None:
         """
         오디오 데이터 처리 파이프라인
@@ -59,18 +96,45 @@ class RealtimeService:
         3. 자막 브로드캐스트
         4. 데이터베이스 저장
         
+        회의 설정 save_audio가 켜져 있으면 오디오를 보관하고 발화에 보관 위치를 기록한다.
+        적응형 청크가 켜져 있으면 참여자 버퍼에 모아 제어기가 정한 길이만큼만 인식한다.
+        
         Args:
             meeting_id: 회의 ID
             participant_id: 참여자 ID
-            audio_data: Base64 인코딩된 오디오 데이터
+            audio_data: Base64 인코딩된 오디오 데이터 (bytes면 디코딩된 PCM)
             manager: WebSocket 연결 관리자
             source_language: 화자 언어 (없으면 자동 감지)
+            flush: 적응형 청크 버퍼에 남은 오디오까지 인식 (연결 종료 시)
+            backlog: 이 청크 뒤에 처리를 기다리는 같은 연결의 오디오 메시지 수
         """
         meeting_state = self.get_meeting_state(meeting_id)
+        # 자막 전송 순번 (인식/번역은 동시에 진행해도 같은 참여자의 자막은 도착 순서대로 전송)
+        previous, release = meeting_state.reserve_release(participant_id)
         
         try:
-            # 1. Base64 디코딩
-            audio_bytes = base64.b64decode(audio_data)
+            # 1. Base64 디코딩 (16kHz LINEAR16 청크, 수신 시각에 끝난 오디오)
+            audio_bytes = base64.b64decode(audio_data) if isinstance(audio_data, str) else audio_data
+            received_at = datetime.utcnow()
+            audio_ms = len(audio_bytes) / (16000 * 2) * 1000
+            
+            # 오디오 보관 (회의 설정 save_audio, 기다리지 않음)
+            await self._load_meeting(meeting_state)
+            audio_ref = (
+                get_audio_archive_service().append(meeting_id, participant_id, audio_bytes)
+                if meeting_state.save_audio
+                else None
+            )
+            
+            # 적응형 청크: flush 크기에 도달했거나 발화가 끝났을 때만 인식
+            if meeting_state.audio_buffers is not None:
+                buffered = meeting_state.buffer_audio(participant_id, audio_bytes, audio_ref, flush=flush)
+                if buffered is None:
+                    return
+                audio_bytes, audio_ref = buffered
+                audio_ms = len(audio_bytes) / (16000 * 2) * 1000
+            elif not audio_bytes:
+                return
             
             # 2. 음성 인식
             # 화자 언어 결정
@@ -79,25 +143,41 @@ class RealtimeService:
                 participant_info = meeting_state.participants.get(participant_id, {})
                 source_language = participant_info.get("language", "ko")
             
-            transcription = await self.speech_service.transcribe_audio(
-                audio_data=audio_bytes,
-                language_code=source_language,
-            )
+            controller = meeting_state.audio_buffers.controller if meeting_state.audio_buffers else None
+            if controller is not None:
+                # 같은 참여자의 처리 중인 인식 요청과 연결 큐 적체 (청크 크기 결정에 반영)
+                controller.set_queue_depth(participant_id, meeting_state.stt_inflight[participant_id] + backlog)
+            meeting_state.stt_inflight[participant_id] += 1
+            started = time.perf_counter()
+            try:
+                transcription = await self._transcribe(meeting_state, audio_bytes, source_language)
+            finally:
+                meeting_state.stt_inflight[participant_id] -= 1
+                if controller is not None:
+                    controller.record_latency(participant_id, (time.perf_counter() - started) * 1000)
             
             if not transcription or not transcription.text.strip():
                 return
             
-            # 3. 참여자별 대상 언어 수집
-            target_languages = meeting_state.get_target_languages()
-            if not target_languages:
-                target_languages = ["ko", "en"]  # 기본값
+            # 3. 청취자 언어 수집 (청취자가 없으면 번역하지 않음)
+            target_languages = self._get_target_languages(meeting_state, manager)
             
             # 4. 번역
-            translations = await self.translation_pipeline.process_utterance(
-                text=transcription.text,
-                source_language=source_language,
-                target_languages=target_languages,
-            )
+            if target_languages:
+                with usage_scope(await self._billing_user(meeting_state), meeting_id=meeting_id):
+                    translations = await self.translation_pipeline.process_utterance(
+                        text=transcription.text,
+                        source_language=source_language,
+                        target_languages=target_languages,
+                        context_id=meeting_id,
+                        speaker_id=participant_id,
+                    )
+            else:
+                translations = {source_language: transcription.text}
+            
+            # 앞선 청크의 자막 전송/저장이 끝날 때까지 대기
+            if previous is not None:
+                await asyncio.shield(previous)
             
             # 5. 발화 데이터 구성
             utterance_data = {
@@ -110,7 +190,14 @@ class RealtimeService:
                 "confidence": transcription.confidence,
                 "timestamp": datetime.utcnow().isoformat(),
                 "is_final": transcription.is_final,
+                **await self._utterance_timing(meeting_state, received_at, audio_ms, transcription),
             }
+            if audio_ref is not None:
+                utterance_data.update(
+                    audio_path=audio_ref.path,
+                    audio_offset_ms=audio_ref.offset_ms,
+                    audio_duration_ms=audio_ref.duration_ms,
+                )
             
             # 6. WebSocket으로 자막 브로드캐스트
             await manager.broadcast_translation(
@@ -119,8 +206,9 @@ class RealtimeService:
                 translations=translations,
             )
             
-            # 7. 데이터베이스 저장 (최종 결과만)
+            # 7. 데이터베이스 저장 및 백필용 최근 발화 기록 (최종 결과만)
             if transcription.is_final:
+                meeting_state.remember_utterance(utterance_data, translations)
                 await self._save_utterance(utterance_data, translations)
             
             self.logger.debug(
@@ -137,6 +225,163 @@ class RealtimeService:
                 participant_id=participant_id,
                 error=str(e),
             )
+        finally:
+            meeting_state.finish_release(participant_id, release)
+    
+    async def process_audio_frame(
+        self,
+        meeting_id: str,
+        participant_id: str,
+        audio_data: str,
+        sequence: int,
+        manager: Any,
+        timestamp_ms: Optional[int] = None,
+        source_language: Optional[str] = None,
+        stream_id: Optional[str] = None,
+        backlog: int = 0,
+    ) -> None:
+        """
+        시퀀스 번호가 있는 오디오 프레임 처리
+        
+        참여자 지터 버퍼에서 순서를 맞추고 중복을 걸러낸 뒤, 내보낼 수 있게 된 PCM을
+        (손실 구간은 무음으로 채워) 이어 붙여 process_audio로 처리한다.
+        빈 순번 뒤로 프레임이 더 오지 않아도 대기 시간이 지나면 타이머가 남은 프레임을 내보낸다.
+        
+        Args:
+            audio_data: Base64 인코딩된 오디오 데이터
+            sequence: 참여자별 프레임 순번 (새 스트림은 0부터 다시 시작 가능)
+            timestamp_ms: 클라이언트 캡처 시각 (손실 구간 무음 길이, 새 스트림 판단)
+            stream_id: 클라이언트 스트림 ID (재연결 시 바뀌면 새 스트림)
+            backlog: 이 프레임 뒤에 처리를 기다리는 같은 연결의 오디오 메시지 수
+        """
+        meeting_state = self.get_meeting_state(meeting_id)
+        frame = AudioFrame(
+            sequence=sequence,
+            data=base64.b64decode(audio_data),
+            timestamp_ms=timestamp_ms,
+            stream_id=stream_id,
+        )
+        buffer = meeting_state.jitter_buffer(participant_id)
+        released = buffer.push(frame)
+        if buffer.gap_wait_ms() is not None and participant_id not in meeting_state.jitter_timers:
+            task = asyncio.create_task(
+                self._release_jitter_gap(meeting_state, participant_id, manager, source_language)
+            )
+            meeting_state.jitter_timers[participant_id] = task
+            task.add_done_callback(lambda done: self._on_jitter_timer_done(meeting_state, participant_id, done))
+        if released:
+            await self.process_audio(
+                meeting_id=meeting_id,
+                participant_id=participant_id,
+                audio_data=b"".join(released),
+                manager=manager,
+                source_language=source_language,
+                backlog=backlog,
+            )
+    
+    async def _release_jitter_gap(
+        self,
+        meeting_state: "MeetingState",
+        participant_id: str,
+        manager: Any,
+        source_language: Optional[str],
+    ) -> None:
+        """빈 순번 대기 시간이 지나면 뒤에 쌓인 프레임 처리 (새 프레임이 오지 않는 경우)"""
+        buffer = meeting_state.jitter_buffers.get(participant_id)
+        while buffer is not None:
+            wait_ms = buffer.gap_wait_ms()
+            if wait_ms is None:
+                return
+            await asyncio.sleep(wait_ms / 1000)
+            released = buffer.poll()
+            if released:
+                await self.process_audio(
+                    meeting_id=meeting_state.meeting_id,
+                    participant_id=participant_id,
+                    audio_data=b"".join(released),
+                    manager=manager,
+                    source_language=source_language,
+                )
+    
+    def _on_jitter_timer_done(self, meeting_state: "MeetingState", participant_id: str, task: asyncio.Task) -> None:
+        if meeting_state.jitter_timers.get(participant_id) is task:
+            del meeting_state.jitter_timers[participant_id]
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(
+                "Jitter buffer release failed",
+                meeting_id=meeting_state.meeting_id,
+                participant_id=participant_id,
+                error=str(task.exception()),
+            )
+    
+    async def flush_audio_frames(self, meeting_id: str, participant_id: str, manager: Any) -> None:
+        """연결 종료 시 지터 버퍼에 남은 프레임 처리 (빈 순번을 기다리지 않음)"""
+        meeting_state = self._meeting_states.get(meeting_id)
+        if meeting_state is None:
+            return
+        buffer = meeting_state.jitter_buffers.get(participant_id)
+        released = buffer.flush() if buffer else None
+        if released or meeting_state.audio_buffers is not None:
+            # 적응형 청크 버퍼에 모아 둔 오디오도 함께 인식
+            await self.process_audio(
+                meeting_id=meeting_id,
+                participant_id=participant_id,
+                audio_data=b"".join(released or ()),
+                manager=manager,
+                flush=True,
+            )
+    
+    def get_jitter_stats(self) -> Dict:
+        """전체 지터 버퍼 집계 (손실/순서 뒤바뀜/늦은 프레임)"""
+        total = JitterStats()
+        buffers = [
+            buffer
+            for meeting_state in self._meeting_states.values()
+            for buffer in meeting_state.jitter_buffers.values()
+        ]
+        for buffer in buffers:
+            total.merge(buffer.stats)
+        return {
+            **total.to_dict(),
+            "active_buffers": len(buffers),
+            "pending_frames": sum(buffer.pending for buffer in buffers),
+        }
+    
+    def get_chunking_stats(self) -> Optional[Dict]:
+        """적응형 청크 결정 집계 (꺼져 있으면 None)"""
+        if not settings.stt_adaptive_chunking_enabled:
+            return None
+        
+        reasons: Counter = Counter()
+        triggers: Counter = Counter()
+        flushes, flushed_ms = 0, 0
+        participants: List[Dict] = []
+        for meeting_state in self._meeting_states.values():
+            if meeting_state.audio_buffers is None:
+                continue
+            stats = meeting_state.audio_buffers.controller.get_stats()
+            reasons.update(stats["reasons"])
+            triggers.update(stats["triggers"])
+            flushes += stats["flushes"]
+            flushed_ms += stats["flushed_ms"]
+            participants.extend(stats["participants"].values())
+        
+        rtts = [participant["rtt_ms"] for participant in participants if participant["rtt_ms"] is not None]
+        return {
+            "target_delay_ms": settings.stt_chunk_target_delay_ms,
+            "flushes": flushes,
+            "avg_flush_ms": round(flushed_ms / flushes) if flushes else None,
+            "stt_calls_per_audio_minute": round(flushes / flushed_ms * 60000, 1) if flushed_ms else None,
+            "reasons": dict(reasons),
+            "triggers": dict(triggers),
+            "active_participants": len(participants),
+            "avg_chunk_ms": (
+                round(sum(participant["chunk_ms"] for participant in participants) / len(participants))
+                if participants
+                else None
+            ),
+            "avg_rtt_ms": round(sum(rtts) / len(rtts)) if rtts else None,
+        }
     
     async def process_text_input(
         self,
@@ -159,15 +404,21 @@ class RealtimeService:
         meeting_state = self.get_meeting_state(meeting_id)
         
         try:
-            # 대상 언어 수집
-            target_languages = meeting_state.get_target_languages()
+            # 청취자 언어 수집
+            target_languages = self._get_target_languages(meeting_state, manager)
             
             # 번역
-            translations = await self.translation_pipeline.process_utterance(
-                text=text,
-                source_language=source_language,
-                target_languages=target_languages,
-            )
+            if target_languages:
+                with usage_scope(await self._billing_user(meeting_state), meeting_id=meeting_id):
+                    translations = await self.translation_pipeline.process_utterance(
+                        text=text,
+                        source_language=source_language,
+                        target_languages=target_languages,
+                        context_id=meeting_id,
+                        speaker_id=participant_id,
+                    )
+            else:
+                translations = {source_language: text}
             
             # 발화 데이터 구성
             utterance_data = {
@@ -190,6 +441,7 @@ class RealtimeService:
             )
             
             # 저장
+            meeting_state.remember_utterance(utterance_data, translations)
             await self._save_utterance(utterance_data, translations)
             
         except Exception as e:
@@ -199,6 +451,255 @@ class RealtimeService:
                 error=str(e),
             )
     
+    async def process_transcript(
+        self,
+        meeting_id: str,
+        participant_id: str,
+        text: str,
+        is_final: bool,
+        source_language: str,
+        manager: Any,
+    ) -> None:
+        """
+        중간/최종 전사 텍스트 처리 (문장 단위 증분 번역)
+        
+        같은 발화의 중간 결과가 반복해서 들어와도 새로 확정된 문장만 번역하고,
+        클라이언트에는 변경된 문장(delta)만 전송한다.
+        
+        Args:
+            meeting_id: 회의 ID
+            participant_id: 참여자 ID (스트림 ID)
+            text: 현재까지의 발화 전체 텍스트
+            is_final: 최종 결과 여부
+            source_language: 원본 언어
+            manager: WebSocket 연결 관리자
+        """
+        meeting_state = self.get_meeting_state(meeting_id)
+        
+        try:
+            target_languages = self._get_target_languages(meeting_state, manager)
+            
+            with usage_scope(await self._billing_user(meeting_state), meeting_id=meeting_id):
+                delta = await self.incremental_translator.process(
+                    meeting_id=meeting_id,
+                    stream_id=participant_id,
+                    text=text,
+                    source_language=source_language,
+                    target_languages=target_languages,
+                    is_final=is_final,
+                )
+            
+            utterance_data = {
+                "id": str(uuid4()),
+                "utterance_key": f"{participant_id}:{delta.utterance_index}",
+                "meeting_id": meeting_id,
+                "participant_id": participant_id,
+                "speaker_name": meeting_state.participants.get(participant_id, {}).get("name", "Unknown"),
+                "original_language": source_language,
+                "original_text": text,
+                "confidence": 1.0,
+                "timestamp": datetime.utcnow().isoformat(),
+                "is_final": is_final,
+            }
+            
+            if delta.segments or delta.pending_text or is_final:
+                await manager.broadcast_translation_delta(
+                    meeting_id=meeting_id,
+                    utterance_data=utterance_data,
+                    delta=delta,
+                )
+            
+            if is_final and text.strip():
+                translations = delta.full_translations or {source_language: text}
+                meeting_state.remember_utterance(utterance_data, translations)
+                await self._save_utterance(utterance_data, translations)
+        
+        except Exception as e:
+            self.logger.error(
+                "Transcript processing failed",
+                meeting_id=meeting_id,
+                participant_id=participant_id,
+                error=str(e),
+            )
+    
+    def _get_target_languages(
+        self,
+        meeting_state: "MeetingState",
+        manager: Any,
+    ) -> List[str]:
+        """번역 대상 언어 (현재 WebSocket 청취자 언어 기준)"""
+        return meeting_state.get_target_languages(
+            listener_languages=manager.get_listener_languages(meeting_state.meeting_id)
+        )
+    
+    async def backfill_language(
+        self,
+        meeting_id: str,
+        language: str,
+    ) -> List[Dict]:
+        """
+        최근 발화를 새 청취 언어로 백필
+        
+        아직 해당 언어 번역이 없는 최근 발화만 원본 언어별로 모아 한 번에 번역한다.
+        
+        Args:
+            meeting_id: 회의 ID
+            language: 새 청취 언어
+        
+        Returns:
+            List[Dict]: 시간순 자막 목록
+        """
+        meeting_state = self._meeting_states.get(meeting_id)
+        if meeting_state is None or not meeting_state.recent_utterances:
+            return []
+        
+        # 원본 언어별 번역 누락 발화 수집
+        pending: Dict[str, List[Dict]] = {}
+        for item in meeting_state.recent_utterances:
+            if language not in item["translations"]:
+                pending.setdefault(item["original_language"], []).append(item)
+        
+        billing_user = await self._billing_user(meeting_state)
+        for source_language, items in pending.items():
+            try:
+                with usage_scope(billing_user, meeting_id=meeting_id):
+                    translated = await self.translation_service.translate_texts(
+                        [item["original_text"] for item in items],
+                        source_language,
+                        language,
+                    )
+            except Exception as e:
+                self.logger.warning(
+                    "Backfill translation failed",
+                    meeting_id=meeting_id,
+                    target=language,
+                    error=str(e),
+                )
+                continue
+            
+            for item, translated_text in zip(items, translated):
+                item["translations"][language] = translated_text
+        
+        return [
+            {
+                "speaker_name": item["speaker_name"],
+                "original_language": item["original_language"],
+                "original_text": item["original_text"],
+                "translated_text": item["translations"].get(language, item["original_text"]),
+                "target_language": language,
+                "timestamp": item["timestamp"],
+                "is_final": True,
+            }
+            for item in meeting_state.recent_utterances
+        ]
+    
+    async def _load_meeting(self, meeting_state: "MeetingState") -> None:
+        """회의 생성자/시작 시각/오디오 보관 여부/인식 엔진 조회 (회의별 최초 1회)"""
+        if meeting_state.owner_id is not None or time.monotonic() < meeting_state.load_retry_at:
+            return
+        try:
+            meeting = await get_db().get_meeting(meeting_state.meeting_id) or {}
+            meeting_state.owner_id = meeting.get("created_by") or ""
+            meeting_settings = meeting.get("settings") or {}
+            meeting_state.save_audio = settings.audio_archive_enabled and bool(meeting_settings.get("save_audio"))
+            meeting_state.speech_engine = select_speech_engine(
+                await self._owner_tier(meeting_state.owner_id),
+                meeting_settings.get("stt_engine"),
+            )
+            if meeting.get("actual_start") and meeting_state.started_at is None:
+                meeting_state.started_at = datetime.fromisoformat(
+                    meeting["actual_start"].replace("Z", "+00:00")
+                ).replace(tzinfo=None)
+        except Exception as e:
+            # 조회 실패 시 간격을 늘려 가며 다시 조회 (그동안은 기본값으로 처리)
+            meeting_state.load_failures += 1
+            delay = min(settings.realtime_meeting_load_retry_seconds * 2 ** (meeting_state.load_failures - 1), 60.0)
+            meeting_state.load_retry_at = time.monotonic() + delay
+            self.logger.warning(
+                "Failed to load meeting info",
+                meeting_id=meeting_state.meeting_id,
+                retry_in=delay,
+                error=str(e),
+            )
+    
+    async def _owner_tier(self, owner_id: str) -> Optional[str]:
+        """회의 생성자 구독 등급 (로컬 엔진이 꺼져 있으면 조회하지 않음)"""
+        if not settings.local_stt_enabled or not owner_id:
+            return None
+        
+        from app.services.billing_service import get_billing_service
+        
+        try:
+            subscription = await get_billing_service().get_subscription(owner_id)
+        except Exception:
+            return None  # 구독이 없으면 무료 등급
+        return (subscription or {}).get("tier")
+    
+    def _speech_service(self, meeting_state: "MeetingState") -> SpeechService:
+        """회의에 선택된 인식 엔진 (로컬 풀이 재시작 대기 중이면 Google)"""
+        if meeting_state.speech_engine == ENGINE_LOCAL:
+            local_service = get_local_speech_service()
+            if local_service.available:
+                return local_service
+        return self.speech_service
+    
+    async def _transcribe(
+        self,
+        meeting_state: "MeetingState",
+        audio_bytes: bytes,
+        source_language: str,
+    ) -> Optional[TranscriptionResult]:
+        """실시간 청크 인식 (로컬 엔진이 실패하면 같은 청크를 Google로 다시 인식)"""
+        options = {
+            "audio_data": audio_bytes,
+            "language_code": source_language,
+            "profile": settings.speech_realtime_profile,
+            "enable_word_time_offsets": settings.speech_word_time_offsets,
+        }
+        speech_service = self._speech_service(meeting_state)
+        if speech_service is not self.speech_service:
+            try:
+                return await speech_service.transcribe_audio(**options)
+            except LocalEngineUnavailable as e:
+                self.logger.warning(
+                    "Local STT unavailable, falling back to Google",
+                    meeting_id=meeting_state.meeting_id,
+                    error=str(e),
+                )
+        return await self.speech_service.transcribe_audio(**options)
+    
+    async def _billing_user(self, meeting_state: "MeetingState") -> Optional[str]:
+        """번역 사용량을 과금할 사용자 (회의 생성자)"""
+        await self._load_meeting(meeting_state)
+        return meeting_state.owner_id or None
+    
+    async def _utterance_timing(
+        self,
+        meeting_state: "MeetingState",
+        received_at: datetime,
+        audio_ms: float,
+        transcription: TranscriptionResult,
+    ) -> Dict[str, Any]:
+        """
+        회의 시작 기준 발화 구간과 단어 타임스탬프 (자막 내보내기용)
+        
+        오디오 청크는 수신 시각에 끝난 것으로 보고, 청크 안의 위치는 단어 타임스탬프로 계산한다.
+        """
+        await self._load_meeting(meeting_state)
+        if meeting_state.started_at is None:
+            # 시작 API 없이 진행된 회의는 첫 오디오 시작을 기준으로 사용
+            meeting_state.started_at = received_at
+        
+        chunk_start_ms = max(0.0, (received_at - meeting_state.started_at).total_seconds() * 1000 - audio_ms)
+        words = transcription.words
+        start_ms = chunk_start_ms + (words[0].start_ms if words else 0.0)
+        end_ms = chunk_start_ms + (transcription.end_ms if transcription.end_ms is not None else audio_ms)
+        return {
+            "start_ms": int(start_ms),
+            "end_ms": int(max(end_ms, start_ms)),
+            "word_timings": pack_word_timings(words, base_ms=start_ms - chunk_start_ms) if words else None,
+        }
+    
     async def _save_utterance(
         self,
         utterance_data: Dict,
@@ -217,6 +718,14 @@ class RealtimeService:
                 "original_text": utterance_data["original_text"],
                 "confidence": utterance_data.get("confidence"),
                 "timestamp": utterance_data["timestamp"],
+                **{
+                    key: utterance_data[key]
+                    for key in (
+                        "start_ms", "end_ms", "word_timings",
+                        "audio_path", "audio_offset_ms", "audio_duration_ms",
+                    )
+                    if utterance_data.get(key) is not None
+                },
             })
             
             utterance_id = utterance.get("id")
@@ -249,6 +758,24 @@ class MeetingState:
         self.started_at: Optional[datetime] = None
         self.utterance_count: int = 0
         self.is_active: bool = True
+        self.owner_id: Optional[str] = None  # 사용량 과금 대상 (None이면 아직 조회 전)
+        self.load_failures = 0  # 회의 정보 조회 연속 실패 수
+        self.load_retry_at = 0.0  # 다음 조회 가능 시각 (monotonic)
+        self.save_audio: bool = False  # 회의 설정 save_audio (오디오 보관)
+        self.speech_engine: str = ENGINE_GOOGLE  # google | local (구독 등급/회의 설정)
+        self.jitter_buffers: Dict[str, JitterBuffer] = {}  # participant_id -> 오디오 프레임 재조립
+        self.jitter_timers: Dict[str, asyncio.Task] = {}  # participant_id -> 빈 순번 대기 타이머
+        # 적응형 청크 버퍼 (참여자별 인식 청크 길이 조절)
+        self.audio_buffers: Optional[AudioBufferManager] = (
+            AudioBufferManager(controller=AdaptiveChunkController())
+            if settings.stt_adaptive_chunking_enabled
+            else None
+        )
+        self.stt_inflight: Counter = Counter()  # participant_id -> 처리 중인 인식 요청 수
+        self._window_refs: Dict[str, Optional[AudioArchiveRef]] = {}  # 모으는 중인 오디오 끝의 연속 보관 구간
+        self._release_tails: Dict[str, asyncio.Future] = {}  # participant_id -> 마지막으로 예약한 자막 전송 순번
+        # 언어 변경 시 백필할 최근 발화 (링 버퍼)
+        self.recent_utterances: Deque[Dict] = deque(maxlen=settings.realtime_backfill_size)
     
     def add_participant(
         self,
@@ -267,6 +794,119 @@ class MeetingState:
         """참여자 제거"""
         if participant_id in self.participants:
             del self.participants[participant_id]
+        self.jitter_buffers.pop(participant_id, None)
+        timer = self.jitter_timers.pop(participant_id, None)
+        if timer is not None:
+            timer.cancel()
+        if self.audio_buffers is not None:
+            self.audio_buffers.remove(participant_id)
+        self._window_refs.pop(participant_id, None)
+        self._release_tails.pop(participant_id, None)
+    
+    def reserve_release(self, participant_id: str) -> Tuple[Optional[asyncio.Future], asyncio.Future]:
+        """
+        참여자 자막 전송 순번 예약 (오디오 도착 순서대로, await 전에 호출)
+        
+        Returns:
+            Tuple: (기다릴 직전 순번 또는 None, 전송/저장을 마치면 finish_release로 완료할 순번)
+        """
+        previous = self._release_tails.get(participant_id)
+        if previous is not None and previous.done():
+            previous = None
+        release = asyncio.get_running_loop().create_future()
+        self._release_tails[participant_id] = release
+        return previous, release
+    
+    def finish_release(self, participant_id: str, release: asyncio.Future) -> None:
+        """자막 전송 순번 완료 (실패/취소/결과 없음 포함, 다음 청크가 전송을 시작함)"""
+        if not release.done():
+            release.set_result(None)
+        if self._release_tails.get(participant_id) is release:
+            del self._release_tails[participant_id]
+    
+    def jitter_buffer(self, participant_id: str) -> JitterBuffer:
+        """참여자 지터 버퍼 조회 또는 생성 (재연결해도 유지해 다시 보낸 프레임을 걸러냄)"""
+        if participant_id not in self.jitter_buffers:
+            self.jitter_buffers[participant_id] = JitterBuffer()
+        return self.jitter_buffers[participant_id]
+    
+    def buffer_audio(
+        self,
+        participant_id: str,
+        pcm: bytes,
+        audio_ref: Optional[AudioArchiveRef],
+        flush: bool = False,
+    ) -> Optional[Tuple[bytes, Optional[AudioArchiveRef]]]:
+        """
+        적응형 청크 버퍼에 오디오 추가
+        
+        Returns:
+            (인식할 PCM, 보관 위치): flush 크기에 도달했거나 발화가 끝났을 때 (아니면 None)
+        """
+        window = None
+        if pcm:
+            self._extend_window_ref(participant_id, audio_ref)
+            window = self.audio_buffers.add_chunk(participant_id, pcm)
+        if window is None and flush:
+            window = self.audio_buffers.flush(participant_id)
+        if window is None:
+            return None
+        # 창은 다음 add_chunk 전까지만 유효하므로 인식 요청용으로 복사
+        return bytes(window), self._take_window_ref(participant_id, len(window))
+    
+    def _extend_window_ref(self, participant_id: str, ref: Optional[AudioArchiveRef]) -> None:
+        """최근 오디오의 연속 보관 구간 확장 (세그먼트가 바뀌거나 이어지지 않으면 새 구간 시작)"""
+        current = self._window_refs.get(participant_id)
+        if (
+            current is not None
+            and ref is not None
+            and ref.path == current.path
+            and abs(ref.offset_ms - (current.offset_ms + current.duration_ms)) <= 1
+        ):
+            self._window_refs[participant_id] = AudioArchiveRef(
+                path=current.path,
+                offset_ms=current.offset_ms,
+                duration_ms=ref.offset_ms + ref.duration_ms - current.offset_ms,
+            )
+        else:
+            self._window_refs[participant_id] = ref
+    
+    def _take_window_ref(self, participant_id: str, window_bytes: int) -> Optional[AudioArchiveRef]:
+        """
+        꺼낸 창의 보관 위치
+        
+        버퍼 오디오는 항상 연속 구간의 끝에서 끝나므로 남은 오디오와 창 길이만큼 거슬러 올라가 계산한다.
+        (링 버퍼가 넘쳐 앞부분을 버린 경우도 그대로 맞음, 창이 연속 구간 앞에서 시작하면 None)
+        """
+        run = self._window_refs.get(participant_id)
+        if run is None:
+            return None
+        
+        buffers = self.audio_buffers
+        remaining_ms = round(buffers.available_bytes(participant_id) / buffers.bytes_per_ms)
+        window_ms = round(window_bytes / buffers.bytes_per_ms)
+        end_ms = run.offset_ms + run.duration_ms
+        start_ms = end_ms - remaining_ms - window_ms
+        
+        if remaining_ms:
+            self._window_refs[participant_id] = AudioArchiveRef(
+                path=run.path,
+                offset_ms=max(run.offset_ms, end_ms - remaining_ms),
+                duration_ms=min(run.duration_ms, remaining_ms),
+            )
+        else:
+            self._window_refs.pop(participant_id, None)
+        
+        if start_ms < run.offset_ms - 1:
+            return None
+        return AudioArchiveRef(path=run.path, offset_ms=start_ms, duration_ms=window_ms)
+    
+    def get_jitter_stats(self) -> Dict[str, Dict]:
+        """참여자별 지터 버퍼 집계"""
+        return {
+            participant_id: buffer.get_stats()
+            for participant_id, buffer in self.jitter_buffers.items()
+        }
     
     def update_participant_language(
         self,
@@ -277,8 +917,34 @@ class MeetingState:
         if participant_id in self.participants:
             self.participants[participant_id]["language"] = language
     
-    def get_target_languages(self) -> List[str]:
-        """모든 참여자의 언어 목록 반환"""
+    def remember_utterance(
+        self,
+        utterance_data: Dict,
+        translations: Dict[str, str],
+    ) -> None:
+        """최근 발화 기록 (백필용)"""
+        self.utterance_count += 1
+        self.recent_utterances.append({
+            "speaker_name": utterance_data.get("speaker_name"),
+            "original_language": utterance_data["original_language"],
+            "original_text": utterance_data["original_text"],
+            "timestamp": utterance_data["timestamp"],
+            "translations": dict(translations),
+        })
+    
+    def get_target_languages(
+        self,
+        listener_languages: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        번역 대상 언어 목록 반환
+        
+        Args:
+            listener_languages: 현재 청취자 언어 목록 (주어지면 그대로 사용, 빈 목록이면 번역 안 함)
+        """
+        if listener_languages is not None:
+            return list(listener_languages)
+        
         languages = set()
         for participant in self.participants.values():
             lang = participant.get("language")
@@ -298,7 +964,11 @@ class MeetingState:
 
 
 class AudioBufferManager:
-    """오디오 버퍼 관리자"""
+    """
+    오디오 버퍼 관리자 (참여자별 링 버퍼)
+    
+    controller가 없으면 buffer_duration_ms 단위 창을, 있으면 참여자별로 조절한 길이만큼 모아 반환한다.
+    """
     
     def __init__(
         self,
@@ -306,55 +976,104 @@ class AudioBufferManager:
         sample_rate: int = 16000,
         channels: int = 1,
         bytes_per_sample: int = 2,
+        capacity_buffers: int = 2,
+        controller: Optional[AdaptiveChunkController] = None,
     ):
+        self.controller = controller
+        if controller is not None:
+            # 적응형: 창 최대 길이는 제어기의 최대 청크 길이
+            buffer_duration_ms = controller.max_ms
         self.buffer_duration_ms = buffer_duration_ms
         self.sample_rate = sample_rate
         self.channels = channels
         self.bytes_per_sample = bytes_per_sample
+        self.bytes_per_ms = sample_rate * channels * bytes_per_sample / 1000
         
-        # 버퍼 크기 계산
-        self.buffer_size = int(
-            sample_rate * channels * bytes_per_sample * buffer_duration_ms / 1000
-        )
+        # 버퍼 크기 계산 (샘플 프레임 단위)
+        self.buffer_samples = int(sample_rate * buffer_duration_ms / 1000) * channels
+        self.buffer_size = self.buffer_samples * bytes_per_sample
+        # 용량을 창 크기의 배수로 잡아 창이 버퍼 끝을 넘지 않게 함
+        self.capacity_samples = self.buffer_samples * capacity_buffers
         
-        self._buffers: Dict[str, bytearray] = {}  # participant_id -> buffer
+        self._buffers: Dict[str, AudioRingBuffer] = {}  # participant_id -> ring buffer
     
-    def add_chunk(self, participant_id: str, data: bytes) -> Optional[bytes]:
+    def _buffer(self, participant_id: str) -> AudioRingBuffer:
+        buffer = self._buffers.get(participant_id)
+        if buffer is None:
+            buffer = self._buffers[participant_id] = AudioRingBuffer(self.capacity_samples, self.buffer_samples)
+        return buffer
+    
+    def add_chunk(self, participant_id: str, data: bytes) -> Optional[memoryview]:
         """
         오디오 청크 추가
         
-        버퍼가 가득 차면 데이터 반환
+        버퍼가 가득 차면 buffer_size 바이트 창 반환 (다음 add_chunk 전까지 유효)
+        적응형이면 제어기의 flush 크기에 도달했거나 발화가 끝났을 때 모은 오디오 창 반환
         """
-        if participant_id not in self._buffers:
-            self._buffers[participant_id] = bytearray()
+        buffer = self._buffer(participant_id)
+        buffer.write(data)
         
-        self._buffers[participant_id].extend(data)
+        if self.controller is None:
+            if buffer.available >= self.buffer_samples:
+                return buffer.read(self.buffer_samples)
+            return None
         
-        if len(self._buffers[participant_id]) >= self.buffer_size:
-            buffer_data = bytes(self._buffers[participant_id])
-            self._buffers[participant_id] = bytearray()
-            return buffer_data
+        ended = self.controller.observe_audio(participant_id, len(data) / self.bytes_per_ms, is_speech(data))
+        target_samples = self.controller.chunk_ms(participant_id) * self.sample_rate // 1000 * self.channels
+        if buffer.available >= target_samples:
+            trigger = "size"
+        elif ended and buffer.available:
+            trigger = "segment_end"
+        else:
+            return None
         
-        return None
+        window = buffer.read()
+        self.controller.record_flush(participant_id, len(window) / self.bytes_per_ms, trigger)
+        return window
+    
+    def available_bytes(self, participant_id: str) -> int:
+        """아직 꺼내지 않은 오디오 크기"""
+        buffer = self._buffers.get(participant_id)
+        return buffer.available * self.bytes_per_sample if buffer is not None else 0
     
-    def flush(self, participant_id: str) -> Optional[bytes]:
-        """버퍼 플러시"""
-        if participant_id in self._buffers and self._buffers[participant_id]:
-            buffer_data = bytes(self._buffers[participant_id])
-            self._buffers[participant_id] = bytearray()
-            return buffer_data
+    def flush(self, participant_id: str) -> Optional[memoryview]:
+        """버퍼 플러시 (남은 샘플 창, 최대 buffer_size 바이트)"""
+        buffer = self._buffers.get(participant_id)
+        if buffer is not None and buffer.available:
+            window = buffer.read()
+            if self.controller is not None:
+                self.controller.record_flush(participant_id, len(window) / self.bytes_per_ms, "flush")
+            return window
         return None
     
+    def remove(self, participant_id: str) -> None:
+        """참여자 버퍼와 제어 상태 제거"""
+        self._buffers.pop(participant_id, None)
+        if self.controller is not None:
+            self.controller.remove(participant_id)
+    
     def clear(self, participant_id: str) -> None:
         """버퍼 클리어"""
         if participant_id in self._buffers:
-            self._buffers[participant_id] = bytearray()
+            self._buffers[participant_id].clear()
     
     def clear_all(self) -> None:
         """모든 버퍼 클리어"""
         self._buffers.clear()
 
 
+# 싱글톤 인스턴스 (회의 상태를 모든 WebSocket 연결이 공유)
+_realtime_service: Optional[RealtimeService] = None
+
+
+def get_realtime_service() -> RealtimeService:
+    """실시간 서비스 인스턴스 반환"""
+    global _realtime_service
+    if _realtime_service is None:
+        _realtime_service = RealtimeService()
+    return _realtime_service
+
+
 
 
 
@@ -0,0 +1,244 @@
+"""
+음성 인식 설정 레지스트리
+=======================
+
+RecognitionConfig / StreamingRecognitionConfig를 조합별로 한 번만 만들어 재사용한다.
+
+- 키: (언어, 샘플링 레이트, 프로파일(모델), 화자 분리, 대체 언어, 단어 타임스탬프, 구두점)
+- 프로파일: low_latency(latest_short, 중간 결과/짧은 발화) / accurate(latest_long, 긴 오디오 정확도)
+- 반환된 설정은 공유 객체이므로 호출자가 수정하면 안 된다 (필요한 옵션은 키 인자로 지정)
+"""
+
+import threading
+from enum import Enum
+from typing import Dict, Iterable, Optional, Tuple
+
+from google.cloud.speech_v1.types import RecognitionConfig, StreamingRecognitionConfig
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 지원 언어 매핑 (ISO 639-1 -> BCP-47)
+LANGUAGE_CODES = {
+    "ko": "ko-KR",
+    "en": "en-US",
+    "ja": "ja-JP",
+    "zh": "zh-CN",
+    "es": "es-ES",
+    "fr": "fr-FR",
+    "de": "de-DE",
+    "pt": "pt-BR",
+    "ru": "ru-RU",
+    "ar": "ar-SA",
+    "hi": "hi-IN",
+    "vi": "vi-VN",
+    "th": "th-TH",
+    "id": "id-ID",
+}
+
+
+class RecognitionProfile(str, Enum):
+    """지연 시간/정확도 프로파일"""
+    LOW_LATENCY = "low_latency"  # 중간 결과, 짧은 실시간 청크
+    ACCURATE = "accurate"  # 긴 오디오, 파일 전사
+
+
+PROFILE_MODELS = {
+    RecognitionProfile.LOW_LATENCY: "latest_short",
+    RecognitionProfile.ACCURATE: "latest_long",
+}
+
+
+class RecognitionConfigRegistry:
+    """조합별 불변(공유) 인식 설정 저장소"""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._configs: Dict[Tuple, RecognitionConfig] = {}
+        self._streaming_configs: Dict[Tuple, StreamingRecognitionConfig] = {}
+        self._hits = 0
+        self._misses = 0
+    
+    @staticmethod
+    def _key(
+        language_code: str,
+        sample_rate: int,
+        profile: Optional[str],
+        enable_speaker_diarization: bool,
+        diarization_speaker_count: int,
+        alternative_language_codes: Optional[Iterable[str]],
+        enable_word_time_offsets: bool,
+        enable_automatic_punctuation: bool,
+    ) -> Tuple:
+        alternatives = tuple(dict.fromkeys(
+            code for code in alternative_language_codes or () if code != language_code
+        ))[:3]  # 최대 3개
+        return (
+            language_code,
+            sample_rate,
+            RecognitionProfile(profile or settings.speech_default_profile),
+            (enable_speaker_diarization, diarization_speaker_count if enable_speaker_diarization else 0),
+            alternatives,
+            enable_word_time_offsets,
+            enable_automatic_punctuation,
+        )
+    
+    @staticmethod
+    def _build(key: Tuple) -> RecognitionConfig:
+        (
+            language_code,
+            sample_rate,
+            profile,
+            (diarization, speaker_count),
+            alternatives,
+            word_time_offsets,
+            punctuation,
+        ) = key
+        
+        config = RecognitionConfig(
+            encoding=RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code=LANGUAGE_CODES.get(language_code, "ko-KR"),
+            enable_automatic_punctuation=punctuation,
+            enable_word_time_offsets=word_time_offsets,
+            model=PROFILE_MODELS[profile],
+            use_enhanced=True,  # 향상된 모델 사용
+        )
+        
+        # 다중 언어 인식 (대체 언어)
+        if alternatives:
+            config.alternative_language_codes = [LANGUAGE_CODES.get(code, code) for code in alternatives]
+        
+        # 화자 분리 설정
+        if diarization:
+            config.enable_speaker_diarization = True
+            config.diarization_speaker_count = speaker_count
+        
+        return config
+    
+    def get(
+        self,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        enable_speaker_diarization: bool = False,
+        diarization_speaker_count: int = 2,
+        alternative_language_codes: Optional[Iterable[str]] = None,
+        enable_word_time_offsets: bool = False,
+        enable_automatic_punctuation: bool = True,
+    ) -> RecognitionConfig:
+        """
+        인식 설정 조회 (없으면 생성 후 등록)
+        
+        Args:
+            language_code: 언어 코드 (ISO 639-1)
+            sample_rate: 샘플링 레이트
+            profile: low_latency | accurate (None이면 설정 기본값)
+            enable_speaker_diarization: 화자 분리 여부
+            diarization_speaker_count: 화자 수
+            alternative_language_codes: 대체 언어 (최대 3개 사용)
+            enable_word_time_offsets: 단어별 타임스탬프 포함 여부
+            enable_automatic_punctuation: 자동 구두점 여부
+        
+        Returns:
+            RecognitionConfig: 공유 설정 객체 (수정 금지)
+        """
+        key = self._key(
+            language_code,
+            sample_rate,
+            profile,
+            enable_speaker_diarization,
+            diarization_speaker_count,
+            alternative_language_codes,
+            enable_word_time_offsets,
+            enable_automatic_punctuation,
+        )
+        config = self._configs.get(key)
+        if config is not None:
+            self._hits += 1
+            return config
+        
+        with self._lock:
+            config = self._configs.get(key)
+            if config is None:
+                self._misses += 1
+                config = self._configs[key] = self._build(key)
+        return config
+    
+    def streaming(
+        self,
+        interim_results: bool = True,
+        single_utterance: bool = False,
+        **kwargs,
+    ) -> StreamingRecognitionConfig:
+        """스트리밍 인식 설정 조회 (kwargs는 get()과 동일)"""
+        config = self.get(**kwargs)
+        key = (id(config), interim_results, single_utterance)
+        streaming_config = self._streaming_configs.get(key)
+        if streaming_config is None:
+            with self._lock:
+                streaming_config = self._streaming_configs.get(key)
+                if streaming_config is None:
+                    streaming_config = self._streaming_configs[key] = StreamingRecognitionConfig(
+                        config=config,
+                        interim_results=interim_results,
+                        single_utterance=single_utterance,
+                    )
+        return streaming_config
+    
+    def preload(self, languages: Iterable[str], sample_rate: int = 16000) -> int:
+        """
+        자주 쓰는 조합(언어 x 프로파일) 미리 생성
+        
+        실제 호출과 같은 플래그로 만들어야 재사용된다.
+        (실시간 프로파일: speech_word_time_offsets, 그 외: 구간/스트리밍 인식의 단어 타임스탬프)
+        """
+        for language_code in languages:
+            for profile in RecognitionProfile:
+                self.get(
+                    language_code=language_code,
+                    sample_rate=sample_rate,
+                    profile=profile,
+                    enable_word_time_offsets=(
+                        settings.speech_word_time_offsets
+                        if profile == settings.speech_realtime_profile
+                        else True
+                    ),
+                )
+        return len(self._configs)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """등록된 설정 수와 재사용 횟수"""
+        return {
+            "configs": len(self._configs),
+            "streaming_configs": len(self._streaming_configs),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+
+# 싱글톤 인스턴스
+_recognition_config_registry: Optional[RecognitionConfigRegistry] = None
+
+
+def get_recognition_config_registry() -> RecognitionConfigRegistry:
+    """인식 설정 레지스트리 인스턴스 반환"""
+    global _recognition_config_registry
+    if _recognition_config_registry is None:
+        _recognition_config_registry = RecognitionConfigRegistry()
+    return _recognition_config_registry
+
+
+
+
+
+
+
+
+
+
+
+
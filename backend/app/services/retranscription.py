@@ -0,0 +1,553 @@
+"""
+보관 오디오 재전사
+================
+
+오디오를 보관한 회의의 발화를 더 정확한 모델/화자 분리로 다시 인식해
+기존 기록을 갱신하는 일괄 작업.
+
+- 발화 오디오를 보관 세그먼트에서 읽어 병렬 인식 (동시 수 제한, 배치 우선순위)
+- 화자 분리 시 같은 세그먼트에서 이어지는 발화를 한 구간으로 인식하고 단어 위치로 발화에 나눔
+  (화자 태그는 한 인식 요청 안에서만 같은 화자를 가리킴)
+- 새 인식 결과와 utterances 행을 비교해 바뀐 발화만 일괄 갱신하고 번역을 다시 생성
+- 페이지(발화 묶음)를 끝낼 때마다 체크포인트를 기록해 중단/재시작 후 이어서 실행
+  (번역을 먼저 교체하고 발화를 갱신하므로 페이지를 다시 실행해도 결과가 같음)
+- 회의별 처리량(오디오 길이 / 소요 시간)과 예상 비용(STT + 번역) 보고
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import time
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.api_core import exceptions as core_exceptions
+from google.cloud.speech_v1.types import RecognitionConfig
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.rate_limiter import PriorityClass, RateLimitExceeded, priority_scope
+from app.schemas.billing import API_COSTS
+from app.services.audio_archive import SAMPLE_RATE, get_audio_archive_service
+from app.services.speech_service import SpeechService, TranscriptionResult, WordTiming, pack_word_timings
+from app.services.stt_cache import get_stt_result_cache
+from app.services.usage_metering import usage_scope
+
+logger = get_logger(__name__)
+
+# 공백 없이 이어 쓰는 언어 (문자 단위 결합)
+_UNSPACED_LANGUAGES = ("ja", "zh", "th")
+
+# 인식 재시도 대상 오류 (속도 제한 폐기, 일시적 연결 오류)
+_RETRYABLE_ERRORS = (
+    RateLimitExceeded,
+    core_exceptions.ServiceUnavailable,
+    core_exceptions.DeadlineExceeded,
+)
+_MAX_ATTEMPTS = 3
+
+
+@dataclass
+class RetranscriptionJob:
+    """회의 하나의 재전사 작업 상태 (체크포인트로 저장)"""
+    meeting_id: str
+    profile: str = "accurate"
+    enable_speaker_diarization: bool = False
+    diarization_speaker_count: int = 2
+    status: str = "running"
+    offset: int = 0  # 처리를 끝낸 발화 수 (재개 위치)
+    utterances: int = 0
+    changed: int = 0
+    failed: int = 0  # 오디오를 읽지 못했거나 인식에 실패한 발화
+    audio_seconds: float = 0.0
+    translated_chars: int = 0
+    cache_hits: int = 0
+    elapsed_seconds: float = 0.0  # 재개 전 실행 시간 포함
+    resumed: int = 0
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    updated_at: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    
+    def options(self) -> Tuple:
+        return (self.profile, self.enable_speaker_diarization, self.diarization_speaker_count)
+    
+    def to_state(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "task"}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        stt_cost = self.audio_seconds / 60 * API_COSTS["stt_per_minute"]
+        translation_cost = self.translated_chars * API_COSTS["translation_per_char"]
+        return {
+            **self.to_state(),
+            "elapsed_seconds": round(self.elapsed_seconds, 1),
+            "throughput": round(self.audio_seconds / self.elapsed_seconds, 1) if self.elapsed_seconds else None,
+            "estimated_cost": {
+                "stt_usd": round(stt_cost, 4),
+                "translation_usd": round(translation_cost, 4),
+                "total_usd": round(stt_cost + translation_cost, 4),
+            },
+        }
+
+
+class RetranscriptionService:
+    """보관 오디오 재전사 작업 관리"""
+    
+    def __init__(self, speech_service: Optional[SpeechService] = None, state_dir: Optional[str] = None):
+        self.logger = get_logger(__name__)
+        self.speech_service = speech_service or SpeechService()
+        self.state_dir = state_dir or settings.retranscription_dir
+        self._jobs: Dict[str, RetranscriptionJob] = {}
+        self._completed = 0
+        self._failed = 0
+        self._audio_seconds = 0.0
+        self._wall_seconds = 0.0
+    
+    # ==================== 체크포인트 ====================
+    
+    def _state_path(self, meeting_id: str) -> str:
+        return os.path.join(self.state_dir, f"{meeting_id}.json")
+    
+    def _save(self, job: RetranscriptionJob) -> None:
+        job.updated_at = datetime.utcnow().isoformat()
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._state_path(job.meeting_id)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(job.to_state(), f)
+        os.replace(temp_path, path)
+    
+    def _load(self, meeting_id: str) -> Optional[RetranscriptionJob]:
+        try:
+            with open(self._state_path(meeting_id)) as f:
+                return RetranscriptionJob(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+    
+    # ==================== 작업 관리 ====================
+    
+    def get_job(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회 (실행 중이 아니면 체크포인트에서)"""
+        job = self._jobs.get(meeting_id) or self._load(meeting_id)
+        return job.to_dict() if job else None
+    
+    def is_running(self, meeting_id: str) -> bool:
+        job = self._jobs.get(meeting_id)
+        return job is not None and job.task is not None and not job.task.done()
+    
+    def start(
+        self,
+        meeting_id: str,
+        profile: str = "accurate",
+        enable_speaker_diarization: bool = False,
+        diarization_speaker_count: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        재전사 작업 시작 (같은 옵션으로 끝나지 않은 작업이 있으면 이어서 실행)
+        
+        Returns:
+            Dict: 작업 상태
+        
+        Raises:
+            ValueError: 이미 진행 중인 작업
+        """
+        if self.is_running(meeting_id):
+            raise ValueError("이미 재전사가 진행 중입니다.")
+        
+        job = RetranscriptionJob(
+            meeting_id=meeting_id,
+            profile=profile,
+            enable_speaker_diarization=enable_speaker_diarization,
+            diarization_speaker_count=diarization_speaker_count,
+        )
+        previous = self._load(meeting_id)
+        if previous is not None and previous.status != "completed" and previous.options() == job.options():
+            job = previous
+            job.status = "running"
+            job.error = None
+            job.resumed += 1
+        
+        self._jobs[meeting_id] = job
+        self._save(job)
+        job.task = asyncio.create_task(self._run(job))
+        return job.to_dict()
+    
+    def resume_incomplete(self) -> int:
+        """중단된 작업 재개 (애플리케이션 시작 시 호출)"""
+        try:
+            names = os.listdir(self.state_dir)
+        except FileNotFoundError:
+            return 0
+        
+        resumed = 0
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            job = self._load(name[:-len(".json")])
+            if job is None or job.status != "running" or self.is_running(job.meeting_id):
+                continue
+            self.start(job.meeting_id, *job.options())
+            resumed += 1
+        
+        if resumed:
+            self.logger.info("Retranscription jobs resumed", count=resumed)
+        return resumed
+    
+    async def close(self) -> None:
+        """진행 중인 작업 중단 (체크포인트는 running으로 남아 다음 시작 시 재개)"""
+        tasks = [job.task for job in self._jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # ==================== 재전사 ====================
+    
+    async def _run(self, job: RetranscriptionJob) -> None:
+        db = get_db()
+        page_size = settings.retranscription_page_size
+        started = time.monotonic()
+        
+        def checkpoint() -> None:
+            nonlocal started
+            now = time.monotonic()
+            job.elapsed_seconds += now - started
+            started = now
+            self._save(job)
+        
+        with priority_scope(PriorityClass.BATCH):
+            try:
+                meeting = await db.get_meeting(job.meeting_id) or {}
+                owner_id = meeting.get("created_by")
+                
+                while True:
+                    rows = await db.get_meeting_archived_utterances(
+                        job.meeting_id, limit=page_size, offset=job.offset
+                    )
+                    if rows:
+                        await self._process_page(job, rows, owner_id)
+                        job.offset += len(rows)
+                        checkpoint()
+                    if len(rows) < page_size:
+                        break
+                
+                job.status = "completed"
+                self._completed += 1
+                self._audio_seconds += job.audio_seconds
+                self._wall_seconds += job.elapsed_seconds
+            except asyncio.CancelledError:
+                # 중단: 마지막 체크포인트부터 재개
+                checkpoint()
+                raise
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                self._failed += 1
+                self.logger.error("Retranscription failed", meeting_id=job.meeting_id, error=str(e))
+            
+            checkpoint()
+            self.logger.info(
+                "Retranscription finished",
+                meeting_id=job.meeting_id,
+                status=job.status,
+                utterances=job.utterances,
+                changed=job.changed,
+                audio_seconds=round(job.audio_seconds, 1),
+                elapsed_seconds=round(job.elapsed_seconds, 1),
+            )
+    
+    async def _process_page(
+        self,
+        job: RetranscriptionJob,
+        rows: List[Dict[str, Any]],
+        owner_id: Optional[str],
+    ) -> None:
+        """발화 묶음 인식 -> 바뀐 발화 번역 교체 -> 발화 갱신"""
+        semaphore = asyncio.Semaphore(settings.retranscription_concurrency)
+        recognized: Dict[str, List[TranscriptionResult]] = {}
+        
+        async def recognize(span: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                try:
+                    results = await self._recognize_span(job, span)
+                except Exception as e:
+                    self.logger.warning(
+                        "Utterance retranscription failed",
+                        utterance_ids=[row["id"] for row in span],
+                        error=str(e),
+                    )
+                    return
+            for row, row_results in zip(span, results):
+                recognized[row["id"]] = row_results
+        
+        await asyncio.gather(*(recognize(span) for span in self._build_spans(job, rows)))
+        
+        updated: List[Dict[str, Any]] = []
+        for row in rows:
+            results = recognized.get(row["id"])
+            if results is None:
+                job.failed += 1
+                continue
+            job.utterances += 1
+            job.audio_seconds += row["audio_duration_ms"] / 1000
+            
+            changes = self._diff(job, row, results)
+            if changes:
+                translations = row.pop("translations", None) or []
+                updated.append({
+                    **row,
+                    **changes,
+                    "_languages": [item["target_language"] for item in translations],
+                })
+        
+        if not updated:
+            return
+        
+        # 번역을 먼저 교체 (발화 갱신 전에 중단되면 다음 실행에서 다시 비교)
+        translation_records = await self._translate(job, updated, owner_id)
+        db = get_db()
+        await db.replace_translations([row["id"] for row in updated if row["_languages"]], translation_records)
+        await db.upsert_utterances([
+            {key: value for key, value in row.items() if key not in ("_languages", "translations")}
+            for row in updated
+        ])
+        job.changed += len(updated)
+    
+    @staticmethod
+    def _build_spans(job: RetranscriptionJob, rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """함께 인식할 발화 묶음 (화자 분리가 아니면 발화마다 따로)"""
+        if not job.enable_speaker_diarization:
+            return [[row] for row in rows]
+        
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault((row["audio_path"], row["original_language"]), []).append(row)
+        
+        max_ms = settings.retranscription_span_max_seconds * 1000
+        spans: List[List[Dict[str, Any]]] = []
+        for group in groups.values():
+            group.sort(key=lambda row: row["audio_offset_ms"])
+            span: List[Dict[str, Any]] = []
+            span_end = 0
+            for row in group:
+                end = row["audio_offset_ms"] + row["audio_duration_ms"]
+                if span and (
+                    row["audio_offset_ms"] - span_end > settings.retranscription_span_max_gap_ms
+                    or max(end, span_end) - span[0]["audio_offset_ms"] > max_ms
+                ):
+                    spans.append(span)
+                    span = []
+                if not span:
+                    span_end = end
+                span.append(row)
+                span_end = max(span_end, end)
+            spans.append(span)
+        return spans
+    
+    async def _recognize_span(
+        self,
+        job: RetranscriptionJob,
+        span: List[Dict[str, Any]],
+    ) -> List[List[TranscriptionResult]]:
+        """
+        발화 구간 오디오 인식 (같은 PCM/설정의 캐시 결과가 있으면 생략, 일시적 오류는 재시도)
+        
+        Returns:
+            List[List[TranscriptionResult]]: 발화별 결과 (시간은 보관 세그먼트 기준)
+        """
+        span_start = span[0]["audio_offset_ms"]
+        span_end = max(row["audio_offset_ms"] + row["audio_duration_ms"] for row in span)
+        pcm = await get_audio_archive_service().read_pcm(span[0]["audio_path"], span_start, span_end - span_start)
+        language = span[0]["original_language"]
+        options = {
+            "profile": job.profile,
+            "enable_speaker_diarization": job.enable_speaker_diarization,
+            "diarization_speaker_count": job.diarization_speaker_count,
+        }
+        
+        results: Optional[List[TranscriptionResult]] = None
+        cache = get_stt_result_cache() if settings.stt_cache_enabled else None
+        if cache is not None:
+            config = self.speech_service.segment_config(language, SAMPLE_RATE, **options)
+            key = cache.make_key(pcm, RecognitionConfig.serialize(config))
+            results = await cache.get(key, offset_ms=span_start)
+            if results is not None:
+                job.cache_hits += 1
+        
+        if results is None:
+            for attempt in range(1, _MAX_ATTEMPTS + 1):
+                try:
+                    results = await self.speech_service.recognize_segments(
+                        pcm,
+                        language_code=language,
+                        sample_rate=SAMPLE_RATE,
+                        offset_ms=span_start,
+                        **options,
+                    )
+                    break
+                except _RETRYABLE_ERRORS as e:
+                    if attempt == _MAX_ATTEMPTS:
+                        raise
+                    self.logger.warning(
+                        "Utterance recognition retry", utterance_id=span[0]["id"], attempt=attempt, error=str(e)
+                    )
+                    await asyncio.sleep(attempt)
+            if cache is not None:
+                await cache.put(key, language, results, offset_ms=span_start)
+        
+        if len(span) == 1:
+            return [results]
+        return self._split_results(span, results)
+    
+    @staticmethod
+    def _split_results(
+        span: List[Dict[str, Any]],
+        results: List[TranscriptionResult],
+    ) -> List[List[TranscriptionResult]]:
+        """구간 인식 결과를 단어 위치로 발화별로 나눔 (발화 사이 간격은 가운데를 경계로)"""
+        boundaries = [
+            (previous["audio_offset_ms"] + previous["audio_duration_ms"] + row["audio_offset_ms"]) / 2
+            for previous, row in zip(span, span[1:])
+        ]
+        separator = "" if span[0]["original_language"] in _UNSPACED_LANGUAGES else " "
+        split: List[List[TranscriptionResult]] = [[] for _ in span]
+        for result in results:
+            pieces: Dict[int, List[WordTiming]] = {}
+            for word in result.words:
+                index = bisect.bisect_right(boundaries, (word.start_ms + word.end_ms) / 2)
+                pieces.setdefault(index, []).append(word)
+            for index, words in pieces.items():
+                tags = [word.speaker_tag for word in words if word.speaker_tag]
+                split[index].append(TranscriptionResult(
+                    text=separator.join(word.word for word in words),
+                    language=result.language,
+                    confidence=result.confidence,
+                    is_final=True,
+                    speaker_tag=max(set(tags), key=tags.count) if tags else None,
+                    start_ms=words[0].start_ms,
+                    end_ms=words[-1].end_ms,
+                    words=words,
+                ))
+        return split
+    
+    @staticmethod
+    def _diff(
+        job: RetranscriptionJob,
+        row: Dict[str, Any],
+        results: List[TranscriptionResult],
+    ) -> Optional[Dict[str, Any]]:
+        """새 인식 결과와 기존 발화 비교 (바뀐 컬럼만 반환, 인식 결과가 없으면 기존 유지)"""
+        separator = "" if row["original_language"] in _UNSPACED_LANGUAGES else " "
+        text = separator.join(result.text.strip() for result in results if result.text.strip())
+        if not text:
+            return None
+        
+        changes: Dict[str, Any] = {}
+        if " ".join(text.split()) != " ".join((row["original_text"] or "").split()):
+            words = [word for result in results for word in result.words]
+            changes.update(
+                original_text=text,
+                confidence=sum(result.confidence for result in results) / len(results),
+                word_timings=pack_word_timings(words, base_ms=words[0].start_ms) if words else None,
+            )
+            if words and row.get("start_ms") is not None:
+                # word_timings 기준(첫 단어)과 회의 기준 발화 구간을 함께 옮김
+                offset_ms = RetranscriptionService._meeting_offset(row, words)
+                end_ms = results[-1].end_ms if results[-1].end_ms is not None else words[-1].end_ms
+                changes.update(
+                    start_ms=int(round(offset_ms + words[0].start_ms)),
+                    end_ms=int(round(offset_ms + max(end_ms, words[-1].end_ms))),
+                )
+        
+        if job.enable_speaker_diarization:
+            tags = [result.speaker_tag for result in results if result.speaker_tag]
+            speaker_tag = max(set(tags), key=tags.count) if tags else None
+            if speaker_tag != row.get("speaker_tag"):
+                changes["speaker_tag"] = speaker_tag
+        
+        return changes or None
+    
+    @staticmethod
+    def _meeting_offset(row: Dict[str, Any], words: List[WordTiming]) -> float:
+        """
+        인식 결과 시간 -> 회의 기준 시간 변환값
+        
+        기존 첫 단어를 새 결과에서 찾으면 그 위치에, 없으면 새 첫 단어에 기존 start_ms를 맞춘다.
+        """
+        previous = row.get("word_timings") or []
+        if previous:
+            first_word, first_start = previous[0][0].casefold(), previous[0][1]
+            for word in words:
+                if word.word.casefold() == first_word:
+                    return row["start_ms"] + first_start - word.start_ms
+        return row["start_ms"] - words[0].start_ms
+    
+    async def _translate(
+        self,
+        job: RetranscriptionJob,
+        rows: List[Dict[str, Any]],
+        owner_id: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """바뀐 발화를 기존 번역 언어로 다시 번역 (원문 언어/대상 언어 조합별 일괄 번역)"""
+        from app.services.realtime_service import get_realtime_service
+        
+        translation_service = get_realtime_service().translation_service
+        groups: Dict[Tuple[str, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+        for row in rows:
+            if row["_languages"]:
+                key = (row["original_language"], tuple(sorted(row["_languages"])))
+                groups.setdefault(key, []).append(row)
+        
+        records: List[Dict[str, Any]] = []
+        with usage_scope(owner_id, meeting_id=job.meeting_id):
+            for (source_language, languages), group in groups.items():
+                texts = [row["original_text"] for row in group]
+                results = await translation_service.translate_batch(texts, source_language, list(languages))
+                job.translated_chars += sum(len(text) for text in texts) * len(languages)
+                for row, item in zip(group, results):
+                    records.extend(
+                        {
+                            "utterance_id": row["id"],
+                            "target_language": language,
+                            "translated_text": item["translations"].get(language, item["original"]),
+                            "translation_engine": "google",
+                        }
+                        for language in languages
+                    )
+        return records
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """작업 수와 처리 속도 (오디오 길이 / 소요 시간)"""
+        return {
+            "running": sum(1 for meeting_id in self._jobs if self.is_running(meeting_id)),
+            "completed": self._completed,
+            "failed": self._failed,
+            "audio_seconds": round(self._audio_seconds, 1),
+            "speedup": round(self._audio_seconds / self._wall_seconds, 1) if self._wall_seconds else None,
+        }
+
+
+# 싱글톤 인스턴스
+_retranscription_service: Optional[RetranscriptionService] = None
+
+
+def get_retranscription_service() -> RetranscriptionService:
+    """재전사 서비스 인스턴스 반환"""
+    global _retranscription_service
+    if _retranscription_service is None:
+        _retranscription_service = RetranscriptionService()
+    return _retranscription_service
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,109 @@
+"""
+미디어 세션 이벤트 허브
+=====================
+
+백그라운드 작업(파일 전사 등)의 진행 이벤트를 세션 WebSocket 구독자에게 전달한다.
+
+- 세션별 구독 큐 (느린 구독자는 오래된 이벤트부터 버림)
+- 마지막 진행 이벤트를 보관해 늦게 연결한 구독자에게 바로 전달
+"""
+
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 구독자별 대기 이벤트 최대 수
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class SessionEventHub:
+    """세션별 이벤트 발행/구독"""
+    
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._last_events: Dict[str, Dict[str, Any]] = {}
+        self._published = 0
+        self._dropped = 0
+    
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        """구독 시작 (마지막 진행 이벤트가 있으면 큐에 먼저 넣어 반환)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        last_event = self._last_events.get(session_id)
+        if last_event is not None:
+            queue.put_nowait(last_event)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        return queue
+    
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        """구독 해제"""
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[session_id]
+    
+    def publish(self, session_id: str, event: Dict[str, Any], retain: bool = False) -> int:
+        """
+        이벤트 발행
+        
+        Args:
+            session_id: 세션 ID
+            event: {"type": ..., "data": ...} 형식 이벤트
+            retain: 늦게 연결한 구독자에게 전달할 마지막 이벤트로 보관할지 여부
+        
+        Returns:
+            int: 전달한 구독자 수
+        """
+        self._published += 1
+        if retain:
+            self._last_events[session_id] = event
+        
+        subscribers = self._subscribers.get(session_id, ())
+        for queue in subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self._dropped += 1
+            queue.put_nowait(event)
+        return len(subscribers)
+    
+    def clear(self, session_id: str) -> None:
+        """보관 중인 마지막 이벤트 삭제"""
+        self._last_events.pop(session_id, None)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """구독 세션/구독자 수와 발행/버린 이벤트 수"""
+        return {
+            "sessions": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self._published,
+            "dropped": self._dropped,
+        }
+
+
+# 싱글톤 인스턴스
+_session_event_hub: Optional[SessionEventHub] = None
+
+
+def get_session_event_hub() -> SessionEventHub:
+    """세션 이벤트 허브 인스턴스 반환"""
+    global _session_event_hub
+    if _session_event_hub is None:
+        _session_event_hub = SessionEventHub()
+    return _session_event_hub
+
+
+
+
+
+
+
+
+
+
+
+
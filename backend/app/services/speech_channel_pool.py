@@ -0,0 +1,279 @@
+"""
+Speech gRPC 채널 풀
+==================
+
+프로세스 전체에서 공유하는 Speech-to-Text gRPC 채널 풀
+
+- 시작 시 모든 채널을 미리 연결(TLS 핸드셰이크)하고 인증 토큰을 갱신
+- keepalive ping으로 유휴 채널 연결 유지
+- 호출마다 진행 중인 요청이 가장 적은 정상 채널을 선택
+- 연결 상태 구독 + 연속 실패 횟수로 주기적 상태 점검, 비정상 채널은 재생성
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+import google.auth
+import grpc
+from google.api_core import exceptions as core_exceptions
+from google.auth.transport.requests import Request
+from google.cloud.speech_v1 import SpeechClient
+from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SPEECH_HOST = "speech.googleapis.com:443"
+
+# 채널 재생성이 필요한 연결 오류
+_CONNECTION_ERRORS = (
+    core_exceptions.ServiceUnavailable,
+    core_exceptions.DeadlineExceeded,
+)
+
+
+@dataclass
+class _PooledChannel:
+    """풀의 채널 하나"""
+    index: int
+    channel: grpc.Channel
+    client: SpeechClient
+    state: grpc.ChannelConnectivity = grpc.ChannelConnectivity.IDLE
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0  # 연속 연결 오류 수
+    rebuilds: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.state not in (
+                grpc.ChannelConnectivity.TRANSIENT_FAILURE,
+                grpc.ChannelConnectivity.SHUTDOWN,
+            )
+            and self.failures < settings.speech_channel_max_failures
+        )
+
+
+class SpeechChannelPool:
+    """워밍업/keepalive/상태 점검을 하는 SpeechClient 채널 풀"""
+    
+    def __init__(self, size: Optional[int] = None, host: str = SPEECH_HOST):
+        self.size = size or settings.speech_channel_pool_size
+        self.host = host
+        self.logger = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._credentials = None
+        self._channels: List[_PooledChannel] = []
+        self._retired: List[_PooledChannel] = []  # 재생성 후 진행 중인 호출이 끝나길 기다리는 채널
+        self._health_task: Optional[asyncio.Task] = None
+        self._warmup_ms: Optional[float] = None
+    
+    # ==================== 채널 생성 ====================
+    
+    def _get_credentials(self):
+        """모든 채널이 공유하는 인증 정보 (토큰 갱신 1회로 전체 채널에 적용)"""
+        if self._credentials is None:
+            self._credentials, _ = google.auth.default(scopes=SpeechGrpcTransport.AUTH_SCOPES)
+        return self._credentials
+    
+    def _create_channel(self, index: int) -> _PooledChannel:
+        channel = SpeechGrpcTransport.create_channel(
+            self.host,
+            credentials=self._get_credentials(),
+            options=[
+                ("grpc.max_send_message_length", -1),
+                ("grpc.max_receive_message_length", -1),
+                ("grpc.keepalive_time_ms", settings.speech_channel_keepalive_ms),
+                ("grpc.keepalive_timeout_ms", settings.speech_channel_keepalive_timeout_ms),
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.max_pings_without_data", 0),
+            ],
+        )
+        client = SpeechClient(transport=SpeechGrpcTransport(channel=channel, host=self.host))
+        entry = _PooledChannel(index=index, channel=channel, client=client)
+        
+        def on_state(state: grpc.ChannelConnectivity) -> None:
+            entry.state = state
+        
+        channel.subscribe(on_state, try_to_connect=True)
+        return entry
+    
+    def _ensure_channels(self) -> None:
+        with self._lock:
+            if not self._channels:
+                self._channels = [self._create_channel(index) for index in range(self.size)]
+    
+    def _rebuild(self, entry: _PooledChannel) -> None:
+        """비정상 채널 교체 (진행 중인 호출은 기존 채널에서 끝까지 진행)"""
+        replacement = self._create_channel(entry.index)
+        replacement.rebuilds = entry.rebuilds + 1
+        replacement.requests = entry.requests
+        with self._lock:
+            self._channels[entry.index] = replacement
+            self._retired.append(entry)
+        
+        self.logger.warning(
+            "Speech channel rebuilt",
+            channel=entry.index,
+            state=entry.state.name,
+            failures=entry.failures,
+        )
+    
+    # ==================== 사용 ====================
+    
+    def _pick(self) -> _PooledChannel:
+        self._ensure_channels()
+        with self._lock:
+            candidates = [entry for entry in self._channels if entry.healthy] or self._channels
+            entry = min(candidates, key=lambda item: (item.in_flight, item.requests))
+            entry.in_flight += 1
+            entry.requests += 1
+            return entry
+    
+    @contextmanager
+    def lease(self) -> Iterator[SpeechClient]:
+        """
+        호출 하나 동안 사용할 클라이언트 (진행 중인 요청이 가장 적은 정상 채널)
+        
+        스레드에서도 사용 가능하며, 연결 오류는 채널 상태 점검에 반영된다.
+        """
+        entry = self._pick()
+        try:
+            yield entry.client
+        except _CONNECTION_ERRORS:
+            entry.failures += 1
+            raise
+        else:
+            entry.failures = 0
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+    
+    def client(self) -> SpeechClient:
+        """호출 수 추적 없이 클라이언트 하나 반환 (하위 호환용)"""
+        entry = self._pick()
+        with self._lock:
+            entry.in_flight -= 1
+        return entry.client
+    
+    # ==================== 수명 관리 ====================
+    
+    def _warm_up_sync(self) -> None:
+        self._ensure_channels()
+        self._get_credentials().refresh(Request())
+        for entry in self._channels:
+            grpc.channel_ready_future(entry.channel).result(
+                timeout=settings.speech_channel_connect_timeout
+            )
+    
+    async def start(self) -> None:
+        """채널 연결/토큰 갱신 워밍업 후 상태 점검 시작"""
+        started = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._warm_up_sync)
+            self._warmup_ms = (time.perf_counter() - started) * 1000
+            self.logger.info(
+                "Speech channel pool warmed up",
+                channels=self.size,
+                elapsed_ms=round(self._warmup_ms, 1),
+            )
+        finally:
+            if self._health_task is None:
+                self._health_task = asyncio.create_task(self._health_loop())
+    
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.speech_channel_health_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                self.logger.warning("Speech channel health check failed", error=str(e))
+    
+    async def check_health(self) -> int:
+        """비정상 채널 재생성 (재생성한 채널 수 반환)"""
+        with self._lock:
+            unhealthy = [entry for entry in self._channels if not entry.healthy]
+        for entry in unhealthy:
+            await asyncio.get_running_loop().run_in_executor(None, self._rebuild, entry)
+        
+        with self._lock:
+            idle = [entry for entry in self._retired if entry.in_flight == 0]
+            self._retired = [entry for entry in self._retired if entry.in_flight > 0]
+        for entry in idle:
+            entry.channel.close()
+        
+        return len(unhealthy)
+    
+    async def close(self) -> None:
+        """상태 점검 중지 및 채널 종료"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        with self._lock:
+            channels, self._channels = self._channels + self._retired, []
+            self._retired = []
+        for entry in channels:
+            entry.channel.close()
+    
+    def get_stats(self) -> Dict:
+        """채널별 연결 상태/부하와 워밍업 시간"""
+        with self._lock:
+            channels = list(self._channels)
+        return {
+            "size": self.size,
+            "warmup_ms": round(self._warmup_ms, 1) if self._warmup_ms is not None else None,
+            "healthy": sum(1 for entry in channels if entry.healthy),
+            "in_flight": sum(entry.in_flight for entry in channels),
+            "channels": [
+                {
+                    "index": entry.index,
+                    "state": entry.state.name,
+                    "in_flight": entry.in_flight,
+                    "requests": entry.requests,
+                    "failures": entry.failures,
+                    "rebuilds": entry.rebuilds,
+                    "age_seconds": round(time.monotonic() - entry.created_at),
+                }
+                for entry in channels
+            ],
+        }
+
+
+# 싱글톤 인스턴스
+_speech_channel_pool: Optional[SpeechChannelPool] = None
+
+
+def get_speech_channel_pool() -> SpeechChannelPool:
+    """Speech 채널 풀 인스턴스 반환"""
+    global _speech_channel_pool
+    if _speech_channel_pool is None:
+        _speech_channel_pool = SpeechChannelPool()
+    return _speech_channel_pool
+
+
+async def close_speech_channel_pool() -> None:
+    """Speech 채널 풀 종료 (애플리케이션 종료 시 호출)"""
+    global _speech_channel_pool
+    if _speech_channel_pool is not None:
+        await _speech_channel_pool.close()
+        _speech_channel_pool = None
+
+
+
+
+
+
+
+
+
+
+
+
@@ -7,8 +7,9 @@ Google Cloud Speech-to-Text API를 사용한 실시간 음성 인식
 
 import asyncio
 import base64
-from typing import AsyncGenerator, Callable, Dict, List, Optional
-from dataclasses import dataclass
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, AsyncGenerator, Callable, Dict, Iterator, List, Optional
+from dataclasses import dataclass, field
 
 from google.cloud import speech_v1 as speech
 from google.cloud.speech_v1 import SpeechClient
@@ -21,10 +22,27 @@ from google.cloud.speech_v1.types import (
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.rate_limiter import get_rate_limiter
+from app.services.audio_ring_buffer import AudioRingBuffer
+from app.services.chunk_controller import AdaptiveChunkController, is_speech
+from app.services.recognition_config import LANGUAGE_CODES, get_recognition_config_registry
+from app.services.speech_channel_pool import get_speech_channel_pool
+
+if TYPE_CHECKING:
+    from app.services.streaming_recognition import StreamingRecognitionSession
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class WordTiming:
+    """단어별 타임스탬프 (밀리초)"""
+    word: str
+    start_ms: float
+    end_ms: float
+    speaker_tag: Optional[int] = None  # 화자 분리 시 단어 화자
+
+
 @dataclass
 class TranscriptionResult:
     """음성 인식 결과"""
@@ -33,28 +51,43 @@ class TranscriptionResult:
     confidence: float
     is_final: bool
     speaker_tag: Optional[int] = None
+    start_ms: Optional[float] = None  # 오디오 기준 시작 위치 (타임스탬프를 요청한 경우)
+    end_ms: Optional[float] = None
+    words: List[WordTiming] = field(default_factory=list)
+
+
+def pack_word_timings(words: List[WordTiming], base_ms: float = 0.0) -> List[list]:
+    """단어 타임스탬프를 저장용 압축 형식으로 변환 ([단어, base 기준 시작 ms, 끝 ms] 정수 목록)"""
+    return [
+        [word.word, int(round(word.start_ms - base_ms)), int(round(word.end_ms - base_ms))]
+        for word in words
+    ]
+
+
+def unpack_word_timings(packed: Optional[List[list]], base_ms: float = 0.0) -> List[WordTiming]:
+    """pack_word_timings() 결과를 WordTiming 목록으로 복원"""
+    return [
+        WordTiming(word=word, start_ms=base_ms + start, end_ms=base_ms + end)
+        for word, start, end in packed or ()
+    ]
+
+
+def _word_timings(alternative, offset_ms: float = 0.0) -> List[WordTiming]:
+    return [
+        WordTiming(
+            word=word.word,
+            start_ms=offset_ms + word.start_time.total_seconds() * 1000,
+            end_ms=offset_ms + word.end_time.total_seconds() * 1000,
+        )
+        for word in alternative.words
+    ]
 
 
 class SpeechService:
     """Google Cloud Speech-to-Text 서비스"""
     
     # 지원 언어 매핑 (ISO 639-1 -> BCP-47)
-    LANGUAGE_CODES = {
-        "ko": "ko-KR",
-        "en": "en-US",
-        "ja": "ja-JP",
-        "zh": "zh-CN",
-        "es": "es-ES",
-        "fr": "fr-FR",
-        "de": "de-DE",
-        "pt": "pt-BR",
-        "ru": "ru-RU",
-        "ar": "ar-SA",
-        "hi": "hi-IN",
-        "vi": "vi-VN",
-        "th": "th-TH",
-        "id": "id-ID",
-    }
+    LANGUAGE_CODES = LANGUAGE_CODES
     
     def __init__(self):
         self.logger = get_logger(__name__)
@@ -62,11 +95,23 @@ class SpeechService:
     
     @property
     def client(self) -> SpeechClient:
-        """Speech 클라이언트 (지연 초기화)"""
-        if self._client is None:
-            self._client = SpeechClient()
+        """Speech 클라이언트 (채널 풀 사용 시 풀의 클라이언트, 아니면 지연 초기화)"""
+        if self._client is not None:
+            return self._client
+        if settings.speech_channel_pool_enabled:
+            return get_speech_channel_pool().client()
+        self._client = SpeechClient()
         return self._client
     
+    @contextmanager
+    def lease_client(self) -> Iterator[SpeechClient]:
+        """호출 하나 동안 사용할 클라이언트 (채널 풀의 부하 분산/상태 점검 반영)"""
+        if self._client is None and settings.speech_channel_pool_enabled:
+            with get_speech_channel_pool().lease() as client:
+                yield client
+        else:
+            yield self.client
+    
     def _get_recognition_config(
         self,
         language_code: str = "ko",
@@ -75,41 +120,28 @@ class SpeechService:
         enable_speaker_diarization: bool = False,
         diarization_speaker_count: int = 2,
         alternative_language_codes: Optional[List[str]] = None,
+        profile: Optional[str] = None,
+        enable_word_time_offsets: bool = False,
     ) -> RecognitionConfig:
-        """음성 인식 설정 생성"""
-        
-        bcp47_code = self.LANGUAGE_CODES.get(language_code, "ko-KR")
-        
-        config = RecognitionConfig(
-            encoding=RecognitionConfig.AudioEncoding.LINEAR16,
-            sample_rate_hertz=sample_rate,
-            language_code=bcp47_code,
+        """음성 인식 설정 조회 (레지스트리의 공유 객체, 수정 금지)"""
+        return get_recognition_config_registry().get(
+            language_code=language_code,
+            sample_rate=sample_rate,
+            profile=profile,
+            enable_speaker_diarization=enable_speaker_diarization,
+            diarization_speaker_count=diarization_speaker_count,
+            alternative_language_codes=alternative_language_codes,
+            enable_word_time_offsets=enable_word_time_offsets,
             enable_automatic_punctuation=enable_automatic_punctuation,
-            model="latest_long",  # 긴 오디오에 적합한 모델
-            use_enhanced=True,  # 향상된 모델 사용
         )
-        
-        # 다중 언어 인식 (대체 언어)
-        if alternative_language_codes:
-            alt_codes = [
-                self.LANGUAGE_CODES.get(code, code)
-                for code in alternative_language_codes
-                if code != language_code
-            ]
-            config.alternative_language_codes = alt_codes[:3]  # 최대 3개
-        
-        # 화자 분리 설정
-        if enable_speaker_diarization:
-            config.enable_speaker_diarization = True
-            config.diarization_speaker_count = diarization_speaker_count
-        
-        return config
     
     async def transcribe_audio(
         self,
         audio_data: bytes,
         language_code: str = "ko",
         sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        enable_word_time_offsets: bool = False,
     ) -> Optional[TranscriptionResult]:
         """
         단일 오디오 청크 음성 인식
@@ -118,6 +150,8 @@ class SpeechService:
             audio_data: PCM 오디오 데이터
             language_code: 언어 코드 (ISO 639-1)
             sample_rate: 샘플링 레이트
+            profile: 인식 프로파일 (low_latency | accurate, None이면 기본값)
+            enable_word_time_offsets: 단어 타임스탬프 포함 여부 (청크 시작 기준 start_ms/end_ms/words)
             
         Returns:
             TranscriptionResult: 인식 결과
@@ -126,26 +160,36 @@ class SpeechService:
             config = self._get_recognition_config(
                 language_code=language_code,
                 sample_rate=sample_rate,
+                profile=profile,
+                enable_word_time_offsets=enable_word_time_offsets,
             )
             
             audio = speech.RecognitionAudio(content=audio_data)
             
             # 동기 API 호출을 비동기로 래핑
+            def recognize():
+                with self.lease_client() as client:
+                    return client.recognize(config=config, audio=audio)
+            
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.recognize(config=config, audio=audio)
+            response = await get_rate_limiter().call(
+                "speech",
+                lambda: loop.run_in_executor(None, recognize),
             )
             
             if response.results:
                 result = response.results[0]
                 alternative = result.alternatives[0]
+                words = _word_timings(alternative)
                 
                 return TranscriptionResult(
                     text=alternative.transcript,
                     language=language_code,
                     confidence=alternative.confidence,
                     is_final=True,
+                    start_ms=words[0].start_ms if words else None,
+                    end_ms=result.result_end_time.total_seconds() * 1000 if words else None,
+                    words=words,
                 )
             
             return None
@@ -154,6 +198,104 @@ class SpeechService:
             self.logger.error("Transcription failed", error=str(e))
             raise
     
+    def segment_config(
+        self,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        enable_speaker_diarization: bool = False,
+        diarization_speaker_count: int = 2,
+    ) -> RecognitionConfig:
+        """recognize_segments()가 사용하는 인식 설정 (단어 타임스탬프 포함, 공유 객체)"""
+        return get_recognition_config_registry().get(
+            language_code=language_code,
+            sample_rate=sample_rate,
+            profile=profile or "accurate",
+            enable_speaker_diarization=enable_speaker_diarization,
+            diarization_speaker_count=diarization_speaker_count,
+            enable_word_time_offsets=True,
+        )
+    
+    async def recognize_segments(
+        self,
+        audio_data: bytes,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+        offset_ms: float = 0.0,
+        enable_speaker_diarization: bool = False,
+        diarization_speaker_count: int = 2,
+    ) -> List[TranscriptionResult]:
+        """
+        오디오 구간의 모든 인식 결과를 단어 타임스탬프와 함께 반환 (파일 전사/재전사용)
+        
+        Args:
+            audio_data: PCM 오디오 데이터 (동기 인식 제한 1분 미만)
+            language_code: 언어 코드 (ISO 639-1)
+            sample_rate: 샘플링 레이트
+            profile: 인식 프로파일 (None이면 accurate)
+            offset_ms: 결과 타임스탬프에 더할 구간 시작 위치
+            enable_speaker_diarization: 화자 분리 (결과별 speaker_tag는 단어 화자 다수결)
+            diarization_speaker_count: 예상 화자 수
+        
+        Returns:
+            List[TranscriptionResult]: 시간 순 인식 결과 (start_ms/end_ms/words 포함)
+        """
+        config = self.segment_config(
+            language_code,
+            sample_rate,
+            profile,
+            enable_speaker_diarization=enable_speaker_diarization,
+            diarization_speaker_count=diarization_speaker_count,
+        )
+        audio = speech.RecognitionAudio(content=audio_data)
+        
+        def recognize():
+            with self.lease_client() as client:
+                return client.recognize(config=config, audio=audio)
+        
+        loop = asyncio.get_event_loop()
+        response = await get_rate_limiter().call(
+            "speech",
+            lambda: loop.run_in_executor(None, recognize),
+        )
+        
+        response_results = list(response.results)
+        
+        # 화자 분리 시 마지막 결과는 전체 단어의 화자 태그 모음
+        speaker_tags: List[int] = []
+        if enable_speaker_diarization and len(response_results) > 1:
+            summary = response_results.pop()
+            if summary.alternatives:
+                speaker_tags = [word.speaker_tag for word in summary.alternatives[0].words]
+        
+        results: List[TranscriptionResult] = []
+        segment_start_ms = offset_ms
+        word_index = 0
+        for result in response_results:
+            if not result.alternatives:
+                continue
+            alternative = result.alternatives[0]
+            end_ms = offset_ms + result.result_end_time.total_seconds() * 1000
+            words = _word_timings(alternative, offset_ms)
+            for word, tag in zip(words, speaker_tags[word_index:word_index + len(words)]):
+                word.speaker_tag = tag or None
+            tags = [word.speaker_tag for word in words if word.speaker_tag]
+            word_index += len(words)
+            results.append(TranscriptionResult(
+                text=alternative.transcript,
+                language=language_code,
+                confidence=alternative.confidence,
+                is_final=True,
+                speaker_tag=max(set(tags), key=tags.count) if tags else None,
+                start_ms=words[0].start_ms if words else segment_start_ms,
+                end_ms=end_ms,
+                words=words,
+            ))
+            segment_start_ms = end_ms
+        
+        return results
+    
     async def transcribe_audio_base64(
         self,
         audio_base64: str,
@@ -174,6 +316,35 @@ class SpeechService:
         audio_data = base64.b64decode(audio_base64)
         return await self.transcribe_audio(audio_data, language_code, sample_rate)
     
+    async def open_streaming_session(
+        self,
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        profile: Optional[str] = None,
+    ) -> "StreamingRecognitionSession":
+        """
+        장시간 스트리밍 인식 세션 시작 (스트림 자동 교체 및 겹침 이어붙이기)
+        
+        Args:
+            language_code: 언어 코드
+            sample_rate: 샘플링 레이트
+            profile: 인식 프로파일 (None이면 기본값)
+        
+        Returns:
+            StreamingRecognitionSession: send()/close()/results()로 사용하는 세션
+                (async with로 사용하면 블록을 벗어날 때 닫힘)
+        """
+        from app.services.streaming_recognition import StreamingRecognitionSession
+        
+        session = StreamingRecognitionSession(
+            self,
+            language_code=language_code,
+            sample_rate=sample_rate,
+            profile=profile,
+        )
+        await session.start()
+        return session
+    
     async def stream_transcribe(
         self,
         audio_stream: AsyncGenerator[bytes, None],
@@ -184,6 +355,8 @@ class SpeechService:
         """
         실시간 스트리밍 음성 인식
         
+        제공자 스트림 길이 제한을 넘는 오디오도 스트림을 자동 교체하며 끊김 없이 인식한다.
+        
         Args:
             audio_stream: 오디오 청크 생성기
             language_code: 언어 코드
@@ -193,55 +366,33 @@ class SpeechService:
         Yields:
             TranscriptionResult: 실시간 인식 결과
         """
-        config = self._get_recognition_config(
-            language_code=language_code,
-            sample_rate=sample_rate,
-        )
-        
-        streaming_config = StreamingRecognitionConfig(
-            config=config,
-            interim_results=True,  # 중간 결과 포함
-            single_utterance=False,  # 연속 발화 인식
-        )
+        session = await self.open_streaming_session(language_code, sample_rate)
         
-        async def request_generator():
-            """스트리밍 요청 생성기"""
-            # 첫 번째 요청: 설정
-            yield StreamingRecognizeRequest(streaming_config=streaming_config)
-            
-            # 이후 요청: 오디오 데이터
-            async for chunk in audio_stream:
-                yield StreamingRecognizeRequest(audio_content=chunk)
+        async def feed() -> None:
+            try:
+                async for chunk in audio_stream:
+                    await session.send(chunk)
+            finally:
+                await session.close()
         
-        try:
-            # 스트리밍 인식 실행
-            # 참고: 실제 구현에서는 gRPC 비동기 스트리밍 사용
-            requests = []
-            async for req in request_generator():
-                requests.append(req)
+        async with session:
+            feeder = asyncio.create_task(feed())
             
-            responses = self.client.streaming_recognize(requests=iter(requests))
+            try:
+                async for transcription in session.results():
+                    if on_result:
+                        on_result(transcription)
+                    
+                    yield transcription
+                
+                await feeder
             
-            for response in responses:
-                for result in response.results:
-                    if result.alternatives:
-                        alternative = result.alternatives[0]
-                        
-                        transcription = TranscriptionResult(
-                            text=alternative.transcript,
-                            language=language_code,
-                            confidence=alternative.confidence if result.is_final else 0.0,
-                            is_final=result.is_final,
-                        )
-                        
-                        if on_result:
-                            on_result(transcription)
-                        
-                        yield transcription
-                        
-        except Exception as e:
-            self.logger.error("Streaming transcription failed", error=str(e))
-            raise
+            except Exception as e:
+                self.logger.error("Streaming transcription failed", error=str(e))
+                raise
+            finally:
+                if not feeder.done():
+                    feeder.cancel()
     
     async def detect_language(
         self,
@@ -292,56 +443,71 @@ class SpeechService:
 
 
 class RealtimeSpeechProcessor:
-    """실시간 음성 처리기"""
+    """실시간 음성 처리기 (controller가 있으면 최소 버퍼 길이를 제어기가 결정)"""
     
-    def __init__(self, speech_service: SpeechService):
+    def __init__(
+        self,
+        speech_service: SpeechService,
+        sample_rate: int = 16000,
+        controller: Optional[AdaptiveChunkController] = None,
+        participant_id: str = "default",
+    ):
         self.speech_service = speech_service
         self.logger = get_logger(__name__)
-        self._audio_buffer: List[bytes] = []
-        self._buffer_duration_ms: int = 0
+        self.sample_rate = sample_rate
+        self.controller = controller
+        self.participant_id = participant_id
         self._min_buffer_ms: int = 500  # 최소 버퍼 (500ms)
         self._max_buffer_ms: int = 5000  # 최대 버퍼 (5초)
+        # 최대 버퍼 길이의 링 버퍼 (넘치면 오래된 샘플부터 버려 최근 데이터만 유지)
+        self._audio_buffer = AudioRingBuffer(sample_rate * self._max_buffer_ms // 1000)
+        self._min_samples = sample_rate * self._min_buffer_ms // 1000
     
     def add_audio_chunk(
         self,
         audio_data: bytes,
-        duration_ms: int,
-    ) -> Optional[bytes]:
+        duration_ms: Optional[int] = None,
+    ) -> Optional[memoryview]:
         """
         오디오 청크 추가 및 버퍼 관리
         
         Args:
-            audio_data: 오디오 데이터
-            duration_ms: 청크 길이 (밀리초)
+            audio_data: 오디오 데이터 (LINEAR16)
+            duration_ms: 청크 길이 (밀리초, 버퍼 길이는 샘플 수로 계산하므로 참고용)
             
         Returns:
-            bytes: 처리할 버퍼가 준비되면 반환, 아니면 None
+            memoryview: 처리할 버퍼가 준비되면 샘플 경계에 맞춘 창 반환 (다음 호출 전까지 유효), 아니면 None
         """
-        self._audio_buffer.append(audio_data)
-        self._buffer_duration_ms += duration_ms
+        self._audio_buffer.write(audio_data)
+        
+        if self.controller is not None:
+            return self._adaptive_flush(audio_data)
         
         # 버퍼가 최소 크기 이상이면 반환
-        if self._buffer_duration_ms >= self._min_buffer_ms:
-            buffer_data = b"".join(self._audio_buffer)
-            
-            # 버퍼가 최대 크기를 넘으면 일부만 유지
-            if self._buffer_duration_ms > self._max_buffer_ms:
-                # 최근 데이터만 유지
-                keep_ratio = self._max_buffer_ms / self._buffer_duration_ms
-                keep_bytes = int(len(buffer_data) * keep_ratio)
-                buffer_data = buffer_data[-keep_bytes:]
-            
-            self._audio_buffer = []
-            self._buffer_duration_ms = 0
-            
-            return buffer_data
+        if self._audio_buffer.available >= self._min_samples:
+            return self._audio_buffer.read()
         
         return None
     
+    def _adaptive_flush(self, audio_data: bytes) -> Optional[memoryview]:
+        """제어기 flush 크기에 도달했거나 발화가 끝났으면 모은 오디오 반환"""
+        bytes_per_ms = self.sample_rate * 2 / 1000
+        ended = self.controller.observe_audio(self.participant_id, len(audio_data) / bytes_per_ms, is_speech(audio_data))
+        target_samples = self.controller.chunk_ms(self.participant_id) * self.sample_rate // 1000
+        if self._audio_buffer.available >= target_samples:
+            trigger = "size"
+        elif ended and self._audio_buffer.available:
+            trigger = "segment_end"
+        else:
+            return None
+        
+        window = self._audio_buffer.read()
+        self.controller.record_flush(self.participant_id, len(window) / bytes_per_ms, trigger)
+        return window
+    
     def clear_buffer(self) -> None:
         """버퍼 초기화"""
-        self._audio_buffer = []
-        self._buffer_duration_ms = 0
+        self._audio_buffer.clear()
 
 
 
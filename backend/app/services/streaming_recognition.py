@@ -0,0 +1,398 @@
+"""
+장시간 스트리밍 음성 인식 세션
+============================
+
+제공자 스트림 길이 제한(약 5분)을 넘는 회의 오디오를 끊김 없이 인식한다.
+
+- 현재 스트림이 제한에 도달하기 overlap 초 전에 다음 스트림을 미리 열고
+  겹치는 구간의 오디오를 두 스트림에 모두 전송
+- 겹침 구간이 지나면 이전 스트림의 오디오를 종료하고 남은 최종 결과를 모두 수신
+- 결과는 스트림 순서대로 내보내고, 다음 스트림 결과 중 이미 내보낸 구간은
+  단어 타임스탬프(세션 기준 절대 시간)와 텍스트 겹침 비교로 제거
+- 스트림마다 전용 스레드에서 동기 gRPC 스트리밍 호출 (공유 executor를 오래 점유하지 않음)
+- async with로 사용하면 블록을 벗어날 때 세션을 닫고, 결과 수신 작업이 끝나면(취소 포함)
+  남은 스트림의 오디오를 닫아 전용 스레드가 남지 않게 함
+"""
+
+import asyncio
+import queue
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
+
+from google.cloud.speech_v1.types import StreamingRecognizeRequest
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.rate_limiter import get_rate_limiter
+from app.services.recognition_config import get_recognition_config_registry
+
+if TYPE_CHECKING:
+    from app.services.speech_service import SpeechService, TranscriptionResult
+
+logger = get_logger(__name__)
+
+# 공백 없이 이어 쓰는 언어 (문자 단위 비교/결합)
+_UNSPACED_LANGUAGES = ("ja", "zh", "th")
+
+_TOKEN_STRIP_RE = re.compile(r"^[\W_]+|[\W_]+$", re.UNICODE)
+
+_END = object()
+
+
+def _tokenize(text: str, unspaced: bool) -> List[str]:
+    return list(text.replace(" ", "")) if unspaced else text.split()
+
+
+def _token_key(token: str) -> str:
+    normalized = unicodedata.normalize("NFKC", token).casefold()
+    return _TOKEN_STRIP_RE.sub("", normalized)
+
+
+def merge_overlapping_text(
+    tail: str,
+    text: str,
+    unspaced: bool = False,
+    max_overlap: int = 30,
+    max_skip: int = 2,
+) -> str:
+    """
+    이미 내보낸 텍스트(tail)와 겹치는 text의 앞부분 제거
+    
+    tail의 끝 k개 토큰과 text의 j번째부터 k개 토큰이 같으면 text[:j+k]를 버린다.
+    새 스트림이 단어 중간에서 시작해 생긴 앞쪽 조각(최대 max_skip개)은 건너뛰고 비교한다.
+    
+    Args:
+        tail: 직전에 내보낸 최종 텍스트
+        text: 새 스트림의 결과 텍스트
+        unspaced: 문자 단위 비교 여부 (일본어/중국어/태국어)
+        max_overlap: 비교할 최대 겹침 토큰 수
+        max_skip: text 앞에서 건너뛸 수 있는 최대 토큰 수
+    
+    Returns:
+        str: 겹침을 제거한 텍스트 (겹침이 없으면 원본)
+    """
+    tail_tokens = [_token_key(token) for token in _tokenize(tail, unspaced)][-max_overlap:]
+    tokens = _tokenize(text, unspaced)
+    keys = [_token_key(token) for token in tokens]
+    
+    best_end = 0
+    for skip in range(0, min(max_skip, len(keys)) + 1):
+        for size in range(min(len(tail_tokens), len(keys) - skip), 0, -1):
+            if size < skip:
+                break  # 건너뛴 조각보다 짧은 겹침은 우연 일치로 본다
+            if tail_tokens[-size:] == keys[skip:skip + size] and any(tail_tokens[-size:]):
+                best_end = max(best_end, skip + size)
+                break
+    
+    remaining = tokens[best_end:]
+    return "".join(remaining) if unspaced else " ".join(remaining)
+
+
+@dataclass
+class _StreamLeg:
+    """세션 안의 제공자 스트림 하나"""
+    index: int
+    start_ms: float  # 세션 오디오 기준 시작 위치
+    audio: "queue.Queue[Optional[bytes]]" = field(default_factory=queue.Queue)
+    results: asyncio.Queue = field(default_factory=asyncio.Queue)
+    audio_closed: bool = False
+    stitched: bool = False  # 이전 스트림과 이어붙인 첫 최종 결과를 내보냈는지
+    thread: Optional[threading.Thread] = None
+    
+    def feed(self, chunk: bytes) -> None:
+        if not self.audio_closed:
+            self.audio.put(chunk)
+    
+    def close_audio(self) -> None:
+        if not self.audio_closed:
+            self.audio_closed = True
+            self.audio.put(None)
+
+
+class StreamingRecognitionSession:
+    """
+    스트림 자동 교체(롤오버)와 겹침 이어붙이기를 하는 장시간 인식 세션
+    
+    사용 예:
+        async with StreamingRecognitionSession(speech_service) as session:
+            await session.send(chunk)
+            ...
+    """
+    
+    def __init__(
+        self,
+        speech_service: "SpeechService",
+        language_code: str = "ko",
+        sample_rate: int = 16000,
+        max_stream_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        profile: Optional[str] = None,
+    ):
+        """
+        Args:
+            speech_service: 클라이언트/인식 설정을 제공하는 음성 인식 서비스
+            language_code: 언어 코드 (ISO 639-1)
+            sample_rate: 샘플링 레이트 (LINEAR16 모노 기준으로 오디오 길이 계산)
+            max_stream_seconds: 스트림 하나의 최대 길이 (제공자 제한보다 짧게)
+            overlap_seconds: 이전/다음 스트림에 모두 보내는 겹침 구간 길이
+            profile: 인식 프로파일 (None이면 기본값, 장시간 스트림은 accurate 권장)
+        """
+        self.speech_service = speech_service
+        self.language_code = language_code
+        self.sample_rate = sample_rate
+        self.profile = profile
+        self.max_stream_ms = (max_stream_seconds or settings.speech_stream_max_seconds) * 1000
+        self.overlap_ms = (overlap_seconds or settings.speech_stream_overlap_seconds) * 1000
+        self.unspaced = language_code.split("-")[0] in _UNSPACED_LANGUAGES
+        self.logger = get_logger(__name__)
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._legs: List[_StreamLeg] = []  # 아직 결과를 다 내보내지 않은 스트림 (순서대로)
+        self._leg_count = 0
+        self._audio_ms = 0.0
+        self._closed = False
+        self._output: asyncio.Queue = asyncio.Queue()
+        self._pump_task: Optional[asyncio.Task] = None
+        self._leg_ready = asyncio.Event()
+        
+        # 이어붙이기 상태
+        self._emitted_until_ms = 0.0  # 최종 결과로 내보낸 오디오 끝 위치 (세션 기준)
+        self._tail = ""  # 마지막으로 내보낸 최종 텍스트
+        
+        self._rollovers = 0
+        self._dropped_words = 0
+        self._dropped_results = 0
+    
+    async def __aenter__(self) -> "StreamingRecognitionSession":
+        if self._pump_task is None:
+            await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+        if exc_type is not None and self._pump_task is not None:
+            # 결과를 더 읽지 않고 떠나는 경우 수신 중단 (남은 스트림은 _pump의 finally에서 정리)
+            self._pump_task.cancel()
+    
+    # ==================== 오디오 입력 ====================
+    
+    async def start(self) -> None:
+        """첫 스트림 열기 및 결과 수신 시작"""
+        self._loop = asyncio.get_running_loop()
+        await self._open_leg(0.0)
+        self._pump_task = asyncio.create_task(self._pump())
+    
+    async def send(self, chunk: bytes) -> None:
+        """
+        오디오 청크 전송 (LINEAR16 모노)
+        
+        스트림 교체 시점이면 다음 스트림을 열고, 겹침 구간에서는 두 스트림에 모두 보낸다.
+        """
+        if self._closed:
+            raise RuntimeError("Streaming session is closed")
+        
+        chunk_start = self._audio_ms
+        self._audio_ms += len(chunk) / (self.sample_rate * 2) * 1000
+        
+        if not self._legs:
+            # 이전 스트림이 오류로 먼저 끝난 경우 현재 위치부터 새 스트림
+            await self._open_leg(chunk_start)
+        elif chunk_start - self._legs[-1].start_ms >= self.max_stream_ms - self.overlap_ms:
+            await self._open_leg(chunk_start)
+            self._rollovers += 1
+            self.logger.debug(
+                "Streaming recognition rollover",
+                leg=self._leg_count,
+                audio_seconds=round(chunk_start / 1000, 1),
+            )
+        
+        newest = self._legs[-1]
+        for leg in self._legs:
+            if leg.audio_closed:
+                continue
+            # 다음 스트림이 겹침 구간만큼 오디오를 받았으면 이전 스트림 오디오 종료
+            if leg is not newest and chunk_start - newest.start_ms >= self.overlap_ms:
+                leg.close_audio()
+                continue
+            leg.feed(chunk)
+    
+    async def close(self) -> None:
+        """오디오 입력 종료 (남은 결과는 results()로 계속 수신)"""
+        if self._closed:
+            return
+        self._closed = True
+        for leg in self._legs:
+            leg.close_audio()
+        self._leg_ready.set()
+    
+    async def results(self) -> AsyncIterator["TranscriptionResult"]:
+        """이어붙인 인식 결과 (세션 종료 후 모든 결과를 내보내면 끝남)"""
+        while True:
+            item = await self._output.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    # ==================== 제공자 스트림 ====================
+    
+    async def _open_leg(self, start_ms: float) -> None:
+        """새 제공자 스트림 열기 (전용 스레드에서 동기 스트리밍 호출)"""
+        await get_rate_limiter().acquire("speech")
+        if self._closed:
+            raise RuntimeError("Streaming session is closed")
+        
+        leg = _StreamLeg(index=self._leg_count, start_ms=start_ms, stitched=not self._leg_count)
+        self._leg_count += 1
+        
+        streaming_config = get_recognition_config_registry().streaming(
+            language_code=self.language_code,
+            sample_rate=self.sample_rate,
+            profile=self.profile,
+            enable_word_time_offsets=True,  # 겹침 구간 이어붙이기용
+        )
+        speech_service = self.speech_service
+        loop = self._loop
+        
+        def requests():
+            while True:
+                chunk = leg.audio.get()
+                if chunk is None:
+                    return
+                yield StreamingRecognizeRequest(audio_content=chunk)
+        
+        def run() -> None:
+            try:
+                with speech_service.lease_client() as client:
+                    for response in client.streaming_recognize(streaming_config, requests()):
+                        loop.call_soon_threadsafe(leg.results.put_nowait, response)
+            except Exception as e:
+                loop.call_soon_threadsafe(leg.results.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(leg.results.put_nowait, _END)
+        
+        leg.thread = threading.Thread(target=run, name=f"stt-stream-{leg.index}", daemon=True)
+        leg.thread.start()
+        self._legs.append(leg)
+        self._leg_ready.set()
+    
+    async def _pump(self) -> None:
+        """스트림 순서대로 결과를 이어붙여 출력 큐로 전달"""
+        try:
+            while True:
+                if not self._legs:
+                    if self._closed:
+                        break
+                    self._leg_ready.clear()
+                    await self._leg_ready.wait()
+                    continue
+                
+                leg = self._legs[0]
+                while True:
+                    response = await leg.results.get()
+                    if response is _END:
+                        break
+                    if isinstance(response, Exception):
+                        # 제공자 오류: 열려 있는 다음 스트림이 있으면 계속, 없으면 세션 오류
+                        self.logger.warning(
+                            "Streaming recognition leg failed",
+                            leg=leg.index,
+                            error=str(response),
+                        )
+                        if len(self._legs) == 1 and self._closed:
+                            raise response
+                        continue
+                    # 이전 스트림이 끝나기를 기다리는 동안 쌓인 중간 결과는 최신 것만 사용
+                    self._handle_response(leg, response, stale=not leg.results.empty())
+                
+                leg.close_audio()
+                self._legs.pop(0)
+        except Exception as e:
+            self._output.put_nowait(e)
+        finally:
+            # 정상 종료/오류/취소 모두 남은 스트림의 오디오를 닫아 전용 스레드를 끝냄
+            self._closed = True
+            for leg in self._legs:
+                leg.close_audio()
+            self._leg_ready.set()
+            self._output.put_nowait(_END)
+    
+    # ==================== 이어붙이기 ====================
+    
+    def _handle_response(self, leg: _StreamLeg, response, stale: bool) -> None:
+        from app.services.speech_service import TranscriptionResult
+        
+        for result in response.results:
+            if not result.alternatives:
+                continue
+            if not result.is_final and stale:
+                continue
+            
+            alternative = result.alternatives[0]
+            text, end_ms = self._trim_overlap(leg, result, alternative)
+            if not text.strip():
+                if result.is_final:
+                    self._dropped_results += 1
+                continue
+            
+            if result.is_final:
+                leg.stitched = True
+                self._tail = text
+                self._emitted_until_ms = max(self._emitted_until_ms, end_ms)
+            
+            self._output.put_nowait(TranscriptionResult(
+                text=text,
+                language=self.language_code,
+                confidence=alternative.confidence if result.is_final else 0.0,
+                is_final=result.is_final,
+            ))
+    
+    def _trim_overlap(self, leg: _StreamLeg, result, alternative) -> Tuple[str, float]:
+        """이미 내보낸 구간과 겹치는 앞부분 제거 후 (텍스트, 세션 기준 끝 위치) 반환"""
+        end_ms = leg.start_ms + result.result_end_time.total_seconds() * 1000
+        text = alternative.transcript
+        
+        # 첫 스트림이거나 겹침 구간을 이미 지난 스트림의 결과는 그대로 사용
+        if leg.stitched or leg.start_ms >= self._emitted_until_ms or not self._tail:
+            return text, end_ms
+        
+        if alternative.words:
+            kept = []
+            for word in alternative.words:
+                start = leg.start_ms + word.start_time.total_seconds() * 1000
+                end = leg.start_ms + word.end_time.total_seconds() * 1000
+                if (start + end) / 2 < self._emitted_until_ms:
+                    if result.is_final:
+                        self._dropped_words += 1
+                    continue
+                kept.append(word.word)
+            text = "".join(kept) if self.unspaced else " ".join(kept)
+        
+        # 타임스탬프 경계에서 남은 중복 단어는 텍스트 겹침으로 제거
+        return merge_overlapping_text(self._tail, text, unspaced=self.unspaced), end_ms
+    
+    def get_stats(self) -> Dict[str, float]:
+        """롤오버/중복 제거 통계"""
+        return {
+            "audio_seconds": round(self._audio_ms / 1000, 1),
+            "streams": self._leg_count,
+            "rollovers": self._rollovers,
+            "dropped_words": self._dropped_words,
+            "dropped_results": self._dropped_results,
+        }
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,222 @@
+"""
+음성 인식 결과 캐시 (내용 주소 기반)
+=================================
+
+같은 녹음을 다시 올리거나 번역 언어만 바꿔 다시 처리할 때 청크 인식을 생략한다.
+
+- 키: 디코딩된 PCM + 직렬화한 인식 설정(언어, 모델, 샘플링 레이트, 타임스탬프/화자 분리 옵션)의 SHA-256
+  (청크 분할은 PCM에 대해 결정적이므로 같은 파일은 같은 청크 키를 만든다)
+- 결과는 청크 시작 기준 상대 시간으로 저장해 파일 안 위치와 무관하게 재사용
+- 로컬 디스크에 키 앞 2글자 디렉터리로 나눠 저장, 용량을 넘으면 오래 쓰지 않은 항목부터 삭제
+- 파일 입출력은 작업 스레드에서 처리하고, 크기/최근 사용 순서는 메모리 색인으로 유지
+  (디렉터리는 처음 한 번만 훑음)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.speech_service import TranscriptionResult, WordTiming
+
+logger = get_logger(__name__)
+
+CACHE_VERSION = 1
+
+
+class SttResultCache:
+    """청크 단위 인식 결과 디스크 캐시"""
+    
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.logger = get_logger(__name__)
+        self.cache_dir = cache_dir or settings.stt_cache_dir
+        self.max_bytes = max_bytes or settings.stt_cache_max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._index: Optional["OrderedDict[str, int]"] = None  # 키 -> 크기 (최근 사용 순, 첫 기록 시 구성)
+        self._size: Optional[int] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    @staticmethod
+    def make_key(pcm: bytes, config_fingerprint: bytes) -> str:
+        """PCM과 인식 설정으로 캐시 키 생성"""
+        digest = hashlib.sha256()
+        digest.update(config_fingerprint)
+        digest.update(len(config_fingerprint).to_bytes(4, "big"))
+        digest.update(pcm)
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    async def get(self, key: str, offset_ms: float = 0.0) -> Optional[List[TranscriptionResult]]:
+        """
+        캐시된 인식 결과 조회
+        
+        Args:
+            key: make_key()로 만든 키
+            offset_ms: 결과 타임스탬프에 더할 청크 시작 위치
+        
+        Returns:
+            List[TranscriptionResult]: 결과 (없으면 None, 결과가 비어 있던 청크는 빈 목록)
+        """
+        entry = await asyncio.to_thread(self._read, key)
+        if entry is None or entry.get("v") != CACHE_VERSION:
+            self._misses += 1
+            return None
+        
+        self._hits += 1
+        language = entry["language"]
+        return [
+            TranscriptionResult(
+                text=item["text"],
+                language=language,
+                confidence=item["confidence"],
+                is_final=True,
+                speaker_tag=item.get("speaker_tag"),
+                start_ms=offset_ms + item["start_ms"],
+                end_ms=offset_ms + item["end_ms"],
+                words=[
+                    WordTiming(
+                        word=word,
+                        start_ms=offset_ms + start,
+                        end_ms=offset_ms + end,
+                        speaker_tag=speaker[0] if speaker else None,
+                    )
+                    for word, start, end, *speaker in item["words"]
+                ],
+            )
+            for item in entry["results"]
+        ]
+    
+    async def put(self, key: str, language: str, results: List[TranscriptionResult], offset_ms: float = 0.0) -> None:
+        """인식 결과 저장 (offset_ms를 빼서 청크 기준 상대 시간으로 기록)"""
+        entry = {
+            "v": CACHE_VERSION,
+            "language": language,
+            "results": [
+                {
+                    "text": result.text,
+                    "confidence": result.confidence,
+                    "speaker_tag": result.speaker_tag,
+                    "start_ms": (result.start_ms or offset_ms) - offset_ms,
+                    "end_ms": (result.end_ms or offset_ms) - offset_ms,
+                    "words": [
+                        # 단어 화자는 화자 분리 결과에만 기록
+                        [word.word, word.start_ms - offset_ms, word.end_ms - offset_ms]
+                        + ([word.speaker_tag] if word.speaker_tag else [])
+                        for word in result.words
+                    ],
+                }
+                for result in results
+            ],
+        }
+        await asyncio.to_thread(self._write, key, entry)
+    
+    # ==================== 디스크 (작업 스레드) ====================
+    
+    def _read(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)  # 최근 사용 시각 갱신 (재시작 후 색인 순서)
+        except (OSError, ValueError):
+            return None
+        
+        with self._lock:
+            if self._index is not None and key in self._index:
+                self._index.move_to_end(key)
+        return entry
+    
+    def _write(self, key: str, entry: Dict) -> None:
+        data = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode()
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.warning("STT cache write failed", error=str(e))
+            return
+        
+        with self._lock:
+            self._load_index()
+            self._size += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def _load_index(self) -> None:
+        """처음 한 번만 디렉터리를 훑어 최근 사용 순 색인 구성 (잠금 안에서 호출)"""
+        if self._index is not None:
+            return
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+        self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+        self._size = sum(self._index.values())
+    
+    def _evict(self) -> None:
+        """최근 사용 시각이 오래된 항목부터 삭제 (용량의 90%까지, 잠금 안에서 호출)"""
+        target = int(self.max_bytes * 0.9)
+        while self._index and self._size > target:
+            key, size = self._index.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.warning("STT cache evict failed", error=str(e))
+            self._size -= size
+            self._evictions += 1
+    
+    def get_stats(self) -> Dict[str, float]:
+        """적중률과 사용 용량"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+            "evictions": self._evictions,
+            "size_mb": round(self._size / 1024 / 1024, 1) if self._size is not None else None,
+        }
+
+
+# 싱글톤 인스턴스
+_stt_result_cache: Optional[SttResultCache] = None
+
+
+def get_stt_result_cache() -> SttResultCache:
+    """인식 결과 캐시 인스턴스 반환"""
+    global _stt_result_cache
+    if _stt_result_cache is None:
+        _stt_result_cache = SttResultCache()
+    return _stt_result_cache
+
+
+
+
+
+
+
+
+
+
+
+
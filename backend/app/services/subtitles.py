@@ -0,0 +1,376 @@
+"""
+자막 내보내기 (SRT / WebVTT)
+==========================
+
+회의 발화와 파일 전사 구간을 자막 큐로 배치해 스트리밍으로 내보낸다.
+
+- 원문 자막은 단어 타임스탬프로 큐를 나누고, 번역 자막은 발화 구간을 글자 수 비율로 나눔
+- 줄당 최대 글자 수 / 최대 줄 수 / 최소·최대 표시 시간 안에서 큐 배치,
+  문장 부호에서 우선 분할, 다음 큐와 겹치지 않게 끝 시각 조정 (큐 하나만 보류)
+- 발화/구간은 페이지 단위로 읽어 회의 전체를 메모리에 올리지 않음
+- 번역 자막은 저장된 번역을 사용 (없으면 원문)
+"""
+
+import html
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.rate_limiter import PriorityClass, priority_scope
+from app.services.speech_service import WordTiming, unpack_word_timings
+from app.services.usage_metering import usage_scope
+
+logger = get_logger(__name__)
+
+# 공백 없이 이어 쓰는 언어 (문자 단위 줄바꿈)
+_UNSPACED_LANGUAGES = ("ja", "zh", "th")
+
+_SENTENCE_ENDINGS = (".", "?", "!", "。", "？", "！", "…")
+
+# 줄 머리에 올 수 없는 부호 (공백 없는 언어)
+_CLOSING_MARKS = set("。、，．？！…」』）〕】〉》”’")
+
+# 스트리밍 응답 한 조각 크기
+_FLUSH_BYTES = 16 * 1024
+
+
+class SubtitleFormat(str, Enum):
+    """자막 형식"""
+    SRT = "srt"
+    VTT = "vtt"
+
+
+SUBTITLE_MEDIA_TYPES = {
+    SubtitleFormat.SRT: "application/x-subrip",
+    SubtitleFormat.VTT: "text/vtt",
+}
+
+
+@dataclass
+class SubtitleSegment:
+    """자막으로 배치할 발화 구간 (시작 기준 밀리초)"""
+    start_ms: float
+    end_ms: float
+    text: str
+    words: List[WordTiming] = field(default_factory=list)  # 원문 자막일 때만 사용
+
+
+@dataclass
+class SubtitleCue:
+    """자막 큐"""
+    start_ms: float
+    end_ms: float
+    lines: List[str]
+
+
+@dataclass
+class SubtitleLayout:
+    """큐 배치 제한"""
+    max_chars_per_line: int
+    max_lines: int
+    min_duration_ms: int
+    max_duration_ms: int
+    unspaced: bool = False
+    
+    @classmethod
+    def for_language(cls, language: str) -> "SubtitleLayout":
+        unspaced = language in _UNSPACED_LANGUAGES
+        return cls(
+            max_chars_per_line=(
+                settings.subtitle_max_chars_per_line_unspaced
+                if unspaced
+                else settings.subtitle_max_chars_per_line
+            ),
+            max_lines=settings.subtitle_max_lines,
+            min_duration_ms=settings.subtitle_min_cue_ms,
+            max_duration_ms=settings.subtitle_max_cue_ms,
+            unspaced=unspaced,
+        )
+
+
+class CueBuilder:
+    """발화 구간을 순서대로 받아 자막 큐로 배치"""
+    
+    def __init__(self, layout: SubtitleLayout):
+        self.layout = layout
+        self._pending: Optional[SubtitleCue] = None  # 다음 큐를 보고 끝 시각을 정할 큐
+    
+    def _join(self, tokens: List[str]) -> str:
+        return ("" if self.layout.unspaced else " ").join(tokens)
+    
+    def wrap(self, tokens: List[str]) -> List[str]:
+        """줄당 최대 글자 수로 줄바꿈 (한 토큰이 더 길면 그 줄만 초과)"""
+        lines: List[List[str]] = []
+        for token in tokens:
+            if lines and len(self._join(lines[-1] + [token])) <= self.layout.max_chars_per_line:
+                lines[-1].append(token)
+            else:
+                lines.append([token])
+        return [self._join(line) for line in lines]
+    
+    def _timed_tokens(self, segment: SubtitleSegment) -> List[Tuple[str, float, float]]:
+        if segment.words:
+            return [(word.word, word.start_ms, word.end_ms) for word in segment.words]
+        
+        # 타임스탬프가 없으면 구간을 글자 수 비율로 나눔
+        text = segment.text.strip()
+        if self.layout.unspaced:
+            # 문자 단위 (닫는 부호는 앞 글자에 붙여 줄 머리에 오지 않게)
+            tokens: List[str] = []
+            for char in text.replace(" ", ""):
+                if tokens and char in _CLOSING_MARKS:
+                    tokens[-1] += char
+                else:
+                    tokens.append(char)
+        else:
+            tokens = text.split()
+        total = sum(len(token) for token in tokens) or 1
+        duration = max(segment.end_ms - segment.start_ms, 0.0)
+        timed = []
+        position = 0
+        for token in tokens:
+            start = segment.start_ms + duration * position / total
+            position += len(token)
+            timed.append((token, start, segment.start_ms + duration * position / total))
+        return timed
+    
+    def add(self, segment: SubtitleSegment) -> List[SubtitleCue]:
+        """구간 추가 후 끝 시각이 확정된 큐 반환"""
+        cues: List[SubtitleCue] = []
+        current: List[Tuple[str, float, float]] = []
+        
+        def close() -> None:
+            if current:
+                cues.extend(self._push(SubtitleCue(
+                    start_ms=current[0][1],
+                    end_ms=current[-1][2],
+                    lines=self.wrap([token for token, _, _ in current]),
+                )))
+                current.clear()
+        
+        for timed in self._timed_tokens(segment):
+            candidate = [token for token, _, _ in current] + [timed[0]]
+            too_long = len(self.wrap(candidate)) > self.layout.max_lines
+            too_slow = current and timed[2] - current[0][1] > self.layout.max_duration_ms
+            if current and (too_long or too_slow):
+                close()
+            current.append(timed)
+            
+            # 문장 끝에서 최소 표시 시간을 채웠으면 분할
+            if timed[0].endswith(_SENTENCE_ENDINGS) and timed[2] - current[0][1] >= self.layout.min_duration_ms:
+                close()
+        
+        close()
+        return cues
+    
+    def _push(self, cue: SubtitleCue) -> List[SubtitleCue]:
+        previous, self._pending = self._pending, cue
+        if previous is None:
+            return []
+        
+        # 최소 표시 시간까지 늘리되 다음 큐와 겹치지 않게 (단, 최소 시간의 절반은 보장)
+        min_duration = self.layout.min_duration_ms
+        end = max(previous.end_ms, previous.start_ms + min_duration)
+        end = min(end, max(cue.start_ms, previous.start_ms + min_duration / 2))
+        previous.end_ms = end
+        if cue.start_ms < end:
+            cue.start_ms = end
+            cue.end_ms = max(cue.end_ms, end + min_duration / 2)
+        return [previous]
+    
+    def flush(self) -> List[SubtitleCue]:
+        """보류 중인 마지막 큐 반환"""
+        cue, self._pending = self._pending, None
+        if cue is None:
+            return []
+        cue.end_ms = max(cue.end_ms, cue.start_ms + self.layout.min_duration_ms)
+        return [cue]
+
+
+# ==================== 형식 ====================
+
+def format_timestamp(ms: float, subtitle_format: SubtitleFormat) -> str:
+    """HH:MM:SS,mmm (SRT) / HH:MM:SS.mmm (VTT)"""
+    hours, rest = divmod(int(round(ms)), 3_600_000)
+    minutes, rest = divmod(rest, 60_000)
+    seconds, millis = divmod(rest, 1000)
+    separator = "," if subtitle_format == SubtitleFormat.SRT else "."
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{millis:03d}"
+
+
+def render_cue(cue: SubtitleCue, index: int, subtitle_format: SubtitleFormat) -> str:
+    """큐 하나를 SRT/VTT 블록으로 변환"""
+    timing = (
+        f"{format_timestamp(cue.start_ms, subtitle_format)} --> "
+        f"{format_timestamp(cue.end_ms, subtitle_format)}"
+    )
+    lines = cue.lines
+    if subtitle_format == SubtitleFormat.VTT:
+        lines = [html.escape(line, quote=False) for line in lines]
+    return f"{index}\n{timing}\n" + "\n".join(lines) + "\n\n"
+
+
+async def write_subtitles(
+    segments: AsyncIterator[SubtitleSegment],
+    subtitle_format: SubtitleFormat,
+    language: str,
+) -> AsyncIterator[str]:
+    """
+    구간 스트림을 자막 파일 조각으로 변환 (스트리밍 응답용)
+    
+    Args:
+        segments: 시간 순 구간
+        subtitle_format: srt | vtt
+        language: 자막 언어 (줄바꿈 방식/줄 길이 결정)
+    
+    Yields:
+        str: 자막 파일 조각
+    """
+    builder = CueBuilder(SubtitleLayout.for_language(language))
+    buffer: List[str] = ["WEBVTT\n\n"] if subtitle_format == SubtitleFormat.VTT else []
+    size = 0
+    index = 1
+    
+    async for segment in segments:
+        for cue in builder.add(segment):
+            block = render_cue(cue, index, subtitle_format)
+            buffer.append(block)
+            size += len(block)
+            index += 1
+        if size >= _FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    
+    for cue in builder.flush():
+        buffer.append(render_cue(cue, index, subtitle_format))
+    if buffer:
+        yield "".join(buffer)
+
+
+# ==================== 데이터 소스 ====================
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def _estimated_duration_ms(text: str) -> float:
+    """타이밍이 없는 발화의 표시 시간 추정 (초당 약 15자)"""
+    return max(settings.subtitle_min_cue_ms, len(text) / 15 * 1000)
+
+
+async def meeting_subtitle_segments(
+    meeting_id: str,
+    language: str,
+    started_at: Optional[str] = None,
+) -> AsyncIterator[SubtitleSegment]:
+    """
+    회의 발화를 페이지 단위로 읽어 자막 구간으로 변환
+    
+    Args:
+        meeting_id: 회의 ID
+        language: 자막 언어 (원문 언어가 아니면 저장된 번역, 없으면 원문)
+        started_at: 회의 시작 시각 (ISO, 타이밍이 없는 발화의 기준. 없으면 첫 발화)
+    """
+    db = get_db()
+    reference = _parse_time(started_at)
+    page_size = settings.subtitle_page_size
+    offset = 0
+    
+    while True:
+        rows = await db.get_meeting_transcript_page(meeting_id, language, limit=page_size, offset=offset)
+        for row in rows:
+            original = row["original_language"] == language
+            translations = row.get("translations") or []
+            text = row["original_text"] if original or not translations else translations[0]["translated_text"]
+            if not text or not text.strip():
+                continue
+            
+            if row.get("start_ms") is not None:
+                start_ms = float(row["start_ms"])
+            else:
+                timestamp = _parse_time(row["timestamp"])
+                reference = reference or timestamp
+                start_ms = max(0.0, (timestamp - reference).total_seconds() * 1000)
+            end_ms = (
+                float(row["end_ms"])
+                if row.get("end_ms") is not None
+                else start_ms + _estimated_duration_ms(text)
+            )
+            
+            yield SubtitleSegment(
+                start_ms=start_ms,
+                end_ms=end_ms,
+                text=text,
+                words=unpack_word_timings(row.get("word_timings"), base_ms=start_ms) if original else [],
+            )
+        
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+async def media_subtitle_segments(
+    session_id: str,
+    language: str,
+    user_id: Optional[str] = None,
+) -> AsyncIterator[SubtitleSegment]:
+    """
+    파일 전사 구간을 페이지 단위로 읽어 자막 구간으로 변환
+    
+    전사 언어가 아닌 자막은 페이지마다 일괄 번역한다 (파일 전사는 번역을 저장하지 않음).
+    
+    Args:
+        session_id: 미디어 세션 ID
+        language: 자막 언어
+        user_id: 번역 사용량을 기록할 사용자 (세션 소유자)
+    """
+    from app.services.realtime_service import get_realtime_service
+    
+    db = get_db()
+    translation_service = get_realtime_service().translation_pipeline.translation_service
+    page_size = settings.subtitle_page_size
+    offset = 0
+    
+    while True:
+        rows = await db.get_media_transcript_segments(session_id, limit=page_size, offset=offset)
+        texts = [row["text"] for row in rows]
+        source_language = rows[0]["language"] if rows else language
+        
+        if rows and source_language != language:
+            with priority_scope(PriorityClass.BATCH), usage_scope(user_id, session_id=session_id):
+                results = await translation_service.translate_batch(texts, source_language, [language])
+            texts = [item["translations"].get(language, item["original"]) for item in results]
+        
+        for row, text in zip(rows, texts):
+            yield SubtitleSegment(
+                start_ms=float(row["start_ms"]),
+                end_ms=float(row["end_ms"]),
+                text=text,
+                words=(
+                    unpack_word_timings(row.get("words"), base_ms=row["start_ms"])
+                    if source_language == language
+                    else []
+                ),
+            )
+        
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+
+
+
+
+
+
+
+
+
+
@@ -5,6 +5,7 @@
 Google Gemini를 사용한 회의 요약 생성
 """
 
+import asyncio
 import json
 from typing import Dict, List, Optional
 
@@ -12,7 +13,8 @@ import google.generativeai as genai
 
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.services.translation_service import TranslationService
+from app.core.rate_limiter import PriorityClass, get_rate_limiter, priority_scope
+from app.services.translation_service import TranslationService, create_translation_service
 
 logger = get_logger(__name__)
 
@@ -46,9 +48,9 @@ class SummaryService:
 반드시 유효한 JSON 형식으로만 응답해주세요.
 """
     
-    def __init__(self):
+    def __init__(self, translation_service: Optional[TranslationService] = None):
         self.logger = get_logger(__name__)
-        self.translation_service = TranslationService()
+        self.translation_service = translation_service or create_translation_service()
         self._model: Optional[genai.GenerativeModel] = None
         
         # Gemini API 설정
@@ -118,8 +120,13 @@ class SummaryService:
         )
         
         try:
-            # Gemini API 호출
-            response = self.model.generate_content(prompt)
+            # Gemini API 호출 (요약 우선순위로 스케줄링)
+            loop = asyncio.get_event_loop()
+            with priority_scope(PriorityClass.SUMMARY):
+                response = await get_rate_limiter().call(
+                    "gemini",
+                    lambda: loop.run_in_executor(None, self.model.generate_content, prompt),
+                )
             
             # 응답 파싱
             response_text = response.text.strip()
@@ -205,13 +212,14 @@ class SummaryService:
         
         summaries = [primary_summary]
         
-        # 나머지 언어로 번역
-        for target_lang in languages[1:]:
-            translated_summary = await self._translate_summary(
-                summary=primary_summary,
-                target_language=target_lang,
-            )
-            summaries.append(translated_summary)
+        # 나머지 언어로 번역 (실시간 자막보다 낮은 우선순위)
+        with priority_scope(PriorityClass.SUMMARY):
+            for target_lang in languages[1:]:
+                translated_summary = await self._translate_summary(
+                    summary=primary_summary,
+                    target_language=target_lang,
+                )
+                summaries.append(translated_summary)
         
         return summaries
     
@@ -0,0 +1,374 @@
+"""
+번역 메모리 서비스
+=================
+
+이전 번역 결과를 재사용하여 반복 발화의 API 호출을 줄인다.
+
+- 정확 일치: (원본 언어, 대상 언어, 정규화된 원문) 해시 인덱스
+- 퍼지 일치: 문자 n-gram MinHash + LSH 밴드 인덱스 후 Jaccard 유사도 검증 (숫자열은 정확히 같아야 함)
+- 문장 끝 구두점 종류(물음표/느낌표/그 외)는 키에 남겨 의문문과 평서문을 구분
+- 기존 translations 테이블에서 메모리 구축
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# MinHash 파라미터
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCT_RE = re.compile(r"^[\s\W_]+|[\s\W_]+$", re.UNICODE)
+_TRAILING_PUNCT_RE = re.compile(r"[\s\W_]+$", re.UNICODE)
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def _sentence_end(text: str) -> str:
+    """문장 끝 구두점 종류 ("?", "!", 그 외는 "")"""
+    trailing = _TRAILING_PUNCT_RE.search(text)
+    if trailing is None:
+        return ""
+    punctuation = trailing.group()
+    if "?" in punctuation:
+        return "?"
+    return "!" if "!" in punctuation else ""
+
+
+def normalize_segment(text: str) -> str:
+    """
+    번역 메모리 키용 원문 정규화 (NFKC, 소문자, 공백/양끝 구두점 정리)
+    
+    양끝의 따옴표/괄호/마침표 등은 지우되 문장 끝 물음표/느낌표는 하나만 남긴다.
+    ("회의 시작할까요?"와 "회의 시작할까요."는 다른 키)
+    """
+    normalized = unicodedata.normalize("NFKC", text).casefold()
+    normalized = _WHITESPACE_RE.sub(" ", normalized)
+    stripped = _EDGE_PUNCT_RE.sub("", normalized)
+    return stripped + _sentence_end(normalized) if stripped else stripped
+
+
+@dataclass
+class TranslationMemoryMatch:
+    """번역 메모리 조회 결과"""
+    translated_text: str
+    similarity: float
+    is_exact: bool
+
+
+@dataclass
+class _MemoryEntry:
+    """번역 메모리 항목"""
+    translated_text: str
+    shingles: Optional[FrozenSet[int]] = None
+    signature: Optional[Tuple[int, ...]] = None
+
+
+class TranslationMemory:
+    """정확/퍼지 일치 번역 메모리"""
+    
+    def __init__(
+        self,
+        fuzzy_threshold: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        ngram_size: int = 3,
+        num_perm: int = 64,
+        bands: int = 16,
+        min_fuzzy_length: int = 8,
+        max_candidates: int = 16,
+    ):
+        self.logger = get_logger(__name__)
+        self.fuzzy_threshold = (
+            fuzzy_threshold
+            if fuzzy_threshold is not None
+            else settings.translation_memory_fuzzy_threshold
+        )
+        self.max_entries = max_entries or settings.translation_memory_max_entries
+        self.ngram_size = ngram_size
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_fuzzy_length = min_fuzzy_length
+        self.max_candidates = max_candidates
+        
+        rng = np.random.RandomState(1)
+        self._perm_a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._perm_b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        
+        # (src, tgt, 정규화 원문) -> 항목 (삽입 순서 = 오래된 순)
+        self._entries: "OrderedDict[Tuple[str, str, str], _MemoryEntry]" = OrderedDict()
+        # (src, tgt, 밴드 번호, 밴드 해시) -> 정규화 원문 집합
+        self._buckets: Dict[Tuple[str, str, int, int], Set[str]] = {}
+        
+        self._lookups = 0
+        self._exact_hits = 0
+        self._fuzzy_hits = 0
+        self._chars_saved = 0
+    
+    # ==================== 인덱싱 ====================
+    
+    def _shingles(self, normalized: str) -> FrozenSet[int]:
+        """문자 n-gram 해시 집합"""
+        n = self.ngram_size
+        if len(normalized) <= n:
+            return frozenset([zlib.crc32(normalized.encode("utf-8"))])
+        return frozenset(
+            zlib.crc32(normalized[i:i + n].encode("utf-8"))
+            for i in range(len(normalized) - n + 1)
+        )
+    
+    def _signature(self, shingles: FrozenSet[int]) -> Tuple[int, ...]:
+        """MinHash 시그니처"""
+        values = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        hashed = (np.outer(values, self._perm_a) + self._perm_b) % _MERSENNE_PRIME
+        return tuple(int(v) for v in (hashed & _MAX_HASH).min(axis=0))
+    
+    def _band_keys(
+        self,
+        source_language: str,
+        target_language: str,
+        signature: Tuple[int, ...],
+    ) -> List[Tuple[str, str, int, int]]:
+        """LSH 밴드 버킷 키 목록"""
+        return [
+            (source_language, target_language, band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+    
+    def add(
+        self,
+        source_text: str,
+        source_language: str,
+        target_language: str,
+        translated_text: str,
+    ) -> None:
+        """번역 결과 추가"""
+        if source_language == target_language or not translated_text:
+            return
+        
+        normalized = normalize_segment(source_text)
+        if not normalized:
+            return
+        
+        key = (source_language, target_language, normalized)
+        existing = self._entries.get(key)
+        if existing is not None:
+            existing.translated_text = translated_text
+            self._entries.move_to_end(key)
+            return
+        
+        entry = _MemoryEntry(translated_text=translated_text)
+        
+        if len(normalized) >= self.min_fuzzy_length:
+            entry.shingles = self._shingles(normalized)
+            entry.signature = self._signature(entry.shingles)
+            for bucket_key in self._band_keys(source_language, target_language, entry.signature):
+                self._buckets.setdefault(bucket_key, set()).add(normalized)
+        
+        self._entries[key] = entry
+        
+        while len(self._entries) > self.max_entries:
+            self._evict_oldest()
+    
+    def _evict_oldest(self) -> None:
+        """가장 오래된 항목 제거"""
+        (source_language, target_language, normalized), entry = self._entries.popitem(last=False)
+        if entry.signature is None:
+            return
+        
+        for bucket_key in self._band_keys(source_language, target_language, entry.signature):
+            bucket = self._buckets.get(bucket_key)
+            if bucket is not None:
+                bucket.discard(normalized)
+                if not bucket:
+                    del self._buckets[bucket_key]
+    
+    # ==================== 조회 ====================
+    
+    def lookup(
+        self,
+        source_text: str,
+        source_language: str,
+        target_language: str,
+    ) -> Optional[TranslationMemoryMatch]:
+        """
+        번역 메모리 조회
+        
+        Args:
+            source_text: 원본 텍스트
+            source_language: 원본 언어 코드
+            target_language: 대상 언어 코드
+        
+        Returns:
+            TranslationMemoryMatch: 일치 결과 (임계값 미만이면 None)
+        """
+        self._lookups += 1
+        normalized = normalize_segment(source_text)
+        if not normalized:
+            return None
+        
+        entry = self._entries.get((source_language, target_language, normalized))
+        if entry is not None:
+            self._exact_hits += 1
+            self._chars_saved += len(source_text)
+            return TranslationMemoryMatch(entry.translated_text, 1.0, True)
+        
+        if len(normalized) < self.min_fuzzy_length or self.fuzzy_threshold >= 1.0:
+            return None
+        
+        shingles = self._shingles(normalized)
+        signature = self._signature(shingles)
+        digits = _DIGITS_RE.findall(normalized)
+        ending = _sentence_end(normalized)
+        
+        # 일치하는 밴드 수가 많은 후보부터 최대 max_candidates개만 검증
+        band_hits: Counter = Counter()
+        for bucket_key in self._band_keys(source_language, target_language, signature):
+            band_hits.update(self._buckets.get(bucket_key, ()))
+        
+        best: Optional[TranslationMemoryMatch] = None
+        for candidate, _ in band_hits.most_common(self.max_candidates):
+            candidate_entry = self._entries.get((source_language, target_language, candidate))
+            if candidate_entry is None or candidate_entry.shingles is None:
+                continue
+            
+            union = len(shingles | candidate_entry.shingles)
+            similarity = len(shingles & candidate_entry.shingles) / union if union else 0.0
+            if similarity < self.fuzzy_threshold or (best is not None and similarity <= best.similarity):
+                continue
+            # 숫자가 다르거나 (날짜, 금액, 수량) 문장 종류(의문/감탄/평서)가 다르면 재사용하지 않음
+            if _DIGITS_RE.findall(candidate) != digits or _sentence_end(candidate) != ending:
+                continue
+            best = TranslationMemoryMatch(candidate_entry.translated_text, similarity, False)
+        
+        if best is not None:
+            self._fuzzy_hits += 1
+            self._chars_saved += len(source_text)
+        
+        return best
+    
+    def lookup_many(
+        self,
+        source_text: str,
+        source_language: str,
+        target_languages: List[str],
+    ) -> Dict[str, str]:
+        """여러 대상 언어에 대해 조회하여 {언어코드: 번역텍스트} 반환 (일치한 언어만)"""
+        matches = {}
+        for target_language in target_languages:
+            if target_language == source_language:
+                continue
+            match = self.lookup(source_text, source_language, target_language)
+            if match is not None:
+                matches[target_language] = match.translated_text
+        return matches
+    
+    # ==================== 구축 ====================
+    
+    async def load_from_db(self, limit: Optional[int] = None, page_size: int = 1000) -> int:
+        """
+        translations 테이블에서 번역 메모리 구축
+        
+        Args:
+            limit: 불러올 최대 번역 수 (최신순)
+            page_size: 페이지 크기
+        
+        Returns:
+            int: 추가된 항목 수
+        """
+        from app.core.database import get_db
+        
+        db = get_db()
+        limit = limit or settings.translation_memory_load_limit
+        # 최신순 페이지를 모아 키별 최신 번역만 남김 (이미 메모리에 있는 키는 실행 중 추가된 더 최신 번역)
+        latest: Dict[Tuple[str, str, str], Tuple[str, str, str, str]] = {}
+        offset = 0
+        
+        while offset < limit:
+            rows = await db.list_translations_with_source(
+                limit=min(page_size, limit - offset),
+                offset=offset,
+            )
+            if not rows:
+                break
+            
+            for row in rows:
+                utterance = row.get("utterances") or {}
+                original_text = utterance.get("original_text")
+                original_language = utterance.get("original_language")
+                if not original_text or not original_language:
+                    continue
+                
+                key = (original_language, row["target_language"], normalize_segment(original_text))
+                if key in latest or key in self._entries:
+                    continue
+                latest[key] = (original_text, original_language, row["target_language"], row["translated_text"])
+            
+            offset += len(rows)
+        
+        # 오래된 번역부터 넣어 최신 번역이 LRU에서 늦게 밀려나도록 역순 처리
+        for source_text, source_language, target_language, translated_text in reversed(list(latest.values())):
+            self.add(
+                source_text=source_text,
+                source_language=source_language,
+                target_language=target_language,
+                translated_text=translated_text,
+            )
+        loaded = len(latest)
+        
+        self.logger.info("Translation memory loaded", entries=len(self._entries), rows=loaded)
+        return loaded
+    
+    # ==================== 통계 ====================
+    
+    def get_stats(self) -> Dict[str, float]:
+        """적중률 및 절감 문자 수 통계"""
+        hits = self._exact_hits + self._fuzzy_hits
+        return {
+            "entries": len(self._entries),
+            "lookups": self._lookups,
+            "exact_hits": self._exact_hits,
+            "fuzzy_hits": self._fuzzy_hits,
+            "hit_rate": round(hits / self._lookups, 4) if self._lookups else 0.0,
+            "characters_saved": self._chars_saved,
+            "fuzzy_threshold": self.fuzzy_threshold,
+        }
+    
+    def clear(self) -> None:
+        """메모리 초기화"""
+        self._entries.clear()
+        self._buckets.clear()
+
+
+# 싱글톤 인스턴스
+_translation_memory: Optional[TranslationMemory] = None
+
+
+def get_translation_memory() -> TranslationMemory:
+    """번역 메모리 인스턴스 반환"""
+    global _translation_memory
+    if _translation_memory is None:
+        _translation_memory = TranslationMemory()
+    return _translation_memory
+
+
+
+
+
+
+
+
+
+
+
+
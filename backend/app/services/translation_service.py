@@ -6,12 +6,19 @@ Google Cloud Translation API를 사용한 실시간 번역
 """
 
 import asyncio
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
 
 from google.cloud import translate_v2 as translate
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.rate_limiter import PriorityClass, RateLimitExceeded, current_priority, get_rate_limiter
+from app.services.language_id import get_language_identifier
+from app.services.translation_memory import TranslationMemory
+from app.services.usage_metering import get_usage_meter
+
+if TYPE_CHECKING:
+    from app.services.utterance_batcher import UtteranceBatcher
 
 logger = get_logger(__name__)
 
@@ -48,6 +55,11 @@ class TranslationService:
             self._client = translate.Client()
         return self._client
     
+    async def warm_up(self) -> None:
+        """클라이언트 미리 생성 (자격 증명 로드, 세션 생성)"""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, lambda: self.client)
+    
     async def translate(
         self,
         text: str,
@@ -73,16 +85,20 @@ class TranslationService:
         
         try:
             loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.client.translate(
-                    text,
-                    source_language=source_language,
-                    target_language=target_language,
-                )
+            result = await get_rate_limiter().call(
+                "translate",
+                lambda: loop.run_in_executor(
+                    None,
+                    lambda: self.client.translate(
+                        text,
+                        source_language=source_language,
+                        target_language=target_language,
+                    )
+                ),
             )
             
             translated_text = result.get("translatedText", text)
+            get_usage_meter().record_translation(len(text), target_language)
             
             self.logger.debug(
                 "Translation completed",
@@ -103,6 +119,62 @@ class TranslationService:
             )
             raise
     
+    async def translate_texts(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str,
+        format_: str = "text",
+    ) -> List[str]:
+        """
+        여러 텍스트를 한 번의 API 호출로 번역
+        
+        Args:
+            texts: 원본 텍스트 목록
+            source_language: 원본 언어 코드
+            target_language: 대상 언어 코드
+            format_: 입력 형식 (text | html)
+        
+        Returns:
+            List[str]: 입력 순서와 동일한 번역 텍스트 목록
+        """
+        if not texts:
+            return []
+        
+        if source_language == target_language:
+            return list(texts)
+        
+        try:
+            loop = asyncio.get_event_loop()
+            results = await get_rate_limiter().call(
+                "translate",
+                lambda: loop.run_in_executor(
+                    None,
+                    lambda: self.client.translate(
+                        list(texts),
+                        source_language=source_language,
+                        target_language=target_language,
+                        format_=format_,
+                    )
+                ),
+            )
+            get_usage_meter().record_translation(sum(len(text) for text in texts), target_language)
+            
+            return [
+                result.get("translatedText", text)
+                for text, result in zip(texts, results)
+            ]
+        
+        except Exception as e:
+            self.logger.error(
+                "Batch translation failed",
+                error=str(e),
+                source=source_language,
+                target=target_language,
+                count=len(texts),
+            )
+            raise
+    
     async def translate_to_multiple(
         self,
         text: str,
@@ -119,32 +191,34 @@ class TranslationService:
             
         Returns:
             Dict[str, str]: {언어코드: 번역텍스트} 딕셔너리
+                (실시간 요청에서 속도 제한으로 폐기된 언어는 제외)
+        
+        Raises:
+            RateLimitExceeded: 배치/요약 우선순위 요청이 폐기된 경우
         """
         if not text.strip():
             return {lang: text for lang in target_languages}
         
         # 병렬 번역 실행
-        tasks = []
-        for target_lang in target_languages:
-            if target_lang == source_language:
-                continue
-            tasks.append(self._translate_with_lang(text, source_language, target_lang))
+        translate_languages = [
+            lang for lang in target_languages if lang != source_language
+        ]
+        tasks = [
+            self._translate_with_lang(text, source_language, target_lang)
+            for target_lang in translate_languages
+        ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         translations = {source_language: text}  # 원본 언어는 그대로
+        shed: List[str] = []
         
-        for i, target_lang in enumerate(target_languages):
-            if target_lang == source_language:
-                continue
-            
-            task_idx = sum(1 for l in target_languages[:i] if l != source_language) - 1
-            if task_idx < 0:
-                task_idx = 0
-            
-            result = results[task_idx] if task_idx < len(results) else None
-            
-            if isinstance(result, Exception):
+        for target_lang, result in zip(translate_languages, results):
+            if isinstance(result, RateLimitExceeded):
+                if current_priority() >= PriorityClass.BATCH:
+                    raise result
+                shed.append(target_lang)  # 원문으로 채우지 않음 (저하 상태로 전달, 캐시 제외)
+            elif isinstance(result, Exception):
                 self.logger.warning(
                     "Translation to language failed",
                     target=target_lang,
@@ -156,6 +230,13 @@ class TranslationService:
             else:
                 translations[target_lang] = text
         
+        if shed:
+            self.logger.warning(
+                "Translation shed by rate limiter",
+                source=source_language,
+                targets=shed,
+            )
+        
         return translations
     
     async def _translate_with_lang(
@@ -164,9 +245,11 @@ class TranslationService:
         source_language: str,
         target_language: str,
     ) -> str:
-        """번역 헬퍼 (에러 처리 포함)"""
+        """번역 헬퍼 (에러 처리 포함, 속도 제한 폐기는 호출자에게 전달)"""
         try:
             return await self.translate(text, source_language, target_language)
+        except RateLimitExceeded:
+            raise
         except Exception as e:
             self.logger.error(f"Translation error: {e}")
             return text
@@ -186,28 +269,135 @@ class TranslationService:
             target_languages: 대상 언어 코드 목록
             
         Returns:
-            List[Dict]: 각 텍스트의 번역 결과 목록
+            List[Dict]: 각 텍스트의 번역 결과 목록 (입력 순서)
         """
-        results = []
+        results: List[Optional[Dict]] = [None] * len(texts)
         
-        for text in texts:
-            translations = await self.translate_to_multiple(
-                text=text,
-                source_language=source_language,
-                target_languages=target_languages,
-            )
-            results.append({
-                "original": text,
-                "source_language": source_language,
-                "translations": translations,
-            })
+        async for item in self.translate_batch_stream(texts, source_language, target_languages):
+            index = item.pop("index")
+            results[index] = item
         
         return results
     
+    async def translate_batch_stream(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_languages: List[str],
+    ) -> AsyncIterator[Dict]:
+        """
+        일괄 번역 결과를 완료되는 대로 반환
+        
+        - 중복 텍스트는 한 번만 번역
+        - 고유 텍스트를 제공자 요청 한도(세그먼트 수/문자 수)로 나눈 청크를
+          언어별로 동시에 번역 (동시 요청 수 제한)
+        - 한 텍스트의 모든 언어 번역이 끝나면 즉시 반환 (완료 순서)
+        
+        Args:
+            texts: 원본 텍스트 목록
+            source_language: 원본 언어 코드
+            target_languages: 대상 언어 코드 목록
+        
+        Yields:
+            Dict: {"index", "original", "source_language", "translations"}
+        
+        Raises:
+            RateLimitExceeded: 배치/요약 우선순위 요청이 폐기된 경우 (원문으로 대체하지 않음)
+        """
+        languages = [lang for lang in dict.fromkeys(target_languages) if lang != source_language]
+        
+        # 고유 텍스트 -> 입력 위치 목록
+        positions: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            positions.setdefault(text, []).append(index)
+        
+        def result_items(text: str, translations: Dict[str, str]) -> List[Dict]:
+            return [
+                {
+                    "index": index,
+                    "original": text,
+                    "source_language": source_language,
+                    "translations": {source_language: text, **translations},
+                }
+                for index in positions[text]
+            ]
+        
+        pending: List[str] = []
+        for text in positions:
+            if languages and text.strip():
+                pending.append(text)
+            else:
+                for item in result_items(text, {lang: text for lang in languages}):
+                    yield item
+        
+        if not pending:
+            return
+        
+        chunks = self._chunk_texts(pending)
+        translations: Dict[str, Dict[str, str]] = {text: {} for text in pending}
+        semaphore = asyncio.Semaphore(settings.translation_bulk_concurrency)
+        
+        async def translate_chunk(chunk: List[str], lang: str) -> Tuple[List[str], str, List[str]]:
+            async with semaphore:
+                try:
+                    return chunk, lang, await self.translate_texts(chunk, source_language, lang)
+                except Exception as e:
+                    if isinstance(e, RateLimitExceeded) and current_priority() >= PriorityClass.BATCH:
+                        raise
+                    self.logger.warning(
+                        "Batch chunk translation failed",
+                        target=lang,
+                        count=len(chunk),
+                        error=str(e),
+                    )
+                    return chunk, lang, list(chunk)  # 실패 시 원본 반환
+        
+        # 앞쪽 청크의 모든 언어가 먼저 끝나도록 청크 순서대로 작업 생성
+        tasks = [
+            asyncio.ensure_future(translate_chunk(chunk, lang))
+            for chunk in chunks
+            for lang in languages
+        ]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                chunk, lang, translated = await next_done
+                for text, translated_text in zip(chunk, translated):
+                    translations[text][lang] = translated_text
+                    if len(translations[text]) == len(languages):
+                        for item in result_items(text, translations.pop(text)):
+                            yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    @staticmethod
+    def _chunk_texts(texts: List[str]) -> List[List[str]]:
+        """제공자 요청 한도(세그먼트 수, 문자 수)에 맞게 텍스트 분할"""
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        chars = 0
+        
+        for text in texts:
+            if current and (
+                len(current) >= settings.translation_bulk_chunk_size
+                or chars + len(text) > settings.translation_bulk_chunk_chars
+            ):
+                chunks.append(current)
+                current, chars = [], 0
+            current.append(text)
+            chars += len(text)
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
     async def detect_language(self, text: str) -> Dict[str, any]:
         """
         텍스트의 언어 감지
         
+        로컬 언어 감지 신뢰도가 임계값 미만일 때만 API를 호출한다.
+        
         Args:
             text: 감지할 텍스트
             
@@ -217,11 +407,29 @@ class TranslationService:
         if not text.strip():
             return {"language": "en", "confidence": 0.0}
         
+        if settings.language_id_local_enabled:
+            guess = get_language_identifier().identify(text)
+            if guess.confidence >= settings.language_id_min_confidence:
+                return {"language": guess.language, "confidence": guess.confidence}
+            
+            self.logger.debug(
+                "Local language ID below threshold, using API",
+                guess=guess.language,
+                confidence=guess.confidence,
+            )
+        
+        return await self._detect_language_remote(text)
+    
+    async def _detect_language_remote(self, text: str) -> Dict[str, any]:
+        """Translation API로 언어 감지"""
         try:
             loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                lambda: self.client.detect_language(text)
+            result = await get_rate_limiter().call(
+                "translate",
+                lambda: loop.run_in_executor(
+                    None,
+                    lambda: self.client.detect_language(text)
+                ),
             )
             
             return {
@@ -245,8 +453,15 @@ class TranslationService:
 class RealtimeTranslationPipeline:
     """실시간 번역 파이프라인"""
     
-    def __init__(self, translation_service: TranslationService):
+    def __init__(
+        self,
+        translation_service: TranslationService,
+        translation_memory: Optional[TranslationMemory] = None,
+        batcher: Optional["UtteranceBatcher"] = None,
+    ):
         self.translation_service = translation_service
+        self.translation_memory = translation_memory
+        self.batcher = batcher  # 같은 화자 연속 발화 묶음 번역 (선택)
         self.logger = get_logger(__name__)
         self._cache: Dict[str, Dict[str, str]] = {}  # 번역 캐시
         self._cache_max_size = 1000
@@ -257,6 +472,8 @@ class RealtimeTranslationPipeline:
         source_language: str,
         target_languages: List[str],
         use_cache: bool = True,
+        context_id: Optional[str] = None,
+        speaker_id: Optional[str] = None,
     ) -> Dict[str, str]:
         """
         발화 텍스트 번역 처리
@@ -266,9 +483,11 @@ class RealtimeTranslationPipeline:
             source_language: 원본 언어
             target_languages: 대상 언어 목록
             use_cache: 캐시 사용 여부
+            context_id: 묶음 번역 단위 (보통 회의 ID)
+            speaker_id: 화자 ID (context_id와 함께 주면 묶음 번역 사용)
             
         Returns:
-            Dict[str, str]: 번역 결과
+            Dict[str, str]: 번역 결과 (속도 제한으로 폐기된 언어는 제외되어 캐시되지 않음)
         """
         # 캐시 키 생성
         cache_key = f"{source_language}:{text}"
@@ -280,32 +499,144 @@ class RealtimeTranslationPipeline:
             if all(lang in cached for lang in target_languages):
                 return {lang: cached[lang] for lang in target_languages}
         
+        # 번역 메모리 확인 (정확/퍼지 일치는 API 호출 없이 사용)
+        remembered: Dict[str, str] = {}
+        if use_cache and self.translation_memory is not None:
+            remembered = self.translation_memory.lookup_many(
+                text, source_language, target_languages
+            )
+        
+        missing_languages = [
+            lang for lang in target_languages
+            if lang != source_language and lang not in remembered
+        ]
+        
         # 번역 실행
-        translations = await self.translation_service.translate_to_multiple(
-            text=text,
-            source_language=source_language,
-            target_languages=target_languages,
-        )
+        if missing_languages and self.batcher is not None and context_id and speaker_id:
+            translations = await self.batcher.translate(
+                context_id=context_id,
+                speaker_id=speaker_id,
+                text=text,
+                source_language=source_language,
+                target_languages=missing_languages,
+            )
+        elif missing_languages:
+            translations = await self.translation_service.translate_to_multiple(
+                text=text,
+                source_language=source_language,
+                target_languages=missing_languages,
+            )
+        else:
+            translations = {source_language: text}
+        
+        if use_cache:
+            self._remember(text, source_language, translations, missing_languages)
+        
+        translations.update(remembered)
         
         # 캐시 저장
         if use_cache:
-            if len(self._cache) >= self._cache_max_size:
-                # 캐시 크기 초과 시 오래된 항목 제거
-                keys_to_remove = list(self._cache.keys())[:100]
-                for key in keys_to_remove:
-                    del self._cache[key]
-            
-            if cache_key not in self._cache:
-                self._cache[cache_key] = {}
-            self._cache[cache_key].update(translations)
+            self._cache_put(cache_key, translations)
         
         return translations
     
+    async def preload(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_languages: List[str],
+    ) -> int:
+        """
+        자주 쓰는 문구를 미리 번역하여 캐시/번역 메모리에 적재
+        
+        이미 모든 대상 언어가 캐시나 번역 메모리에 있는 문구는 건너뛰고,
+        나머지는 일괄 번역(중복 제거, 청크 병렬 처리)으로 한 번에 번역한다.
+        
+        Args:
+            texts: 원본 문구 목록
+            source_language: 원본 언어
+            target_languages: 대상 언어 목록
+        
+        Returns:
+            int: 새로 번역한 문구 수
+        """
+        languages = [lang for lang in dict.fromkeys(target_languages) if lang != source_language]
+        if not languages:
+            return 0
+        
+        pending: List[str] = []
+        for text in dict.fromkeys(texts):
+            if not text.strip():
+                continue
+            cached = self._cache.get(f"{source_language}:{text}", {})
+            missing = [lang for lang in languages if lang not in cached]
+            if missing and self.translation_memory is not None:
+                remembered = self.translation_memory.lookup_many(text, source_language, missing)
+                missing = [lang for lang in missing if lang not in remembered]
+            if missing:
+                pending.append(text)
+        
+        if not pending:
+            return 0
+        
+        results = await self.translation_service.translate_batch(pending, source_language, languages)
+        
+        for item in results:
+            text = item["original"]
+            # 실패한 언어는 원문이 반환되므로 적재하지 않음
+            translations = {
+                lang: translated_text
+                for lang, translated_text in item["translations"].items()
+                if lang == source_language or translated_text != text
+            }
+            self._remember(text, source_language, translations, languages)
+            self._cache_put(f"{source_language}:{text}", translations)
+        
+        return len(pending)
+    
+    def _remember(
+        self,
+        text: str,
+        source_language: str,
+        translations: Dict[str, str],
+        languages: List[str],
+    ) -> None:
+        """새 번역을 번역 메모리에 추가 (실패 시 원문이 반환되므로 제외)"""
+        if self.translation_memory is None:
+            return
+        for lang in languages:
+            translated_text = translations.get(lang)
+            if translated_text and translated_text != text:
+                self.translation_memory.add(text, source_language, lang, translated_text)
+    
+    def _cache_put(self, cache_key: str, translations: Dict[str, str]) -> None:
+        """번역 캐시 저장"""
+        if len(self._cache) >= self._cache_max_size:
+            # 캐시 크기 초과 시 오래된 항목 제거
+            keys_to_remove = list(self._cache.keys())[:100]
+            for key in keys_to_remove:
+                del self._cache[key]
+        
+        if cache_key not in self._cache:
+            self._cache[cache_key] = {}
+        self._cache[cache_key].update(translations)
+    
     def clear_cache(self) -> None:
         """캐시 초기화"""
         self._cache.clear()
 
 
+def create_translation_service() -> TranslationService:
+    """설정된 번역 백엔드(sdk/http)에 맞는 번역 서비스 생성"""
+    if settings.translation_hedging_enabled:
+        from app.services.hedged_translation_service import create_hedged_translation_service
+        return create_hedged_translation_service()
+    if settings.translation_backend == "http":
+        from app.services.http_translation_service import HttpTranslationService
+        return HttpTranslationService()
+    return TranslationService()
+
+
 
 
 
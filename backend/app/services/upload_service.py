@@ -0,0 +1,297 @@
+"""
+재개 가능한 청크 업로드
+=====================
+
+대용량(최대 2GB) 미디어 파일을 tus 방식 오프셋 업로드로 받는다.
+
+- 업로드 생성 시 전체 크기만큼 파일을 미리 할당하고, 청크는 요청 본문을
+  버퍼링하지 않고 받은 조각을 해당 오프셋에 바로 기록 (메모리 사용량이 파일 크기와 무관)
+- Upload-Offset이 현재 오프셋과 다르면 거부, 끊긴 업로드는 HEAD로 오프셋 조회 후 재개
+- Upload-Checksum(sha1/sha256/md5, base64)이 있으면 청크 단위 검증 후에만 오프셋 확정
+- 업로드 상태는 저장 디렉터리의 uploads/{upload_id}.json에 기록 (재시작 후에도 재개 가능)
+- follow()로 업로드가 끝나기 전부터 확정된 구간을 순서대로 읽을 수 있음 (전사 조기 시작)
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Upload-Checksum 알고리즘 (tus checksum 확장)
+CHECKSUM_ALGORITHMS = ("sha1", "sha256", "md5")
+
+
+class UploadError(Exception):
+    """업로드 요청 오류 (status_code는 HTTP 상태 코드)"""
+    
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class ResumableUploadService:
+    """오프셋 기반 재개 가능 업로드 관리"""
+    
+    def __init__(self, storage_dir: Optional[str] = None):
+        self.logger = get_logger(__name__)
+        self.storage_dir = os.path.realpath(storage_dir or settings.media_storage_dir)
+        self._uploads: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._progress: Dict[str, asyncio.Event] = {}
+        self._bytes_received = 0
+        self._checksum_failures = 0
+    
+    # ==================== 상태 ====================
+    
+    def _state_path(self, upload_id: str) -> str:
+        return os.path.join(self.storage_dir, "uploads", f"{upload_id}.json")
+    
+    def _file_path(self, upload: Dict[str, Any]) -> str:
+        return os.path.join(self.storage_dir, upload["file_path"])
+    
+    def _save(self, upload: Dict[str, Any]) -> None:
+        path = self._state_path(upload["upload_id"])
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(upload, f)
+        os.replace(temp_path, path)
+    
+    def get_upload(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """업로드 상태 조회 (메모리에 없으면 상태 파일에서 복원)"""
+        upload = self._uploads.get(upload_id)
+        if upload is None:
+            try:
+                with open(self._state_path(upload_id)) as f:
+                    upload = self._uploads[upload_id] = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return upload
+    
+    def find_by_path(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """file_path로 업로드 조회 (media/{user_id}/{upload_id}/{filename})"""
+        parts = file_path.strip("/").split("/")
+        upload = self.get_upload(parts[2]) if len(parts) >= 4 else None
+        return upload if upload and upload["file_path"] == file_path.strip("/") else None
+    
+    # ==================== 업로드 ====================
+    
+    def create_upload(
+        self,
+        user_id: str,
+        filename: str,
+        file_size: int,
+        mime_type: str,
+    ) -> Dict[str, Any]:
+        """
+        업로드 생성 및 파일 미리 할당
+        
+        Returns:
+            Dict: upload_id, file_path, length, offset 등 업로드 상태
+        """
+        upload_id = str(uuid4())
+        safe_name = os.path.basename(filename) or "upload"
+        upload = {
+            "upload_id": upload_id,
+            "user_id": user_id,
+            "file_path": f"media/{user_id}/{upload_id}/{safe_name}",
+            "filename": safe_name,
+            "mime_type": mime_type,
+            "length": file_size,
+            "offset": 0,
+            "completed": file_size == 0,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        
+        path = self._file_path(upload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.makedirs(os.path.dirname(self._state_path(upload_id)), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o640)
+        try:
+            if file_size and hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, file_size)
+            else:
+                os.ftruncate(fd, file_size)
+        finally:
+            os.close(fd)
+        
+        self._uploads[upload_id] = upload
+        self._save(upload)
+        
+        self.logger.info("Upload created", upload_id=upload_id, length=file_size)
+        return upload
+    
+    @staticmethod
+    def _parse_checksum(header: Optional[str]):
+        if not header:
+            return None, None
+        algorithm, _, value = header.strip().partition(" ")
+        if algorithm not in CHECKSUM_ALGORITHMS or not value:
+            raise UploadError(400, f"지원하지 않는 체크섬입니다: {algorithm}")
+        try:
+            return hashlib.new(algorithm), base64.b64decode(value, validate=True)
+        except ValueError:
+            raise UploadError(400, "체크섬 값이 올바른 base64가 아닙니다.")
+    
+    async def write_chunk(
+        self,
+        upload_id: str,
+        offset: int,
+        body: AsyncIterator[bytes],
+        checksum: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        청크 기록 (요청 본문 조각을 받는 즉시 파일의 해당 위치에 기록)
+        
+        Args:
+            upload_id: 업로드 ID
+            offset: 클라이언트가 보낸 Upload-Offset
+            body: 요청 본문 스트림
+            checksum: Upload-Checksum 헤더 ("<algorithm> <base64 digest>")
+        
+        Returns:
+            Dict: 갱신된 업로드 상태
+        
+        Raises:
+            UploadError: 404(없음), 409(오프셋 불일치), 413(크기 초과),
+                423(다른 청크 기록 중), 460(체크섬 불일치)
+        """
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            raise UploadError(404, "업로드를 찾을 수 없습니다.")
+        
+        lock = self._locks.setdefault(upload_id, asyncio.Lock())
+        if lock.locked():
+            raise UploadError(423, "다른 청크를 기록하는 중입니다.")
+        
+        async with lock:
+            if offset != upload["offset"]:
+                raise UploadError(409, f"오프셋이 일치하지 않습니다 (현재 {upload['offset']}).")
+            if settings.upload_require_checksum and not checksum:
+                raise UploadError(400, "Upload-Checksum 헤더가 필요합니다.")
+            digest, expected = self._parse_checksum(checksum)
+            
+            received = 0
+            completed = False
+            fd = os.open(self._file_path(upload), os.O_WRONLY)
+            try:
+                async for data in body:
+                    if offset + received + len(data) > upload["length"]:
+                        raise UploadError(413, "업로드 크기를 초과했습니다.")
+                    os.pwrite(fd, data, offset + received)
+                    if digest is not None:
+                        digest.update(data)
+                    received += len(data)
+                    self._bytes_received += len(data)
+                completed = True
+            finally:
+                os.close(fd)
+                # 체크섬 없는 청크는 끊겨도 받은 만큼 확정 (tus 규약)
+                if completed or digest is None:
+                    if digest is not None and digest.digest() != expected:
+                        self._checksum_failures += 1
+                        raise UploadError(460, "체크섬이 일치하지 않습니다.")
+                    self._commit(upload, offset + received)
+        
+        return upload
+    
+    def _commit(self, upload: Dict[str, Any], offset: int) -> None:
+        upload["offset"] = offset
+        if offset >= upload["length"]:
+            upload["completed"] = True
+            upload["completed_at"] = datetime.utcnow().isoformat()
+            self.logger.info("Upload completed", upload_id=upload["upload_id"], length=upload["length"])
+        self._save(upload)
+        
+        event = self._progress.get(upload["upload_id"])
+        if event is not None:
+            event.set()
+    
+    def delete_upload(self, upload_id: str) -> bool:
+        """업로드 취소 (파일과 상태 삭제)"""
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            return False
+        for path in (self._file_path(upload), self._state_path(upload_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._uploads.pop(upload_id, None)
+        self._locks.pop(upload_id, None)
+        event = self._progress.pop(upload_id, None)
+        if event is not None:
+            event.set()
+        return True
+    
+    # ==================== 업로드 중 읽기 ====================
+    
+    async def follow(self, upload_id: str, read_size: int = 256 * 1024) -> AsyncIterator[bytes]:
+        """
+        확정된 구간을 처음부터 순서대로 읽기 (업로드가 끝날 때까지 새 청크를 기다림)
+        
+        Raises:
+            UploadError: 업로드가 삭제됨
+        """
+        position = 0
+        while True:
+            upload = self.get_upload(upload_id)
+            if upload is None:
+                raise UploadError(404, "업로드가 취소되었습니다.")
+            
+            if position < upload["offset"]:
+                with open(self._file_path(upload), "rb", buffering=0) as f:
+                    while position < upload["offset"]:
+                        data = os.pread(f.fileno(), min(read_size, upload["offset"] - position), position)
+                        if not data:
+                            break
+                        position += len(data)
+                        yield data
+                continue
+            
+            if upload["completed"]:
+                return
+            
+            event = self._progress.setdefault(upload_id, asyncio.Event())
+            event.clear()
+            await event.wait()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """진행 중 업로드 수와 수신 바이트"""
+        return {
+            "active": sum(1 for upload in self._uploads.values() if not upload["completed"]),
+            "bytes_received": self._bytes_received,
+            "checksum_failures": self._checksum_failures,
+        }
+
+
+# 싱글톤 인스턴스
+_upload_service: Optional[ResumableUploadService] = None
+
+
+def get_upload_service() -> ResumableUploadService:
+    """업로드 서비스 인스턴스 반환"""
+    global _upload_service
+    if _upload_service is None:
+        _upload_service = ResumableUploadService()
+    return _upload_service
+
+
+
+
+
+
+
+
+
+
+
+
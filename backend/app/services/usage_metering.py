@@ -0,0 +1,241 @@
+"""
+번역 사용량 계량
+===============
+
+번역 계층에서 실제 API로 보낸 문자 수를 사용자/세션별로 메모리에 집계하고
+주기적으로(또는 세션 종료 시) usage_records에 묶어서 기록한다.
+
+- 번역 API 호출이 성공한 경우에만 집계 (캐시/번역 메모리 적중은 API를 거치지 않으므로 제외)
+- 과금 주체는 contextvar 범위(usage_scope)로 전달 (실시간 파이프라인, REST 엔드포인트)
+- 발화마다 행을 쓰지 않고 (사용자, 세션, 회의)별 한 행으로 합쳐 일괄 insert
+- 기록 실패 시 집계를 되돌려 다음 주기에 재시도
+"""
+
+import asyncio
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class UsageScope:
+    """과금 주체"""
+    user_id: str
+    session_id: Optional[str] = None  # media_sessions.id
+    meeting_id: Optional[str] = None
+
+
+_current_scope: contextvars.ContextVar[Optional[UsageScope]] = contextvars.ContextVar(
+    "usage_scope", default=None
+)
+
+
+@contextmanager
+def usage_scope(
+    user_id: Optional[str],
+    session_id: Optional[str] = None,
+    meeting_id: Optional[str] = None,
+) -> Iterator[None]:
+    """블록 안의 번역 사용량을 지정한 사용자/세션에 집계 (user_id가 없으면 집계 안 함)"""
+    scope = UsageScope(user_id, session_id, meeting_id) if user_id else None
+    token = _current_scope.set(scope)
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+def current_usage_scope() -> Optional[UsageScope]:
+    """현재 과금 주체 (범위 밖이면 None)"""
+    return _current_scope.get()
+
+
+@dataclass
+class _UsageBucket:
+    """집계 중인 사용량"""
+    characters: int = 0
+    requests: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+    period_start: datetime = field(default_factory=datetime.utcnow)
+    period_end: datetime = field(default_factory=datetime.utcnow)
+    
+    def merge(self, other: "_UsageBucket") -> None:
+        self.characters += other.characters
+        self.requests += other.requests
+        for lang, chars in other.languages.items():
+            self.languages[lang] = self.languages.get(lang, 0) + chars
+        self.period_start = min(self.period_start, other.period_start)
+        self.period_end = max(self.period_end, other.period_end)
+
+
+class UsageMeter:
+    """번역 문자 수 계량기"""
+    
+    def __init__(self, flush_interval: Optional[float] = None):
+        self.logger = get_logger(__name__)
+        self.flush_interval = flush_interval or settings.usage_flush_interval_seconds
+        self._buckets: Dict[Tuple[str, Optional[str], Optional[str]], _UsageBucket] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        
+        self._recorded_chars = 0
+        self._unscoped_chars = 0
+        self._flushed_rows = 0
+        self._flushed_chars = 0
+        self._flush_failures = 0
+    
+    def record_translation(self, characters: int, target_language: str) -> None:
+        """
+        번역 API 호출 1회의 과금 문자 수 집계
+        
+        Args:
+            characters: API로 보낸 원문 문자 수
+            target_language: 대상 언어
+        """
+        if not settings.usage_metering_enabled or characters <= 0:
+            return
+        
+        scope = current_usage_scope()
+        if scope is None:
+            self._unscoped_chars += characters
+            return
+        
+        key = (scope.user_id, scope.session_id, scope.meeting_id)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _UsageBucket()
+        
+        bucket.characters += characters
+        bucket.requests += 1
+        bucket.languages[target_language] = bucket.languages.get(target_language, 0) + characters
+        bucket.period_end = datetime.utcnow()
+        self._recorded_chars += characters
+    
+    async def flush(
+        self,
+        session_id: Optional[str] = None,
+        meeting_id: Optional[str] = None,
+    ) -> int:
+        """
+        집계된 사용량을 usage_records에 일괄 기록
+        
+        Args:
+            session_id: 지정 시 해당 미디어 세션 사용량만 기록
+            meeting_id: 지정 시 해당 회의 사용량만 기록
+        
+        Returns:
+            int: 기록한 행 수
+        """
+        from app.schemas.billing import UsageType
+        from app.services.billing_service import get_billing_service
+        
+        async with self._flush_lock:
+            keys = [
+                key for key in self._buckets
+                if (session_id is None or key[1] == session_id)
+                and (meeting_id is None or key[2] == meeting_id)
+            ]
+            if not keys:
+                return 0
+            
+            taken = {key: self._buckets.pop(key) for key in keys}
+            records = [
+                {
+                    "user_id": user_id,
+                    "session_id": session,
+                    "usage_type": UsageType.TRANSLATION,
+                    "quantity": Decimal(bucket.characters),
+                    "unit": "characters",
+                    "metadata": {
+                        "meeting_id": meeting,
+                        "requests": bucket.requests,
+                        "languages": bucket.languages,
+                        "period_start": bucket.period_start.isoformat(),
+                        "period_end": bucket.period_end.isoformat(),
+                    },
+                }
+                for (user_id, session, meeting), bucket in taken.items()
+            ]
+            
+            try:
+                await get_billing_service().record_usage_bulk(records)
+            except Exception as e:
+                # 다음 주기에 다시 기록하도록 집계 복원
+                for key, bucket in taken.items():
+                    current = self._buckets.get(key)
+                    if current is not None:
+                        bucket.merge(current)
+                    self._buckets[key] = bucket
+                self._flush_failures += 1
+                self.logger.error("Usage flush failed", rows=len(records), error=str(e))
+                return 0
+            
+            self._flushed_rows += len(records)
+            self._flushed_chars += sum(bucket.characters for bucket in taken.values())
+            self.logger.debug("Usage flushed", rows=len(records), session_id=session_id, meeting_id=meeting_id)
+            return len(records)
+    
+    def start(self) -> None:
+        """주기적 기록 작업 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+    
+    async def stop(self) -> None:
+        """주기적 기록 중지 후 남은 사용량 기록"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """집계/기록 통계"""
+        return {
+            "pending_rows": len(self._buckets),
+            "pending_chars": sum(bucket.characters for bucket in self._buckets.values()),
+            "recorded_chars": self._recorded_chars,
+            "unscoped_chars": self._unscoped_chars,
+            "flushed_rows": self._flushed_rows,
+            "flushed_chars": self._flushed_chars,
+            "flush_failures": self._flush_failures,
+        }
+
+
+# 싱글톤 인스턴스
+_usage_meter: Optional[UsageMeter] = None
+
+
+def get_usage_meter() -> UsageMeter:
+    """사용량 계량기 인스턴스 반환"""
+    global _usage_meter
+    if _usage_meter is None:
+        _usage_meter = UsageMeter()
+    return _usage_meter
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,285 @@
+"""
+발화 묶음 번역 서비스
+===================
+
+같은 화자의 연속 발화를 짧은 지연 예산 안에서 모아 한 번의 요청으로 번역한다.
+
+- 첫 발화 도착 후 batch_window_ms 안에 들어온 같은 화자의 발화를 한 묶음으로 처리
+- 다른 화자의 발화가 들어오거나 묶음 크기 한도에 도달하면 즉시 번역
+- 각 발화를 HTML 세그먼트 마커(<span id="N">)로 감싸 번역 후 다시 분리
+- 마커가 깨지면 발화 목록을 그대로 묶음 번역하여 대체 (문맥 없이)
+- 속도 제한으로 폐기된 언어는 원문으로 채우지 않고 결과에서 제외 (저하 상태로 전달)
+"""
+
+import asyncio
+import functools
+import html
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.rate_limiter import RateLimitExceeded
+from app.services.translation_service import TranslationService
+
+logger = get_logger(__name__)
+
+_SEGMENT_RE = re.compile(r'<span id="?(\d+)"?>(.*?)</span>', re.S | re.I)
+
+
+@dataclass
+class _PendingSegment:
+    """묶음에 포함된 발화"""
+    text: str
+    target_languages: List[str]
+    future: asyncio.Future
+    enqueued: float
+
+
+@dataclass
+class _Batch:
+    """화자별 대기 중인 발화 묶음"""
+    speaker_id: str
+    source_language: str
+    segments: List[_PendingSegment] = field(default_factory=list)
+    chars: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def join_segments(texts: List[str]) -> str:
+    """발화 목록을 세그먼트 마커가 있는 HTML로 결합"""
+    return " ".join(
+        f'<span id="{index}">{html.escape(text, quote=False)}</span>'
+        for index, text in enumerate(texts)
+    )
+
+
+def split_segments(translated: str, count: int) -> Optional[List[str]]:
+    """번역된 HTML을 세그먼트별로 분리 (마커가 어긋나면 None)"""
+    parts: Dict[int, str] = {}
+    for match in _SEGMENT_RE.finditer(translated):
+        parts[int(match.group(1))] = html.unescape(match.group(2)).strip()
+    
+    if sorted(parts) != list(range(count)):
+        return None
+    return [parts[index] for index in range(count)]
+
+
+class UtteranceBatcher:
+    """화자별 연속 발화 묶음 번역기"""
+    
+    def __init__(
+        self,
+        translation_service: TranslationService,
+        window_ms: Optional[float] = None,
+        max_segments: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ):
+        self.translation_service = translation_service
+        self.logger = get_logger(__name__)
+        self.window = (window_ms if window_ms is not None else settings.translation_batch_window_ms) / 1000
+        self.max_segments = max_segments or settings.translation_batch_max_segments
+        self.max_chars = max_chars or settings.translation_batch_max_chars
+        
+        # 컨텍스트(회의) ID -> 대기 중인 묶음
+        self._batches: Dict[str, _Batch] = {}
+        self._tasks: Set[asyncio.Task] = set()  # 진행 중인 묶음 번역
+        
+        self._batches_flushed = 0
+        self._segments = 0
+        self._api_calls = 0
+        self._fallbacks = 0
+        self._shed = 0  # 속도 제한으로 폐기된 언어별 묶음 수
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+    
+    async def translate(
+        self,
+        context_id: str,
+        speaker_id: str,
+        text: str,
+        source_language: str,
+        target_languages: List[str],
+    ) -> Dict[str, str]:
+        """
+        발화를 묶음에 추가하고 번역 결과 대기
+        
+        Args:
+            context_id: 묶음 단위 (보통 회의 ID)
+            speaker_id: 화자 ID
+            text: 원본 텍스트
+            source_language: 원본 언어
+            target_languages: 대상 언어 목록
+        
+        Returns:
+            Dict[str, str]: {언어코드: 번역텍스트} (원본 언어 포함)
+        """
+        languages = [lang for lang in target_languages if lang != source_language]
+        if not languages or not text.strip():
+            return {source_language: text, **{lang: text for lang in languages}}
+        
+        batch = self._batches.get(context_id)
+        if batch is not None and (
+            batch.speaker_id != speaker_id or batch.source_language != source_language
+        ):
+            # 다른 화자가 말하기 시작하면 이전 화자의 묶음은 바로 번역
+            self._flush(context_id)
+            batch = None
+        
+        if batch is None:
+            batch = _Batch(speaker_id=speaker_id, source_language=source_language)
+            self._batches[context_id] = batch
+            batch.timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush, context_id
+            )
+        
+        segment = _PendingSegment(
+            text=text,
+            target_languages=languages,
+            future=asyncio.get_running_loop().create_future(),
+            enqueued=time.perf_counter(),
+        )
+        batch.segments.append(segment)
+        batch.chars += len(text)
+        
+        if len(batch.segments) >= self.max_segments or batch.chars >= self.max_chars:
+            self._flush(context_id)
+        
+        return await segment.future
+    
+    def _flush(self, context_id: str) -> None:
+        """대기 중인 묶음 번역 시작"""
+        batch = self._batches.pop(context_id, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._translate_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._on_batch_done, batch))
+    
+    def _on_batch_done(self, batch: _Batch, task: asyncio.Task) -> None:
+        """묶음 번역 완료 (실패하면 기록하고 기다리는 발화에 오류 전달)"""
+        self._tasks.discard(task)
+        error = asyncio.CancelledError() if task.cancelled() else task.exception()
+        if error is None:
+            return
+        if not task.cancelled():
+            self.logger.error("Batch translation failed", segments=len(batch.segments), error=str(error))
+        for segment in batch.segments:
+            if not segment.future.done():
+                segment.future.set_exception(error)
+    
+    async def _translate_batch(self, batch: _Batch) -> None:
+        """언어별로 묶음을 한 번에 번역하여 각 발화의 결과 전달"""
+        started = time.perf_counter()
+        segments = batch.segments
+        results: List[Dict[str, str]] = [
+            {batch.source_language: segment.text} for segment in segments
+        ]
+        
+        languages: List[str] = []
+        for segment in segments:
+            for lang in segment.target_languages:
+                if lang not in languages:
+                    languages.append(lang)
+        
+        async def translate_language(lang: str) -> None:
+            indexes = [i for i, segment in enumerate(segments) if lang in segment.target_languages]
+            texts = [segments[i].text for i in indexes]
+            translated = await self._translate_texts(texts, batch.source_language, lang)
+            if translated is None:
+                return
+            for index, translated_text in zip(indexes, translated):
+                results[index][lang] = translated_text
+        
+        await asyncio.gather(*(translate_language(lang) for lang in languages))
+        
+        self._batches_flushed += 1
+        self._segments += len(segments)
+        for segment, result in zip(segments, results):
+            waited = started - segment.enqueued
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            if not segment.future.done():
+                segment.future.set_result(result)
+    
+    async def _translate_texts(
+        self,
+        texts: List[str],
+        source_language: str,
+        target_language: str,
+    ) -> Optional[List[str]]:
+        """세그먼트 마커로 결합해 번역 (실패 시 원문, 속도 제한으로 폐기되면 None 반환)"""
+        try:
+            if len(texts) > 1:
+                self._api_calls += 1
+                translated = await self.translation_service.translate_texts(
+                    [join_segments(texts)],
+                    source_language,
+                    target_language,
+                    format_="html",
+                )
+                split = split_segments(translated[0], len(texts))
+                if split is not None:
+                    return split
+                
+                self._fallbacks += 1
+                self.logger.debug(
+                    "Segment markers lost, translating segments separately",
+                    source=source_language,
+                    target=target_language,
+                    count=len(texts),
+                )
+            
+            self._api_calls += 1
+            return await self.translation_service.translate_texts(
+                texts, source_language, target_language
+            )
+        
+        except RateLimitExceeded as e:
+            self._shed += 1
+            self.logger.warning(
+                "Batched translation shed by rate limiter",
+                target=target_language,
+                count=len(texts),
+                error=str(e),
+            )
+            return None
+        
+        except Exception as e:
+            self.logger.warning(
+                "Batched translation failed",
+                target=target_language,
+                count=len(texts),
+                error=str(e),
+            )
+            return list(texts)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """묶음 크기, API 호출 수, 대기 시간 통계"""
+        segments = self._segments or 1
+        return {
+            "batches": self._batches_flushed,
+            "segments": self._segments,
+            "avg_batch_size": round(self._segments / self._batches_flushed, 2) if self._batches_flushed else 0.0,
+            "api_calls": self._api_calls,
+            "marker_fallbacks": self._fallbacks,
+            "shed": self._shed,
+            "avg_wait_ms": round(self._wait_total / segments * 1000, 1),
+            "max_wait_ms": round(self._wait_max * 1000, 1),
+        }
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,13 @@
+"""성능 벤치마크 스크립트"""
+
+
+
+
+
+
+
+
+
+
+
+
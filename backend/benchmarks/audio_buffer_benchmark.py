@@ -0,0 +1,206 @@
+"""
+오디오 버퍼 할당/복사 벤치마크
+===========================
+
+동시 화자 수만큼 20ms 청크를 흘려 넣어 오디오 1초당 메모리 할당과 복사량을 비교한다.
+
+- bytearray: 링 버퍼 도입 전 AudioBufferManager / RealtimeSpeechProcessor와 같은 방식
+  (extend로 이어 붙이고 bytes(...)/b"".join으로 복사한 뒤 새로 할당)
+- ring: AudioRingBuffer 기반 (미리 할당, memoryview 창 반환)
+- 화자별 버퍼 생성과 첫 1초는 측정에서 제외 (정상 상태 비교, 미리 할당한 크기는 reserved_MB로 표시)
+- 할당량은 tracemalloc으로 호출마다 측정한 일시 최대 할당의 합 (하한)
+- 복사량은 버퍼로 들어오는 복사를 제외한 내부 복사 (bytearray 재할당 추정치는 제외)
+- 반환된 창은 인식 요청 직전처럼 바로 소비하고 버림
+
+실행:
+    cd backend
+    python -m benchmarks.audio_buffer_benchmark --speakers 500 --seconds 10
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import numpy as np  # noqa: E402
+
+from app.core.logging import setup_logging  # noqa: E402
+from app.services.realtime_service import AudioBufferManager  # noqa: E402
+from app.services.speech_service import RealtimeSpeechProcessor  # noqa: E402
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 20
+
+
+class BytearrayBufferManager:
+    """링 버퍼 도입 전 AudioBufferManager와 같은 방식"""
+    
+    def __init__(self, buffer_duration_ms: int = 1000):
+        self.buffer_size = SAMPLE_RATE * 2 * buffer_duration_ms // 1000
+        self._buffers: Dict[str, bytearray] = {}
+        self.copied_bytes = 0
+    
+    def add_chunk(self, participant_id: str, data: bytes) -> Optional[bytes]:
+        if participant_id not in self._buffers:
+            self._buffers[participant_id] = bytearray()
+        self._buffers[participant_id].extend(data)
+        if len(self._buffers[participant_id]) >= self.buffer_size:
+            buffer_data = bytes(self._buffers[participant_id])
+            self.copied_bytes += len(buffer_data)
+            self._buffers[participant_id] = bytearray()
+            return buffer_data
+        return None
+
+
+class BytearrayProcessor:
+    """링 버퍼 도입 전 RealtimeSpeechProcessor와 같은 방식"""
+    
+    def __init__(self):
+        self._audio_buffer: List[bytes] = []
+        self._buffer_duration_ms = 0
+        self.copied_bytes = 0
+    
+    def add_audio_chunk(self, audio_data: bytes, duration_ms: int) -> Optional[bytes]:
+        self._audio_buffer.append(audio_data)
+        self._buffer_duration_ms += duration_ms
+        if self._buffer_duration_ms >= 500:
+            buffer_data = b"".join(self._audio_buffer)
+            self.copied_bytes += len(buffer_data)
+            if self._buffer_duration_ms > 5000:
+                keep_bytes = int(len(buffer_data) * 5000 / self._buffer_duration_ms)
+                buffer_data = buffer_data[-keep_bytes:]
+                self.copied_bytes += keep_bytes
+            self._audio_buffer = []
+            self._buffer_duration_ms = 0
+            return buffer_data
+        return None
+
+
+def make_chunks(count: int) -> List[bytes]:
+    """화자마다 다른 20ms LINEAR16 청크 (입력 버퍼는 측정 전에 만들어 둠)"""
+    rng = np.random.default_rng(0)
+    samples = SAMPLE_RATE * CHUNK_MS // 1000
+    return [rng.integers(-3000, 3000, samples, dtype=np.int16).tobytes() for _ in range(count)]
+
+
+def run(kind: str, speakers: int, seconds: int, traced: bool) -> Dict[str, float]:
+    chunks = make_chunks(speakers)
+    participants = [f"speaker-{index}" for index in range(speakers)]
+    
+    if kind == "bytearray":
+        manager = BytearrayBufferManager()
+        processors = [BytearrayProcessor() for _ in range(speakers)]
+    else:
+        manager = AudioBufferManager()
+        processors = [RealtimeSpeechProcessor(speech_service=None) for _ in range(speakers)]
+    
+    allocated = 0
+    windows = 0
+    
+    def step(index: int) -> int:
+        count = 0
+        if manager.add_chunk(participants[index], chunks[index]) is not None:
+            count += 1
+        if processors[index].add_audio_chunk(chunks[index], CHUNK_MS) is not None:
+            count += 1
+        return count
+    
+    # 워밍업: 화자별 버퍼 생성 (링 버퍼는 여기서 미리 할당)
+    for _ in range(1000 // CHUNK_MS):
+        for index in range(speakers):
+            step(index)
+    if kind == "bytearray":
+        manager.copied_bytes = 0
+        for processor in processors:
+            processor.copied_bytes = 0
+        preallocated = 0
+    else:
+        for buffer in [*manager._buffers.values(), *(processor._audio_buffer for processor in processors)]:
+            buffer.mirrored_bytes = 0
+        preallocated = sum(buffer._samples.nbytes for buffer in manager._buffers.values()) + sum(
+            processor._audio_buffer._samples.nbytes for processor in processors
+        )
+    
+    rounds = seconds * 1000 // CHUNK_MS
+    if traced:
+        tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for index in range(speakers):
+            if traced:
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                windows += step(index)
+                allocated += tracemalloc.get_traced_memory()[1] - before
+            else:
+                windows += step(index)
+    elapsed = time.perf_counter() - started
+    if traced:
+        tracemalloc.stop()
+    
+    if kind == "bytearray":
+        copied = manager.copied_bytes + sum(processor.copied_bytes for processor in processors)
+    else:
+        copied = sum(buffer.mirrored_bytes for buffer in manager._buffers.values()) + sum(
+            processor._audio_buffer.mirrored_bytes for processor in processors
+        )
+    
+    return {
+        "elapsed": elapsed,
+        "allocated": allocated,
+        "copied": copied,
+        "windows": windows,
+        "preallocated": preallocated,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--speakers", type=int, default=500, help="동시 화자 수")
+    parser.add_argument("--seconds", type=int, default=10, help="화자별 오디오 길이")
+    args = parser.parse_args()
+    
+    setup_logging()
+    audio_seconds = args.seconds
+    print(f"speakers: {args.speakers}  audio: {args.seconds}s/speaker  chunk: {CHUNK_MS}ms")
+    print(f"{'buffer':<10} {'cpu_ms/s':>9} {'alloc_MB/s':>11} {'copy_MB/s':>10} {'windows/s':>10} {'reserved_MB':>12}")
+    results = {}
+    for kind in ("bytearray", "ring"):
+        timed = run(kind, args.speakers, args.seconds, traced=False)
+        traced = run(kind, args.speakers, args.seconds, traced=True)
+        results[kind] = traced
+        print(
+            f"{kind:<10} {timed['elapsed'] / audio_seconds * 1000:>9.2f} "
+            f"{traced['allocated'] / audio_seconds / 1e6:>11.2f} "
+            f"{traced['copied'] / audio_seconds / 1e6:>10.2f} "
+            f"{traced['windows'] / audio_seconds:>10.1f} "
+            f"{traced['preallocated'] / 1e6:>12.1f}"
+        )
+    
+    saved_alloc = (results["bytearray"]["allocated"] - results["ring"]["allocated"]) / audio_seconds
+    saved_copy = (results["bytearray"]["copied"] - results["ring"]["copied"]) / audio_seconds
+    print(f"eliminated per second of audio: alloc {saved_alloc / 1e6:.2f} MB, copy {saved_copy / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,176 @@
+"""
+요청당 의존성 생성 비용 벤치마크
+==============================
+
+요청마다 서비스를 새로 만드는 방식(기존 get_translation_service)과
+애플리케이션 범위 서비스 컨테이너를 Depends로 주입하는 방식을 비교한다.
+
+- noop: 의존성 생성만 (TranslationService + SummaryService)
+- translate: 로컬 mock Translation 서버로 실제 번역 1회 (SDK 클라이언트/커넥션 재사용 효과)
+
+실행:
+    cd backend
+    python -m benchmarks.dependency_overhead_benchmark --requests 300
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # 클라이언트 자체 처리량 측정
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from google.auth.credentials import AnonymousCredentials  # noqa: E402
+from google.cloud import translate_v2 as translate  # noqa: E402
+
+from app.core.logging import setup_logging  # noqa: E402
+from app.services.summary_service import SummaryService  # noqa: E402
+from app.services.translation_service import TranslationService  # noqa: E402
+from benchmarks.translation_client_benchmark import start_mock_server  # noqa: E402
+
+
+class MockEndpointTranslationService(TranslationService):
+    """mock 서버를 호출하는 SDK 번역 서비스"""
+    
+    base_url = ""
+    
+    @property
+    def client(self) -> translate.Client:
+        if self._client is None:
+            self._client = translate.Client(
+                credentials=AnonymousCredentials(),
+                client_options={"api_endpoint": self.base_url},
+            )
+        return self._client
+
+
+def build_app() -> FastAPI:
+    """요청별 생성 / 공유 인스턴스 라우트를 가진 벤치마크 앱"""
+    app = FastAPI()
+    shared_translation = MockEndpointTranslationService()
+    shared_summary = SummaryService(translation_service=shared_translation)
+    app.state.shared_translation = shared_translation
+    
+    def per_request_translation() -> TranslationService:
+        return MockEndpointTranslationService()
+    
+    def per_request_summary() -> SummaryService:
+        return SummaryService()
+    
+    def container_translation() -> TranslationService:
+        return shared_translation
+    
+    def container_summary() -> SummaryService:
+        return shared_summary
+    
+    @app.get("/per-request/noop")
+    async def per_request_noop(
+        t: TranslationService = Depends(per_request_translation),
+        s: SummaryService = Depends(per_request_summary),
+    ):
+        return {"ok": True}
+    
+    @app.get("/container/noop")
+    async def container_noop(
+        t: TranslationService = Depends(container_translation),
+        s: SummaryService = Depends(container_summary),
+    ):
+        return {"ok": True}
+    
+    @app.get("/per-request/translate")
+    async def per_request_translate(t: TranslationService = Depends(per_request_translation)):
+        return {"text": await t.translate("안녕하세요", "ko", "en")}
+    
+    @app.get("/container/translate")
+    async def container_translate(t: TranslationService = Depends(container_translation)):
+        return {"text": await t.translate("안녕하세요", "ko", "en")}
+    
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> Dict[str, float]:
+    """동시성 concurrency로 requests건 호출"""
+    latencies: List[float] = []
+    queue = iter(range(requests))
+    
+    async def worker() -> None:
+        for _ in queue:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - started) * 1000)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "rps": requests / wall,
+        "mean_ms": statistics.fmean(latencies),
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+async def main(requests: int, concurrency: int, latency_ms: float) -> None:
+    setup_logging()
+    server, base_url = start_mock_server(latency_ms)
+    MockEndpointTranslationService.base_url = base_url
+    control = httpx.AsyncClient(base_url=base_url)
+    
+    app = build_app()
+    await app.state.shared_translation.warm_up()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    
+    print(f"requests: {requests}  concurrency: {concurrency}  mock latency: {latency_ms} ms")
+    print(f"{'route':<24} {'req/s':>8} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'conns':>6}")
+    
+    try:
+        for route in ("noop", "translate"):
+            for mode in ("per-request", "container"):
+                path = f"/{mode}/{route}"
+                await run(client, path, min(requests, 20), concurrency)  # 워밍업
+                await control.post("/_reset")
+                result = await run(client, path, requests, concurrency)
+                connections = (await control.get("/_stats")).json()["connections"]
+                print(
+                    f"{path:<24} {result['rps']:>8.0f} {result['mean_ms']:>8.2f} "
+                    f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {connections:>6}"
+                )
+    finally:
+        await client.aclose()
+        await control.aclose()
+        server.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="라우트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="mock 서버 응답 지연")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.requests, args.concurrency, args.latency_ms))
+
+
+
+
+
+
+
+
+
+
+
+
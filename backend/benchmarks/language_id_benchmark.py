@@ -0,0 +1,178 @@
+"""
+로컬 언어 감지 벤치마크
+=====================
+
+라벨이 붙은 예문 집합으로 로컬 언어 감지(LanguageIdentifier)의
+언어별 정확도, 호출 지연, API 대체 감지 비율을 측정한다.
+
+실행:
+    cd backend
+    python -m benchmarks.language_id_benchmark --threshold 0.8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.core.logging import setup_logging  # noqa: E402
+from app.services.language_id import LanguageIdentifier  # noqa: E402
+
+# (언어 코드, 예문) - 모델 학습용 예문과 겹치지 않는 문장
+SAMPLES: List[Tuple[str, str]] = [
+    ("ko", "안녕하세요, 오늘 회의를 시작하겠습니다."),
+    ("ko", "다음 분기 예산안을 검토해 주세요."),
+    ("ko", "제 목소리 잘 들리시나요?"),
+    ("ko", "이 부분은 팀과 다시 논의해 보겠습니다."),
+    ("ko", "네"),
+    ("ko", "API 응답 시간이 너무 깁니다."),
+    ("en", "Could you repeat the last point, please?"),
+    ("en", "I'll send the meeting notes after the call."),
+    ("en", "The deadline has been moved to Friday."),
+    ("en", "We are still waiting for feedback from the client."),
+    ("en", "Sounds good to me."),
+    ("en", "Let me check the dashboard and get back to you."),
+    ("ja", "こんにちは、今日の会議を始めましょう。"),
+    ("ja", "来週までに資料を準備してください。"),
+    ("ja", "音声が途切れています。"),
+    ("ja", "ありがとうございます"),
+    ("ja", "予算について質問があります。"),
+    ("ja", "画面を共有してもいいですか？"),
+    ("zh", "大家好，我们现在开始开会。"),
+    ("zh", "请把下个季度的预算发给我。"),
+    ("zh", "我觉得这个方案还需要修改。"),
+    ("zh", "你能听到我说话吗？"),
+    ("zh", "项目进度比预期快。"),
+    ("zh", "谢谢大家的参与。"),
+    ("es", "¿Podrías repetir la última parte, por favor?"),
+    ("es", "Enviaré el acta de la reunión después de la llamada."),
+    ("es", "La fecha límite se ha movido al viernes."),
+    ("es", "Todavía estamos esperando la respuesta del cliente."),
+    ("es", "Me parece bien, sigamos adelante."),
+    ("es", "Necesitamos más tiempo para terminar las pruebas."),
+    ("fr", "Pourriez-vous répéter le dernier point, s'il vous plaît ?"),
+    ("fr", "J'enverrai le compte rendu après l'appel."),
+    ("fr", "La date limite a été repoussée à vendredi."),
+    ("fr", "Nous attendons toujours le retour du client."),
+    ("fr", "Ça me va, continuons."),
+    ("fr", "Il nous faut plus de temps pour terminer les tests."),
+    ("de", "Könntest du den letzten Punkt bitte wiederholen?"),
+    ("de", "Ich schicke das Protokoll nach dem Anruf."),
+    ("de", "Die Frist wurde auf Freitag verschoben."),
+    ("de", "Wir warten immer noch auf die Rückmeldung des Kunden."),
+    ("de", "Das klingt gut, machen wir weiter."),
+    ("de", "Wir brauchen mehr Zeit, um die Tests abzuschließen."),
+    ("pt", "Você poderia repetir o último ponto, por favor?"),
+    ("pt", "Vou enviar a ata da reunião depois da chamada."),
+    ("pt", "O prazo foi adiado para sexta-feira."),
+    ("pt", "Ainda estamos aguardando o retorno do cliente."),
+    ("pt", "Parece bom, vamos continuar."),
+    ("pt", "Precisamos de mais tempo para terminar os testes."),
+    ("ru", "Здравствуйте, давайте начнём совещание."),
+    ("ru", "Пришлите, пожалуйста, бюджет на следующий квартал."),
+    ("ru", "Вы меня слышите?"),
+    ("ru", "Срок перенесли на пятницу."),
+    ("ru", "Спасибо"),
+    ("ru", "Нам нужно больше времени на тестирование."),
+    ("ar", "مرحبا بالجميع، لنبدأ الاجتماع."),
+    ("ar", "هل يمكنك إعادة النقطة الأخيرة من فضلك؟"),
+    ("ar", "تم تأجيل الموعد النهائي إلى يوم الجمعة."),
+    ("ar", "شكرا لكم جميعا."),
+    ("ar", "نحتاج إلى مزيد من الوقت لإنهاء الاختبارات."),
+    ("ar", "هل تسمعني؟"),
+    ("hi", "नमस्ते, चलिए मीटिंग शुरू करते हैं।"),
+    ("hi", "क्या आप आखिरी बात दोहरा सकते हैं?"),
+    ("hi", "समय सीमा शुक्रवार तक बढ़ा दी गई है।"),
+    ("hi", "धन्यवाद"),
+    ("hi", "हमें परीक्षण पूरा करने के लिए और समय चाहिए।"),
+    ("hi", "क्या आप मुझे सुन सकते हैं?"),
+    ("vi", "Bạn có thể nhắc lại ý cuối được không?"),
+    ("vi", "Tôi sẽ gửi biên bản sau cuộc gọi."),
+    ("vi", "Hạn chót đã được dời sang thứ sáu."),
+    ("vi", "Chúng tôi vẫn đang chờ phản hồi từ khách hàng."),
+    ("vi", "Nghe hay đấy, tiếp tục thôi."),
+    ("vi", "Chúng ta cần thêm thời gian để hoàn thành kiểm thử."),
+    ("th", "สวัสดีครับ เริ่มประชุมกันเลย"),
+    ("th", "ช่วยพูดประเด็นสุดท้ายอีกครั้งได้ไหม"),
+    ("th", "กำหนดส่งเลื่อนไปเป็นวันศุกร์"),
+    ("th", "ขอบคุณ"),
+    ("th", "เราต้องการเวลาเพิ่มเพื่อทดสอบให้เสร็จ"),
+    ("th", "ได้ยินผมไหมครับ"),
+    ("id", "Bisakah kamu mengulangi poin terakhir?"),
+    ("id", "Saya akan mengirim notulen setelah panggilan ini."),
+    ("id", "Tenggat waktunya diundur ke hari Jumat."),
+    ("id", "Kami masih menunggu tanggapan dari klien."),
+    ("id", "Kedengarannya bagus, ayo lanjutkan."),
+    ("id", "Kita butuh waktu lebih untuk menyelesaikan pengujian."),
+]
+
+
+def main(threshold: float, repeat: int) -> None:
+    setup_logging()
+    identifier = LanguageIdentifier()
+    
+    per_language: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])  # 정답, 전체, API 대체
+    latencies: List[float] = []
+    errors: List[Tuple[str, str, str, float]] = []
+    
+    for language, text in SAMPLES:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            guess = identifier.identify(text)
+        latencies.append((time.perf_counter() - started) / repeat * 1e6)
+        
+        stats = per_language[language]
+        stats[1] += 1
+        if guess.confidence < threshold:
+            stats[2] += 1
+        if guess.language == language:
+            stats[0] += 1
+        else:
+            errors.append((language, guess.language, text, guess.confidence))
+    
+    print(f"samples: {len(SAMPLES)}  threshold: {threshold}")
+    print(f"{'lang':<5} {'acc':>6} {'api %':>6}")
+    for language, (correct, total, fallback) in sorted(per_language.items()):
+        print(f"{language:<5} {correct / total:>6.2f} {fallback / total * 100:>6.1f}")
+    
+    correct = sum(stats[0] for stats in per_language.values())
+    fallback = sum(stats[2] for stats in per_language.values())
+    latencies.sort()
+    print(
+        f"\naccuracy: {correct / len(SAMPLES):.3f}  "
+        f"api fallback: {fallback / len(SAMPLES) * 100:.1f}%  "
+        f"latency p50: {statistics.median(latencies):.1f} us  "
+        f"p99: {latencies[int(len(latencies) * 0.99) - 1]:.1f} us"
+    )
+    
+    for expected, actual, text, confidence in errors:
+        print(f"  miss {expected} -> {actual} ({confidence:.2f}): {text}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=0.8, help="API 대체 감지 신뢰도 임계값")
+    parser.add_argument("--repeat", type=int, default=200, help="예문당 반복 횟수 (지연 측정)")
+    args = parser.parse_args()
+    main(args.threshold, args.repeat)
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,134 @@
+"""
+로컬 음성 인식 실시간 배율 벤치마크
+================================
+
+LocalSpeechService(프로세스 풀 + 묶음 처리)로 같은 오디오 청크를 동시에 인식해
+워커/스레드 구성별 실시간 배율(RTF = 처리 시간 / 오디오 길이)과 코어당 RTF를 측정한다.
+
+- RTF < 1 이면 실시간보다 빠름, 코어당 RTF = RTF x 사용 코어 수 (코어 하나가 오디오 1초에 쓰는 시간)
+- 코어당 RTF로 동시 회의 수당 필요한 코어 수를 추정 (예: 코어당 RTF 0.25 -> 코어 하나로 4개 스트림)
+- faster-whisper와 CTranslate2 형식 모델이 필요 (pip install faster-whisper)
+
+실행:
+    cd backend
+    python -m benchmarks.local_stt_benchmark --model ./models/whisper-small-ct2 --audio sample.wav \\
+        --configs 1x4 2x2 4x1 --requests 32
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import numpy as np  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.logging import setup_logging  # noqa: E402
+from app.services.local_speech_service import SAMPLE_RATE, LocalSpeechService  # noqa: E402
+
+
+def load_chunks(path: str, chunk_seconds: float) -> List[bytes]:
+    """오디오 파일을 16kHz mono LINEAR16 청크로 분할"""
+    import soundfile as sf
+    
+    audio, sample_rate = sf.read(path, dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    if sample_rate != SAMPLE_RATE:
+        positions = np.arange(0, len(audio), sample_rate / SAMPLE_RATE)
+        audio = np.interp(positions, np.arange(len(audio)), audio)
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    
+    size = int(chunk_seconds * SAMPLE_RATE)
+    return [pcm[start:start + size].tobytes() for start in range(0, len(pcm) - size + 1, size)]
+
+
+async def run(
+    model: str,
+    chunks: List[bytes],
+    workers: int,
+    threads: int,
+    requests: int,
+    language: str,
+) -> Tuple[float, float, List[float], dict]:
+    settings.local_stt_workers = workers
+    settings.local_stt_cpu_threads = threads
+    service = LocalSpeechService(model_path=model)
+    
+    # 워커 시작/모델 로드는 측정에서 제외
+    await asyncio.gather(*(
+        service.recognize_segments(chunks[0], language_code=language) for _ in range(workers)
+    ))
+    service._requests = service._batches = 0
+    service._audio_seconds = service._busy_seconds = 0.0
+    
+    latencies: List[float] = []
+    
+    async def one(index: int) -> None:
+        started = time.perf_counter()
+        await service.recognize_segments(chunks[index % len(chunks)], language_code=language)
+        latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    wall = time.perf_counter() - started
+    
+    audio_seconds = sum(len(chunks[index % len(chunks)]) for index in range(requests)) / 2 / SAMPLE_RATE
+    stats = service.get_stats()
+    await service.close()
+    return wall, audio_seconds, latencies, stats
+
+
+async def main(args: argparse.Namespace) -> None:
+    setup_logging()
+    chunks = load_chunks(args.audio, args.chunk_seconds)
+    if not chunks:
+        sys.exit(f"{args.audio}: {args.chunk_seconds}초보다 짧은 오디오입니다.")
+    
+    print(f"model: {args.model}  chunk: {args.chunk_seconds}s  requests: {args.requests}  cpus: {os.cpu_count()}")
+    print(f"{'config':<8} {'wall_s':>8} {'RTF':>7} {'RTF/core':>9} {'p50_s':>7} {'p95_s':>7} {'batch':>6}")
+    for config in args.configs:
+        workers, threads = (int(value) for value in config.split("x"))
+        wall, audio_seconds, latencies, stats = await run(
+            args.model, chunks, workers, threads, args.requests, args.language
+        )
+        rtf = wall / audio_seconds
+        latencies.sort()
+        print(
+            f"{config:<8} {wall:>8.2f} {rtf:>7.3f} {rtf * workers * threads:>9.3f} "
+            f"{statistics.median(latencies):>7.2f} {latencies[int(len(latencies) * 0.95) - 1]:>7.2f} "
+            f"{stats['avg_batch_size'] or 0:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.local_stt_model_path, help="CTranslate2 whisper 모델 경로")
+    parser.add_argument("--audio", required=True, help="음성 파일 (wav/flac 등)")
+    parser.add_argument("--language", default="ko")
+    parser.add_argument("--chunk-seconds", type=float, default=5.0, help="요청 하나의 오디오 길이")
+    parser.add_argument("--requests", type=int, default=32, help="동시 요청 수")
+    parser.add_argument("--configs", nargs="+", default=["1x4", "2x2", "4x1"], help="워커 수 x 워커당 스레드")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args))
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,96 @@
+"""
+음성 인식 설정 생성 비용 벤치마크
+===============================
+
+transcribe_audio 한 번에 필요한 요청 객체 준비 비용을 비교한다.
+
+- rebuild: 호출마다 RecognitionConfig 생성 (BCP-47 조회, 대체 언어 목록 포함)
+- registry: RecognitionConfigRegistry의 공유 설정 재사용
+- 두 경우 모두 RecognizeRequest(config + RecognitionAudio) 직렬화까지 포함
+
+실행:
+    cd backend
+    python -m benchmarks.recognition_config_benchmark --iterations 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from google.cloud import speech_v1 as speech  # noqa: E402
+from google.cloud.speech_v1.types import RecognitionConfig, RecognizeRequest  # noqa: E402
+
+from app.core.logging import setup_logging  # noqa: E402
+from app.services.recognition_config import LANGUAGE_CODES, RecognitionConfigRegistry  # noqa: E402
+
+AUDIO = b"\x00\x01" * 8000  # 0.5초 16kHz LINEAR16
+ALTERNATIVES = ["en", "ja", "zh"]
+
+
+def rebuild_config(language_code: str, sample_rate: int) -> RecognitionConfig:
+    """레지스트리 도입 전 _get_recognition_config와 같은 방식"""
+    config = RecognitionConfig(
+        encoding=RecognitionConfig.AudioEncoding.LINEAR16,
+        sample_rate_hertz=sample_rate,
+        language_code=LANGUAGE_CODES.get(language_code, "ko-KR"),
+        enable_automatic_punctuation=True,
+        model="latest_long",
+        use_enhanced=True,
+    )
+    config.alternative_language_codes = [
+        LANGUAGE_CODES.get(code, code) for code in ALTERNATIVES if code != language_code
+    ][:3]
+    return config
+
+
+def measure(label: str, make_config, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        config = make_config()
+        audio = speech.RecognitionAudio(content=AUDIO)
+        RecognizeRequest.serialize(RecognizeRequest(config=config, audio=audio))
+    elapsed = time.perf_counter() - started
+    per_call_us = elapsed / iterations * 1e6
+    print(f"{label:<10} {per_call_us:>10.1f} us/call")
+    return per_call_us
+
+
+def main(iterations: int) -> None:
+    setup_logging()
+    registry = RecognitionConfigRegistry()
+    
+    print(f"iterations: {iterations}")
+    rebuild = measure("rebuild", lambda: rebuild_config("ko", 16000), iterations)
+    shared = measure(
+        "registry",
+        lambda: registry.get("ko", 16000, alternative_language_codes=ALTERNATIVES),
+        iterations,
+    )
+    print(f"speedup: {rebuild / shared:.2f}x  registry: {registry.get_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    
+    main(args.iterations)
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,185 @@
+"""
+번역 클라이언트 벤치마크
+======================
+
+google-cloud-translate SDK 경로(TranslationService)와 httpx 비동기 경로
+(HttpTranslationService)를 로컬 mock 서버에 대해 동시 요청 100/1000건으로 비교한다.
+
+실행:
+    cd backend
+    python -m benchmarks.translation_client_benchmark --latency-ms 20
+
+참고: mock 서버는 평문 HTTP라 HTTP/2(ALPN)는 협상되지 않는다.
+이 벤치마크는 커넥션 재사용과 스레드 풀 제거 효과를 측정한다.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+from typing import Dict, List, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.services 패키지 import 시 Supabase 클라이언트가 생성되므로 더미 값 지정
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "eyJhbGciOiJIUzI1NiJ9.e30.benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")  # 클라이언트 자체 처리량 측정
+
+import httpx  # noqa: E402
+from aiohttp import web  # noqa: E402
+from google.auth.credentials import AnonymousCredentials  # noqa: E402
+from google.cloud import translate_v2 as translate  # noqa: E402
+
+from app.core.logging import setup_logging  # noqa: E402
+from app.services.http_translation_service import (  # noqa: E402
+    HttpTranslationService,
+    close_http_clients,
+)
+from app.services.translation_service import TranslationService  # noqa: E402
+
+
+class MockTranslateServer:
+    """Translation v2 REST API mock 서버 (별도 프로세스에서 실행)"""
+    
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.peers: Set[str] = set()
+        self.requests = 0
+    
+    async def _translate(self, request: web.Request) -> web.Response:
+        self.peers.add(str(request.transport.get_extra_info("peername")))
+        self.requests += 1
+        payload = await request.json()
+        await asyncio.sleep(self.latency)
+        values = payload.get("q", [])
+        if isinstance(values, str):
+            values = [values]
+        return web.json_response({
+            "data": {
+                "translations": [
+                    {"translatedText": f"[{payload.get('target')}] {value}"}
+                    for value in values
+                ]
+            }
+        })
+    
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"connections": len(self.peers), "requests": self.requests})
+    
+    async def _reset(self, request: web.Request) -> web.Response:
+        self.peers.clear()
+        self.requests = 0
+        return web.json_response({})
+    
+    def run(self, port: int) -> None:
+        app = web.Application()
+        app.router.add_post("/language/translate/v2", self._translate)
+        app.router.add_get("/_stats", self._stats)
+        app.router.add_post("/_reset", self._reset)
+        web.run_app(app, host="127.0.0.1", port=port, access_log=None, print=None)
+
+
+def _serve(latency_ms: float, port: int) -> None:
+    MockTranslateServer(latency_ms).run(port)
+
+
+def start_mock_server(latency_ms: float) -> Tuple[multiprocessing.Process, str]:
+    """mock 서버 프로세스 시작 후 (프로세스, base_url) 반환"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    
+    process = multiprocessing.get_context("spawn").Process(
+        target=_serve, args=(latency_ms, port), daemon=True
+    )
+    process.start()
+    
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(f"{base_url}/_stats")
+            break
+        except httpx.TransportError:
+            time.sleep(0.1)
+    return process, base_url
+
+
+async def run_round(service: TranslationService, concurrency: int) -> Dict[str, float]:
+    """동시 요청 한 라운드 실행"""
+    latencies: List[float] = []
+    
+    async def one(i: int) -> None:
+        started = time.perf_counter()
+        await service.translate(f"안녕하세요 {i}", "ko", "en")
+        latencies.append((time.perf_counter() - started) * 1000)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "wall_s": wall,
+        "rps": concurrency / wall,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+async def main(latency_ms: float, levels: List[int]) -> None:
+    setup_logging()
+    server, base_url = start_mock_server(latency_ms)
+    control = httpx.AsyncClient(base_url=base_url)
+    
+    sdk_service = TranslationService()
+    sdk_service._client = translate.Client(
+        credentials=AnonymousCredentials(),
+        client_options={"api_endpoint": base_url},
+    )
+    http_service = HttpTranslationService(base_url=base_url, api_key="benchmark")
+    
+    print(f"mock latency: {latency_ms} ms")
+    print(f"{'path':<6} {'conc':>5} {'wall s':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'conns':>6}")
+    
+    try:
+        for concurrency in levels:
+            for name, service in (("sdk", sdk_service), ("http", http_service)):
+                await run_round(service, min(concurrency, 20))  # 워밍업
+                await control.post("/_reset")
+                result = await run_round(service, concurrency)
+                stats = (await control.get("/_stats")).json()
+                print(
+                    f"{name:<6} {concurrency:>5} {result['wall_s']:>8.2f} {result['rps']:>9.0f} "
+                    f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {stats['connections']:>6}"
+                )
+    finally:
+        await close_http_clients()
+        await control.aclose()
+        server.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mock 서버 응답 지연")
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 1000], help="동시 요청 수")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.latency_ms, args.levels))
+
+
+
+
+
+
+
+
+
+
+
+
@@ -0,0 +1,17 @@
+-- 회의 오디오 보관 위치 컬럼 추가
+-- 실행: Supabase SQL Editor에서 실행
+
+-- 1. 발화별 보관 오디오 위치 (세그먼트 경로 + 세그먼트 안 오프셋)
+--    경로: {meeting_id}/{participant_id}/{트랙 시작 시각}-{세그먼트 번호}.flac (또는 .ogg)
+--    audio_archive_bucket 설정 시 Supabase Storage 버킷 경로, 아니면 audio_archive_dir 기준 로컬 경로
+ALTER TABLE utterances
+ADD COLUMN IF NOT EXISTS audio_path TEXT,
+ADD COLUMN IF NOT EXISTS audio_offset_ms INTEGER,
+ADD COLUMN IF NOT EXISTS audio_duration_ms INTEGER;
+
+-- 2. 회의별 보관 오디오 조회 인덱스 (재전사/화자 분리 재실행)
+CREATE INDEX IF NOT EXISTS idx_utterances_meeting_audio
+ON utterances(meeting_id, audio_path)
+WHERE audio_path IS NOT NULL;
+
+-- 오디오 보관은 회의 settings.save_audio = true인 회의만 적용
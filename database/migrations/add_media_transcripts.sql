@@ -0,0 +1,23 @@
+-- 업로드 파일 전사 결과 테이블 (병렬 청크 전사)
+-- 실행: Supabase SQL Editor에서 실행
+
+-- 1. 전사 구간 테이블 (구간별 시작/끝 시각과 단어 타임스탬프)
+CREATE TABLE IF NOT EXISTS media_transcript_segments (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    session_id UUID REFERENCES media_sessions(id) ON DELETE CASCADE,
+    segment_index INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    language VARCHAR(10) NOT NULL,
+    confidence REAL,
+    words JSONB DEFAULT '[]',  -- [[단어, 구간 시작 기준 시작 ms, 끝 ms], ...]
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- 2. 세션별 순서 조회 인덱스 (재전사 시 중복 방지)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_media_transcript_segments_session_index
+ON media_transcript_segments(session_id, segment_index);
+
+-- 전사 진행 상태는 media_sessions.source_metadata->'transcription'에 기록
+-- status 값: 'running' | 'completed' | 'failed'
@@ -0,0 +1,8 @@
+-- 보관 오디오 재전사 지원
+-- 실행: Supabase SQL Editor에서 실행
+
+-- 1. 화자 분리 결과 (같은 마이크를 쓰는 참여자 구분, 재전사 시 화자 분리 옵션)
+ALTER TABLE utterances
+ADD COLUMN IF NOT EXISTS speaker_tag INTEGER;
+
+-- 재전사 진행 상태/체크포인트는 retranscription_dir/{meeting_id}.json에 기록
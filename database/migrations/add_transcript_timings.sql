@@ -0,0 +1,18 @@
+-- 회의 발화 타이밍 컬럼 추가 (자막 내보내기)
+-- 실행: Supabase SQL Editor에서 실행
+
+-- 1. 발화 시작/끝 시각 (회의 시작 기준 ms)과 단어 타임스탬프
+ALTER TABLE utterances
+ADD COLUMN IF NOT EXISTS start_ms INTEGER,
+ADD COLUMN IF NOT EXISTS end_ms INTEGER,
+ADD COLUMN IF NOT EXISTS word_timings JSONB;  -- [[단어, 발화 시작 기준 시작 ms, 끝 ms], ...]
+
+-- 2. 회의별 시간 순 페이지 조회 인덱스
+CREATE INDEX IF NOT EXISTS idx_utterances_meeting_timestamp
+ON utterances(meeting_id, timestamp);
+
+-- 3. 번역 언어별 조회 인덱스 (자막 번역 임베드)
+CREATE INDEX IF NOT EXISTS idx_translations_utterance_language
+ON translations(utterance_id, target_language);
+
+-- 기존 발화(타이밍 없음)는 timestamp와 회의 시작 시각으로 자막 시각을 추정